@@ -1,8 +1,10 @@
 import logging
-from django.core.cache import cache
+from django.core.cache import caches
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from apps.accesscontrol.permissions import require_auth  # returns 401 JSON, not 302
+from apps.accesscontrol.scoped_service import scope_key
+from gyangrit import cache_keys
 from django.db.models import Count, Q
 
 from .models import (
@@ -17,10 +19,12 @@ from .models import (
 from ..content.models import Lesson, LessonProgress, Course
 
 logger = logging.getLogger(__name__)
+catalog = caches["catalog"]   # two-tier cache for read-mostly catalog data
 
 # Cache TTLs (seconds)
 _SUBJECTS_STUDENT_TTL = 15 * 60   # 15 min — changes only when teacher adds subjects
 _SUBJECTS_TEACHER_TTL = 30 * 60   # 30 min — rarely changes
+_DISTRICTS_TTL        = 60 * 60   # 1 h — districts are seeded, almost never edited
 
 
 # =========================================================
@@ -149,13 +153,13 @@ def sections(request):
 def subjects(request):
     """
     Returns subjects scoped by role.
-    Cached per-user via Redis to avoid repeated joins on every dashboard load.
-    Cache is busted by TeachingAssignment post_save signal (apps.academics.signals).
+    Cached per scope (teacher subject set, institution, district) so users
+    in the same scope share one payload; see _subjects_cache_key.
     """
     user = request.user
-    cache_key = f"subjects:{user.role}:{user.id}"
+    cache_key = _subjects_cache_key(request)
 
-    cached = cache.get(cache_key)
+    cached = catalog.get(cache_key) if cache_key else None
     if cached is not None:
         return JsonResponse(cached, safe=False)
 
@@ -192,10 +196,29 @@ def subjects(request):
     else:
         return JsonResponse({"detail": "Forbidden"}, status=403)
 
-    cache.set(cache_key, data, timeout=_SUBJECTS_TEACHER_TTL)
+    catalog.set(cache_key, data, timeout=_SUBJECTS_TEACHER_TTL)
     return JsonResponse(data, safe=False)
 
 
+def _subjects_cache_key(request):
+    """
+    Teachers are keyed by their assigned subject set (UserContext, which is
+    invalidated on TeachingAssignment changes); other staff by the
+    scope_queryset scope. Students are not cached here — their payload
+    carries per-user progress.
+    """
+    ctx = request.user_context
+    if ctx.role == "STUDENT":
+        return None
+    if ctx.role == "TEACHER":
+        scope = f"t:s{cache_keys.id_set(ctx.assigned_subject_ids)}"
+    else:
+        scope = scope_key(request.user)
+    return cache_keys.scoped("subjects", scope, models=(
+        "academics.subject", "academics.classsubject", "academics.classroom", "academics.institution",
+    ))
+
+
 def _subjects_for_student(request):
     """
     Optimised subject+progress query for a student.
@@ -413,6 +436,13 @@ def my_assignments(request):
 @require_http_methods(["GET"])
 def districts(request):
     query = request.GET.get("q", "")
+    if not query:
+        # The full list backs every registration form — serve it from the catalog tier
+        data = catalog.get("districts:all")
+        if data is None:
+            data = list(District.objects.order_by("name").values("id", "name"))
+            catalog.set("districts:all", data, timeout=_DISTRICTS_TTL)
+        return JsonResponse(data, safe=False)
     qs = District.objects.filter(name__icontains=query).order_by("name")
     return JsonResponse(list(qs.values("id", "name")), safe=False)
 
@@ -0,0 +1,126 @@
+# apps.accesscontrol.access
+"""
+Course access decisions.
+
+A user's accessible set is computed once and every check is then answered
+in memory:
+
+    has_access_to_course(user, course)     → bool, no query
+    filter_accessible(user, course_ids)    → accessible IDs, one query
+
+Who can access a course:
+  ADMIN / superuser  every course
+  STUDENT            courses of a StudentSubject subject, plus any course
+                     they hold an Enrollment for
+  TEACHER            courses of a TeachingAssignment subject
+  PRINCIPAL          courses of a subject taught (ClassSubject) in their
+                     institution
+  OFFICIAL           same, across their district
+
+Student and teacher sets come from the cached UserContext
+(apps.accesscontrol.context), which is already invalidated when their
+subjects, assignments or enrollments change. Principal / official sets
+depend only on ClassSubject rows, so they are cached per institution /
+district under the ClassSubject generation (gyangrit.cache_keys), which
+every ClassSubject save/delete bumps.
+
+The resolved set is memoized on the user object for the rest of the request.
+"""
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from gyangrit import cache_keys
+
+from .context import for_user
+
+SCOPE_TTL = 15 * 60
+
+_MEMO_ATTR = "_course_access"
+
+
+@dataclass(frozen=True)
+class CourseAccess:
+    everything:  bool = False
+    subject_ids: frozenset = frozenset()
+    course_ids:  frozenset = frozenset()
+
+    def allows(self, course_id: int, subject_id: int) -> bool:
+        return self.everything or subject_id in self.subject_ids or course_id in self.course_ids
+
+
+NO_ACCESS = CourseAccess()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Principal / official scope sets
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _scope_subject_ids(scope: str, value) -> frozenset:
+    from apps.academics.models import ClassSubject
+
+    key = cache_keys.scoped(
+        "access_subjects", f"{scope[0]}{cache_keys.token(value)}", models=("academics.classsubject",),
+    )
+    subject_ids = cache.get(key)
+    if subject_ids is None:
+        lookup = (
+            {"classroom__institution_id": value} if scope == "institution"
+            else {"classroom__institution__district__name": value}
+        )
+        subject_ids = frozenset(
+            ClassSubject.objects.filter(**lookup).values_list("subject_id", flat=True)
+        )
+        cache.set(key, subject_ids, timeout=SCOPE_TTL)
+    return subject_ids
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Decisions
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _resolve(ctx) -> CourseAccess:
+    if ctx.is_admin:
+        return CourseAccess(everything=True)
+    if ctx.role == "STUDENT":
+        return CourseAccess(subject_ids=ctx.enrolled_subject_ids, course_ids=ctx.enrolled_course_ids)
+    if ctx.role == "TEACHER":
+        return CourseAccess(subject_ids=ctx.assigned_subject_ids)
+    if ctx.role == "PRINCIPAL" and ctx.institution_id:
+        return CourseAccess(subject_ids=_scope_subject_ids("institution", ctx.institution_id))
+    if ctx.role == "OFFICIAL" and ctx.district:
+        return CourseAccess(subject_ids=_scope_subject_ids("district", ctx.district))
+    return NO_ACCESS
+
+
+def course_access(user) -> CourseAccess:
+    """The user's accessible course set (memoized on the user object)."""
+    if not user.is_authenticated:
+        return NO_ACCESS
+    access = getattr(user, _MEMO_ATTR, None)
+    if access is None:
+        access = _resolve(for_user(user))
+        setattr(user, _MEMO_ATTR, access)
+    return access
+
+
+def forget(user) -> None:
+    user.__dict__.pop(_MEMO_ATTR, None)
+
+
+def has_access_to_course(user, course) -> bool:
+    return course_access(user).allows(course.id, course.subject_id)
+
+
+def filter_accessible(user, course_ids) -> list[int]:
+    """The subset of course_ids the user may access, in input order."""
+    from apps.content.models import Course
+
+    access = course_access(user)
+    if access is NO_ACCESS:
+        return []
+    subjects = dict(Course.objects.filter(id__in=course_ids).values_list("id", "subject_id"))
+    return [
+        cid for cid in course_ids
+        if cid in subjects and access.allows(cid, subjects[cid])
+    ]
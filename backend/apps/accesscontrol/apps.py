@@ -3,4 +3,12 @@ from django.apps import AppConfig
 
 class AccesscontrolConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "apps.accesscontrol"
\ No newline at end of file
+    name = "apps.accesscontrol"
+
+    def ready(self):
+        # Invalidate cached UserContext when its source rows change
+        import apps.accesscontrol.signals  # noqa: F401
+
+        # Bump cache generations (gyangrit.cache_keys) on tracked model writes
+        from gyangrit.cache_keys import connect_signals
+        connect_signals()
@@ -0,0 +1,183 @@
+# apps.accesscontrol.context
+"""
+Request-scoped identity facts for the signed-in user.
+
+Views keep re-deriving the same things about request.user — the grade
+behind user.section.classroom, the teacher's assigned subjects, the
+student's StudentSubject / Enrollment rows. UserContext gathers them once:
+
+    ctx = request.user_context          # set by UserContextMiddleware
+    if course.subject_id in ctx.assigned_subject_ids: ...
+
+Helpers that only receive a user call for_user(user); the context is
+memoized on the user object, so within one request it is built at most
+once whichever path asks first.
+
+The built context is cached under a per-user version:
+
+    user_ctx:ver:{user_id}        → version (never expires)
+    user_ctx:{user_id}:{version}  → pickled UserContext (CONTEXT_TTL)
+
+invalidate(user_id) bumps the version, orphaning every cached context for
+that user. Signals (apps.accesscontrol.signals) call it on User,
+StudentSubject, TeachingAssignment and Enrollment saves/deletes; bulk
+writers that bypass signals call it themselves. A reader that built its
+context from pre-write rows stores it under the old version, so it can
+never be served after the bump.
+"""
+import logging
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_TTL = 15 * 60
+
+_MEMO_ATTR = "_user_context"
+
+
+@dataclass(frozen=True)
+class UserContext:
+    user_id:              int
+    role:                 str | None
+    is_superuser:         bool
+    institution_id:       int | None
+    district:             str | None
+    section_id:           int | None
+    grade:                int | None
+    # TEACHER — subjects / sections from TeachingAssignment
+    assigned_subject_ids: frozenset
+    assigned_section_ids: tuple         # assignment order; first = home section
+    # STUDENT — StudentSubject subjects and Enrollment courses (any status)
+    enrolled_subject_ids: frozenset
+    enrolled_course_ids:  frozenset
+
+    @property
+    def is_admin(self) -> bool:
+        return self.is_superuser or self.role == "ADMIN"
+
+    @property
+    def primary_section_id(self) -> int | None:
+        """The student's own section, or the teacher's first assigned section."""
+        if self.role == "STUDENT":
+            return self.section_id
+        return self.assigned_section_ids[0] if self.assigned_section_ids else None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cache keys
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _version_key(user_id: int) -> str:
+    return f"user_ctx:ver:{user_id}"
+
+
+def _version(user_id: int):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never resurrects an old version
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(user_id: int) -> None:
+    """Orphan every cached context for user_id."""
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def forget(user) -> None:
+    """Drop the context memoized on this user object (after it was modified)."""
+    user.__dict__.pop(_MEMO_ATTR, None)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Building
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _parse_grade(classroom_name, user_id):
+    if classroom_name is None:
+        return None
+    try:
+        return int(classroom_name.strip())
+    except (ValueError, AttributeError):
+        logger.warning(
+            "Cannot parse grade from classroom name '%s' for user id=%s",
+            classroom_name,
+            user_id,
+        )
+        return None
+
+
+def build(user) -> UserContext:
+    """Read the context from the database (at most three small queries)."""
+    from apps.academics.models import Section, StudentSubject, TeachingAssignment
+    from apps.learning.models import Enrollment
+
+    role = getattr(user, "role", None)
+    grade = None
+    assigned_subjects, assigned_sections = frozenset(), ()
+    enrolled_subjects, enrolled_courses = frozenset(), frozenset()
+
+    if user.section_id:
+        grade = _parse_grade(
+            Section.objects.filter(id=user.section_id)
+            .values_list("classroom__name", flat=True).first(),
+            user.id,
+        )
+
+    if role == "TEACHER":
+        rows = list(
+            TeachingAssignment.objects.filter(teacher_id=user.id)
+            .order_by("id").values_list("subject_id", "section_id")
+        )
+        assigned_subjects = frozenset(subject_id for subject_id, _ in rows)
+        assigned_sections = tuple(dict.fromkeys(section_id for _, section_id in rows))
+    elif role == "STUDENT":
+        enrolled_subjects = frozenset(
+            StudentSubject.objects.filter(student_id=user.id).values_list("subject_id", flat=True)
+        )
+        enrolled_courses = frozenset(
+            Enrollment.objects.filter(user_id=user.id).values_list("course_id", flat=True)
+        )
+
+    return UserContext(
+        user_id=user.id,
+        role=role,
+        is_superuser=user.is_superuser,
+        institution_id=user.institution_id,
+        district=user.district,
+        section_id=user.section_id,
+        grade=grade,
+        assigned_subject_ids=assigned_subjects,
+        assigned_section_ids=assigned_sections,
+        enrolled_subject_ids=enrolled_subjects,
+        enrolled_course_ids=enrolled_courses,
+    )
+
+
+def for_user(user) -> UserContext | None:
+    """
+    The user's context — memoized on the user object, then the versioned
+    cache, then built. None for anonymous users.
+    """
+    if not user.is_authenticated:
+        return None
+    ctx = getattr(user, _MEMO_ATTR, None)
+    if ctx is not None:
+        return ctx
+
+    key = f"user_ctx:{user.id}:{_version(user.id)}"
+    ctx = cache.get(key)
+    if ctx is None:
+        ctx = build(user)
+        cache.set(key, ctx, timeout=CONTEXT_TTL)
+    setattr(user, _MEMO_ATTR, ctx)
+    return ctx
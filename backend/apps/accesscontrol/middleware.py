@@ -0,0 +1,24 @@
+import logging
+
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from apps.accesscontrol.context import for_user
+
+logger = logging.getLogger(__name__)
+
+
+class UserContextMiddleware(MiddlewareMixin):
+    """
+    Attaches request.user_context — the signed-in user's UserContext
+    (apps.accesscontrol.context), or None when anonymous.
+
+    The context is resolved lazily on first access, so requests that never
+    read it cost nothing; once read it is reused for the rest of the
+    request (and by for_user(request.user) in helpers).
+
+    Must run after AuthenticationMiddleware.
+    """
+
+    def process_request(self, request):
+        request.user_context = SimpleLazyObject(lambda: for_user(request.user))
@@ -132,6 +132,26 @@ def scope_queryset(user, queryset):
     return queryset.none()
 
 
+def scope_key(user) -> str:
+    """
+    Key-safe token for the scope scope_queryset() applies to `user`, so
+    cached payloads can be shared by everyone in the same scope:
+    "all" (ADMIN), "d<token>" (OFFICIAL district), "i<id>" (institution),
+    or "none" (missing profile data / unknown role → empty querysets).
+    """
+    from gyangrit.cache_keys import token
+
+    if not user.is_authenticated:
+        return "none"
+    if user.is_superuser or getattr(user, "role", None) == "ADMIN":
+        return "all"
+    if user.role == "OFFICIAL":
+        return f"d{token(user.district)}" if user.district else "none"
+    if user.role in ("PRINCIPAL", "TEACHER", "STUDENT"):
+        return f"i{user.institution_id}" if user.institution_id else "none"
+    return "none"
+
+
 def get_scoped_object_or_404(user, queryset, **lookup):
     """
     Fetch a single object within the user's scope.
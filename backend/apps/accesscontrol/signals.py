@@ -0,0 +1,38 @@
+"""
+accesscontrol/signals.py
+
+Invalidate cached UserContext (apps.accesscontrol.context) and the
+request-memoized course access set (apps.accesscontrol.access) whenever a
+row they are built from changes. Bulk writers that skip signals
+(bulk_create / queryset.update) call context.invalidate() themselves.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.academics.models import StudentSubject, TeachingAssignment
+from apps.accounts.models import User
+from apps.learning.models import Enrollment
+
+from . import access, context
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    context.forget(instance)
+    access.forget(instance)
+    context.invalidate(instance.id)
+
+
+@receiver([post_save, post_delete], sender=StudentSubject)
+def invalidate_student_subject(sender, instance, **kwargs):
+    context.invalidate(instance.student_id)
+
+
+@receiver([post_save, post_delete], sender=TeachingAssignment)
+def invalidate_teaching_assignment(sender, instance, **kwargs):
+    context.invalidate(instance.teacher_id)
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+def invalidate_enrollment(sender, instance, **kwargs):
+    context.invalidate(instance.user_id)
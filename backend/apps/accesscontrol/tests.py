@@ -16,3 +16,65 @@ class TestRoleGates:
     def test_teacher_cannot_delete_course(self, teacher_client, course):
         resp = teacher_client.delete(f"/api/v1/courses/{course.id}/delete/")
         assert resp.status_code in (403, 404, 405)
+
+
+@pytest.mark.django_db
+class TestUserContext:
+    def test_student_context_fields(self, student_user, subject, classroom):
+        from apps.academics.models import StudentSubject
+        from apps.accesscontrol import context
+
+        StudentSubject.objects.get_or_create(student=student_user, subject=subject, classroom=classroom)
+        ctx = context.for_user(student_user)
+        assert ctx.role == "STUDENT"
+        assert ctx.section_id == student_user.section_id
+        assert ctx.grade == int(classroom.name)
+        assert subject.id in ctx.enrolled_subject_ids
+
+    def test_cached_until_assignment_changes(self, teacher_user, subject, section, django_assert_num_queries):
+        from apps.academics.models import TeachingAssignment
+        from apps.accesscontrol import context
+
+        assert context.for_user(teacher_user).assigned_subject_ids == frozenset()
+        context.forget(teacher_user)
+        with django_assert_num_queries(0):
+            context.for_user(teacher_user)
+
+        TeachingAssignment.objects.create(teacher=teacher_user, subject=subject, section=section)
+        context.forget(teacher_user)
+        ctx = context.for_user(teacher_user)
+        assert ctx.assigned_subject_ids == {subject.id}
+        assert ctx.primary_section_id == section.id
+
+    def test_teacher_course_access_from_context(self, teacher_client, teacher_user, course, section):
+        from apps.academics.models import TeachingAssignment
+
+        assert teacher_client.get(f"/api/v1/courses/{course.id}/lessons/").status_code == 403
+        TeachingAssignment.objects.create(teacher=teacher_user, subject=course.subject, section=section)
+        assert teacher_client.get(f"/api/v1/courses/{course.id}/lessons/").status_code == 200
+
+
+@pytest.mark.django_db
+class TestCourseAccess:
+    def test_filter_accessible_keeps_order_and_drops_unknown(self, student_user, course, subject, classroom):
+        from apps.academics.models import StudentSubject, Subject
+        from apps.accesscontrol.access import filter_accessible
+        from apps.content.models import Course
+
+        other = Course.objects.create(title="Other", subject=Subject.objects.create(name="Art"), grade=10)
+        StudentSubject.objects.get_or_create(student=student_user, subject=subject, classroom=classroom)
+        assert filter_accessible(student_user, [other.id, 999999, course.id]) == [course.id]
+
+    def test_principal_scope_follows_class_subjects(self, principal_user, course, classroom):
+        from apps.academics.models import ClassSubject
+        from apps.accesscontrol import access
+
+        assert not access.has_access_to_course(principal_user, course)
+        ClassSubject.objects.create(classroom=classroom, subject=course.subject)
+        access.forget(principal_user)
+        assert access.has_access_to_course(principal_user, course)
+
+    def test_batch_progress_filters_inaccessible(self, teacher_client, course):
+        resp = teacher_client.get(f"/api/v1/courses/progress/batch/?ids={course.id}")
+        assert resp.status_code == 200
+        assert resp.json() == {}
@@ -41,6 +41,8 @@ urlpatterns = [
 
     # Admin system overview
     path("system-stats/",       views.system_stats),
+    path("http-stats/",         views.http_stats),
+    path("cache-stats/",        views.cache_stats),
 
     # Public
     path("contact/",            views.contact_form),
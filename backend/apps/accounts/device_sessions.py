@@ -0,0 +1,97 @@
+# apps.accounts.device_sessions
+"""
+Active session key per user, for single-device enforcement.
+
+DeviceSession (one row per user) is the source of truth. Because
+SingleActiveSessionMiddleware checks it on every authenticated request —
+heartbeats included — reads go through two cache layers first:
+
+  in-process   {user_id: (expires_at, key)}, LOCAL_TTL seconds per worker
+  shared       cache key "device_session:{user_id}" (Redis in production)
+  database     DeviceSession row, read only on a miss and written back
+
+activate() and clear() write the row and both caches. A worker's local
+entry can trail a login or logout on another worker by up to LOCAL_TTL,
+so a mismatch is never acted on from cache: active_key(..., fresh=True)
+re-reads the row before the middleware kicks anyone.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+
+from .models import DeviceSession
+
+LOCAL_TTL = 5
+SHARED_TTL = 24 * 60 * 60
+LOCAL_MAX_ENTRIES = 10_000
+
+_NONE = ""   # cached marker for "no DeviceSession row"
+
+_local: dict[int, tuple[float, str]] = {}
+_local_lock = threading.Lock()
+
+
+def _key(user_id: int) -> str:
+    return f"device_session:{user_id}"
+
+
+def _remember(user_id: int, value: str) -> None:
+    with _local_lock:
+        if len(_local) >= LOCAL_MAX_ENTRIES:
+            _local.clear()
+        _local[user_id] = (time.monotonic() + LOCAL_TTL, value)
+
+
+def _forget(user_id: int) -> None:
+    with _local_lock:
+        _local.pop(user_id, None)
+
+
+def _store(user_id: int, value: str) -> None:
+    cache.set(_key(user_id), value, timeout=SHARED_TTL)
+    _remember(user_id, value)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Reads
+# ─────────────────────────────────────────────────────────────────────────────
+
+def active_key(user_id: int, fresh: bool = False) -> str | None:
+    """
+    The user's active session key, or None if they have no DeviceSession.
+    fresh=True skips both caches and re-reads the row.
+    """
+    if not fresh:
+        entry = _local.get(user_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1] or None
+        value = cache.get(_key(user_id))
+        if value is not None:
+            _remember(user_id, value)
+            return value or None
+
+    value = (
+        DeviceSession.objects.filter(user_id=user_id)
+        .values_list("device_fingerprint", flat=True).first()
+    ) or _NONE
+    _store(user_id, value)
+    return value or None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Writes
+# ─────────────────────────────────────────────────────────────────────────────
+
+def activate(user, session_key: str) -> None:
+    """Make session_key the user's only active session (login)."""
+    DeviceSession.objects.filter(user=user).delete()
+    DeviceSession.objects.create(user=user, device_fingerprint=session_key)
+    _store(user.id, session_key)
+
+
+def clear(user_id: int) -> None:
+    """Drop the user's active session (logout, kick, password reset)."""
+    DeviceSession.objects.filter(user_id=user_id).delete()
+    cache.delete(_key(user_id))
+    _forget(user_id)
@@ -0,0 +1,46 @@
+# apps.accounts.jobs
+"""
+Background job handlers for OTP and transactional email delivery.
+Enqueued by the *_async helpers in apps.accounts.services.
+"""
+import logging
+
+from django.core.mail import send_mail
+
+from apps.jobs.queue import job
+
+from . import services
+
+logger = logging.getLogger(__name__)
+
+
+@job(queue="critical", max_attempts=1)
+def deliver_otp(username, email, mobile, otp_code):
+    # Single attempt: _deliver_otp_background already falls back
+    # Email → SMS → log, and a retried OTP would arrive after it expired.
+    services._deliver_otp_background(username, email, mobile, otp_code)
+
+
+@job()
+def send_notification_email(user_email, subject, title, message,
+                            greeting="", action_text=None, action_url=None):
+    services._deliver_notification_email(
+        user_email, subject, title, message, greeting, action_text, action_url,
+    )
+
+
+@job(queue="critical")
+def send_password_reset_email(user_email, username, reset_url):
+    services._deliver_password_reset_email(user_email, username, reset_url)
+
+
+@job()
+def send_contact_email(subject, body_text, sender_name, sender_email, recipient):
+    send_mail(
+        subject=subject,
+        message=body_text,
+        from_email=None,           # uses DEFAULT_FROM_EMAIL (noreply@gyangrit.site)
+        recipient_list=[recipient],
+        fail_silently=False,
+    )
+    logger.info("Contact form email sent from %s <%s>", sender_name, sender_email)
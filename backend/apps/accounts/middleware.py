@@ -1,7 +1,7 @@
 import logging
 from django.utils.deprecation import MiddlewareMixin
 from django.contrib.auth import logout
-from apps.accounts.models import DeviceSession
+from apps.accounts import device_sessions
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +30,13 @@ class SingleActiveSessionMiddleware(MiddlewareMixin):
     Enforces single active session per user across all roles.
 
     On every authenticated request:
-    1. Looks up the stored DeviceSession for the user.
+    1. Looks up the user's active session key (apps.accounts.device_sessions:
+       in-process → Redis → DeviceSession row, so normally no DB query).
     2. Compares the stored session key with the current request's session key.
-    3. If they differ, the user has logged in from another device/browser.
-       The current request's session is terminated (logout).
+    3. If they differ, the key is re-read from the database (caches may lag
+       a login on another worker) and, if it still differs, the user has
+       logged in from another device/browser. The current request's session
+       is terminated (logout).
 
     This implements FR-02 from the SRS: single-device session enforcement.
 
@@ -59,7 +62,11 @@ class SingleActiveSessionMiddleware(MiddlewareMixin):
             return
 
         try:
-            device_session = DeviceSession.objects.get(user=request.user)
+            stored_key = device_sessions.active_key(request.user.id)
+            if stored_key is None:
+                # No device session on record — login view will create one.
+                # This is normal immediately after account creation.
+                return
 
             current_key = request.session.session_key
 
@@ -69,16 +76,22 @@ class SingleActiveSessionMiddleware(MiddlewareMixin):
                 request.session.save()
                 current_key = request.session.session_key
 
-            if device_session.device_fingerprint != current_key:
+            if stored_key != current_key:
+                # The cached key may trail a login on another worker —
+                # confirm against the database before kicking.
+                stored_key = device_sessions.active_key(request.user.id, fresh=True)
+
+            if stored_key is not None and stored_key != current_key:
                 logger.warning(
                     "Session mismatch for user id=%s: stored=%s current=%s — "
                     "forcing logout (single-session enforcement).",
                     request.user.id,
-                    device_session.device_fingerprint,
+                    stored_key,
                     current_key,
                 )
+                user_id = request.user.id
                 logout(request)
-                device_session.delete()
+                device_sessions.clear(user_id)
 
                 # Return a JSON response so the frontend can show a message
                 # instead of silently redirecting to login.
@@ -88,11 +101,6 @@ class SingleActiveSessionMiddleware(MiddlewareMixin):
                     status=401,
                 )
 
-        except DeviceSession.DoesNotExist:
-            # No device session on record — login view will create one.
-            # This is normal immediately after account creation.
-            pass
-
         except Exception:
             # Log with full traceback so production issues are visible.
             # Do NOT swallow silently — this middleware protects session integrity.
@@ -13,6 +13,7 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 
 from apps.academics.models import ClassRoom, Section, TeachingAssignment
+from gyangrit import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,9 @@ def assign_teacher_to_classes(teacher, subject, institution):
     ]
     if assignments:
         TeachingAssignment.objects.bulk_create(assignments, ignore_conflicts=True)
+        # bulk_create skips post_save — refresh the teacher's cached UserContext
+        from apps.accesscontrol.context import invalidate
+        invalidate(teacher.id)
 
     logger.info(
         "assign_teacher_to_classes: teacher id=%s assigned to %d sections "
@@ -52,7 +56,8 @@ def assign_teacher_to_classes(teacher, subject, institution):
 # OTP delivery  —  async, email-first
 #
 # Priority:  Email → SMS (Twilio) → Log fallback
-# Delivery:  fire-and-forget via threading.Thread (safe with gthread workers)
+# Delivery:  background job on the "critical" queue (apps.accounts.jobs),
+#            consumed by `manage.py run_workers`
 #
 # Why Email primary?
 #   - Twilio SMS is reliable but expensive.
@@ -66,7 +71,6 @@ def assign_teacher_to_classes(teacher, subject, institution):
 #     can verify as soon as the message arrives
 # ─────────────────────────────────────────────────────────────────────────────
 
-import threading
 import time
 
 from twilio.rest import Client
@@ -95,7 +99,7 @@ def _send_sms_fast2sms(mobile: str, otp_code: str) -> bool:
     )
 
     try:
-        resp = requests.get(
+        resp = http_client.get(
             "https://www.fast2sms.com/dev/bulkV2",
             params={
                 "authorization": api_key,
@@ -197,8 +201,8 @@ def _send_sms_twilio(mobile: str, otp_code: str) -> bool:
 
 def _deliver_otp_background(username: str, email: str, mobile: str, otp_code: str) -> None:
     """
-    Background thread: try Email first, then Twilio SMS, then log.
-    This runs AFTER the HTTP response has already been sent to the user.
+    Background job: try Email first, then Twilio SMS, then log.
+    This runs in a job worker, never on the HTTP request thread.
     """
     t0 = time.monotonic()
 
@@ -250,13 +254,8 @@ def send_otp_async(user, otp_code: str) -> str:
     else:
         channel = "log"
 
-    # Fire background thread — daemon=True so it won't block server shutdown
-    thread = threading.Thread(
-        target=_deliver_otp_background,
-        args=(user.username, email, mobile, otp_code),
-        daemon=True,
-    )
-    thread.start()
+    from .jobs import deliver_otp
+    deliver_otp.delay(user.username, email, mobile, otp_code)
 
     logger.info("OTP[%s] delivery dispatched (channel=%s)", user.username, channel)
     return channel
@@ -293,32 +292,44 @@ def send_notification_email_async(
         logger.warning("Skipping notification email: Missing destination or Zoho setup.")
         return
 
-    def _deliver_notification():
-        try:
-            context = {
-                "title": title,
-                "message": message,
-                "greeting": greeting,
-                "action_text": action_text,
-                "action_url": action_url,
-            }
-            html_content = render_to_string("emails/notification_email.html", context)
-            
-            send_mail(
-                subject=f"GyanGrit — {subject}",
-                message=message,  # Text fallback
-                html_message=html_content,
-                from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@gyangrit.site"),
-                recipient_list=[user_email],
-                fail_silently=True,
-            )
-            masked = user_email[:3] + "***" + user_email[user_email.find("@"):]
-            logger.info("Notification email '%s' delivered to %s", subject, masked)
-        except Exception as exc:
-            logger.error("Failed to send notification email '%s': %s", subject, exc)
-
-    thread = threading.Thread(target=_deliver_notification, daemon=True)
-    thread.start()
+    from .jobs import send_notification_email
+    send_notification_email.delay(
+        user_email, subject, title, message, greeting, action_text, action_url,
+    )
+
+
+def _deliver_notification_email(
+    user_email: str,
+    subject: str,
+    title: str,
+    message: str,
+    greeting: str = "",
+    action_text: str = None,
+    action_url: str = None,
+) -> None:
+    """Render and send the universal notification email. Runs in a job worker."""
+    try:
+        context = {
+            "title": title,
+            "message": message,
+            "greeting": greeting,
+            "action_text": action_text,
+            "action_url": action_url,
+        }
+        html_content = render_to_string("emails/notification_email.html", context)
+
+        send_mail(
+            subject=f"GyanGrit — {subject}",
+            message=message,  # Text fallback
+            html_message=html_content,
+            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@gyangrit.site"),
+            recipient_list=[user_email],
+            fail_silently=True,
+        )
+        masked = user_email[:3] + "***" + user_email[user_email.find("@"):]
+        logger.info("Notification email '%s' delivered to %s", subject, masked)
+    except Exception as exc:
+        logger.error("Failed to send notification email '%s': %s", subject, exc)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -330,7 +341,7 @@ def send_password_reset_email_async(user_email: str, username: str, reset_url: s
     Fire-and-forget password reset email.
 
     Renders emails/password_reset_email.html and sends via Zoho SMTP in a
-    background thread so the forgot-password API endpoint returns instantly.
+    background job so the forgot-password API endpoint returns instantly.
 
     Args:
         user_email: Recipient's email address.
@@ -341,28 +352,31 @@ def send_password_reset_email_async(user_email: str, username: str, reset_url: s
         logger.warning("Skipping password reset email: missing destination or SMTP config.")
         return
 
-    def _deliver():
-        try:
-            context = {"username": username, "reset_url": reset_url}
-            html_content = render_to_string("emails/password_reset_email.html", context)
-            text_content = (
-                f"Hi {username},\n\n"
-                f"Click the link below to reset your GyanGrit password:\n{reset_url}\n\n"
-                f"This link expires in 1 hour. If you didn't request this, ignore this email.\n\n"
-                f"— The GyanGrit Security Team"
-            )
-            send_mail(
-                subject="GyanGrit — Reset your password",
-                message=text_content,
-                html_message=html_content,
-                from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "GyanGrit <noreply@gyangrit.site>"),
-                recipient_list=[user_email],
-                fail_silently=False,
-            )
-            masked = user_email[:3] + "***" + user_email[user_email.find("@"):]
-            logger.info("Password reset email delivered to %s", masked)
-        except Exception as exc:
-            logger.error("Password reset email failed: %s", exc)
-
-    threading.Thread(target=_deliver, daemon=True).start()
+    from .jobs import send_password_reset_email
+    send_password_reset_email.delay(user_email, username, reset_url)
 
+
+def _deliver_password_reset_email(user_email: str, username: str, reset_url: str) -> None:
+    """Render and send the password reset email. Runs in a job worker."""
+    try:
+        context = {"username": username, "reset_url": reset_url}
+        html_content = render_to_string("emails/password_reset_email.html", context)
+        text_content = (
+            f"Hi {username},\n\n"
+            f"Click the link below to reset your GyanGrit password:\n{reset_url}\n\n"
+            f"This link expires in 1 hour. If you didn't request this, ignore this email.\n\n"
+            f"— The GyanGrit Security Team"
+        )
+        send_mail(
+            subject="GyanGrit — Reset your password",
+            message=text_content,
+            html_message=html_content,
+            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "GyanGrit <noreply@gyangrit.site>"),
+            recipient_list=[user_email],
+            fail_silently=False,
+        )
+        masked = user_email[:3] + "***" + user_email[user_email.find("@"):]
+        logger.info("Password reset email delivered to %s", masked)
+    except Exception as exc:
+        logger.error("Password reset email failed: %s", exc)
+        raise  # let the job worker retry — SMTP hiccups are usually transient
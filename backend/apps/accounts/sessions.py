@@ -0,0 +1,49 @@
+# apps.accounts.sessions
+"""
+Sliding session expiry without a write on every request.
+
+SESSION_SAVE_EVERY_REQUEST rewrites the session (a remote Redis SET in
+production) on every response, heartbeats and bell polls included, just to
+push the expiry forward. SlidingSessionMiddleware replaces it:
+
+  - data is saved only when the request modified it (Django's default);
+  - otherwise the session is "touched" — saved again and its cookie
+    re-issued, restarting SESSION_COOKIE_AGE — only once
+    SESSION_REFRESH_FRACTION of that age has passed since the last save.
+
+With a 1-hour age and fraction 0.25 an active user costs at most one
+session write per 15 minutes, and an idle session expires 45–60 minutes
+after its last request instead of exactly 60.
+
+The last save time is kept in the session itself under TOUCHED_KEY.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+
+TOUCHED_KEY = "_touched"
+
+
+def _refresh_after() -> float:
+    return settings.SESSION_COOKIE_AGE * getattr(settings, "SESSION_REFRESH_FRACTION", 0.25)
+
+
+class SlidingSessionMiddleware(SessionMiddleware):
+    """
+    Drop-in replacement for django.contrib.sessions SessionMiddleware
+    (keep SESSION_SAVE_EVERY_REQUEST off).
+
+    Only sessions this request already loaded are considered, so requests
+    that never look at the session don't pay to load it here.
+    """
+
+    def process_response(self, request, response):
+        session = getattr(request, "session", None)
+        if session is not None and session.accessed and not session.is_empty():
+            now = int(time.time())
+            touched = session.get(TOUCHED_KEY, 0)
+            if session.modified or now - touched >= _refresh_after():
+                # Sets modified → the base class saves and re-issues the cookie
+                session[TOUCHED_KEY] = now
+        return super().process_response(request, response)
@@ -120,6 +120,183 @@ class TestContact:
         assert resp.status_code in (200, 201, 429)
 
 
+# ── SINGLE ACTIVE SESSION ─────────────────────────────────────────────────────
+
+def _login(client, username="student1"):
+    return client.post(
+        "/api/v1/accounts/login/",
+        data=json.dumps({"username": username, "password": "TestPass123!"}),
+        content_type="application/json",
+    )
+
+
+@pytest.mark.django_db
+class TestSingleActiveSession:
+    def test_second_login_kicks_first(self, student_user):
+        first, second = Client(), Client()
+        _login(first)
+        assert first.get("/api/v1/accounts/me/").status_code == 200
+        _login(second)
+        resp = first.get("/api/v1/accounts/me/")
+        assert resp.status_code == 401
+        assert resp.json()["error"] == "session_kicked"
+
+    def test_enforcement_served_from_cache(self, student_user, django_assert_num_queries):
+        from apps.accounts import device_sessions
+        from apps.accounts.models import DeviceSession
+
+        client = Client()
+        _login(client)
+        key = DeviceSession.objects.get(user=student_user).device_fingerprint
+        assert device_sessions.active_key(student_user.id) == key
+        with django_assert_num_queries(0):
+            device_sessions.active_key(student_user.id)
+
+    def test_logout_clears_cached_key(self, student_user):
+        from apps.accounts import device_sessions
+
+        client = Client()
+        _login(client)
+        client.post("/api/v1/accounts/logout/")
+        assert device_sessions.active_key(student_user.id) is None
+
+
+@pytest.mark.django_db
+class TestSlidingSession:
+    def test_unmodified_session_not_resaved(self, student_client):
+        student_client.get("/api/v1/accounts/me/")   # first touch stamps the session
+        resp = student_client.get("/api/v1/accounts/me/")
+        assert resp.status_code == 200
+        assert "gyangrit_sessionid" not in resp.cookies
+
+    def test_session_refreshed_once_due(self, student_client, settings):
+        settings.SESSION_REFRESH_FRACTION = 0
+        resp = student_client.get("/api/v1/accounts/me/")
+        assert resp.cookies["gyangrit_sessionid"]["max-age"] == settings.SESSION_COOKIE_AGE
+
+
+# ── OUTBOUND HTTP POOL ────────────────────────────────────────────────────────
+
+@pytest.mark.django_db
+class TestHttpClient:
+    def test_connections_reused(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from gyangrit import http_client
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            http_client.reset_stats()
+            url = f"http://127.0.0.1:{server.server_port}/publish"
+            for _ in range(5):
+                assert http_client.post(url, json={"n": 1}, timeout=2).status_code == 200
+        finally:
+            server.shutdown()
+            server.server_close()
+            http_client.reset_session()
+
+        host = http_client.stats()["hosts"]["127.0.0.1"]
+        assert host["requests"] == 5
+        assert host["connections"] == 1
+        assert host["reuse_ratio"] == 0.8
+
+    def test_scalar_timeout_keeps_connect_bound(self):
+        from gyangrit import http_client
+        assert http_client._timeout("rest.ably.io", 30) == (3.05, 30)
+        assert http_client._timeout("rest.ably.io", None) == (3.05, 5)
+
+    def test_stats_admin_only(self, admin_client, student_client):
+        assert admin_client.get("/api/v1/accounts/http-stats/").status_code == 200
+        assert student_client.get("/api/v1/accounts/http-stats/").status_code == 403
+
+
+# ── TWO-TIER CACHE ────────────────────────────────────────────────────────────
+
+class TestTieredCache:
+    def test_local_tier_serves_repeat_reads(self):
+        from django.core.cache import cache, caches
+        from gyangrit import tiered_cache
+
+        catalog = caches["catalog"]
+        tiered_cache.reset_stats()
+        catalog.set("courses:test", [1, 2], timeout=60)
+        cache.delete("courses:test")            # gone remotely, still local
+        value = catalog.get("courses:test")
+        assert value == [1, 2]
+        value.append(3)                         # callers get their own copy
+        assert catalog.get("courses:test") == [1, 2]
+        assert tiered_cache.stats()["families"]["catalog:courses"]["local_hits"] == 2
+
+    def test_delete_and_remote_fallback(self):
+        from django.core.cache import cache, caches
+
+        catalog = caches["catalog"]
+        cache.set("subjects_list:test", ["math"])
+        assert catalog.get("subjects_list:test") == ["math"]   # remote hit, now local
+        catalog.delete("subjects_list:test")
+        assert catalog.get("subjects_list:test") is None
+
+    def test_generations_read_from_local_tier(self):
+        from django.core.cache import cache
+        from gyangrit import cache_keys
+
+        key = cache_keys.scoped("courses", "test", models=("content.course",))
+        cache.set("gen:content.course", 0)      # remote changed — local copy still answers
+        assert cache_keys.scoped("courses", "test", models=("content.course",)) == key
+        cache_keys.bump("content.course")
+        assert cache_keys.scoped("courses", "test", models=("content.course",)) != key
+
+    def test_cache_stats_admin_only(self, admin_client, student_client):
+        assert admin_client.get("/api/v1/accounts/cache-stats/").status_code == 200
+        assert student_client.get("/api/v1/accounts/cache-stats/").status_code == 403
+
+
+class TestSingleFlight:
+    def test_stale_served_then_refreshed(self):
+        from django.core.cache import cache
+        from gyangrit import single_flight
+
+        single_flight.reset_stats()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return len(calls)
+
+        assert single_flight.get_or_compute("sf:test", build, soft_ttl=60, hard_ttl=300) == 1
+        assert single_flight.get_or_compute("sf:test", build, soft_ttl=60, hard_ttl=300) == 1
+        assert len(calls) == 1
+
+        cache.set("sf:test", {"value": 1, "fresh_until": 0}, timeout=300)   # past soft TTL
+        assert single_flight.get_or_compute("sf:test", build, soft_ttl=60, hard_ttl=300) == 1
+        assert single_flight.get_or_compute("sf:test", build, soft_ttl=60, hard_ttl=300) == 2
+        row = single_flight.stats()["families"]["sf"]
+        assert (row["missing"], row["stale"], row["refreshes"], row["computes"]) == (1, 1, 1, 2)
+
+    def test_waits_for_lock_holder(self, monkeypatch):
+        from django.core.cache import cache
+        from gyangrit import single_flight
+
+        monkeypatch.setattr(single_flight, "WAIT_SECONDS", 0.2)
+        cache.add("flight:sf:held", "other-worker")
+        assert single_flight.get_or_compute("sf:held", lambda: "mine", soft_ttl=60, hard_ttl=300) == "mine"
+        assert single_flight.stats()["families"]["sf"]["wait_timeouts"] >= 1
+
+
 # ── MODELS ────────────────────────────────────────────────────────────────────
 
 @pytest.mark.django_db
@@ -14,9 +14,10 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from apps.accesscontrol.permissions import require_roles
-from apps.accesscontrol.scoped_service import scope_queryset
+from apps.accesscontrol.scoped_service import scope_key, scope_queryset
+from gyangrit import cache_keys
 
-from django.core.cache import cache
+from django.core.cache import cache, caches
 
 from apps.academics.models import (
     Institution,
@@ -29,13 +30,14 @@ from apps.academics.models import (
 from .models import (
     StudentRegistrationRecord,
     OTPVerification,
-    DeviceSession,
     JoinCode,
 )
+from . import device_sessions
 from .services import send_otp_async
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
+catalog = caches["catalog"]   # two-tier cache for read-mostly catalog data
 
 
 # =========================================================
@@ -73,11 +75,7 @@ def _create_device_session(request, user):
     if not request.session.session_key:
         request.session.save()
 
-    DeviceSession.objects.filter(user=user).delete()
-    DeviceSession.objects.create(
-        user=user,
-        device_fingerprint=request.session.session_key,
-    )
+    device_sessions.activate(user, request.session.session_key)
 
 
 # =========================================================
@@ -389,7 +387,7 @@ def resend_otp(request):
 @csrf_exempt
 def logout_view(request):
     if request.user.is_authenticated:
-        DeviceSession.objects.filter(user=request.user).delete()
+        device_sessions.clear(request.user.id)
         logger.info("User id=%s logged out.", request.user.id)
     logout(request)
     return JsonResponse({"success": True})
@@ -536,8 +534,11 @@ def users(request):
 @require_roles(["ADMIN", "OFFICIAL", "PRINCIPAL"])
 @require_http_methods(["GET"])
 def institutions_list(request):
-    cache_key = f"institutions_list:{request.user.id}"
-    cached = cache.get(cache_key)
+    cache_key = cache_keys.scoped(
+        "institutions_list", scope_key(request.user),
+        models=("academics.institution", "academics.district"),
+    )
+    cached = catalog.get(cache_key)
     if cached is not None:
         return JsonResponse(cached, safe=False)
 
@@ -546,7 +547,7 @@ def institutions_list(request):
         Institution.objects.select_related("district").order_by("name"),
     )
     data = list(queryset.values("id", "name", "district__name"))
-    cache.set(cache_key, data, timeout=600)
+    catalog.set(cache_key, data, timeout=600)
     return JsonResponse(data, safe=False)
 
 
@@ -561,8 +562,11 @@ def sections_list(request):
     Now returns `short_label` ("Class 8-A") and `label`
     ("Class 8-A — School Name") so the frontend can show meaningful options.
     """
-    cache_key = f"sections_list:{request.user.id}"
-    cached = cache.get(cache_key)
+    cache_key = cache_keys.scoped(
+        "sections_list", scope_key(request.user),
+        models=("academics.section", "academics.classroom", "academics.institution", "academics.district"),
+    )
+    cached = catalog.get(cache_key)
     if cached is not None:
         return JsonResponse(cached, safe=False)
 
@@ -593,21 +597,23 @@ def sections_list(request):
             "label":       full_label,
         })
 
-    cache.set(cache_key, data, timeout=600)
+    catalog.set(cache_key, data, timeout=600)
     return JsonResponse(data, safe=False)
 
 
 @require_roles(["ADMIN", "OFFICIAL", "PRINCIPAL", "TEACHER"])
 @require_http_methods(["GET"])
 def subjects_list(request):
-    cache_key = f"subjects_list:{request.user.id}"
-    cached = cache.get(cache_key)
+    # Subject is not institution-scoped: one payload for everyone with a scope
+    scope = "none" if scope_key(request.user) == "none" else "all"
+    cache_key = cache_keys.scoped("subjects_list", scope, models=("academics.subject",))
+    cached = catalog.get(cache_key)
     if cached is not None:
         return JsonResponse(cached, safe=False)
 
     queryset = scope_queryset(request.user, Subject.objects.all())
     data = list(queryset.values("id", "name"))
-    cache.set(cache_key, data, timeout=600)
+    catalog.set(cache_key, data, timeout=600)
     return JsonResponse(data, safe=False)
 
 
@@ -1239,57 +1245,80 @@ def bulk_create_join_codes(request):
 @require_roles(["ADMIN"])
 @require_http_methods(["GET"])
 def system_stats(request):
-    from django.core.cache import cache as _cache
     from django.db.models import Count as _Count, Q as _Q
     from django.utils import timezone
     from apps.content.models import Course, Lesson, LessonProgress
     from apps.assessments.models import Assessment, AssessmentAttempt
     from apps.notifications.models import Broadcast
     from apps.accounts.models import DeviceSession
+    from gyangrit import single_flight
 
-    _KEY = "admin:system_stats"
-    cached = _cache.get(_KEY)
-    if cached is not None:
-        return JsonResponse(cached)
+    def build():
+        User = get_user_model()
+        today = timezone.now().date()
 
-    User = get_user_model()
-    today = timezone.now().date()
+        # 1 query instead of 6 — GROUP BY role
+        role_rows = (
+            User.objects
+            .values("role")
+            .annotate(cnt=_Count("id"))
+        )
+        role_map = {r["role"]: r["cnt"] for r in role_rows}
+        total_users = sum(role_map.values())
+
+        payload = {
+            "users": {
+                "total":      total_users,
+                "students":   role_map.get("STUDENT",   0),
+                "teachers":   role_map.get("TEACHER",   0),
+                "principals": role_map.get("PRINCIPAL", 0),
+                "officials":  role_map.get("OFFICIAL",  0),
+                "admins":     role_map.get("ADMIN",     0),
+            },
+            "active_sessions": DeviceSession.objects.count(),
+            "content": {
+                "courses":               Course.objects.count(),
+                "lessons":               Lesson.objects.filter(is_published=True).count(),
+                "published_assessments": Assessment.objects.filter(is_published=True).count(),
+            },
+            "activity": {
+                "lessons_completed_today":     LessonProgress.objects.filter(completed=True, last_opened_at__date=today).count(),
+                "assessments_submitted_today": AssessmentAttempt.objects.filter(submitted_at__date=today).count(),
+                "notifications_sent_today":    Broadcast.objects.filter(sent_at__date=today).count(),
+            },
+        }
+        return payload
 
-    # 1 query instead of 6 — GROUP BY role
-    role_rows = (
-        User.objects
-        .values("role")
-        .annotate(cnt=_Count("id"))
+    payload = single_flight.get_or_compute(
+        "admin:system_stats", build, soft_ttl=60, hard_ttl=300,
     )
-    role_map = {r["role"]: r["cnt"] for r in role_rows}
-    total_users = sum(role_map.values())
-
-    payload = {
-        "users": {
-            "total":      total_users,
-            "students":   role_map.get("STUDENT",   0),
-            "teachers":   role_map.get("TEACHER",   0),
-            "principals": role_map.get("PRINCIPAL", 0),
-            "officials":  role_map.get("OFFICIAL",  0),
-            "admins":     role_map.get("ADMIN",     0),
-        },
-        "active_sessions": DeviceSession.objects.count(),
-        "content": {
-            "courses":               Course.objects.count(),
-            "lessons":               Lesson.objects.filter(is_published=True).count(),
-            "published_assessments": Assessment.objects.filter(is_published=True).count(),
-        },
-        "activity": {
-            "lessons_completed_today":     LessonProgress.objects.filter(completed=True, last_opened_at__date=today).count(),
-            "assessments_submitted_today": AssessmentAttempt.objects.filter(submitted_at__date=today).count(),
-            "notifications_sent_today":    Broadcast.objects.filter(sent_at__date=today).count(),
-        },
-    }
-
-    _cache.set(_KEY, payload, timeout=60)
     return JsonResponse(payload)
 
 
+@require_roles(["ADMIN"])
+@require_http_methods(["GET"])
+def http_stats(request):
+    """
+    Outbound HTTP pool metrics (requests, new connections, reuse ratio,
+    connect time per host) for the worker process that served this request.
+    """
+    from gyangrit import http_client
+    return JsonResponse(http_client.stats())
+
+
+@require_roles(["ADMIN"])
+@require_http_methods(["GET"])
+def cache_stats(request):
+    """
+    Two-tier cache metrics (local hits, remote hits, misses per key family)
+    and single-flight stampede metrics (fresh / stale / missing reads,
+    computes, waits per key family) for the worker process that served
+    this request.
+    """
+    from gyangrit import single_flight, tiered_cache
+    return JsonResponse({**tiered_cache.stats(), "stampede": single_flight.stats()["families"]})
+
+
 # =========================================================
 # FORGOT PASSWORD
 # =========================================================
@@ -1403,7 +1432,7 @@ def reset_password(request):
     user.save(update_fields=["password"])
 
     # Invalidate all sessions so old sessions can't be replayed
-    DeviceSession.objects.filter(user=user).delete()
+    device_sessions.clear(user.id)
     # Also flush Django session store for this user (belt-and-suspenders)
     try:
         for session in Session.objects.all():
@@ -1480,10 +1509,9 @@ def contact_form(request):
     Accepts {name, email, message} and sends an email to admin@gyangrit.site.
     Rate-limited to 3 submissions per IP per hour via Redis.
     """
-    import threading
     import re
-    from django.core.mail import send_mail
     from django.core.cache import cache as _cache
+    from .jobs import send_contact_email
 
     try:
         body = json.loads(request.body)
@@ -1528,20 +1556,7 @@ def contact_form(request):
 
     ADMIN_EMAIL = "admin@gyangrit.site"
 
-    def _send():
-        try:
-            send_mail(
-                subject=subject,
-                message=body_text,
-                from_email=None,           # uses DEFAULT_FROM_EMAIL (noreply@gyangrit.site)
-                recipient_list=[ADMIN_EMAIL],
-                fail_silently=True,
-            )
-            logger.info("Contact form email sent from %s <%s>", name, email)
-        except Exception:
-            logger.exception("Failed to send contact form email from %s <%s>", name, email)
-
-    threading.Thread(target=_send, daemon=True).start()
+    send_contact_email.delay(subject, body_text, name, email, ADMIN_EMAIL)
 
     return JsonResponse({"success": True, "message": "Your message has been sent!"})
 
@@ -17,6 +17,8 @@ import threading
 
 import requests
 
+from gyangrit import http_client
+
 logger = logging.getLogger(__name__)
 
 MAX_TOKENS = 512
@@ -87,7 +89,7 @@ def _call_boa(messages: list[dict], system_prompt: str) -> str:
     if not api_key:
         raise ProviderError("No BOA_API_KEY_N keys configured in .env")
 
-    resp = requests.post(
+    resp = http_client.post(
         "https://api.bayofassets.com/v1/chat/completions",
         headers={
             "Authorization": f"Bearer {api_key}",
@@ -126,7 +128,7 @@ def _call_groq(messages: list[dict], system_prompt: str) -> str:
     if not api_key:
         raise ProviderError("GROQ_API_KEY not configured")
 
-    resp = requests.post(
+    resp = http_client.post(
         "https://api.groq.com/openai/v1/chat/completions",
         headers={
             "Authorization": f"Bearer {api_key}",
@@ -160,7 +162,7 @@ def _call_together(messages: list[dict], system_prompt: str) -> str:
     if not api_key:
         raise ProviderError("TOGETHER_API_KEY not configured")
 
-    resp = requests.post(
+    resp = http_client.post(
         "https://api.together.xyz/v1/chat/completions",
         headers={
             "Authorization": f"Bearer {api_key}",
@@ -205,7 +207,7 @@ def _call_gemini(messages: list[dict], system_prompt: str) -> str:
         f"gemini-2.0-flash:generateContent?key={api_key}"
     )
 
-    resp = requests.post(
+    resp = http_client.post(
         url,
         json={
             "system_instruction": {"parts": [{"text": system_prompt}]},
@@ -13,7 +13,7 @@ class EngagementEventAdmin(admin.ModelAdmin):
 
 @admin.register(DailyEngagementSummary)
 class DailyEngagementSummaryAdmin(admin.ModelAdmin):
-    list_display = ("user", "date", "total_minutes", "lesson_minutes", "live_session_minutes", "assessment_minutes", "ai_messages")
+    list_display = ("user", "date", "total_seconds", "lesson_seconds", "live_session_seconds", "assessment_seconds", "ai_messages")
     list_filter  = ("date",)
     search_fields = ("user__username",)
     date_hierarchy = "date"
@@ -8,8 +8,10 @@ from apps.analytics import views
 urlpatterns = [
     path("heartbeat/",           views.heartbeat),
     path("event/",               views.log_event),
+    path("events/batch/",        views.log_events_batch),
     path("my-summary/",          views.my_summary),
     path("my-risk/",             views.my_risk),
     path("class-summary/",       views.class_summary),
     path("nightly-recompute/",   views.nightly_recompute),
+    path("ingest-stats/",        views.ingest_stats),
 ]
@@ -0,0 +1,307 @@
+# apps.analytics.ingest
+"""
+Buffered heartbeat ingestion.
+
+Every active student sends a heartbeat every 30s. Instead of one DB write
+per heartbeat, heartbeats are summed per
+(user_id, event_type, resource_id, event_date) and flushed every
+HEARTBEAT_FLUSH_INTERVAL seconds as one
+INSERT ... ON CONFLICT DO UPDATE per chunk of rows (relies on the
+uniq_heartbeat_event_per_day partial unique index).
+
+Where the buffer lives:
+  Redis (REDIS_URL set)  one shared hash, HINCRBY per heartbeat. Flushed by
+                         the periodic flush_heartbeats job in run_workers.
+  Local (no Redis)       a dict in the web process. Flushed by the first
+                         heartbeat that finds it older than the interval,
+                         and at interpreter exit.
+
+HEARTBEAT_FLUSH_INTERVAL = 0 disables buffering (tests): each heartbeat is
+upserted immediately through the same code path.
+
+Each flush records latency, rows written and remaining buffer depth in the
+cache (see ingest_stats()) and logs them.
+"""
+import atexit
+import logging
+import threading
+import time
+import uuid
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import HEARTBEAT_EVENT_TYPES, EngagementEvent
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 30  # each heartbeat represents 30s of active viewing
+
+_BUFFER_KEY      = "analytics:hb:buffer"
+_LABELS_KEY      = "analytics:hb:labels"
+_FLUSHING_KEY    = "analytics:hb:flushing"
+_FLUSHING_LABELS = "analytics:hb:flushing_labels"
+_FLUSH_LOCK_KEY  = "analytics:hb:flush_lock"
+_STATS_KEY       = "analytics:hb:stats"
+_UPSERT_CHUNK    = 500
+
+# Compare-and-delete: DEL the lock only if it still holds our token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def _flush_interval() -> float:
+    return getattr(settings, "HEARTBEAT_FLUSH_INTERVAL", 5)
+
+
+def _field(user_id, event_type, resource_id, event_date: date) -> str:
+    return f"{user_id}|{event_type}|{resource_id}|{event_date.isoformat()}"
+
+
+def _parse_field(field: str):
+    user_id, event_type, resource_id, day = field.split("|")
+    return int(user_id), event_type, int(resource_id), date.fromisoformat(day)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Buffering
+# ─────────────────────────────────────────────────────────────────────────────
+
+_local_buffer: dict[str, list] = {}     # field → [seconds, label]
+_local_lock = threading.Lock()
+_local_last_flush = time.monotonic()
+
+
+def buffer_heartbeat(user_id: int, event_type: str, resource_id: int, resource_label: str = "") -> None:
+    """Add HEARTBEAT_SECONDS to today's (user, event_type, resource) bucket."""
+    buffer_heartbeats(user_id, [(event_type, resource_id, resource_label)])
+
+
+def buffer_heartbeats(user_id: int, beats) -> None:
+    """
+    Buffer several heartbeats for one user in a single round trip.
+    `beats` is an iterable of (event_type, resource_id, resource_label); repeats
+    of the same resource are summed before touching Redis / the dict.
+    """
+    today = timezone.now().date()
+    pending: dict[str, list] = {}
+    for event_type, resource_id, resource_label in beats:
+        bucket = pending.setdefault(_field(user_id, event_type, resource_id, today), [0, ""])
+        bucket[0] += HEARTBEAT_SECONDS
+        bucket[1] = bucket[1] or resource_label
+    if not pending:
+        return
+
+    if _flush_interval() <= 0:
+        _upsert(pending)
+        return
+
+    from gyangrit.redis_client import get_redis
+    r = get_redis()
+    if r is not None:
+        try:
+            pipe = r.pipeline(transaction=False)
+            for field, (seconds, label) in pending.items():
+                pipe.hincrby(_BUFFER_KEY, field, seconds)
+                if label:
+                    pipe.hsetnx(_LABELS_KEY, field, label)
+            pipe.execute()
+            return
+        except Exception as exc:
+            logger.warning("Heartbeat buffer: Redis unavailable, buffering locally: %s", exc)
+
+    with _local_lock:
+        for field, (seconds, label) in pending.items():
+            bucket = _local_buffer.setdefault(field, [0, ""])
+            bucket[0] += seconds
+            bucket[1] = bucket[1] or label
+        due = time.monotonic() - _local_last_flush >= _flush_interval()
+    if due:
+        flush_local_buffer()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Flushing
+# ─────────────────────────────────────────────────────────────────────────────
+
+def flush_local_buffer() -> int:
+    """Flush this process's in-memory buffer. Returns rows upserted."""
+    global _local_last_flush
+    with _local_lock:
+        pending = dict(_local_buffer)
+        _local_buffer.clear()
+        _local_last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    started = time.monotonic()
+    try:
+        rows = _upsert(pending)
+    except Exception:
+        logger.exception("Heartbeat flush failed — keeping %d buckets for the next flush", len(pending))
+        with _local_lock:
+            for field, (seconds, label) in pending.items():
+                bucket = _local_buffer.setdefault(field, [0, ""])
+                bucket[0] += seconds
+                bucket[1] = bucket[1] or label
+        return 0
+
+    with _local_lock:
+        depth = len(_local_buffer)
+    _record_flush(started, rows, pending, depth)
+    return rows
+
+
+def flush_redis_buffer() -> int:
+    """
+    Flush the shared Redis buffer. Returns rows upserted.
+
+    The live hash is atomically renamed to a "flushing" hash, so heartbeats
+    arriving mid-flush start a fresh buffer. If the DB write fails the
+    flushing hash is left in place and retried first on the next run.
+    """
+    from gyangrit.redis_client import get_redis
+    r = get_redis()
+    if r is None:
+        return 0
+    token = uuid.uuid4().hex
+    if not r.set(_FLUSH_LOCK_KEY, token, nx=True, ex=60):
+        return 0   # another worker is flushing
+
+    started = time.monotonic()
+    try:
+        if not r.exists(_FLUSHING_KEY):
+            pipe = r.pipeline(transaction=True)
+            pipe.rename(_BUFFER_KEY, _FLUSHING_KEY)
+            pipe.rename(_LABELS_KEY, _FLUSHING_LABELS)
+            # RENAME errors when the source is missing (empty buffer / no labels)
+            pipe.execute(raise_on_error=False)
+
+        counts = r.hgetall(_FLUSHING_KEY)
+        if not counts:
+            r.delete(_FLUSHING_LABELS)
+            return 0
+        labels = r.hgetall(_FLUSHING_LABELS)
+        pending = {
+            field: [int(seconds), labels.get(field, "")]
+            for field, seconds in counts.items()
+        }
+        rows = _upsert(pending)
+        r.delete(_FLUSHING_KEY, _FLUSHING_LABELS)
+        _record_flush(started, rows, pending, r.hlen(_BUFFER_KEY))
+        return rows
+    finally:
+        # Only release our own lock — a flush that outran the 60s expiry
+        # must not delete the next holder's
+        r.eval(_RELEASE_LOCK_SCRIPT, 1, _FLUSH_LOCK_KEY, token)
+
+
+def flush_heartbeats() -> int:
+    """Flush whichever buffer this process owns."""
+    return flush_redis_buffer() + flush_local_buffer()
+
+
+def _upsert(pending: dict[str, list]) -> int:
+    """
+    INSERT ... ON CONFLICT (partial unique index) DO UPDATE, adding the
+    buffered seconds to any existing row. Works on PostgreSQL and SQLite.
+    """
+    from django.contrib.auth import get_user_model
+    User = get_user_model()
+
+    parsed = []
+    for field, (seconds, label) in pending.items():
+        try:
+            user_id, event_type, resource_id, day = _parse_field(field)
+        except ValueError:
+            logger.warning("Heartbeat flush: dropping malformed bucket %r", field)
+            continue
+        if event_type in HEARTBEAT_EVENT_TYPES and seconds > 0:
+            parsed.append((user_id, event_type, resource_id, (label or "")[:200], seconds, day))
+    if not parsed:
+        return 0
+
+    # A user deleted since the heartbeat would fail the whole statement on the FK
+    live_ids = set(
+        User.objects.filter(id__in={p[0] for p in parsed}).values_list("id", flat=True)
+    )
+    parsed = [p for p in parsed if p[0] in live_ids]
+
+    table = connection.ops.quote_name(EngagementEvent._meta.db_table)
+    # Must match the uniq_heartbeat_event_per_day predicate for conflict inference
+    types_sql = ", ".join(f"'{t}'" for t in HEARTBEAT_EVENT_TYPES)
+    now = timezone.now()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for i in range(0, len(parsed), _UPSERT_CHUNK):
+            chunk = parsed[i:i + _UPSERT_CHUNK]
+            values_sql = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(chunk))
+            params = []
+            for user_id, event_type, resource_id, label, seconds, day in chunk:
+                params.extend([user_id, event_type, resource_id, label, seconds, now, day])
+            cursor.execute(
+                f"INSERT INTO {table} "
+                f"(user_id, event_type, resource_id, resource_label, duration_seconds, created_at, event_date) "
+                f"VALUES {values_sql} "
+                f"ON CONFLICT (user_id, event_type, resource_id, event_date) "
+                f"WHERE event_type IN ({types_sql}) "
+                f"DO UPDATE SET "
+                f"duration_seconds = {table}.duration_seconds + EXCLUDED.duration_seconds, "
+                f"resource_label = CASE WHEN {table}.resource_label = '' "
+                f"THEN EXCLUDED.resource_label ELSE {table}.resource_label END",
+                params,
+            )
+
+    from .risk import mark_dirty
+    mark_dirty(live_ids)
+    return len(parsed)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Metrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _record_flush(started: float, rows: int, pending: dict, depth: int) -> None:
+    elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+    heartbeats = sum(seconds for seconds, _ in pending.values()) // HEARTBEAT_SECONDS
+    stats = {
+        "flushed_at":     timezone.now().isoformat(),
+        "flush_ms":       elapsed_ms,
+        "rows":           rows,
+        "heartbeats":     heartbeats,
+        "buffer_depth":   depth,
+    }
+    cache.set(_STATS_KEY, stats, timeout=None)
+    logger.info(
+        "Heartbeat flush: %d heartbeats → %d rows in %.1fms (buffer depth now %d)",
+        heartbeats, rows, elapsed_ms, depth,
+    )
+
+
+def ingest_stats() -> dict:
+    """Last flush metrics plus the current buffer depth."""
+    from gyangrit.redis_client import get_redis
+    stats = dict(cache.get(_STATS_KEY) or {})
+    r = get_redis()
+    redis_depth = None
+    if r is not None:
+        try:
+            redis_depth = r.hlen(_BUFFER_KEY)
+        except Exception:
+            pass
+    with _local_lock:
+        local_depth = len(_local_buffer)
+    stats["current_buffer_depth"] = {"redis": redis_depth, "local": local_depth}
+    stats["flush_interval"] = _flush_interval()
+    return stats
+
+
+# Flush whatever is still buffered locally when a gunicorn worker recycles
+atexit.register(flush_local_buffer)
@@ -0,0 +1,76 @@
+# apps.analytics.jobs
+"""
+Background job handlers for engagement tracking.
+
+log_event() / log_events_batch() validate the request and enqueue
+record_event / record_events; the DB write happens in `manage.py run_workers`,
+so a gunicorn worker recycle no longer drops it. Heartbeats are buffered by apps.analytics.ingest and written in
+bulk by the periodic flush_heartbeats job.
+"""
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.jobs.queue import job, periodic
+
+from .models import EngagementEvent
+from .risk import mark_dirty
+
+logger = logging.getLogger(__name__)
+
+
+@periodic(every=getattr(settings, "HEARTBEAT_FLUSH_INTERVAL", 5) or 5)
+def flush_heartbeats():
+    """Upsert the buffered heartbeat totals (see apps.analytics.ingest)."""
+    from .ingest import flush_heartbeats as flush
+    flush()
+
+
+@periodic(every=60 * 60)
+def rollup_engagement():
+    """Roll closed days into DailyEngagementSummary (see apps.analytics.rollup)."""
+    from .rollup import rollup_daily_summaries
+    rollup_daily_summaries()
+
+
+@periodic(every=5 * 60)
+def recompute_dirty_risk():
+    """Rescore students whose risk inputs changed (see apps.analytics.risk)."""
+    from .risk import recompute_dirty
+    recompute_dirty()
+
+
+@job()
+def record_event(user_id, event_type, resource_id, resource_label, duration):
+    """Append a one-shot EngagementEvent."""
+    EngagementEvent.objects.create(
+        user_id=user_id,
+        event_type=event_type,
+        resource_id=resource_id,
+        resource_label=resource_label,
+        duration_seconds=duration,
+        event_date=timezone.now().date(),
+    )
+    mark_dirty([user_id])
+
+
+@job()
+def record_events(user_id, events):
+    """
+    Append a batch of one-shot EngagementEvents in one INSERT.
+    `events` is a list of [event_type, resource_id, resource_label, duration].
+    """
+    today = timezone.now().date()
+    EngagementEvent.objects.bulk_create([
+        EngagementEvent(
+            user_id=user_id,
+            event_type=event_type,
+            resource_id=resource_id,
+            resource_label=resource_label,
+            duration_seconds=duration,
+            event_date=today,
+        )
+        for event_type, resource_id, resource_label, duration in events
+    ])
+    mark_dirty([user_id])
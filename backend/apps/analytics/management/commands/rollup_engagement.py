@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.rollup import rollup_daily_summaries, rollup_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Rolls EngagementEvent rows up into DailyEngagementSummary from the high-water "
+        "mark through yesterday. --date re-rolls a single day."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Re-roll only this day (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            try:
+                day = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError("--date must be YYYY-MM-DD")
+            written = rollup_day(day)
+        else:
+            written = rollup_daily_summaries()
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily engagement summary rows."))
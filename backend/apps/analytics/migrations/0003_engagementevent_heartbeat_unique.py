@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:24
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+HEARTBEAT_TYPES = ("lesson_view", "live_session", "flashcard_study")
+
+
+def merge_duplicate_heartbeat_rows(apps, schema_editor):
+    """
+    The old thread-per-heartbeat get_or_create could race and create two rows
+    for the same (user, event_type, resource_id, event_date). Fold them into
+    the oldest row so the unique constraint can be added.
+    """
+    EngagementEvent = apps.get_model("analytics", "EngagementEvent")
+    dupes = (
+        EngagementEvent.objects
+        .filter(event_type__in=HEARTBEAT_TYPES)
+        .values("user_id", "event_type", "resource_id", "event_date")
+        .annotate(n=Count("id"), total=Sum("duration_seconds"))
+        .filter(n__gt=1)
+    )
+    for group in dupes.iterator():
+        rows = EngagementEvent.objects.filter(
+            user_id=group["user_id"],
+            event_type=group["event_type"],
+            resource_id=group["resource_id"],
+            event_date=group["event_date"],
+        ).order_by("id")
+        keep = rows.first()
+        label = next((r.resource_label for r in rows if r.resource_label), "")
+        rows.exclude(id=keep.id).delete()
+        keep.duration_seconds = group["total"] or 0
+        keep.resource_label = keep.resource_label or label
+        keep.save(update_fields=["duration_seconds", "resource_label"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_alter_engagementevent_event_type_studentriskscore'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_heartbeat_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='engagementevent',
+            constraint=models.UniqueConstraint(condition=models.Q(('event_type__in', ('lesson_view', 'live_session', 'flashcard_study'))), fields=('user', 'event_type', 'resource_id', 'event_date'), name='uniq_heartbeat_event_per_day'),
+        ),
+    ]
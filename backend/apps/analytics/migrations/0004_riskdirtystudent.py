@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_rename_mobile_number_user_mobile_primary_and_more'),
+        ('analytics', '0003_engagementevent_heartbeat_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiskDirtyStudent',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('marked_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def minutes_to_seconds(apps, schema_editor):
+    # Existing rows hold floored minutes; scale them so closed days keep
+    # their totals. New rollups write exact seconds.
+    DailyEngagementSummary = apps.get_model("analytics", "DailyEngagementSummary")
+    DailyEngagementSummary.objects.update(
+        lesson_seconds=F("lesson_seconds") * 60,
+        live_session_seconds=F("live_session_seconds") * 60,
+        assessment_seconds=F("assessment_seconds") * 60,
+        flashcard_seconds=F("flashcard_seconds") * 60,
+        total_seconds=F("total_seconds") * 60,
+    )
+
+
+def seconds_to_minutes(apps, schema_editor):
+    DailyEngagementSummary = apps.get_model("analytics", "DailyEngagementSummary")
+    DailyEngagementSummary.objects.update(
+        lesson_seconds=F("lesson_seconds") / 60,
+        live_session_seconds=F("live_session_seconds") / 60,
+        assessment_seconds=F("assessment_seconds") / 60,
+        flashcard_seconds=F("flashcard_seconds") / 60,
+        total_seconds=F("total_seconds") / 60,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0004_riskdirtystudent"),
+    ]
+
+    operations = [
+        migrations.RenameField("dailyengagementsummary", "lesson_minutes", "lesson_seconds"),
+        migrations.RenameField("dailyengagementsummary", "live_session_minutes", "live_session_seconds"),
+        migrations.RenameField("dailyengagementsummary", "assessment_minutes", "assessment_seconds"),
+        migrations.RenameField("dailyengagementsummary", "flashcard_minutes", "flashcard_seconds"),
+        migrations.RenameField("dailyengagementsummary", "total_minutes", "total_seconds"),
+        migrations.RunPython(minutes_to_seconds, seconds_to_minutes),
+    ]
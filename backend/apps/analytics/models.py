@@ -40,6 +40,16 @@ class EventType(models.TextChoices):
     PAGE_VISIT       = "page_visit",        "Page Visit"
 
 
+# Event types accumulated by 30s heartbeats — at most one row per
+# (user, event_type, resource_id, event_date), enforced by a partial unique
+# index so the buffered flush can INSERT ... ON CONFLICT DO UPDATE.
+HEARTBEAT_EVENT_TYPES = (
+    EventType.LESSON_VIEW,
+    EventType.LIVE_SESSION,
+    EventType.FLASHCARD_STUDY,
+)
+
+
 class EngagementEvent(models.Model):
     """
     Single engagement event. Created when the frontend sends a heartbeat
@@ -69,6 +79,13 @@ class EngagementEvent(models.Model):
             models.Index(fields=["event_type", "event_date"]),
             models.Index(fields=["user", "resource_id", "event_type"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "event_type", "resource_id", "event_date"],
+                condition=models.Q(event_type__in=HEARTBEAT_EVENT_TYPES),
+                name="uniq_heartbeat_event_per_day",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user_id} {self.event_type} {self.resource_id} {self.duration_seconds}s"
@@ -76,23 +93,25 @@ class EngagementEvent(models.Model):
 
 class DailyEngagementSummary(models.Model):
     """
-    Pre-aggregated daily summary per user. Updated by a nightly cron or
-    on-the-fly when queried (lazy aggregation).
+    Pre-aggregated daily summary per user for closed days. Maintained
+    incrementally by apps.analytics.rollup (hourly rollup_engagement job);
+    today is always aggregated from raw events.
 
     This avoids scanning millions of EngagementEvent rows for dashboard
-    queries. One row per user per day.
+    queries. One row per user per day. Durations are stored in seconds and
+    only converted to minutes after summing over the requested range.
     """
     user               = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
         related_name="daily_engagement",
     )
     date               = models.DateField(db_index=True)
-    lesson_minutes     = models.PositiveIntegerField(default=0)
-    live_session_minutes = models.PositiveIntegerField(default=0)
-    assessment_minutes = models.PositiveIntegerField(default=0)
+    lesson_seconds     = models.PositiveIntegerField(default=0)
+    live_session_seconds = models.PositiveIntegerField(default=0)
+    assessment_seconds = models.PositiveIntegerField(default=0)
     ai_messages        = models.PositiveIntegerField(default=0)
-    flashcard_minutes  = models.PositiveIntegerField(default=0)
-    total_minutes      = models.PositiveIntegerField(default=0)
+    flashcard_seconds  = models.PositiveIntegerField(default=0)
+    total_seconds      = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ("user", "date")
@@ -102,7 +121,7 @@ class DailyEngagementSummary(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.user_id} {self.date} {self.total_minutes}min"
+        return f"{self.user_id} {self.date} {self.total_seconds}s"
 
 
 class StudentRiskScore(models.Model):
@@ -128,3 +147,22 @@ class StudentRiskScore(models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.risk_level} ({self.score})"
+
+
+class RiskDirtyStudent(models.Model):
+    """
+    Students whose risk inputs changed since their last score.
+
+    Marked by attempt submissions, heartbeat flushes, one-shot events,
+    lesson completions and live attendance; drained in batches by the
+    periodic recompute_dirty_risk job (apps.analytics.risk). marked_at is
+    bumped on every re-mark so a student marked mid-recompute is kept.
+    """
+    user      = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        primary_key=True, related_name="+",
+    )
+    marked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.user_id} dirty since {self.marked_at:%Y-%m-%d %H:%M}"
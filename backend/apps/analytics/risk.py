@@ -0,0 +1,467 @@
+# apps.analytics.risk
+"""
+Set-based risk engine — the batch form of signals._recalculate_risk().
+
+_recalculate_risk() issues ~12 queries per student. compute_risk_scores()
+pulls each of the 7 signals once per chunk of students with grouped
+queries (GROUP BY user_id / grade), then scores every student in memory
+with the same weights, thresholds and factor strings, so its output is
+identical to calling _recalculate_risk() per student.
+
+recompute_risk_scores() adds persistence: one upsert per chunk into
+StudentRiskScore, cache busting, and teacher alerts for students who newly
+crossed into HIGH.
+
+Dirty set:
+  mark_dirty() records students whose inputs changed (attempt submitted,
+  heartbeats flushed, events logged, lesson completed, live session joined)
+  in RiskDirtyStudent. The periodic recompute_dirty_risk job rescores only
+  those, so the submit path no longer pays for scoring. nightly_recompute
+  adds the students whose score can move with time alone (see
+  mark_time_sensitive_dirty) and drains the same set.
+"""
+import logging
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 2000   # students per set of grouped queries (bounds IN-list size)
+_STALE_DAYS = 2      # nightly sweep rescores anyone not scored for this long
+
+
+def _parse_grade(classroom_name):
+    """Classroom.name → grade, exactly as _recalculate_risk() does it."""
+    try:
+        return int(classroom_name.strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+def compute_risk_scores(student_ids) -> dict[int, tuple[float, str, dict]]:
+    """
+    Score a batch of students. Returns {user_id: (score, risk_level, factors)}.
+    Query count is constant per call, independent of len(student_ids).
+    """
+    from django.contrib.auth import get_user_model
+    from apps.analytics.models import EngagementEvent, StudentRiskScore
+    from apps.assessments.models import Assessment, AssessmentAttempt
+    from apps.content.models import Lesson, LessonProgress
+
+    student_ids = list(student_ids)
+    if not student_ids:
+        return {}
+
+    today = timezone.now().date()
+    now = timezone.now()
+    seven_days_ago = today - timedelta(days=7)
+    fourteen_days_ago = today - timedelta(days=14)
+    week_ago = now - timedelta(days=7)
+
+    User = get_user_model()
+    students = list(
+        User.objects
+        .filter(id__in=student_ids)
+        .values("id", "last_login", "section_id", "section__classroom__name")
+    )
+    grade_of = {
+        s["id"]: _parse_grade(s["section__classroom__name"]) if s["section_id"] else None
+        for s in students
+    }
+    grades = {g for g in grade_of.values() if g is not None}
+
+    # ── Signal inputs, one grouped query each ─────────────────────────────
+    engagement = {
+        row["user_id"]: (row["recent"] or 0, row["prior"] or 0)
+        for row in (
+            EngagementEvent.objects
+            .filter(user_id__in=student_ids, event_date__gte=fourteen_days_ago)
+            .values("user_id")
+            .annotate(
+                recent=Sum("duration_seconds", filter=Q(event_date__gte=seven_days_ago)),
+                prior=Sum("duration_seconds", filter=Q(event_date__lt=seven_days_ago)),
+            )
+            .order_by()
+        )
+    }
+
+    attempts = {
+        row["user_id"]: (row["total"], row["failed"])
+        for row in (
+            AssessmentAttempt.objects
+            .filter(user_id__in=student_ids, submitted_at__gte=week_ago, submitted_at__isnull=False)
+            .values("user_id")
+            .annotate(total=Count("id"), failed=Count("id", filter=Q(passed=False)))
+            .order_by()
+        )
+    }
+
+    lessons_per_grade = dict(
+        Lesson.objects
+        .filter(course__grade__in=grades, is_published=True)
+        .values("course__grade")
+        .annotate(n=Count("id"))
+        .order_by()
+        .values_list("course__grade", "n")
+    )
+    completed = {
+        (row["user_id"], row["lesson__course__grade"]): row["n"]
+        for row in (
+            LessonProgress.objects
+            .filter(
+                user_id__in=student_ids, completed=True,
+                lesson__course__grade__in=grades, lesson__is_published=True,
+            )
+            .values("user_id", "lesson__course__grade")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+    }
+
+    assessments_per_grade = dict(
+        Assessment.objects
+        .filter(course__grade__in=grades, is_published=True)
+        .values("course__grade")
+        .annotate(n=Count("id"))
+        .order_by()
+        .values_list("course__grade", "n")
+    )
+    attempted = {
+        (row["user_id"], row["assessment__course__grade"]): row["n"]
+        for row in (
+            AssessmentAttempt.objects
+            .filter(
+                user_id__in=student_ids, submitted_at__isnull=False,
+                assessment__course__grade__in=grades,
+            )
+            .values("user_id", "assessment__course__grade")
+            .annotate(n=Count("assessment_id", distinct=True))
+            .order_by()
+        )
+    }
+
+    sessions_per_section, attended = _live_session_inputs(students, student_ids, week_ago)
+
+    streaks = {}
+    try:
+        from apps.gamification.models import StudentStreak
+        streaks = {
+            row["user_id"]: (row["current_streak"], row["longest_streak"])
+            for row in StudentStreak.objects.filter(user_id__in=student_ids)
+            .values("user_id", "current_streak", "longest_streak")
+        }
+    except Exception:
+        pass
+
+    # ── Score ─────────────────────────────────────────────────────────────
+    results = {}
+    for s in students:
+        uid = s["id"]
+        score = 0.0
+        factors = {}
+
+        # 1. Login recency (0-25 pts)
+        last_login = s["last_login"]
+        if last_login:
+            days_since = (now - last_login).days
+            if days_since >= 7:
+                score += 25.0
+                factors["login_recency"] = f"{days_since} days since last login"
+            elif days_since >= 5:
+                score += 18.0
+                factors["login_recency"] = f"{days_since} days since last login"
+            elif days_since >= 3:
+                score += 10.0
+                factors["login_recency"] = f"{days_since} days since last login"
+        else:
+            score += 25.0
+            factors["login_recency"] = "Never logged in"
+
+        # 2. Engagement trend (0-20 pts)
+        recent_secs, prior_secs = engagement.get(uid, (0, 0))
+        if prior_secs > 1800:
+            if recent_secs == 0:
+                score += 20.0
+                factors["engagement_trend"] = f"Zero engagement (was {prior_secs // 60}min last week)"
+            elif recent_secs < (prior_secs * 0.3):
+                score += 15.0
+                factors["engagement_trend"] = f"Dropped {100 - round(recent_secs / prior_secs * 100)}%"
+            elif recent_secs < (prior_secs * 0.5):
+                score += 10.0
+                factors["engagement_trend"] = f"Dropped {100 - round(recent_secs / prior_secs * 100)}%"
+
+        # 3. Assessment failures (0-15 pts)
+        total_attempts, failed_count = attempts.get(uid, (0, 0))
+        if failed_count > 0:
+            if total_attempts > 0 and failed_count == total_attempts:
+                score += 15.0
+                factors["assessment_failures"] = f"Failed all {failed_count} attempts this week"
+            elif failed_count >= 3:
+                score += 12.0
+                factors["assessment_failures"] = f"Failed {failed_count}/{total_attempts} attempts"
+            else:
+                score += 5.0 * min(failed_count, 3)
+                factors["assessment_failures"] = f"Failed {failed_count} assessment(s)"
+
+        # 4. Lesson completion rate (0-15 pts)
+        grade = grade_of.get(uid)
+        if grade is not None:
+            total_lessons = lessons_per_grade.get(grade, 0)
+            if total_lessons > 0:
+                done = completed.get((uid, grade), 0)
+                pct = done / total_lessons
+                if pct < 0.1:
+                    score += 15.0
+                    factors["lesson_completion"] = f"{round(pct * 100)}% ({done}/{total_lessons})"
+                elif pct < 0.25:
+                    score += 10.0
+                    factors["lesson_completion"] = f"{round(pct * 100)}% ({done}/{total_lessons})"
+                elif pct < 0.5:
+                    score += 5.0
+                    factors["lesson_completion"] = f"{round(pct * 100)}% completed"
+
+        # 5. Assessment avoidance (0-10 pts)
+        if grade:
+            available = assessments_per_grade.get(grade, 0)
+            if available > 0:
+                n_attempted = attempted.get((uid, grade), 0)
+                attempt_rate = n_attempted / available
+                if attempt_rate < 0.2:
+                    score += 10.0
+                    factors["assessment_avoidance"] = f"Only attempted {n_attempted}/{available} assessments"
+                elif attempt_rate < 0.5:
+                    score += 5.0
+                    factors["assessment_avoidance"] = f"Attempted {n_attempted}/{available} assessments"
+
+        # 6. Live session absence (0-10 pts)
+        recent_sessions = sessions_per_section.get(s["section_id"], 0)
+        if recent_sessions > 0:
+            n_attended = attended.get(uid, 0)
+            if n_attended == 0:
+                score += 10.0
+                factors["live_session_absence"] = f"Missed all {recent_sessions} live sessions"
+            elif n_attended < recent_sessions * 0.5:
+                score += 5.0
+                factors["live_session_absence"] = f"Attended {n_attended}/{recent_sessions} sessions"
+
+        # 7. Streak broken (0-5 pts)
+        streak = streaks.get(uid)
+        if streak and streak[0] == 0 and streak[1] >= 3:
+            score += 5.0
+            factors["streak_broken"] = f"Streak dropped to 0 (was {streak[1]})"
+
+        score = min(score, 100.0)
+        if score >= 60.0:
+            risk_level = StudentRiskScore.RiskLevel.HIGH
+        elif score >= 30.0:
+            risk_level = StudentRiskScore.RiskLevel.MEDIUM
+        else:
+            risk_level = StudentRiskScore.RiskLevel.LOW
+
+        factors["total_score"] = round(score, 1)
+        factors["signals_triggered"] = len(
+            [k for k in factors if k not in ("total_score", "signals_triggered")]
+        )
+        results[uid] = (score, risk_level, factors)
+
+    return results
+
+
+def _live_session_inputs(students, student_ids, week_ago):
+    """
+    Signal 6 inputs: ended sessions per section this week, and attendance per
+    student. Mirrors _recalculate_risk(), which reads a LiveSessionAttendance
+    model — while that import fails the signal contributes nothing, here too.
+    """
+    try:
+        from apps.livesessions.models import LiveSession, LiveSessionAttendance
+    except ImportError:
+        return {}, {}
+
+    section_ids = {s["section_id"] for s in students if s["section_id"]}
+    try:
+        sessions_per_section = dict(
+            LiveSession.objects
+            .filter(section_id__in=section_ids, ended_at__isnull=False, ended_at__gte=week_ago)
+            .values("section_id")
+            .annotate(n=Count("id"))
+            .order_by()
+            .values_list("section_id", "n")
+        )
+        section_of = {s["id"]: s["section_id"] for s in students}
+        attended = {}
+        rows = (
+            LiveSessionAttendance.objects
+            .filter(user_id__in=student_ids, session__ended_at__gte=week_ago)
+            .values("user_id", "session__section_id")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            if section_of.get(row["user_id"]) == row["session__section_id"]:
+                attended[row["user_id"]] = row["n"]
+        return sessions_per_section, attended
+    except Exception:
+        return {}, {}
+
+
+def recompute_risk_scores(student_ids=None) -> dict:
+    """
+    Score `student_ids` (default: every active student) in chunks, upsert
+    StudentRiskScore, bust analytics:risk:{id}, and alert teachers for
+    students who newly crossed into HIGH.
+
+    Returns {"updated": n, "newly_high": n, "errors": n}.
+    """
+    from django.contrib.auth import get_user_model
+    from apps.analytics.models import StudentRiskScore
+    from apps.analytics.signals import _notify_teachers_high_risk
+
+    User = get_user_model()
+    if student_ids is None:
+        student_ids = (
+            User.objects.filter(role="STUDENT", is_active=True)
+            .order_by("id").values_list("id", flat=True)
+        )
+    student_ids = list(student_ids)
+
+    updated = newly_high = errors = 0
+    for i in range(0, len(student_ids), _CHUNK_SIZE):
+        chunk = student_ids[i:i + _CHUNK_SIZE]
+        try:
+            results = compute_risk_scores(chunk)
+            prev_levels = dict(
+                StudentRiskScore.objects.filter(user_id__in=chunk).values_list("user_id", "risk_level")
+            )
+            StudentRiskScore.objects.bulk_create(
+                [
+                    StudentRiskScore(user_id=uid, score=score, risk_level=level, factors=factors)
+                    for uid, (score, level, factors) in results.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["user"],
+                update_fields=["score", "risk_level", "factors", "last_calculated"],
+            )
+            cache.delete_many([f"analytics:risk:{uid}" for uid in results])
+            updated += len(results)
+        except Exception as exc:
+            logger.warning("Risk recompute failed for %d students starting at %s: %s",
+                           len(chunk), chunk[0], exc)
+            errors += len(chunk)
+            continue
+
+        # Notify only on transition INTO high — avoid daily spam for chronic high-risk
+        crossed = [
+            uid for uid, (_, level, _) in results.items()
+            if level == StudentRiskScore.RiskLevel.HIGH
+            and prev_levels.get(uid, StudentRiskScore.RiskLevel.LOW) != StudentRiskScore.RiskLevel.HIGH
+        ]
+        if crossed:
+            for student in User.objects.filter(id__in=crossed).select_related("section"):
+                _notify_teachers_high_risk(student, results[student.id][2])
+            newly_high += len(crossed)
+
+    return {"updated": updated, "newly_high": newly_high, "errors": errors}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Dirty set
+# ─────────────────────────────────────────────────────────────────────────────
+
+def mark_dirty(user_ids) -> None:
+    """Queue students for rescoring. Safe to call from signals and hot paths."""
+    from apps.analytics.models import RiskDirtyStudent
+
+    user_ids = {uid for uid in user_ids if uid}
+    if not user_ids:
+        return
+    now = timezone.now()
+    try:
+        # Savepoint: a failure here must not poison the caller's transaction
+        with transaction.atomic():
+            RiskDirtyStudent.objects.bulk_create(
+                [RiskDirtyStudent(user_id=uid, marked_at=now) for uid in user_ids],
+                update_conflicts=True,
+                unique_fields=["user"],
+                update_fields=["marked_at"],
+            )
+    except Exception as exc:
+        logger.warning("Could not mark %d students risk-dirty: %s", len(user_ids), exc)
+
+
+def mark_time_sensitive_dirty() -> None:
+    """
+    Mark students whose score can change without any activity of their own:
+      - recent activity, so the 7-day windows slide
+      - login recency crossing its 3/5/7-day thresholds
+      - no score yet, or a score older than _STALE_DAYS — lesson completion
+        and assessment avoidance depend on how much content is published
+        for the grade, which changes without the student doing anything
+    """
+    from django.contrib.auth import get_user_model
+    from apps.analytics.models import EngagementEvent
+    from apps.assessments.models import AssessmentAttempt
+
+    User = get_user_model()
+    now = timezone.now()
+    today = now.date()
+    students = User.objects.filter(role="STUDENT", is_active=True)
+
+    candidates = Q(last_login__gt=now - timedelta(days=8), last_login__lte=now - timedelta(days=3))
+    candidates |= Q(risk_score__isnull=True)
+    candidates |= Q(risk_score__last_calculated__lt=now - timedelta(days=_STALE_DAYS))
+    ids = set(students.filter(candidates).values_list("id", flat=True))
+    ids.update(
+        EngagementEvent.objects
+        .filter(event_date__gte=today - timedelta(days=15), user__in=students)
+        .values_list("user_id", flat=True).distinct()
+    )
+    ids.update(
+        AssessmentAttempt.objects
+        .filter(submitted_at__gte=now - timedelta(days=8), user__in=students)
+        .values_list("user_id", flat=True).distinct()
+    )
+    ids = list(ids)
+    for i in range(0, len(ids), _CHUNK_SIZE):
+        mark_dirty(ids[i:i + _CHUNK_SIZE])
+
+
+def recompute_dirty(max_batches: int | None = None) -> dict:
+    """
+    Drain the dirty set in batches of _CHUNK_SIZE. Rows re-marked while a
+    batch is being scored keep their newer marked_at and stay queued.
+    """
+    from django.contrib.auth import get_user_model
+    from apps.analytics.models import RiskDirtyStudent
+
+    User = get_user_model()
+    totals = {"updated": 0, "newly_high": 0, "errors": 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        claimed_at = timezone.now()
+        user_ids = list(
+            RiskDirtyStudent.objects
+            .filter(marked_at__lte=claimed_at)
+            .order_by("marked_at")
+            .values_list("user_id", flat=True)[:_CHUNK_SIZE]
+        )
+        if not user_ids:
+            break
+        students = list(
+            User.objects.filter(id__in=user_ids, role="STUDENT", is_active=True)
+            .values_list("id", flat=True)
+        )
+        result = recompute_risk_scores(students)
+        for key in totals:
+            totals[key] += result[key]
+        RiskDirtyStudent.objects.filter(user_id__in=user_ids, marked_at__lte=claimed_at).delete()
+        batches += 1
+
+    if totals["updated"] or totals["errors"]:
+        logger.info("Dirty risk recompute: updated=%d newly_high=%d errors=%d",
+                    totals["updated"], totals["newly_high"], totals["errors"])
+    return totals
@@ -0,0 +1,140 @@
+# apps.analytics.rollup
+"""
+Incremental DailyEngagementSummary rollup.
+
+Closed days (before today) are rolled up from EngagementEvent into one
+DailyEngagementSummary row per (user, date). my_summary / class_summary read
+rollups for closed days and aggregate raw events only for the days after
+the high-water mark — normally just today.
+
+High-water mark:
+  The latest DailyEngagementSummary.date. Each run re-rolls from that date
+  (inclusive, so heartbeats flushed just after midnight are picked up)
+  through yesterday. Re-rolling a day replaces its rows, so runs are
+  idempotent and a missed run is caught up by the next one.
+
+Run by the periodic rollup_engagement job, or `manage.py rollup_engagement`
+for a backfill.
+"""
+import logging
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.utils import timezone
+
+from .models import DailyEngagementSummary, EngagementEvent, EventType
+
+logger = logging.getLogger(__name__)
+
+_WATERMARK_KEY = "analytics:rollup:through"
+_WATERMARK_TTL = 10 * 60
+
+# EventType → DailyEngagementSummary seconds field (AI chat is counted, not timed)
+SECOND_FIELDS = {
+    EventType.LESSON_VIEW:     "lesson_seconds",
+    EventType.LIVE_SESSION:    "live_session_seconds",
+    EventType.ASSESSMENT:      "assessment_seconds",
+    EventType.FLASHCARD_STUDY: "flashcard_seconds",
+}
+SUMMARY_FIELDS = [*SECOND_FIELDS.values(), "ai_messages", "total_seconds"]
+
+
+def rolled_through() -> date | None:
+    """Last date covered by DailyEngagementSummary rows (None = nothing rolled up)."""
+    through = cache.get(_WATERMARK_KEY)
+    if through is None:
+        through = DailyEngagementSummary.objects.aggregate(d=Max("date"))["d"] or ""
+        cache.set(_WATERMARK_KEY, through, timeout=_WATERMARK_TTL)
+    return through or None
+
+
+def rollup_daily_summaries(until: date | None = None) -> int:
+    """
+    Roll up every closed day from the high-water mark through `until`
+    (default: yesterday). Returns the number of summary rows written.
+    """
+    until = until or timezone.now().date() - timedelta(days=1)
+    start = DailyEngagementSummary.objects.aggregate(d=Max("date"))["d"]
+    if start is None:
+        start = EngagementEvent.objects.aggregate(d=Min("event_date"))["d"]
+        if start is None:
+            return 0
+
+    written = 0
+    day = start
+    while day <= until:
+        written += rollup_day(day)
+        day += timedelta(days=1)
+
+    logger.info("Engagement rollup: %s → %s, %d summary rows", start, until, written)
+    return written
+
+
+def rollup_day(day: date) -> int:
+    """(Re)build all DailyEngagementSummary rows for one day."""
+    rows = (
+        EngagementEvent.objects
+        .filter(event_date=day)
+        .values("user_id", "event_type")
+        .annotate(total_seconds=Sum("duration_seconds"), count=Count("id"))
+        .order_by()
+    )
+    per_user: dict[int, dict] = {}
+    for row in rows:
+        add_event_totals(
+            per_user.setdefault(row["user_id"], empty_summary()),
+            row["event_type"], row["total_seconds"] or 0, row["count"],
+        )
+
+    summaries = [
+        DailyEngagementSummary(user_id=user_id, date=day, **totals)
+        for user_id, totals in per_user.items()
+    ]
+    with transaction.atomic():
+        # Users whose events were deleted since the last roll no longer get a row
+        DailyEngagementSummary.objects.filter(date=day).exclude(user_id__in=per_user).delete()
+        DailyEngagementSummary.objects.bulk_create(
+            summaries,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["user", "date"],
+            update_fields=SUMMARY_FIELDS,
+        )
+    cache.delete(_WATERMARK_KEY)
+    return len(summaries)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Shared aggregation rules (rollup + raw "today" merge in the views)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def empty_summary() -> dict:
+    return {field: 0 for field in SUMMARY_FIELDS}
+
+
+def add_event_totals(summary: dict, event_type: str, total_seconds: int, count: int) -> None:
+    """
+    Fold one (event_type, Σseconds, count) group into a summary dict.
+    Seconds stay seconds here — minutes are floored once, after summing
+    the whole range (see minutes()).
+    """
+    if event_type == EventType.AI_CHAT:
+        summary["ai_messages"] += count
+        return
+    field = SECOND_FIELDS.get(event_type)
+    if field is None:
+        return
+    summary[field] += total_seconds
+    summary["total_seconds"] += total_seconds
+
+
+def minutes(summary: dict) -> dict:
+    """
+    Whole minutes per activity for a summed range, floored per activity as
+    the dashboards always have; the total is the sum of those minutes.
+    """
+    result = {field: summary[field] // 60 for field in SECOND_FIELDS.values()}
+    result["total"] = sum(result.values())
+    return result
@@ -3,9 +3,13 @@ apps.analytics.signals
 Real-time student risk intervention — v2 (7 weighted signals).
 
 Flow:
-  AssessmentAttempt.submitted_at is set  →  post_save fires
-  → _recalculate_risk(student)
+  AssessmentAttempt submitted / LessonProgress completed / LiveAttendance
+  created  →  post_save fires  →  student marked dirty (apps.analytics.risk)
+  → recompute_dirty_risk job rescores dirty students in batches
   → if risk crossed to HIGH → notify all teachers of that student's section
+
+_recalculate_risk() is the per-student reference implementation; the batch
+engine in apps.analytics.risk must produce identical output.
 """
 import logging
 from datetime import timedelta
@@ -248,53 +252,40 @@ def _notify_teachers_high_risk(student, factors: dict) -> None:
         )
         link = f"/analytics/class/{section.classroom_id}/student/{student.id}/"
 
-        notifs = [
-            Notification(
-                user_id=tid,
-                subject=subject,
-                message=message,
-                notification_type=NotificationType.WARNING,
-                link=link,
-            )
-            for tid in teacher_ids
-        ]
-        Notification.objects.bulk_create(notifs, ignore_conflicts=True)
+        Notification.bulk_send(
+            teacher_ids,
+            subject,
+            message=message,
+            notification_type=NotificationType.WARNING,
+            link=link,
+        )
         logger.info("At-risk alert: student=%s teachers=%s", student.id, teacher_ids)
     except Exception as exc:
         logger.warning("Failed to send at-risk notification for student %s: %s", student.id, exc)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Dirty-set feeds — scoring itself happens in the recompute_dirty_risk job
+# ─────────────────────────────────────────────────────────────────────────────
+
 @receiver(post_save, sender="assessments.AssessmentAttempt")
 def on_attempt_submitted(sender, instance, created, **kwargs):
-    """Recalculate risk when assessment attempt is submitted."""
+    """Queue the student for rescoring when an assessment attempt is submitted."""
     if not instance.submitted_at:
         return
+    from apps.analytics.risk import mark_dirty
+    mark_dirty([instance.user_id])
 
-    student = instance.user
-    if getattr(student, "role", None) != "STUDENT":
-        return
-
-    try:
-        from apps.analytics.models import StudentRiskScore
-
-        score, risk_level, factors = _recalculate_risk(student)
-
-        prev = StudentRiskScore.objects.filter(user=student).first()
-        prev_level = prev.risk_level if prev else StudentRiskScore.RiskLevel.LOW
-
-        StudentRiskScore.objects.update_or_create(
-            user=student,
-            defaults={"score": score, "risk_level": risk_level, "factors": factors},
-        )
 
-        from django.core.cache import cache as _cache
-        _cache.delete(f"analytics:risk:{student.id}")
+@receiver(post_save, sender="content.LessonProgress")
+def on_lesson_completed(sender, instance, created, **kwargs):
+    if instance.completed:
+        from apps.analytics.risk import mark_dirty
+        mark_dirty([instance.user_id])
 
-        if (
-            risk_level == StudentRiskScore.RiskLevel.HIGH
-            and prev_level != StudentRiskScore.RiskLevel.HIGH
-        ):
-            _notify_teachers_high_risk(student, factors)
 
-    except Exception as exc:
-        logger.warning("Risk score update failed for student %s: %s", student.id, exc)
+@receiver(post_save, sender="livesessions.LiveAttendance")
+def on_live_attendance(sender, instance, created, **kwargs):
+    if created:
+        from apps.analytics.risk import mark_dirty
+        mark_dirty([instance.student_id])
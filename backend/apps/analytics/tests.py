@@ -1,5 +1,7 @@
 # apps/analytics/tests.py
 """Analytics — verified URLs."""
+import json
+
 import pytest
 
 
@@ -25,3 +27,226 @@ class TestAnalytics:
     def test_class_summary_student_blocked(self, student_client):
         resp = student_client.get("/api/v1/analytics/class-summary/")
         assert resp.status_code in (403, 404)
+
+
+@pytest.mark.django_db
+class TestHeartbeatIngest:
+    def _beat(self, client, resource_id=5, label=""):
+        return client.post(
+            "/api/v1/analytics/heartbeat/",
+            data=json.dumps({"event_type": "lesson_view", "resource_id": resource_id,
+                             "resource_label": label}),
+            content_type="application/json",
+        )
+
+    def test_immediate_upsert_sums_duration(self, student_client, student_user):
+        from apps.analytics.models import EngagementEvent
+        for _ in range(3):
+            assert self._beat(student_client, label="Lesson 1").status_code == 202
+        event = EngagementEvent.objects.get(user=student_user, resource_id=5)
+        assert event.duration_seconds == 90
+        assert event.resource_label == "Lesson 1"
+
+    def test_buffered_heartbeats_flush_as_one_row(self, student_client, student_user, settings):
+        from apps.analytics import ingest
+        from apps.analytics.models import EngagementEvent
+        settings.HEARTBEAT_FLUSH_INTERVAL = 3600
+        for _ in range(4):
+            self._beat(student_client)
+        self._beat(student_client, resource_id=6)
+        assert not EngagementEvent.objects.filter(user=student_user).exists()
+
+        assert ingest.flush_heartbeats() == 2
+        assert EngagementEvent.objects.get(user=student_user, resource_id=5).duration_seconds == 120
+
+        self._beat(student_client)
+        ingest.flush_heartbeats()
+        assert EngagementEvent.objects.get(user=student_user, resource_id=5).duration_seconds == 150
+
+        stats = ingest.ingest_stats()
+        assert stats["heartbeats"] == 1
+        assert stats["current_buffer_depth"]["local"] == 0
+
+    def test_ingest_stats_admin_only(self, admin_client, student_client):
+        assert admin_client.get("/api/v1/analytics/ingest-stats/").status_code == 200
+        assert student_client.get("/api/v1/analytics/ingest-stats/").status_code == 403
+
+
+@pytest.mark.django_db
+class TestEventBatch:
+    URL = "/api/v1/analytics/events/batch/"
+
+    def _post(self, client, payload):
+        return client.post(self.URL, data=json.dumps(payload), content_type="application/json")
+
+    def test_mixed_batch(self, student_client, student_user):
+        from apps.analytics.models import EngagementEvent
+        resp = self._post(student_client, {"events": [
+            {"event_type": "lesson_view", "resource_id": 9, "resource_label": "L9"},
+            {"event_type": "lesson_view", "resource_id": 9},
+            {"event_type": "page_visit", "resource_label": "/dashboard"},
+            {"event_type": "ai_chat", "resource_id": 3, "duration_seconds": 40},
+            {"event_type": "bogus"},
+        ]})
+        assert resp.status_code == 202
+        data = resp.json()
+        assert data["accepted"] == 4
+        assert data["rejected"] == [{"index": 4, "error": "Invalid event_type: 'bogus'"}]
+
+        events = EngagementEvent.objects.filter(user=student_user)
+        assert events.count() == 3
+        assert events.get(event_type="lesson_view").duration_seconds == 60
+        assert events.get(event_type="ai_chat").duration_seconds == 40
+
+    def test_bare_array_and_validation(self, student_client):
+        assert self._post(student_client, [{"event_type": "login"}]).status_code == 202
+        assert self._post(student_client, []).status_code == 400
+        assert self._post(student_client, [{"event_type": "lesson_view"}]).status_code == 400
+        assert self._post(student_client, [{"event_type": "login"}] * 101).status_code == 400
+
+
+@pytest.mark.django_db
+class TestDailyRollup:
+    def _events(self, user, day):
+        from apps.analytics.models import EngagementEvent
+        EngagementEvent.objects.create(user=user, event_type="lesson_view", resource_id=1,
+                                       duration_seconds=600, event_date=day)
+        EngagementEvent.objects.create(user=user, event_type="ai_chat", resource_id=1, event_date=day)
+        EngagementEvent.objects.create(user=user, event_type="ai_chat", resource_id=1, event_date=day)
+
+    def test_rollup_is_incremental_and_idempotent(self, student_user):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.analytics.models import DailyEngagementSummary
+        from apps.analytics.rollup import rollup_daily_summaries
+
+        today = timezone.now().date()
+        self._events(student_user, today - timedelta(days=2))
+        self._events(student_user, today)
+
+        assert rollup_daily_summaries() == 1
+        row = DailyEngagementSummary.objects.get(user=student_user)
+        assert (row.lesson_seconds, row.ai_messages, row.total_seconds) == (600, 2, 600)
+
+        # Today is still open; re-running only re-rolls the high-water mark
+        rollup_daily_summaries()
+        assert DailyEngagementSummary.objects.filter(user=student_user).count() == 1
+
+    def test_summaries_merge_rollups_with_today(self, student_client, student_user, admin_client):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.analytics.rollup import rollup_daily_summaries
+
+        today = timezone.now().date()
+        self._events(student_user, today - timedelta(days=1))
+        rollup_daily_summaries()
+        self._events(student_user, today)
+
+        summary = student_client.get("/api/v1/analytics/my-summary/?days=7").json()["summary"]
+        assert [d["lesson_min"] for d in summary] == [10, 10]
+        assert summary[-1]["date"] == today.isoformat()
+
+        resp = admin_client.get(f"/api/v1/analytics/class-summary/?section_id={student_user.section_id}")
+        student = next(s for s in resp.json()["students"] if s["user_id"] == student_user.id)
+        assert (student["lesson_min"], student["ai_messages"]) == (20, 4)
+
+    def test_minutes_floored_after_summing_days(self, student_user, admin_client):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.analytics.models import EngagementEvent
+        from apps.analytics.rollup import rollup_daily_summaries
+
+        today = timezone.now().date()
+        for days_ago in (1, 2, 3):
+            EngagementEvent.objects.create(user=student_user, event_type="lesson_view", resource_id=1,
+                                           duration_seconds=45, event_date=today - timedelta(days=days_ago))
+        rollup_daily_summaries()
+
+        resp = admin_client.get(f"/api/v1/analytics/class-summary/?section_id={student_user.section_id}")
+        student = next(s for s in resp.json()["students"] if s["user_id"] == student_user.id)
+        assert (student["lesson_min"], student["total_min"]) == (2, 2)    # 135s, not 3 × 0
+
+
+@pytest.mark.django_db
+class TestRiskEngine:
+    def _scenario(self, student_user, student_user2, lesson, assessment):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.analytics.models import EngagementEvent
+        from apps.assessments.models import AssessmentAttempt
+        from apps.content.models import Lesson, LessonProgress
+        from apps.gamification.models import StudentStreak
+
+        today = timezone.now().date()
+        # student 1: never logged in, engagement collapsed, failed this week, streak lost
+        EngagementEvent.objects.create(user=student_user, event_type="lesson_view", resource_id=1,
+                                       duration_seconds=4000, event_date=today - timedelta(days=10))
+        EngagementEvent.objects.create(user=student_user, event_type="lesson_view", resource_id=1,
+                                       duration_seconds=900, event_date=today - timedelta(days=1))
+        AssessmentAttempt.objects.create(user=student_user, assessment=assessment,
+                                         submitted_at=timezone.now(), passed=False)
+        StudentStreak.objects.update_or_create(user=student_user,
+                                               defaults={"current_streak": 0, "longest_streak": 5})
+
+        # student 2: logged in 4 days ago, completed 1 of 3 lessons
+        student_user2.last_login = timezone.now() - timedelta(days=4)
+        student_user2.save(update_fields=["last_login"])
+        for order in (2, 3):
+            Lesson.objects.create(course=lesson.course, title=f"Chapter {order}", order=order,
+                                  is_published=True)
+        LessonProgress.objects.create(user=student_user2, lesson=lesson, completed=True)
+
+    def test_matches_per_student_scoring(self, student_user, student_user2, lesson, assessment):
+        from apps.analytics.risk import compute_risk_scores
+        from apps.analytics.signals import _recalculate_risk
+        from apps.accounts.models import User
+
+        self._scenario(student_user, student_user2, lesson, assessment)
+        batch = compute_risk_scores([student_user.id, student_user2.id])
+
+        for user_id in (student_user.id, student_user2.id):
+            assert batch[user_id] == _recalculate_risk(User.objects.get(id=user_id))
+        assert batch[student_user.id][1] == "high"
+
+    def test_nightly_recompute_upserts(self, anon_client, student_user, student_user2, lesson, assessment):
+        from apps.analytics.models import StudentRiskScore
+
+        self._scenario(student_user, student_user2, lesson, assessment)
+        resp = anon_client.post("/api/v1/analytics/nightly-recompute/")
+        assert resp.status_code == 200
+        assert resp.json()["errors"] == 0
+        assert StudentRiskScore.objects.get(user=student_user).risk_level == "high"
+        assert StudentRiskScore.objects.filter(user=student_user2).exists()
+
+    def test_submit_marks_dirty_and_recompute_drains(self, student_user, assessment):
+        from django.utils import timezone
+        from apps.analytics.models import RiskDirtyStudent, StudentRiskScore
+        from apps.analytics.risk import recompute_dirty
+        from apps.assessments.models import AssessmentAttempt
+
+        AssessmentAttempt.objects.create(user=student_user, assessment=assessment,
+                                         submitted_at=timezone.now(), passed=False)
+        # Scoring is deferred to the batch job
+        assert RiskDirtyStudent.objects.filter(user=student_user).exists()
+        assert not StudentRiskScore.objects.filter(user=student_user).exists()
+
+        assert recompute_dirty()["updated"] == 1
+        assert StudentRiskScore.objects.filter(user=student_user).exists()
+        assert not RiskDirtyStudent.objects.exists()
+
+    def test_idle_student_with_stale_score_is_rescored(self, student_user):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.analytics.models import RiskDirtyStudent, StudentRiskScore
+        from apps.analytics.risk import mark_time_sensitive_dirty
+
+        student_user.last_login = timezone.now() - timedelta(days=30)
+        student_user.save(update_fields=["last_login"])
+        score = StudentRiskScore.objects.create(user=student_user)
+        mark_time_sensitive_dirty()
+        assert not RiskDirtyStudent.objects.filter(user=student_user).exists()   # fresh score
+
+        # New content can move an idle student's score — rescore once it ages
+        StudentRiskScore.objects.filter(id=score.id).update(last_calculated=timezone.now() - timedelta(days=3))
+        mark_time_sensitive_dirty()
+        assert RiskDirtyStudent.objects.filter(user=student_user).exists()
@@ -5,91 +5,54 @@ Analytics endpoints for engagement tracking.
 Endpoints:
   POST /api/v1/analytics/heartbeat/            — student sends a heartbeat (lesson/session view)
   POST /api/v1/analytics/event/                — log a one-shot event (assessment, ai_chat)
+  POST /api/v1/analytics/events/batch/         — many heartbeat / one-shot events in one request
   GET  /api/v1/analytics/my-summary/           — student's own daily summaries
   GET  /api/v1/analytics/my-risk/              — student's own risk score
   GET  /api/v1/analytics/class-summary/        — teacher/admin: class-level aggregation
+  GET  /api/v1/analytics/ingest-stats/         — admin: heartbeat buffer depth + last flush
 
 Performance:
-  heartbeat() and log_event() return 202 immediately and process the DB write
-  in a daemon background thread. This drops response times from ~864ms to <10ms.
-  Trade-off: if Gunicorn restarts mid-thread, that write is lost — acceptable at
-  ~50 active students. At 1000+ students, migrate to Celery/Redis queue.
+  heartbeat() returns 202 after adding 30s to an in-memory/Redis buffer
+  (apps.analytics.ingest); the buffer is flushed every few seconds as one
+  bulk upsert instead of one DB write per heartbeat.
+  log_event() returns 202 immediately and enqueues the DB write as a
+  background job (apps.analytics.jobs, consumed by `manage.py run_workers`).
 """
 import json
 import logging
-import threading
 from datetime import date, timedelta
 
 from apps.accesscontrol.permissions import require_auth, require_roles
 from django.core.cache import cache
-from django.db import close_old_connections
-from django.db.models import Sum, Count, F
+from django.db.models import Sum, Count
 from django.db.models.functions import Coalesce
 from django.http import JsonResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-from .models import EngagementEvent, DailyEngagementSummary, EventType
+from gyangrit import single_flight
 
-logger = logging.getLogger(__name__)
+from . import ingest
+from .jobs import record_event, record_events
+from .models import HEARTBEAT_EVENT_TYPES, EngagementEvent, DailyEngagementSummary, EventType
+from .rollup import SUMMARY_FIELDS, add_event_totals, empty_summary, minutes, rolled_through
 
-HEARTBEAT_SECONDS = 30  # each heartbeat represents 30s of active viewing
-_CLASS_SUMMARY_TTL = 5 * 60   # 5 min — short because heartbeats update it live
-_RISK_TTL          = 60 * 60  # 1 hour — updated on each assessment submit via signal
+logger = logging.getLogger(__name__)
 
+_CLASS_SUMMARY_TTL      = 5 * 60   # 5 min — short because heartbeats update it live
+_CLASS_SUMMARY_HARD_TTL = 15 * 60  # then served stale while one request recomputes
+_RISK_TTL               = 60 * 60  # 1 hour — updated on each assessment submit via signal
+_MAX_BATCH_EVENTS       = 100
 
-def _bg_heartbeat(user_id, event_type, resource_id, resource_label):
-    """Process heartbeat DB write in a background thread."""
-    try:
-        close_old_connections()
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        user = User.objects.get(id=user_id)
-        today = timezone.now().date()
-
-        event, created = EngagementEvent.objects.get_or_create(
-            user=user,
-            event_type=event_type,
-            resource_id=resource_id,
-            event_date=today,
-            defaults={
-                "resource_label": resource_label,
-                "duration_seconds": HEARTBEAT_SECONDS,
-            },
-        )
-
-        if not created:
-            event.duration_seconds = F("duration_seconds") + HEARTBEAT_SECONDS
-            if resource_label and not event.resource_label:
-                event.resource_label = resource_label
-            event.save(update_fields=["duration_seconds", "resource_label"])
-    except Exception:
-        logger.exception("bg_heartbeat failed for user_id=%s", user_id)
-    finally:
-        close_old_connections()
-
-
-def _bg_log_event(user_id, event_type, resource_id, resource_label, duration):
-    """Process one-shot event DB write in a background thread."""
-    try:
-        close_old_connections()
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        user = User.objects.get(id=user_id)
-
-        EngagementEvent.objects.create(
-            user=user,
-            event_type=event_type,
-            resource_id=resource_id,
-            resource_label=resource_label,
-            duration_seconds=duration,
-            event_date=timezone.now().date(),
-        )
-    except Exception:
-        logger.exception("bg_log_event failed for user_id=%s", user_id)
-    finally:
-        close_old_connections()
+# Everything log_event() accepts — heartbeat types go through heartbeat()
+_ONE_SHOT_EVENT_TYPES = {
+    EventType.ASSESSMENT, EventType.AI_CHAT,
+    EventType.LESSON_COMPLETE, EventType.ASSESSMENT_PASS, EventType.ASSESSMENT_FAIL,
+    EventType.LOGIN, EventType.RECORDING_VIEW, EventType.CHATROOM_MSG,
+    EventType.COMPETITION, EventType.STREAK_BREAK, EventType.NOTIFICATION_CLICK,
+    EventType.PAGE_VISIT
+}
 
 
 # ── Heartbeat (student sends every 30s while viewing lesson / in live session) ─
@@ -104,10 +67,10 @@ def heartbeat(request):
             "resource_id": 123,
             "resource_label": "Math Lesson 1" }
 
-    Returns 202 immediately. DB write happens in a background thread.
-    Called by the frontend every 30 seconds while the student is actively
-    viewing content. Each call creates or updates an EngagementEvent for
-    today, incrementing duration_seconds by HEARTBEAT_SECONDS.
+    Returns 202 immediately. Called by the frontend every 30 seconds while the
+    student is actively viewing content. Each call adds HEARTBEAT_SECONDS to
+    a buffered per-day total; the flush upserts today's EngagementEvent for
+    (user, event_type, resource).
     """
     try:
         body = json.loads(request.body)
@@ -118,19 +81,17 @@ def heartbeat(request):
     resource_id = body.get("resource_id")
     resource_label = body.get("resource_label", "")[:200]
 
-    valid_heartbeat_types = {EventType.LESSON_VIEW, EventType.LIVE_SESSION, EventType.FLASHCARD_STUDY}
-    if event_type not in valid_heartbeat_types:
-        return JsonResponse({"error": f"Invalid event_type for heartbeat. Use one of: {sorted(valid_heartbeat_types)}"}, status=400)
+    if event_type not in HEARTBEAT_EVENT_TYPES:
+        return JsonResponse({"error": f"Invalid event_type for heartbeat. Use one of: {sorted(HEARTBEAT_EVENT_TYPES)}"}, status=400)
 
     if not resource_id:
         return JsonResponse({"error": "resource_id is required"}, status=400)
+    try:
+        resource_id = int(resource_id)
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "resource_id must be an integer"}, status=400)
 
-    # Fire-and-forget: return immediately, process in background
-    threading.Thread(
-        target=_bg_heartbeat,
-        args=(request.user.id, event_type, resource_id, resource_label),
-        daemon=True,
-    ).start()
+    ingest.buffer_heartbeat(request.user.id, event_type, resource_id, resource_label)
 
     return JsonResponse({"queued": True}, status=202)
 
@@ -148,7 +109,7 @@ def log_event(request):
             "resource_label": "Math Quiz 1",
             "duration_seconds": 180 }
 
-    Returns 202 immediately. DB write happens in a background thread.
+    Returns 202 immediately. DB write happens in a background job.
     """
     try:
         body = json.loads(request.body)
@@ -160,31 +121,107 @@ def log_event(request):
     resource_label = body.get("resource_label", "")[:200]
     duration = body.get("duration_seconds", 0)
 
-    valid_event_types = {
-        EventType.ASSESSMENT, EventType.AI_CHAT,
-        EventType.LESSON_COMPLETE, EventType.ASSESSMENT_PASS, EventType.ASSESSMENT_FAIL,
-        EventType.LOGIN, EventType.RECORDING_VIEW, EventType.CHATROOM_MSG,
-        EventType.COMPETITION, EventType.STREAK_BREAK, EventType.NOTIFICATION_CLICK,
-        EventType.PAGE_VISIT
-    }
-    if event_type not in valid_event_types:
-        return JsonResponse({"error": f"Invalid event_type. Use one of: {sorted(valid_event_types)}"}, status=400)
+    if event_type not in _ONE_SHOT_EVENT_TYPES:
+        return JsonResponse({"error": f"Invalid event_type. Use one of: {sorted(_ONE_SHOT_EVENT_TYPES)}"}, status=400)
 
     try:
         duration = max(0, int(duration))
     except (TypeError, ValueError):
         duration = 0
 
-    # Fire-and-forget: return immediately, process in background
-    threading.Thread(
-        target=_bg_log_event,
-        args=(request.user.id, event_type, resource_id, resource_label, duration),
-        daemon=True,
-    ).start()
+    record_event.delay(request.user.id, event_type, resource_id, resource_label, duration)
 
     return JsonResponse({"queued": True}, status=202)
 
 
+# ── Batch (frontend telemetry flush: many events in one request) ──────────────
+
+def _validate_batch_item(item):
+    """
+    Apply the heartbeat()/log_event() rules to one batch item.
+    Returns (is_heartbeat, (event_type, resource_id, resource_label, duration)).
+    Raises ValueError with a client-facing message.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("Each event must be an object")
+
+    event_type = str(item.get("event_type") or "").strip()
+    resource_id = item.get("resource_id")
+    resource_label = str(item.get("resource_label") or "")[:200]
+
+    if resource_id is not None:
+        try:
+            resource_id = int(resource_id)
+        except (TypeError, ValueError):
+            raise ValueError("resource_id must be an integer") from None
+
+    if event_type in HEARTBEAT_EVENT_TYPES:
+        if not resource_id:
+            raise ValueError("resource_id is required")
+        return True, (event_type, resource_id, resource_label, 0)
+
+    if event_type not in _ONE_SHOT_EVENT_TYPES:
+        raise ValueError(f"Invalid event_type: {event_type!r}")
+
+    try:
+        duration = max(0, int(item.get("duration_seconds", 0)))
+    except (TypeError, ValueError):
+        duration = 0
+    return False, (event_type, resource_id, resource_label, duration)
+
+
+@require_auth
+@require_http_methods(["POST"])
+@csrf_exempt
+def log_events_batch(request):
+    """
+    POST /api/v1/analytics/events/batch/
+    Body: { "events": [ { "event_type": "lesson_view", "resource_id": 12, "resource_label": "..." },
+                        { "event_type": "page_visit", "resource_label": "/dashboard" },
+                        { "event_type": "ai_chat", "resource_id": 3, "duration_seconds": 40 }, ... ] }
+          (a bare JSON array is accepted too)
+
+    Up to 100 events per request. Heartbeat types count as one heartbeat each
+    and go through the heartbeat buffer; all other events are written by one
+    background job with a single bulk_create. Invalid items are skipped and
+    reported by index; the rest are still accepted.
+
+    Returns 202 { "accepted": N, "rejected": [{ "index": i, "error": "..." }] }.
+    """
+    try:
+        body = json.loads(request.body)
+    except (json.JSONDecodeError, ValueError):
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    events = body.get("events") if isinstance(body, dict) else body
+    if not isinstance(events, list) or not events:
+        return JsonResponse({"error": "events must be a non-empty array"}, status=400)
+    if len(events) > _MAX_BATCH_EVENTS:
+        return JsonResponse({"error": f"At most {_MAX_BATCH_EVENTS} events per batch"}, status=400)
+
+    beats, one_shots, rejected = [], [], []
+    for index, item in enumerate(events):
+        try:
+            is_heartbeat, (event_type, resource_id, resource_label, duration) = _validate_batch_item(item)
+        except ValueError as exc:
+            rejected.append({"index": index, "error": str(exc)})
+            continue
+        if is_heartbeat:
+            beats.append((event_type, resource_id, resource_label))
+        else:
+            one_shots.append([event_type, resource_id, resource_label, duration])
+
+    if not beats and not one_shots:
+        return JsonResponse({"error": "No valid events", "rejected": rejected}, status=400)
+
+    if beats:
+        ingest.buffer_heartbeats(request.user.id, beats)
+    if one_shots:
+        record_events.delay(request.user.id, one_shots)
+
+    return JsonResponse({"accepted": len(beats) + len(one_shots), "rejected": rejected}, status=202)
+
+
 # ── Student: my own summary ────────────────────────────────────────────────────
 
 @require_auth
@@ -194,8 +231,9 @@ def my_summary(request):
     GET /api/v1/analytics/my-summary/?days=7
 
     Returns the requesting student's daily engagement for the last N days.
-    Aggregated from EngagementEvent rows (lazy — no pre-aggregation needed
-    for a single student's data).
+    Closed days come from DailyEngagementSummary rollups; only days after the
+    rollup high-water mark (normally just today) are aggregated from raw
+    EngagementEvent rows.
     """
     try:
         days = min(90, max(1, int(request.GET.get("days", 7))))
@@ -203,36 +241,32 @@ def my_summary(request):
         days = 7
 
     since = timezone.now().date() - timedelta(days=days)
+    through, raw_from = _rollup_split(since)
+
+    by_date: dict[str, dict] = {}
+    if through is not None:
+        rollups = (
+            DailyEngagementSummary.objects
+            .filter(user=request.user, date__gte=since, date__lte=through)
+            .values("date", *SUMMARY_FIELDS)
+        )
+        for row in rollups:
+            d = row["date"].isoformat()
+            by_date[d] = {"date": d, **_summary_payload(row)}
 
     events = (
         EngagementEvent.objects
-        .filter(user=request.user, event_date__gte=since)
+        .filter(user=request.user, event_date__gte=raw_from)
         .values("event_date", "event_type")
         .annotate(total_seconds=Sum("duration_seconds"), count=Count("id"))
         .order_by("event_date")
     )
-
-    # Group by date
-    by_date: dict[str, dict] = {}
+    raw: dict[str, dict] = {}
     for e in events:
-        d = e["event_date"].isoformat()
-        if d not in by_date:
-            by_date[d] = {"date": d, "lesson_min": 0, "live_min": 0, "assessment_min": 0, "ai_messages": 0, "flashcard_min": 0, "total_min": 0}
-        minutes = e["total_seconds"] // 60
-        if e["event_type"] == EventType.LESSON_VIEW:
-            by_date[d]["lesson_min"] += minutes
-        elif e["event_type"] == EventType.LIVE_SESSION:
-            by_date[d]["live_min"] += minutes
-        elif e["event_type"] == EventType.ASSESSMENT:
-            by_date[d]["assessment_min"] += minutes
-        elif e["event_type"] == EventType.AI_CHAT:
-            by_date[d]["ai_messages"] += e["count"]
-        elif e["event_type"] == EventType.FLASHCARD_STUDY:
-            by_date[d]["flashcard_min"] += minutes
-        by_date[d]["total_min"] = (
-            by_date[d]["lesson_min"] + by_date[d]["live_min"] +
-            by_date[d]["assessment_min"] + by_date[d]["flashcard_min"]
-        )
+        totals = raw.setdefault(e["event_date"].isoformat(), empty_summary())
+        add_event_totals(totals, e["event_type"], e["total_seconds"] or 0, e["count"])
+    for d, totals in raw.items():
+        by_date[d] = {"date": d, **_summary_payload(totals)}
 
     return JsonResponse({
         "days": days,
@@ -240,6 +274,32 @@ def my_summary(request):
     })
 
 
+def _rollup_split(since: date) -> tuple[date | None, date]:
+    """
+    Split [since, today] into a rolled-up part (since..through) and a raw part
+    (raw_from..today). through is None when no rollup covers the range.
+    """
+    through = rolled_through()
+    yesterday = timezone.now().date() - timedelta(days=1)
+    if through is None or through < since:
+        return None, since
+    through = min(through, yesterday)
+    return through, through + timedelta(days=1)
+
+
+def _summary_payload(totals: dict) -> dict:
+    """Summed DailyEngagementSummary fields (seconds) → API fields (minutes)."""
+    mins = minutes(totals)
+    return {
+        "lesson_min":     mins["lesson_seconds"],
+        "live_min":       mins["live_session_seconds"],
+        "assessment_min": mins["assessment_seconds"],
+        "ai_messages":    totals["ai_messages"],
+        "flashcard_min":  mins["flashcard_seconds"],
+        "total_min":      mins["total"],
+    }
+
+
 # ── Teacher/Admin: class-level summary ─────────────────────────────────────────
 
 @require_roles(["TEACHER", "PRINCIPAL", "ADMIN"])
@@ -249,8 +309,11 @@ def class_summary(request):
     GET /api/v1/analytics/class-summary/?section_id=5&days=7
 
     Aggregated engagement per student for a section over the last N days.
+    Closed days are summed from DailyEngagementSummary rollups, plus raw
+    events after the rollup high-water mark (normally just today).
     Teachers see only their assigned sections. Admin sees all.
-    Cached per section+days for 5 minutes (short TTL since heartbeats update it live).
+    Fresh for 5 minutes per section+days (short TTL since heartbeats update
+    it live), then served stale for up to 15 while one request recomputes.
     """
     from apps.accounts.models import User
 
@@ -272,70 +335,69 @@ def class_summary(request):
         if class_id and not user.teaching_assignments.filter(section__classroom_id=class_id).exists():
              return JsonResponse({"error": "You are not assigned to this class"}, status=403)
 
-    cache_key = f"analytics:class_summary:{class_id or section_id}:{days}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return JsonResponse(cached)
-
-    since = timezone.now().date() - timedelta(days=days)
-
-    if section_id:
-        students = User.objects.filter(role="STUDENT", section_id=section_id).values("id", "username", "first_name", "last_name")
-    else:
-        students = User.objects.filter(role="STUDENT", section__classroom_id=class_id).values("id", "username", "first_name", "last_name")
-
-    student_ids = [s["id"] for s in students]
+    def build():
+        since = timezone.now().date() - timedelta(days=days)
+
+        if section_id:
+            students = User.objects.filter(role="STUDENT", section_id=section_id).values("id", "username", "first_name", "last_name")
+        else:
+            students = User.objects.filter(role="STUDENT", section__classroom_id=class_id).values("id", "username", "first_name", "last_name")
+
+        student_ids = [s["id"] for s in students]
+        through, raw_from = _rollup_split(since)
+
+        totals_by_user: dict[int, dict] = {}
+        if through is not None:
+            rollups = (
+                DailyEngagementSummary.objects
+                .filter(user_id__in=student_ids, date__gte=since, date__lte=through)
+                .values("user_id")
+                .annotate(**{f"sum_{field}": Sum(field) for field in SUMMARY_FIELDS})
+                .order_by()
+            )
+            for row in rollups:
+                totals_by_user[row["user_id"]] = {field: row[f"sum_{field}"] or 0 for field in SUMMARY_FIELDS}
+
+        events = (
+            EngagementEvent.objects
+            .filter(user_id__in=student_ids, event_date__gte=raw_from)
+            .values("user_id", "event_type")
+            .annotate(total_seconds=Coalesce(Sum("duration_seconds"), 0), count=Count("id"))
+            .order_by()
+        )
+        for e in events:
+            totals = totals_by_user.setdefault(e["user_id"], empty_summary())
+            add_event_totals(totals, e["event_type"], e["total_seconds"], e["count"])
+
+        # Build per-student summary
+        student_map = {s["id"]: {
+            "user_id": s["id"],
+            "username": s["username"],
+            "name": f"{s['first_name']} {s['last_name']}".strip() or s["username"],
+            **_summary_payload(totals_by_user.get(s["id"]) or empty_summary()),
+        } for s in students}
+
+        from .models import StudentRiskScore
+        risk_scores = StudentRiskScore.objects.filter(user_id__in=student_ids).values("user_id", "risk_level", "score")
+        for r in risk_scores:
+            if r["user_id"] in student_map:
+                student_map[r["user_id"]]["risk_level"] = r["risk_level"]
+                student_map[r["user_id"]]["risk_score"] = r["score"]
+
+        results = sorted(student_map.values(), key=lambda x: -x["total_min"])
+
+        payload = {
+            "section_id": int(section_id) if section_id else None,
+            "class_id": int(class_id) if class_id else None,
+            "days": days,
+            "students": results,
+        }
+        return payload
 
-    events = (
-        EngagementEvent.objects
-        .filter(user_id__in=student_ids, event_date__gte=since)
-        .values("user_id", "event_type")
-        .annotate(total_seconds=Coalesce(Sum("duration_seconds"), 0), count=Count("id"))
+    payload = single_flight.get_or_compute(
+        f"analytics:class_summary:{class_id or section_id}:{days}", build,
+        soft_ttl=_CLASS_SUMMARY_TTL, hard_ttl=_CLASS_SUMMARY_HARD_TTL,
     )
-
-    # Build per-student summary
-    student_map = {s["id"]: {
-        "user_id": s["id"],
-        "username": s["username"],
-        "name": f"{s['first_name']} {s['last_name']}".strip() or s["username"],
-        "lesson_min": 0, "live_min": 0, "assessment_min": 0, "ai_messages": 0, "flashcard_min": 0, "total_min": 0,
-    } for s in students}
-
-    for e in events:
-        uid = e["user_id"]
-        if uid not in student_map:
-            continue
-        minutes = e["total_seconds"] // 60
-        if e["event_type"] == EventType.LESSON_VIEW:
-            student_map[uid]["lesson_min"] += minutes
-        elif e["event_type"] == EventType.LIVE_SESSION:
-            student_map[uid]["live_min"] += minutes
-        elif e["event_type"] == EventType.ASSESSMENT:
-            student_map[uid]["assessment_min"] += minutes
-        elif e["event_type"] == EventType.AI_CHAT:
-            student_map[uid]["ai_messages"] += e["count"]
-        elif e["event_type"] == EventType.FLASHCARD_STUDY:
-            student_map[uid]["flashcard_min"] += minutes
-
-    for s in student_map.values():
-        s["total_min"] = s["lesson_min"] + s["live_min"] + s["assessment_min"] + s["flashcard_min"]
-
-    from .models import StudentRiskScore
-    risk_scores = StudentRiskScore.objects.filter(user_id__in=student_ids).values("user_id", "risk_level", "score")
-    for r in risk_scores:
-        if r["user_id"] in student_map:
-            student_map[r["user_id"]]["risk_level"] = r["risk_level"]
-            student_map[r["user_id"]]["risk_score"] = r["score"]
-
-    results = sorted(student_map.values(), key=lambda x: -x["total_min"])
-
-    payload = {
-        "section_id": int(section_id) if section_id else None,
-        "class_id": int(class_id) if class_id else None,
-        "days": days,
-        "students": results,
-    }
-    cache.set(cache_key, payload, timeout=_CLASS_SUMMARY_TTL)
     return JsonResponse(payload)
 
 
@@ -379,6 +441,19 @@ def my_risk(request):
     return JsonResponse(data)
 
 
+# ── Admin: heartbeat ingestion health ──────────────────────────────────────────
+
+@require_roles(["ADMIN"])
+@require_http_methods(["GET"])
+def ingest_stats(request):
+    """
+    GET /api/v1/analytics/ingest-stats/
+
+    Last heartbeat flush (latency, rows, heartbeats) and current buffer depth.
+    """
+    return JsonResponse(ingest.ingest_stats())
+
+
 # ── Nightly risk recompute — called by QStash cron (0 2 * * *) ────────────────
 
 @require_http_methods(["POST"])
@@ -388,56 +463,24 @@ def nightly_recompute(request):
     POST /api/v1/analytics/nightly-recompute/
 
     Triggered nightly at 2 AM IST via QStash schedule (scd_6J2Lypd946oDhWQFW6EoU87hS8T3).
-    Recalculates StudentRiskScore for every active student and sends
-    At-Risk notifications for students who newly cross into HIGH.
+    Recalculates StudentRiskScore for students with recent activity or whose
+    score can shift with time alone, plus anything still in the dirty set
+    (set-based engine, apps.analytics.risk), and sends At-Risk notifications
+    for students who newly cross into HIGH. ?full=1 rescores every active
+    student.
 
     No auth required — this endpoint only triggers read + upsert computation.
     It is rate-limited by QStash schedule frequency (once/day).
     """
-    from django.contrib.auth import get_user_model
-    from .models import StudentRiskScore
-    from .signals import _recalculate_risk, _notify_teachers_high_risk
-
-    # ── Recompute ─────────────────────────────────────────────────────────────
-    User = get_user_model()
-    students = (
-        User.objects
-        .filter(role="STUDENT", is_active=True)
-        .only("id", "username", "first_name", "last_name", "section_id")
-    )
-
-    updated = 0
-    newly_high = 0
-    errors = 0
-
-    for student in students:
-        try:
-            score, risk_level, factors = _recalculate_risk(student)
-
-            prev = StudentRiskScore.objects.filter(user=student).first()
-            prev_level = prev.risk_level if prev else StudentRiskScore.RiskLevel.LOW
+    from .risk import mark_time_sensitive_dirty, recompute_dirty, recompute_risk_scores
 
-            StudentRiskScore.objects.update_or_create(
-                user=student,
-                defaults={"score": score, "risk_level": risk_level, "factors": factors},
-            )
-
-            # Bust the cached risk for this student
-            cache.delete(f"analytics:risk:{student.id}")
-
-            updated += 1
-
-            # Notify only on transition INTO high — avoid daily spam for chronic high-risk
-            if (
-                risk_level == StudentRiskScore.RiskLevel.HIGH
-                and prev_level != StudentRiskScore.RiskLevel.HIGH
-            ):
-                _notify_teachers_high_risk(student, factors)
-                newly_high += 1
-
-        except Exception as exc:
-            logger.warning("nightly_recompute: failed for student %s: %s", student.id, exc)
-            errors += 1
+    # Grouped queries per chunk of students instead of ~12 queries per student
+    if request.GET.get("full") == "1":
+        result = recompute_risk_scores()
+    else:
+        mark_time_sensitive_dirty()
+        result = recompute_dirty()
+    updated, newly_high, errors = result["updated"], result["newly_high"], result["errors"]
 
     logger.info(
         "nightly_recompute complete: updated=%d newly_high=%d errors=%d",
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_assessment_ai_generated_assessment_source_lesson_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentattempt',
+            index=models.Index(fields=['user', '-submitted_at', '-id'], name='assessments_user_id_fccf53_idx'),
+        ),
+    ]
@@ -185,6 +185,7 @@ class AssessmentAttempt(models.Model):
         indexes = [
             models.Index(fields=["user", "assessment"]),
             models.Index(fields=["assessment", "submitted_at"]),
+            models.Index(fields=["user", "-submitted_at", "-id"]),   # keyset pages
         ]
 
     def calculate_score_and_pass(self):
@@ -13,42 +13,18 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from apps.academics.models import ClassRoom
+from apps.accesscontrol.access import has_access_to_course
 from apps.accesscontrol.permissions import require_roles
 from apps.accesscontrol.scoped_service import scope_queryset, get_scoped_object_or_403
 from apps.assessments.models import Assessment, AssessmentAttempt, Question, QuestionOption
 from apps.content.models import Course
 from apps.learning.models import Enrollment
+from gyangrit import pagination, single_flight
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
-# =====================================================
-# ACCESS CHECK
-# =====================================================
-
-def has_access_to_course(user, course):
-    if not user.is_authenticated:
-        return False
-    if user.is_superuser or user.role == "ADMIN":
-        return True
-    if user.role == "STUDENT":
-        return Enrollment.objects.filter(user=user, course=course).exists()
-    if user.role == "TEACHER":
-        return user.teaching_assignments.filter(subject=course.subject).exists()
-    if user.role == "PRINCIPAL":
-        if not user.institution:
-            return False
-        return course.subject.classrooms.filter(classroom__institution=user.institution).exists()
-    if user.role == "OFFICIAL":
-        if not user.district:
-            return False
-        return course.subject.classrooms.filter(
-            classroom__institution__district__name=user.district
-        ).exists()
-    return False
-
-
 # =====================================================
 # ASSESSMENT CRUD
 # =====================================================
@@ -124,21 +100,21 @@ def update_assessment(request, assessment_id):
     # Push notification when assessment is newly published
     if not was_published and assessment.is_published:
         try:
-            from apps.notifications.push import send_push_to_users
+            from apps.notifications.jobs import send_push
             # Find all students enrolled in this course
             enrolled_ids = list(
                 Enrollment.objects.filter(course=assessment.course, status="enrolled")
                 .values_list("user_id", flat=True)
             )
             if enrolled_ids:
-                send_push_to_users(
-                    user_ids=enrolled_ids,
-                    title="New Assessment Available",
-                    body=f"{assessment.title} — {assessment.course.title}",
-                    url=f"/assessments",
-                    tag=f"assessment-published-{assessment.id}",
+                send_push.delay(
+                    enrolled_ids,
+                    "New Assessment Available",
+                    f"{assessment.title} — {assessment.course.title}",
+                    "/assessments",
+                    f"assessment-published-{assessment.id}",
                 )
-                logger.info("Push sent for published assessment %s to %d students", assessment.id, len(enrolled_ids))
+                logger.info("Push queued for published assessment %s to %d students", assessment.id, len(enrolled_ids))
         except Exception as exc:
             logger.warning("Push failed for assessment %s: %s", assessment.id, exc)
 
@@ -477,6 +453,9 @@ def all_my_attempts(request):
     STUDENT → own attempts
     ADMIN   → any student via ?user_id=, or empty list
     Others  → 403
+
+    Newest first, keyset-paginated: {"results", "next", "prev"}
+    (?cursor=, ?page_size= default 50, max 200).
     """
     user = request.user
 
@@ -487,7 +466,7 @@ def all_my_attempts(request):
         if user_id_param:
             target_user = get_object_or_404(User, id=user_id_param)
         else:
-            return JsonResponse([], safe=False)
+            return JsonResponse({"results": [], "next": None, "prev": None})
     else:
         return JsonResponse({"detail": "Forbidden"}, status=403)
 
@@ -499,8 +478,13 @@ def all_my_attempts(request):
             "assessment__course",
             "assessment__course__subject",
         )
-        .order_by("-submitted_at")
     )
+    try:
+        page = pagination.paginate_request(
+            attempts, request, ("-submitted_at", "-id"), default_size=50, max_size=200,
+        )
+    except pagination.InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
     data = [
         {
@@ -516,9 +500,9 @@ def all_my_attempts(request):
             "grade": a.assessment.course.grade,
             "course_title": a.assessment.course.title,
         }
-        for a in attempts
+        for a in page.items
     ]
-    return JsonResponse(data, safe=False)
+    return JsonResponse({"results": data, **page.cursors()})
 
 
 @require_auth
@@ -554,10 +538,9 @@ def my_assessments(request):
         )
 
     elif user.role == "TEACHER":
-        subject_ids = user.teaching_assignments.values_list("subject_id", flat=True)
         assessments_qs = (
             Assessment.objects
-            .filter(course__subject_id__in=subject_ids, is_published=True)
+            .filter(course__subject_id__in=request.user_context.assigned_subject_ids, is_published=True)
             .select_related("course", "course__subject")
             .order_by("course__grade", "course__subject__name", "title")
         )
@@ -658,19 +641,22 @@ def my_assessments(request):
 # TEACHER / ANALYTICS ENDPOINTS
 # =====================================================
 
+# Served through single_flight: fresh for the soft TTL, then served stale
+# while one request recomputes, until the hard TTL
+ANALYTICS_SOFT_TTL = 120
+ANALYTICS_HARD_TTL = 900
+
+
 @require_auth
 @require_http_methods(["GET"])
 def teacher_assessment_analytics(request):
     if request.user.role not in ["TEACHER", "OFFICIAL", "ADMIN", "PRINCIPAL"]:
         return JsonResponse({"detail": "Forbidden"}, status=403)
 
-    _cache_key = f"assess:teacher_analytics:{request.user.id}"
-    cached = cache.get(_cache_key)
-    if cached is not None:
-        return JsonResponse(cached, safe=False)
     if request.user.role == "TEACHER":
-        subject_ids = request.user.teaching_assignments.values_list("subject_id", flat=True)
-        assessments = Assessment.objects.filter(course__subject_id__in=subject_ids)
+        assessments = Assessment.objects.filter(
+            course__subject_id__in=request.user_context.assigned_subject_ids
+        )
     elif request.user.role == "PRINCIPAL":
         if not request.user.institution:
             return JsonResponse({"detail": "No institution assigned"}, status=400)
@@ -686,37 +672,42 @@ def teacher_assessment_analytics(request):
     else:
         assessments = Assessment.objects.all()
 
-    data = []
-    for assessment in assessments.select_related(
-        "course", "course__subject"
-    ).order_by("course__grade", "title"):
-        attempts        = assessment.attempts.filter(submitted_at__isnull=False)
-        agg             = attempts.aggregate(
-            total=Count("id"),
-            avg=Avg("score"),
-            passes=Count("id", filter=Q(passed=True)),
-        )
-        total_attempts  = agg["total"] or 0
-        unique_students = attempts.values("user").distinct().count()
-        avg_score       = agg["avg"] or 0
-        pass_count      = agg["passes"] or 0
-        pass_rate       = (pass_count / total_attempts * 100) if total_attempts else 0
+    def build():
+        data = []
+        for assessment in assessments.select_related(
+            "course", "course__subject"
+        ).order_by("course__grade", "title"):
+            attempts        = assessment.attempts.filter(submitted_at__isnull=False)
+            agg             = attempts.aggregate(
+                total=Count("id"),
+                avg=Avg("score"),
+                passes=Count("id", filter=Q(passed=True)),
+            )
+            total_attempts  = agg["total"] or 0
+            unique_students = attempts.values("user").distinct().count()
+            avg_score       = agg["avg"] or 0
+            pass_count      = agg["passes"] or 0
+            pass_rate       = (pass_count / total_attempts * 100) if total_attempts else 0
 
-        data.append({
-            "assessment_id":  assessment.id,
-            "course_id":      assessment.course.id,
-            "title":          assessment.title,
-            "course":         assessment.course.title,
-            "subject":        assessment.course.subject.name if assessment.course.subject else None,
-            "total_attempts": total_attempts,
-            "unique_students": unique_students,
-            "average_score":  round(avg_score, 2),
-            "pass_count":     pass_count,
-            "fail_count":     total_attempts - pass_count,
-            "pass_rate":      round(pass_rate, 2),
-        })
+            data.append({
+                "assessment_id":  assessment.id,
+                "course_id":      assessment.course.id,
+                "title":          assessment.title,
+                "course":         assessment.course.title,
+                "subject":        assessment.course.subject.name if assessment.course.subject else None,
+                "total_attempts": total_attempts,
+                "unique_students": unique_students,
+                "average_score":  round(avg_score, 2),
+                "pass_count":     pass_count,
+                "fail_count":     total_attempts - pass_count,
+                "pass_rate":      round(pass_rate, 2),
+            })
+        return data
 
-    cache.set(_cache_key, data, timeout=120)  # 2 min TTL
+    data = single_flight.get_or_compute(
+        f"assess:teacher_analytics:{request.user.id}", build,
+        soft_ttl=ANALYTICS_SOFT_TTL, hard_ttl=ANALYTICS_HARD_TTL,
+    )
     return JsonResponse(data, safe=False)
 
 
@@ -749,68 +740,74 @@ def teacher_class_analytics(request):
     else:
         classes = ClassRoom.objects.all().order_by(int_name)
 
-    # Pre-load all student IDs grouped by classroom in 1 query
-    classrooms_list = list(classes.select_related("institution"))
-    all_classroom_ids = [c.id for c in classrooms_list]
-    student_rows = (
-        User.objects
-        .filter(role="STUDENT", section__classroom_id__in=all_classroom_ids)
-        .values("id", "section__classroom_id")
-    )
-    students_by_class: dict[int, list[int]] = {cid: [] for cid in all_classroom_ids}
-    for row in student_rows:
-        students_by_class[row["section__classroom_id"]].append(row["id"])
-
-    # All attempt stats across all classrooms — 1 query
-    all_student_ids = [uid for uids in students_by_class.values() for uid in uids]
-    class_agg_rows: dict[int, dict] = {cid: {"total": 0, "avg": 0, "passes": 0} for cid in all_classroom_ids}
-    if all_student_ids:
-        # Map student → classroom
-        student_to_class = {}
-        for row in student_rows:
-            student_to_class[row["id"]] = row["section__classroom_id"]
-
-        attempt_rows = (
-            AssessmentAttempt.objects
-            .filter(user_id__in=all_student_ids, submitted_at__isnull=False)
-            .values("user_id")
-            .annotate(
-                total=Count("id"),
-                passes=Count("id", filter=Q(passed=True)),
-                avg=Avg("score"),
-            )
+    def build():
+        # Pre-load all student IDs grouped by classroom in 1 query
+        classrooms_list = list(classes.select_related("institution"))
+        all_classroom_ids = [c.id for c in classrooms_list]
+        student_rows = (
+            User.objects
+            .filter(role="STUDENT", section__classroom_id__in=all_classroom_ids)
+            .values("id", "section__classroom_id")
         )
-        for ar in attempt_rows:
-            cid = student_to_class.get(ar["user_id"])
-            if cid:
-                class_agg_rows[cid]["total"]  += ar["total"]
-                class_agg_rows[cid]["passes"] += ar["passes"]
-                # Running weighted avg (approximate — good enough for dashboard)
-                class_agg_rows[cid]["avg"] = (
-                    (class_agg_rows[cid]["avg"] + (ar["avg"] or 0)) / 2
-                    if class_agg_rows[cid]["avg"] else (ar["avg"] or 0)
+        students_by_class: dict[int, list[int]] = {cid: [] for cid in all_classroom_ids}
+        for row in student_rows:
+            students_by_class[row["section__classroom_id"]].append(row["id"])
+
+        # All attempt stats across all classrooms — 1 query
+        all_student_ids = [uid for uids in students_by_class.values() for uid in uids]
+        class_agg_rows: dict[int, dict] = {cid: {"total": 0, "avg": 0, "passes": 0} for cid in all_classroom_ids}
+        if all_student_ids:
+            # Map student → classroom
+            student_to_class = {}
+            for row in student_rows:
+                student_to_class[row["id"]] = row["section__classroom_id"]
+
+            attempt_rows = (
+                AssessmentAttempt.objects
+                .filter(user_id__in=all_student_ids, submitted_at__isnull=False)
+                .values("user_id")
+                .annotate(
+                    total=Count("id"),
+                    passes=Count("id", filter=Q(passed=True)),
+                    avg=Avg("score"),
                 )
+            )
+            for ar in attempt_rows:
+                cid = student_to_class.get(ar["user_id"])
+                if cid:
+                    class_agg_rows[cid]["total"]  += ar["total"]
+                    class_agg_rows[cid]["passes"] += ar["passes"]
+                    # Running weighted avg (approximate — good enough for dashboard)
+                    class_agg_rows[cid]["avg"] = (
+                        (class_agg_rows[cid]["avg"] + (ar["avg"] or 0)) / 2
+                        if class_agg_rows[cid]["avg"] else (ar["avg"] or 0)
+                    )
+
+        data = []
+        for classroom in classrooms_list:
+            cid            = classroom.id
+            total_students = len(students_by_class.get(cid, []))
+            agg            = class_agg_rows.get(cid, {})
+            total_attempts = agg.get("total", 0)
+            avg_score      = agg.get("avg", 0)
+            pass_count     = agg.get("passes", 0)
+            pass_rate      = (pass_count / total_attempts * 100) if total_attempts else 0
 
-    data = []
-    for classroom in classrooms_list:
-        cid            = classroom.id
-        total_students = len(students_by_class.get(cid, []))
-        agg            = class_agg_rows.get(cid, {})
-        total_attempts = agg.get("total", 0)
-        avg_score      = agg.get("avg", 0)
-        pass_count     = agg.get("passes", 0)
-        pass_rate      = (pass_count / total_attempts * 100) if total_attempts else 0
-
-        data.append({
-            "class_id":       classroom.id,
-            "class_name":     classroom.name,
-            "institution":    classroom.institution.name,
-            "total_students": total_students,
-            "total_attempts": total_attempts,
-            "average_score":  round(avg_score, 2),
-            "pass_rate":      round(pass_rate, 2),
-        })
+            data.append({
+                "class_id":       classroom.id,
+                "class_name":     classroom.name,
+                "institution":    classroom.institution.name,
+                "total_students": total_students,
+                "total_attempts": total_attempts,
+                "average_score":  round(avg_score, 2),
+                "pass_rate":      round(pass_rate, 2),
+            })
+        return data
 
+    data = single_flight.get_or_compute(
+        f"assess:teacher_class_analytics:{request.user.id}", build,
+        soft_ttl=ANALYTICS_SOFT_TTL, hard_ttl=ANALYTICS_HARD_TTL,
+    )
     return JsonResponse(data, safe=False)
 
 
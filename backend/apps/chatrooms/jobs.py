@@ -0,0 +1,41 @@
+# apps.chatrooms.jobs
+"""
+Background job handlers for chat fan-out: notification-bell rows and Ably
+notifications:{user_id} events.
+
+Both run once (max_attempts=1): neither is idempotent — a rerun would
+bump coalesced rows again, insert duplicate rows, or re-publish every
+chunk already sent — and a lost chat ping is cheaper than a duplicate.
+"""
+from django.contrib.auth import get_user_model
+
+from apps.jobs.queue import job
+
+from .models import ChatMessage, ChatRoom
+
+User = get_user_model()
+
+
+def _load(room_id, message_id, sender_id):
+    room = ChatRoom.objects.filter(id=room_id).first()
+    message = ChatMessage.objects.filter(id=message_id).first()
+    sender = User.objects.filter(id=sender_id).first()
+    if room is None or message is None or sender is None:
+        return None
+    return room, message, sender
+
+
+@job(max_attempts=1)
+def create_chat_notifications(room_id, message_id, sender_id):
+    from .views import _create_notification_records
+    loaded = _load(room_id, message_id, sender_id)
+    if loaded is not None:
+        _create_notification_records(*loaded)
+
+
+@job(max_attempts=1)
+def push_chat_notification(room_id, message_id, sender_id):
+    from .views import _push_chat_notification
+    loaded = _load(room_id, message_id, sender_id)
+    if loaded is not None:
+        _push_chat_notification(*loaded)
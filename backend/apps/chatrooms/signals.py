@@ -13,7 +13,7 @@ RULES (must match bootstrap_chatrooms exactly):
   OFFICIAL  → officials room.
 """
 import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,7 @@ def handle_user_save(sender, instance, **kwargs):
         get_or_create_staff_room,
         get_or_create_officials_room,
         enroll_admin_in_room,
+        forget_member_rooms,
     )
     from django.contrib.auth import get_user_model
     User = get_user_model()
@@ -48,6 +49,7 @@ def handle_user_save(sender, instance, **kwargs):
                     [ChatRoomMember(room_id=rid, user=instance) for rid in room_ids],
                     ignore_conflicts=True,
                 )
+                forget_member_rooms([instance.id])
                 # Bulk-enroll admins — 1 query for admins, 1 INSERT
                 admin_ids = list(User.objects.filter(role="ADMIN").values_list("id", flat=True))
                 if admin_ids:
@@ -93,6 +95,7 @@ def handle_teaching_assignment(sender, instance, created, **kwargs):
     from apps.chatrooms.views import (
         get_or_create_subject_room,
         enroll_admin_in_room,
+        forget_member_rooms,
     )
     from django.contrib.auth import get_user_model
     User = get_user_model()
@@ -114,6 +117,7 @@ def handle_teaching_assignment(sender, instance, created, **kwargs):
                 [ChatRoomMember(room=room, user_id=uid) for uid in student_ids],
                 ignore_conflicts=True,
             )
+            forget_member_rooms(student_ids)
 
         enroll_admin_in_room(room)
 
@@ -121,3 +125,11 @@ def handle_teaching_assignment(sender, instance, created, **kwargs):
         logger.warning(
             "chatrooms.signals.handle_teaching_assignment [ta=%s]: %s", instance.id, exc
         )
+
+
+@receiver(post_save, sender="chatrooms.ChatRoomMember")
+@receiver(post_delete, sender="chatrooms.ChatRoomMember")
+def handle_membership_change(sender, instance, **kwargs):
+    """Drop the cached room list behind the user's realtime token capability."""
+    from apps.chatrooms.views import forget_member_rooms
+    forget_member_rooms([instance.user_id])
@@ -134,3 +134,68 @@ class TestChatNotificationCreation:
         _create_notification_records(room, msg, teacher_user)
         after = Notification.objects.filter(user=teacher_user).count()
         assert after == before  # sender doesn't get notifications
+
+    def test_burst_coalesced_per_recipient(self, student_user, teacher_user, section, subject):
+        from apps.chatrooms.views import _create_notification_records
+        from apps.notifications.models import Notification
+        room = ChatRoom.objects.create(
+            room_type=RoomType.SUBJECT, section=section, subject=subject,
+            name="Burst Room",
+        )
+        ChatRoomMember.objects.create(room=room, user=teacher_user)
+        ChatRoomMember.objects.create(room=room, user=student_user)
+        for text in ("one", "two", "three"):
+            msg = ChatMessage.objects.create(room=room, sender=teacher_user, content=text)
+            _create_notification_records(room, msg, teacher_user)
+
+        rows = Notification.objects.filter(user=student_user, group_key=f"chat:{room.id}")
+        assert rows.count() == 1
+        assert rows[0].subject == "3 new messages in Burst Room"
+        assert rows[0].message.endswith(": three")
+
+        # Once read, the next message starts a fresh notification
+        rows.update(is_read=True)
+        _create_notification_records(room, msg, teacher_user)
+        assert rows.filter(is_read=False).get().subject == "New message in Burst Room"
+
+    def test_realtime_fan_out_skips_sender(self, student_user, student_user2, teacher_user,
+                                           section, subject):
+        from apps.chatrooms.views import _push_chat_notification
+        from apps.notifications.realtime import broker
+        room = ChatRoom.objects.create(
+            room_type=RoomType.SUBJECT, section=section, subject=subject,
+            name="Test Room 3",
+        )
+        for u in (teacher_user, student_user, student_user2):
+            ChatRoomMember.objects.create(room=room, user=u)
+        msg = ChatMessage.objects.create(room=room, sender=teacher_user, content="Hi")
+        broker.clear()
+        _push_chat_notification(room, msg, teacher_user)
+        channels = {m["channel"] for m in broker.messages(event="chat_message")}
+        assert channels == {f"notifications:{student_user.id}", f"notifications:{student_user2.id}"}
+
+
+@pytest.mark.django_db
+class TestMessageHistoryCursor:
+    def test_pages_back_and_forward(self, student_client, student_user, teacher_user, section, subject):
+        from apps.chatrooms.models import ChatMessage
+        room = ChatRoom.objects.create(
+            room_type=RoomType.SUBJECT, section=section, subject=subject, name="History",
+        )
+        ChatRoomMember.objects.create(room=room, user=student_user)
+        for i in range(5):
+            ChatMessage.objects.create(room=room, sender=teacher_user, content=f"m{i}")
+
+        url = f"/api/v1/chat/rooms/{room.id}/history/?page_size=2"
+        latest = student_client.get(url).json()
+        assert [m["content"] for m in latest["results"]] == ["m3", "m4"]
+        assert latest["prev"] is None
+
+        older = student_client.get(f"{url}&cursor={latest['next']}").json()
+        assert [m["content"] for m in older["results"]] == ["m1", "m2"]
+
+        again = student_client.get(f"{url}&cursor={older['prev']}").json()
+        assert [m["content"] for m in again["results"]] == ["m3", "m4"]
+        assert again["prev"] is None
+
+        assert student_client.get(f"{url}&cursor=bogus").status_code == 400
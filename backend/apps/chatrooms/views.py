@@ -18,17 +18,23 @@ Endpoints:
 """
 import json
 import logging
+from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast, Concat
 from apps.accesscontrol.permissions import require_auth  # returns 401 JSON, not 302
 from django.db import transaction
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from apps.accesscontrol.permissions import require_roles
 from apps.academics.models import Section, Subject, Institution
+from gyangrit import pagination
 from .models import ChatRoom, ChatRoomMember, ChatMessage, RoomType
 
 User = get_user_model()
@@ -130,6 +136,31 @@ def enroll_admin_in_room(room: ChatRoom) -> None:
         )
 
 
+# Student chat-room IDs back the realtime token capability (chat:{room_id}).
+# Staff get chat:* and never need this. Invalidated by the ChatRoomMember
+# signals and after the bulk enrolments in apps.chatrooms.signals.
+_MEMBER_ROOMS_TTL = 10 * 60
+
+
+def _member_rooms_key(user_id) -> str:
+    return f"chat:member_rooms:{user_id}"
+
+
+def member_room_ids(user_id: int) -> list[int]:
+    """IDs of every chat room the user belongs to (cached)."""
+    room_ids = cache.get(_member_rooms_key(user_id))
+    if room_ids is None:
+        room_ids = list(
+            ChatRoomMember.objects.filter(user_id=user_id).values_list("room_id", flat=True)
+        )
+        cache.set(_member_rooms_key(user_id), room_ids, timeout=_MEMBER_ROOMS_TTL)
+    return room_ids
+
+
+def forget_member_rooms(user_ids) -> None:
+    cache.delete_many([_member_rooms_key(uid) for uid in user_ids])
+
+
 def enroll_student_in_all_section_rooms(student) -> None:
     """
     When a student is assigned to a section, enroll them ONLY in subject rooms
@@ -210,19 +241,34 @@ def _user_can_share_files(user) -> bool:
 # Push notification helper
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Unread chat notifications for the same room within this window are folded
+# into one "N new messages in <room>" row per recipient.
+_COALESCE_WINDOW = timedelta(minutes=2)
+_NOTIFY_CHUNK    = 500
+
+
 def _create_notification_records(room: ChatRoom, message: ChatMessage, sender) -> None:
     """
-    Create a persistent Notification row for each room member (excluding sender).
-    This makes the chat message appear in the notification bell on every page.
-    Uses Notification.send() from apps.notifications.
+    Put the message in every member's notification bell (sender excluded).
+    Runs in the create_chat_notifications job, from member IDs only:
+
+      - a member with an unread notification for this room from the last
+        _COALESCE_WINDOW gets that row updated to "N new messages in <room>"
+        (one UPDATE per chunk, and the row moves back to the top)
+      - everyone else gets a new row via Notification.bulk_send
+
+    The whole pass runs in one transaction holding the room row's lock
+    (select_for_update), so two messages in the same room coalesce one
+    after the other instead of both missing the burst row and inserting.
     """
     from apps.notifications.models import Notification, NotificationType
 
     sender_info  = _sender_display(sender)
     preview      = message.content[:120] if message.content else "📎 Attachment"
-    subject      = f"New message in {room.name}"
+    room_name    = room.name[:200]
     msg_body     = f"{sender_info['name']}: {preview}"
     link         = f"/chat"  # frontend will navigate to chat page
+    group_key    = f"chat:{room.id}"
 
     member_ids = list(
         ChatRoomMember.objects.filter(room=room)
@@ -230,72 +276,68 @@ def _create_notification_records(room: ChatRoom, message: ChatMessage, sender) -
         .values_list("user_id", flat=True)
     )
 
-    users = User.objects.filter(id__in=member_ids)
-    for user in users:
-        try:
-            Notification.send(
-                user=user,
-                subject=subject,
+    with transaction.atomic():
+        ChatRoom.objects.select_for_update().filter(id=room.id).exists()
+        now   = timezone.now()
+        fresh = []
+        for i in range(0, len(member_ids), _NOTIFY_CHUNK):
+            chunk = member_ids[i:i + _NOTIFY_CHUNK]
+            burst = Notification.objects.filter(
+                user_id__in=chunk,
+                group_key=group_key,
+                is_read=False,
+                created_at__gte=now - _COALESCE_WINDOW,
+            )
+            coalesced = set(burst.values_list("user_id", flat=True))
+            burst.update(
+                group_count=F("group_count") + 1,
+                subject=Concat(
+                    Cast(F("group_count") + 1, output_field=CharField()),
+                    Value(f" new messages in {room_name}"),
+                ),
                 message=msg_body,
-                notification_type=NotificationType.INFO,
-                link=link,
+                created_at=now,
             )
-        except Exception as exc:
-            logger.warning("Failed to create notification for user %s: %s", user.id, exc)
+            fresh.extend(uid for uid in chunk if uid not in coalesced)
+
+        Notification.bulk_send(
+            fresh,
+            subject=f"New message in {room_name}",
+            message=msg_body,
+            notification_type=NotificationType.INFO,
+            link=link,
+            group_key=group_key,
+        )
 
 
 def _push_chat_notification(room: ChatRoom, message: ChatMessage, sender) -> None:
     """
-    Publish a push notification to each room member via Ably
-    on channel notifications:{user_id}.
-    Skips the sender themselves.
+    Publish a realtime event to each room member's notifications:{user_id}
+    channel (skipping the sender) via Ably batch publish — one request per
+    100 members. Runs in the push_chat_notification job.
     """
-    from django.conf import settings
-    import requests as http_requests
-    import base64
-    from urllib.parse import quote
-
-    api_key = getattr(settings, "ABLY_API_KEY", "").strip()
-    if not api_key or ":" not in api_key:
-        return
+    from apps.notifications import realtime
 
     sender_info = _sender_display(sender)
     preview = message.content[:80] if message.content else "📎 Attachment"
 
-    member_ids = list(
+    member_ids = (
         ChatRoomMember.objects.filter(room=room)
         .exclude(user_id=sender.id)
         .values_list("user_id", flat=True)
     )
-    if not member_ids:
-        return
-
-    credentials = base64.b64encode(api_key.encode()).decode()
-
-    for uid in member_ids:
-        try:
-            channel = quote(f"notifications:{uid}", safe="")
-            http_requests.post(
-                f"https://rest.ably.io/channels/{channel}/messages",
-                json={
-                    "name": "chat_message",
-                    "data": {
-                        "room_id":     room.id,
-                        "room_name":   room.name,
-                        "room_type":   room.room_type,
-                        "sender_name": sender_info["name"],
-                        "role_label":  sender_info["role_label"],
-                        "preview":     preview,
-                    },
-                },
-                headers={
-                    "Authorization": f"Basic {credentials}",
-                    "Content-Type":  "application/json",
-                },
-                timeout=3,
-            )
-        except Exception as exc:
-            logger.warning("Push notification failed for user %s: %s", uid, exc)
+    realtime.send(
+        [f"notifications:{uid}" for uid in member_ids],
+        "chat_message",
+        {
+            "room_id":     room.id,
+            "room_name":   room.name,
+            "room_type":   room.room_type,
+            "sender_name": sender_info["name"],
+            "role_label":  sender_info["role_label"],
+            "preview":     preview,
+        },
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -369,20 +411,30 @@ def room_detail(request, room_id):
 @require_auth
 @require_http_methods(["GET"])
 def message_history(request, room_id):
+    """
+    Top-level messages, oldest first within the page. The first page is the
+    latest 50; `next` pages back to older messages, `prev` forward again
+    (?cursor=, ?page_size= up to 100).
+    """
     room = get_object_or_404(ChatRoom, id=room_id)
     if not _user_can_access_room(request.user, room):
         return JsonResponse({"error": "Forbidden"}, status=403)
 
     from django.db.models import Count
-    messages = list(
+    qs = (
         ChatMessage.objects
         .filter(room=room, parent__isnull=True)
         .select_related("sender")
         .annotate(reply_count=Count("replies"))
-        .order_by("-sent_at")[:50]
     )
-    messages.reverse()
-    return JsonResponse([_msg_to_dict(m, m.reply_count) for m in messages], safe=False)
+    try:
+        page = pagination.paginate_request(qs, request, ("-sent_at", "-id"), default_size=50)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse({
+        "results": [_msg_to_dict(m, m.reply_count) for m in reversed(page.items)],
+        **page.cursors(),
+    })
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -459,11 +511,13 @@ def send_message(request, room_id):
             attachment_type=attachment_type, attachment_name=attachment_name,
         )
 
+    # Both after COMMIT, in background jobs:
     # 1. Create persistent Notification records (shows in bell on any page)
     # 2. Push real-time Ably event to notifications:{user_id} channel
     try:
-        _create_notification_records(room, msg, request.user)
-        _push_chat_notification(room, msg, request.user)
+        from .jobs import create_chat_notifications, push_chat_notification
+        create_chat_notifications.delay_on_commit(room.id, msg.id, request.user.id)
+        push_chat_notification.delay_on_commit(room.id, msg.id, request.user.id)
     except Exception as exc:
         logger.warning("Notification error: %s", exc)
 
@@ -582,15 +636,19 @@ def admin_list_rooms(request):
 def admin_room_messages(request, room_id):
     room = get_object_or_404(ChatRoom, id=room_id)
     from django.db.models import Count
-    messages = list(
+    qs = (
         ChatMessage.objects
         .filter(room=room)
         .select_related("sender")
         .annotate(reply_count=Count("replies"))
-        .order_by("-sent_at")[:100]
     )
-    messages.reverse()
+    # Latest 100 first; `next` pages back through older messages
+    try:
+        page = pagination.paginate_request(qs, request, ("-sent_at", "-id"), default_size=100, max_size=200)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
     return JsonResponse({
         "room": _room_to_dict(room),
-        "messages": [_msg_to_dict(m, m.reply_count) for m in messages],
+        "messages": [_msg_to_dict(m, m.reply_count) for m in reversed(page.items)],
+        **page.cursors(),
     })
@@ -0,0 +1,16 @@
+# apps.competitions.jobs
+"""
+Background job handlers for competition rooms.
+
+publish_room_scores is one tick of the per-room ticker behind the
+throttled room:scores broadcast (see apps.competitions.scoreboard); it
+re-enqueues itself with a delay rather than sleeping. Other room events go
+through apps.notifications.realtime.
+"""
+from apps.jobs.queue import job
+
+
+@job(max_attempts=1)
+def publish_room_scores(room_id):
+    from .scoreboard import run_ticker
+    run_ticker(room_id)
@@ -18,7 +18,8 @@ Ably channel:  competition:{room.id}
   Events pushed by backend:
     room:started      — host triggered start; payload: { question_count }
     room:question     — next question; payload: { index, text, marks, options, time_limit_secs }
-    room:scores       — live leaderboard update; payload: [{ username, score, rank }]
+    room:scores       — live leaderboard update, coalesced to ≤ 2/s (scoreboard.py);
+                        payload: [{ username, score, rank }]
     room:finished     — quiz over; payload: final leaderboard
   Events sent by students (via Ably client):
     student:answer    — { question_id, option_id } — backend validates via REST
@@ -0,0 +1,230 @@
+# apps.competitions.scoreboard
+"""
+Live per-room scoreboard with a throttled `room:scores` broadcast.
+
+Scores:
+  Redis ZSET  comp:{room_id}:scores   member = student_id, score = marks
+  Redis HASH  comp:{room_id}:names    student_id → {"username", "display_name"}
+  Seeded with every participant at 0 by start_room (and join_room while
+  active); each accepted answer is one ZINCRBY. Without Redis, or if the
+  set has gone missing, standings() falls back to one grouped query over
+  CompetitionAnswer — still once per tick, never once per answer.
+
+Broadcast (coalesced, at most one room:scores per COMPETITION_SCORES_INTERVAL):
+  An accepted answer sets comp:{room_id}:pending. If no ticker is running
+  for the room, it claims comp:{room_id}:ticker and enqueues
+  publish_room_scores. Each run of that job is one tick: it publishes and
+  re-enqueues itself one interval later (never sleeping in a worker
+  thread) while answers keep arriving; then it releases the ticker flag.
+
+Persistence:
+  CompetitionParticipant.score / rank are written once, by finish_room,
+  from the authoritative CompetitionAnswer totals (see final_standings).
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+
+from .models import CompetitionAnswer, CompetitionParticipant
+
+logger = logging.getLogger(__name__)
+
+_ROOM_TTL   = 6 * 60 * 60   # Redis keys outlive any realistic room
+_TICKER_TTL = 30             # safety: a crashed ticker frees the room after 30s
+
+
+def _interval() -> float:
+    return getattr(settings, "COMPETITION_SCORES_INTERVAL", 0.5)
+
+
+def _key(room_id, part: str) -> str:
+    return f"comp:{room_id}:{part}"
+
+
+def _redis():
+    from gyangrit.redis_client import get_redis
+    return get_redis()
+
+
+def _names(student) -> str:
+    return json.dumps({
+        "username":     student.username,
+        "display_name": student.display_name or student.username,
+    })
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Score updates
+# ─────────────────────────────────────────────────────────────────────────────
+
+def seed(room) -> None:
+    """Put every current participant on the board at 0 (room just started)."""
+    r = _redis()
+    if r is None:
+        return
+    participants = list(room.participants.select_related("student"))
+    if not participants:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        pipe.zadd(_key(room.id, "scores"), {str(p.student_id): 0 for p in participants}, nx=True)
+        pipe.hset(_key(room.id, "names"), mapping={str(p.student_id): _names(p.student) for p in participants})
+        pipe.expire(_key(room.id, "scores"), _ROOM_TTL)
+        pipe.expire(_key(room.id, "names"), _ROOM_TTL)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("Scoreboard seed failed for room %s: %s", room.id, exc)
+
+
+def add_participant(room_id: int, student) -> None:
+    """A student joined a room that is already live."""
+    r = _redis()
+    if r is None:
+        return
+    try:
+        if not r.exists(_key(room_id, "scores")):
+            return   # not seeded — standings() reads the DB for this room
+        pipe = r.pipeline(transaction=False)
+        pipe.zadd(_key(room_id, "scores"), {str(student.id): 0}, nx=True)
+        pipe.hset(_key(room_id, "names"), str(student.id), _names(student))
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("Scoreboard join failed for room %s: %s", room_id, exc)
+
+
+def record_answer(room_id: int, student_id: int, marks: int) -> None:
+    """Apply one accepted answer and schedule a coalesced broadcast."""
+    r = _redis()
+    if r is not None and marks:
+        try:
+            key = _key(room_id, "scores")
+            # Only increment a seeded board — a lone ZINCRBY would create a
+            # board missing everyone else; standings() uses the DB instead.
+            if r.exists(key):
+                r.zincrby(key, marks, str(student_id))
+        except Exception as exc:
+            logger.warning("Scoreboard update failed for room %s: %s", room_id, exc)
+    schedule_publish(room_id)
+
+
+def clear(room_id: int) -> None:
+    r = _redis()
+    if r is not None:
+        try:
+            r.delete(_key(room_id, "scores"), _key(room_id, "names"))
+        except Exception:
+            pass
+    cache.delete_many([_key(room_id, "pending"), _key(room_id, "ticker")])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Standings
+# ─────────────────────────────────────────────────────────────────────────────
+
+def standings(room) -> list[dict]:
+    """Current live leaderboard, best first, in the room:scores payload shape."""
+    r = _redis()
+    if r is not None:
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.zrevrange(_key(room.id, "scores"), 0, -1, withscores=True)
+            pipe.hgetall(_key(room.id, "names"))
+            scores, names = pipe.execute()
+            if scores:
+                entries = []
+                for rank, (student_id, score) in enumerate(scores, start=1):
+                    name = json.loads(names.get(student_id) or "{}")
+                    entries.append({
+                        "rank":         rank,
+                        "student_id":   int(student_id),
+                        "username":     name.get("username", ""),
+                        "display_name": name.get("display_name", ""),
+                        "score":        int(score),
+                    })
+                return entries
+        except Exception as exc:
+            logger.warning("Scoreboard read failed for room %s: %s", room.id, exc)
+    return [_entry(p) for p in _ranked_participants(room)]
+
+
+def final_standings(room) -> list[dict]:
+    """Rank from CompetitionAnswer totals and persist score/rank in one bulk_update."""
+    participants = _ranked_participants(room)
+    CompetitionParticipant.objects.bulk_update(participants, ["score", "rank"])
+    return [_entry(p) for p in participants]
+
+
+def _ranked_participants(room) -> list:
+    participants = list(room.participants.select_related("student").all())
+    score_map = dict(
+        CompetitionAnswer.objects
+        .filter(room=room)
+        .values("student")
+        .annotate(total=Sum("marks_earned"))
+        .values_list("student", "total")
+    )
+    for p in participants:
+        p.score = score_map.get(p.student_id) or 0
+    participants.sort(key=lambda p: -p.score)
+    for i, p in enumerate(participants, 1):
+        p.rank = i
+    return participants
+
+
+def _entry(p) -> dict:
+    return {
+        "rank":         p.rank,
+        "student_id":   p.student_id,
+        "username":     p.student.username,
+        "display_name": p.student.display_name or p.student.username,
+        "score":        p.score,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Throttled broadcast
+# ─────────────────────────────────────────────────────────────────────────────
+
+def schedule_publish(room_id: int) -> None:
+    cache.set(_key(room_id, "pending"), 1, timeout=_TICKER_TTL)
+    if cache.add(_key(room_id, "ticker"), 1, timeout=_TICKER_TTL):
+        from .jobs import publish_room_scores
+        publish_room_scores.delay(room_id)
+
+
+def run_ticker(room_id: int) -> None:
+    """
+    One tick: publish room:scores if answers arrived since the last tick,
+    then schedule the next tick one interval later. Called by the
+    publish_room_scores job that holds the room's ticker flag.
+    """
+    from apps.jobs.queue import enqueue
+    from apps.notifications import realtime
+    from .jobs import publish_room_scores
+    from .models import CompetitionRoom, RoomStatus
+
+    pending_key, ticker_key = _key(room_id, "pending"), _key(room_id, "ticker")
+    try:
+        if not cache.get(pending_key):
+            cache.delete(ticker_key)
+            # An answer may have set pending after our check but before the
+            # delete, and seen the ticker still held — pick it up here.
+            if not cache.get(pending_key) or not cache.add(ticker_key, 1, timeout=_TICKER_TTL):
+                return
+        cache.delete(pending_key)
+
+        room = CompetitionRoom.objects.filter(id=room_id).first()
+        if room is None or room.status != RoomStatus.ACTIVE:
+            cache.delete(ticker_key)
+            return   # finish_room publishes the final board itself
+        realtime.send([f"competition:{room_id}"], "room:scores",
+                      {"leaderboard": standings(room)})
+        cache.touch(ticker_key, _TICKER_TTL)
+    except Exception:
+        cache.delete(ticker_key)
+        raise
+
+    enqueue(publish_room_scores.job_name, args=[room_id], delay=_interval())
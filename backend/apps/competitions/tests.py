@@ -103,6 +103,48 @@ class TestCompetitionJoin:
         assert resp.status_code in (400, 403)
 
 
+@pytest.mark.django_db
+class TestCompetitionScoring:
+    def test_live_scores_then_final_ranks(self, teacher_client, student_client, student_user,
+                                          section, assessment, question, correct_option):
+        from django.core.cache import cache
+        from apps.competitions.models import CompetitionParticipant
+        from apps.notifications.realtime import broker
+
+        broker.clear()
+        published = broker.messages   # called for a fresh snapshot each time
+
+        room = TestCompetitionJoin()._create(teacher_client, section, assessment)
+        student_client.post(f"/api/v1/competitions/{room['id']}/join/",
+                            data="{}", content_type="application/json")
+        assert teacher_client.post(f"/api/v1/competitions/{room['id']}/start/").status_code == 200
+
+        resp = student_client.post(
+            f"/api/v1/competitions/{room['id']}/answer/",
+            data=json.dumps({"question_id": question.id, "option_id": correct_option.id}),
+            content_type="application/json",
+        )
+        assert resp.json()["accepted"] is True
+        scores = [m["data"] for m in published(event="room:scores")]
+        assert scores[-1]["leaderboard"][0]["score"] == 1
+        # Scores are live in the room view but not yet written to the participant row
+        detail = student_client.get(f"/api/v1/competitions/{room['id']}/").json()
+        assert detail["participants"][0]["score"] == 1
+        assert CompetitionParticipant.objects.get(student=student_user).score == 0
+
+        # While a ticker holds the room, further answers only mark it pending
+        cache.set(f"comp:{room['id']}:ticker", 1)
+        before = len(published())
+        from apps.competitions.scoreboard import schedule_publish
+        schedule_publish(room["id"])
+        assert len(published()) == before
+
+        resp = teacher_client.post(f"/api/v1/competitions/{room['id']}/finish/")
+        assert resp.json()["leaderboard"][0]["score"] == 1
+        participant = CompetitionParticipant.objects.get(student=student_user)
+        assert (participant.score, participant.rank) == (1, 1)
+
+
 @pytest.mark.django_db
 class TestCompetitionHistory:
     def test_empty_history(self, student_client):
@@ -131,3 +173,34 @@ class TestAblyTokenCapability:
             content_type="application/json",
         )
         assert resp.status_code in (401, 403)
+
+    def test_token_request_signed_locally(self, student_client, student_user, section, subject,
+                                          settings):
+        import base64
+        import hashlib
+        import hmac
+        from apps.chatrooms.models import ChatRoom, ChatRoomMember, RoomType
+
+        settings.ABLY_API_KEY = "app.key:s3cret"
+        room = ChatRoom.objects.create(room_type=RoomType.SUBJECT, section=section,
+                                       subject=subject, name="Token Room")
+
+        def token():
+            resp = student_client.post("/api/v1/realtime/token/",
+                                       data=json.dumps({"channel_type": "chat"}),
+                                       content_type="application/json")
+            assert resp.status_code == 200
+            return resp.json()["token_request"]
+
+        assert f"chat:{room.id}" not in json.loads(token()["capability"])
+        # Joining a room invalidates the cached membership
+        ChatRoomMember.objects.create(room=room, user=student_user)
+        tr = token()
+        capability = json.loads(tr["capability"])
+        assert capability[f"chat:{room.id}"] == ["subscribe", "publish"]
+        assert capability[f"notifications:{student_user.id}"] == ["subscribe"]
+
+        signed = "".join(f"{tr[f]}\n" for f in
+                         ("keyName", "ttl", "capability", "clientId", "timestamp", "nonce"))
+        mac = base64.b64encode(hmac.new(b"s3cret", signed.encode(), hashlib.sha256).digest())
+        assert (tr["keyName"], tr["clientId"], tr["mac"]) == ("app.key", str(student_user.id), mac.decode())
@@ -12,7 +12,7 @@ Endpoints:
   POST /api/v1/competitions/<id>/answer/  — student submits an answer
 
 Ably token:
-  POST /api/v1/realtime/token/            — returns a short-lived Ably JWT
+  POST /api/v1/realtime/token/            — returns a locally signed Ably TokenRequest
   (lives in apps.competitions.views but mounted under /api/v1/realtime/)
 
 Security:
@@ -37,6 +37,8 @@ from django.conf import settings
 from apps.accesscontrol.permissions import require_roles
 from apps.academics.models import Section
 from apps.assessments.models import Assessment, Question, QuestionOption
+from apps.notifications import realtime
+from . import scoreboard
 from .models import CompetitionRoom, CompetitionParticipant, CompetitionAnswer, RoomStatus
 
 User = get_user_model()
@@ -81,90 +83,6 @@ def _room_to_dict(room: CompetitionRoom, include_participants: bool = False) ->
     return d
 
 
-def _publish_ably_event(channel_name: str, event: str, data: dict) -> bool:
-    """
-    Publish an event to an Ably channel from the backend via Ably REST HTTP API.
-    Uses requests directly — Ably Python v3 SDK is async-only, incompatible with
-    sync Django views.
-    Returns True on success, False if ABLY_API_KEY is not set or publish fails.
-    """
-    import requests as http_requests
-    import base64
-
-    api_key = getattr(settings, "ABLY_API_KEY", "").strip()
-    if not api_key:
-        logger.warning("ABLY_API_KEY not set — skipping publish to %s", channel_name)
-        return False
-
-    if ":" not in api_key:
-        logger.error("ABLY_API_KEY format invalid")
-        return False
-
-    try:
-        credentials = base64.b64encode(api_key.encode()).decode()
-        # URL-encode the channel name (handles special chars like [chat]123)
-        from urllib.parse import quote
-        encoded_channel = quote(channel_name, safe="")
-        url = f"https://rest.ably.io/channels/{encoded_channel}/messages"
-
-        resp = http_requests.post(
-            url,
-            json={"name": event, "data": data},
-            headers={
-                "Authorization": f"Basic {credentials}",
-                "Content-Type":  "application/json",
-            },
-            timeout=5,
-        )
-        resp.raise_for_status()
-        return True
-    except Exception as exc:
-        logger.error("Ably publish failed on %s: %s", channel_name, exc)
-        return False
-
-
-def _recalculate_leaderboard(room: CompetitionRoom) -> list:
-    """
-    Recalculate scores from CompetitionAnswer rows, update participant ranks,
-    and return the sorted leaderboard list.
-    """
-    from django.db.models import Sum
-    participants = list(
-        room.participants.select_related("student").all()
-    )
-    # Aggregate marks_earned per student
-    from django.db.models import Sum as DjSum
-    score_map = {
-        row["student"]: row["total"]
-        for row in (
-            CompetitionAnswer.objects
-            .filter(room=room)
-            .values("student")
-            .annotate(total=DjSum("marks_earned"))
-        )
-    }
-    # Update scores
-    for p in participants:
-        p.score = score_map.get(p.student_id, 0)
-
-    # Sort and assign ranks
-    participants.sort(key=lambda p: -p.score)
-    for i, p in enumerate(participants, 1):
-        p.rank = i
-    CompetitionParticipant.objects.bulk_update(participants, ["score", "rank"])
-
-    return [
-        {
-            "rank":         p.rank,
-            "student_id":   p.student_id,
-            "username":     p.student.username,
-            "display_name": p.student.display_name or p.student.username,
-            "score":        p.score,
-        }
-        for p in participants
-    ]
-
-
 # ─────────────────────────────────────────────────────────────────────────────
 # LIST rooms — GET /api/v1/competitions/
 # ─────────────────────────────────────────────────────────────────────────────
@@ -274,6 +192,15 @@ def room_detail(request, room_id):
 
     data = _room_to_dict(room, include_participants=True)
 
+    # Participant rows are only scored at finish — overlay the live board
+    if room.status == RoomStatus.ACTIVE:
+        live = {e["student_id"]: e for e in scoreboard.standings(room)}
+        for p in data["participants"]:
+            entry = live.get(p["student_id"])
+            if entry:
+                p["score"], p["rank"] = entry["score"], entry["rank"]
+        data["participants"].sort(key=lambda p: p["rank"] or 0)
+
     # Add questions for ACTIVE rooms (no correct answer included for students)
     if room.status == RoomStatus.ACTIVE:
         questions = list(
@@ -335,6 +262,8 @@ def join_room(request, room_id):
     )
     if created:
         logger.info("Student %s joined competition room %s", user.id, room.id)
+        if room.status == RoomStatus.ACTIVE:
+            scoreboard.add_participant(room.id, user)
 
     return JsonResponse({
         "joined":    True,
@@ -365,9 +294,10 @@ def start_room(request, room_id):
     room.status     = RoomStatus.ACTIVE
     room.started_at = timezone.now()
     room.save(update_fields=["status", "started_at"])
+    scoreboard.seed(room)
 
     # Notify all participants via Ably
-    _publish_ably_event(
+    realtime.publish(
         f"competition:{room.id}",
         "room:started",
         {"room_id": room.id, "question_count": question_count},
@@ -394,8 +324,10 @@ def finish_room(request, room_id):
     room.finished_at = timezone.now()
     room.save(update_fields=["status", "finished_at"])
 
-    leaderboard = _recalculate_leaderboard(room)
-    _publish_ably_event(
+    # Final ranks are persisted here, once, from the CompetitionAnswer totals
+    leaderboard = scoreboard.final_standings(room)
+    scoreboard.clear(room.id)
+    realtime.publish(
         f"competition:{room.id}",
         "room:finished",
         {"room_id": room.id, "leaderboard": leaderboard},
@@ -453,13 +385,8 @@ def submit_answer(request, room_id):
             # Already answered — ignore (first answer counts)
             return JsonResponse({"accepted": False, "reason": "Already answered"})
 
-    # Recalculate and broadcast updated leaderboard
-    leaderboard = _recalculate_leaderboard(room)
-    _publish_ably_event(
-        f"competition:{room.id}",
-        "room:scores",
-        {"leaderboard": leaderboard},
-    )
+    # Incremental score update; room:scores goes out on the next coalesced tick
+    scoreboard.record_answer(room.id, user.id, answer.marks_earned)
 
     return JsonResponse({
         "accepted":     True,
@@ -470,27 +397,26 @@ def submit_answer(request, room_id):
 
 # ─────────────────────────────────────────────────────────────────────────────
 # ABLY TOKEN — POST /api/v1/realtime/token/
-# Returns a short-lived Ably token request for the requesting user.
+# Returns a signed Ably TokenRequest for the requesting user.
 #
-# Uses the Ably REST API directly (requests lib) because the Ably Python v3
-# SDK uses async/await throughout — incompatible with sync Django views.
-# Ably token request endpoint: POST https://rest.ably.io/keys/{key_name}/requestToken
+# The TokenRequest is HMAC-signed locally from ABLY_API_KEY (see
+# apps.notifications.realtime.token_request) — no call to Ably here; the
+# browser's Ably client exchanges it for a token via its authCallback.
 #
 # Channel scope:
 #   STUDENT (competition) → subscribe competition:{room_id}
-#   STUDENT (chat)        → publish+subscribe [chat]{section_id}
+#   STUDENT (chat)        → publish+subscribe chat:{room_id} per membership
 #   TEACHER/ADMIN (comp)  → publish+subscribe competition:*
-#   TEACHER/ADMIN (chat)  → publish+subscribe [chat]*
+#   TEACHER/ADMIN (chat)  → publish+subscribe chat:*
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ABLY_TOKEN_TTL_MS = 3600 * 1000  # 1 hour
+
+
 @require_auth
 @require_http_methods(["POST"])
 @csrf_exempt
 def ably_token(request):
-    import requests as http_requests
-    import base64
-    import time
-
     api_key = getattr(settings, "ABLY_API_KEY", "").strip()
     if not api_key:
         return JsonResponse({"error": "Real-time not configured"}, status=503)
@@ -500,8 +426,6 @@ def ably_token(request):
         logger.error("ABLY_API_KEY format invalid — expected keyName:keySecret")
         return JsonResponse({"error": "Real-time misconfigured"}, status=503)
 
-    key_name, key_secret = api_key.split(":", 1)
-
     try:
         body = json.loads(request.body) if request.body else {}
     except (json.JSONDecodeError, ValueError):
@@ -512,17 +436,11 @@ def ably_token(request):
     user         = request.user
 
     # ── Build capability ─────────────────────────────────────────────────
-    # All authenticated users subscribe to their own notification channel
-    notification_cap = {f"notifications:{user.id}": ["subscribe"]}
-
     if user.role == "STUDENT":
         if channel_type == "chat":
-            # Chat rooms by membership — subscribe to all their chat rooms
-            from apps.chatrooms.models import ChatRoomMember
-            room_ids = list(
-                ChatRoomMember.objects.filter(user=user).values_list("room_id", flat=True)
-            )
-            capability = {f"chat:{rid}": ["subscribe", "publish"] for rid in room_ids}
+            # Chat rooms by membership (cached; see chatrooms.views.member_room_ids)
+            from apps.chatrooms.views import member_room_ids
+            capability = {f"chat:{rid}": ["subscribe", "publish"] for rid in member_room_ids(user.id)}
         else:
             if not room_id:
                 return JsonResponse({"error": "room_id is required for students"}, status=400)
@@ -534,47 +452,16 @@ def ably_token(request):
         else:
             capability = {"competition:*": ["subscribe", "publish"]}
 
-    # Merge notification capability
-    capability.update(notification_cap)
-
-    # ── Request token from Ably REST API ─────────────────────────────────
-    # https://ably.com/docs/api/rest-api#request-token
-    ttl_ms = 3600 * 1000  # 1 hour
-
-    token_params = {
-        "keyName":    key_name,
-        "ttl":        ttl_ms,
-        "capability": json.dumps(capability),
-        "clientId":   str(user.id),
-        "timestamp":  int(time.time() * 1000),
-    }
-
-    credentials = base64.b64encode(f"{api_key}".encode()).decode()
-    url = f"https://rest.ably.io/keys/{key_name}/requestToken"
+    # All authenticated users subscribe to their own notification channel
+    capability[f"notifications:{user.id}"] = ["subscribe"]
 
-    try:
-        resp = http_requests.post(
-            url,
-            json=token_params,
-            headers={
-                "Authorization": f"Basic {credentials}",
-                "Content-Type":  "application/json",
-            },
-            timeout=10,
-        )
-        resp.raise_for_status()
-        token_data = resp.json()
-
-        return JsonResponse({
-            "token":      token_data.get("token"),
-            "expires":    token_data.get("expires"),
-            "client_id":  str(user.id),
-            "capability": capability,
-        })
-
-    except Exception as exc:
-        logger.error("Ably token request failed: %s", exc)
-        return JsonResponse({"error": "Could not generate real-time token"}, status=500)
+    token_request = realtime.token_request(api_key, str(user.id), capability, _ABLY_TOKEN_TTL_MS)
+    return JsonResponse({
+        "token_request": token_request,
+        "expires":       token_request["timestamp"] + _ABLY_TOKEN_TTL_MS,
+        "client_id":     str(user.id),
+        "capability":    capability,
+    })
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class ContentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "apps.content"
\ No newline at end of file
+    name = "apps.content"
+
+    def ready(self):
+        import apps.content.signals  # noqa: F401 — lesson list cache invalidation
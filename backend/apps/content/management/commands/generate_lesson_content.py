@@ -15,7 +15,7 @@ With --force: overwrites ALL lesson content.
 import logging
 import time
 
-import requests
+from gyangrit import http_client
 
 from django.core.management.base import BaseCommand
 from apps.content.models import Course, Lesson
@@ -173,7 +173,7 @@ def _call_boa(prompt: str) -> str:
         raise ValueError("No BOA_API_KEY_N keys in env")
     api_key = keys[_boa_mgmt_idx % len(keys)]
     _boa_mgmt_idx += 1
-    resp = requests.post(
+    resp = http_client.post(
         "https://api.bayofassets.com/v1/chat/completions",
         headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
         json={
@@ -192,11 +192,11 @@ def _call_boa(prompt: str) -> str:
 
 
 def _call_groq(prompt: str) -> str:
-    import os, requests
+    import os
     key = os.environ.get("GROQ_API_KEY", "")
     if not key:
         raise ValueError("GROQ_API_KEY not set")
-    resp = requests.post(
+    resp = http_client.post(
         "https://api.groq.com/openai/v1/chat/completions",
         headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
         json={
@@ -215,11 +215,11 @@ def _call_groq(prompt: str) -> str:
 
 
 def _call_together(prompt: str) -> str:
-    import os, requests
+    import os
     key = os.environ.get("TOGETHER_API_KEY", "")
     if not key:
         raise ValueError("TOGETHER_API_KEY not set")
-    resp = requests.post(
+    resp = http_client.post(
         "https://api.together.xyz/v1/chat/completions",
         headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
         json={
@@ -238,11 +238,11 @@ def _call_together(prompt: str) -> str:
 
 
 def _call_gemini(prompt: str) -> str:
-    import os, requests
+    import os
     key = os.environ.get("GEMINI_API_KEY", "")
     if not key:
         raise ValueError("GEMINI_API_KEY not set")
-    resp = requests.post(
+    resp = http_client.post(
         f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={key}",
         headers={"Content-Type": "application/json"},
         json={
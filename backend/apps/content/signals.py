@@ -0,0 +1,16 @@
+"""
+content/signals.py
+
+Drop the cached per-course lesson list (apps.content.views.course_lessons,
+catalog cache tier) whenever one of its lessons changes.
+"""
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Lesson
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_course_lessons(sender, instance, **kwargs):
+    caches["catalog"].delete(f"course_lessons:{instance.course_id}")
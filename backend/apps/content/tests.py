@@ -17,6 +17,30 @@ class TestCourseList:
         resp = anon_client.get("/api/v1/courses/")
         assert resp.status_code in (401, 403)
 
+    def test_cohort_cache_shared_and_fresh_after_edit(self, student_user, student_user2, course, classroom):
+        from django.db import connection
+        from django.test import Client
+        from django.test.utils import CaptureQueriesContext
+        from apps.academics.models import StudentSubject
+        from apps.content.models import Course
+
+        clients = []
+        for user in (student_user, student_user2):
+            StudentSubject.objects.get_or_create(student=user, subject=course.subject, classroom=classroom)
+            client = Client()
+            client.force_login(user)
+            clients.append(client)
+
+        assert [c["id"] for c in clients[0].get("/api/v1/courses/").json()] == [course.id]
+        # Same grade + subjects → the second student is served the shared payload
+        with CaptureQueriesContext(connection) as ctx:
+            clients[1].get("/api/v1/courses/")
+        assert not any("content_course" in q["sql"] for q in ctx.captured_queries)
+
+        extra = Course.objects.create(title="Math 10 B", subject=course.subject, grade=10)
+        ids = [c["id"] for c in clients[1].get("/api/v1/courses/").json()]
+        assert extra.id in ids
+
 
 @pytest.mark.django_db
 class TestCourseCreate:
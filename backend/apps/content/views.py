@@ -38,7 +38,7 @@ import re
 
 from django.contrib.auth import get_user_model
 from apps.accesscontrol.permissions import require_auth  # returns 401 JSON, not 302
-from django.core.cache import cache
+from django.core.cache import cache, caches
 from django.db.models import Avg
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
@@ -46,14 +46,17 @@ from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
+from apps.accesscontrol.access import filter_accessible, has_access_to_course
 from apps.accesscontrol.permissions import require_roles
-from apps.accesscontrol.scoped_service import scope_queryset, get_scoped_object_or_403
-from apps.academics.models import ClassRoom, ClassSubject, StudentSubject
+from apps.accesscontrol.scoped_service import scope_key, scope_queryset, get_scoped_object_or_403
+from apps.academics.models import ClassRoom
 from apps.assessments.models import Assessment, AssessmentAttempt
+from gyangrit import cache_keys, single_flight
 from .models import Course, Lesson, SectionLesson, LessonProgress, LessonNote
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
+catalog = caches["catalog"]   # two-tier cache for read-mostly catalog data
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -108,97 +111,47 @@ def health(request):
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# ACCESS CONTROL HELPERS
+# COURSES
 # ─────────────────────────────────────────────────────────────────────────────
 
-def has_access_to_course(user, course):
-    if not user.is_authenticated:
-        return False
-    if user.is_superuser or user.role == "ADMIN":
-        return True
-    subject = course.subject
-    if user.role == "STUDENT":
-        return StudentSubject.objects.filter(student=user, subject=subject).exists()
-    if user.role == "TEACHER":
-        return user.teaching_assignments.filter(subject=subject).exists()
-    if user.role == "PRINCIPAL":
-        if not user.institution:
-            return False
-        return ClassSubject.objects.filter(
-            classroom__institution=user.institution, subject=subject
-        ).exists()
-    if user.role == "OFFICIAL":
-        if not user.district:
-            return False
-        return ClassSubject.objects.filter(
-            classroom__institution__district__name=user.district, subject=subject
-        ).exists()
-    return False
-
-
-def _get_student_section(user):
-    try:
-        return user.section
-    except AttributeError:
-        return None
-
-
-def _get_teacher_section(user):
-    assignment = getattr(user, "teaching_assignments", None)
-    if assignment is None:
-        return None
-    first = assignment.first()
-    return first.section if first else None
-
-
-def _get_student_grade(user):
-    section = _get_student_section(user)
-    if section is None:
-        return None
-    classroom = getattr(section, "classroom", None)
-    if classroom is None:
-        return None
-    try:
-        return int(classroom.name.strip())
-    except (ValueError, AttributeError):
-        logger.warning(
-            "Cannot parse grade from classroom name '%s' for user id=%s",
-            getattr(classroom, "name", None),
-            user.id,
-        )
-        return None
+_COURSES_MODELS = (
+    "content.course", "academics.subject", "academics.classsubject",
+    "academics.classroom", "academics.institution",
+)
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# COURSES
-# ─────────────────────────────────────────────────────────────────────────────
+def _courses_scope(ctx, user) -> str:
+    if ctx.role == "STUDENT":
+        return f"g{ctx.grade}:s{cache_keys.id_set(ctx.enrolled_subject_ids)}"
+    if ctx.role == "TEACHER":
+        return f"t:s{cache_keys.id_set(ctx.assigned_subject_ids)}"
+    return scope_key(user)
+
 
 @require_auth
 @require_http_methods(["GET"])
 def courses(request):
-    from django.core.cache import cache
-    user    = request.user
-    cache_key = f"courses:{user.role}:{user.id}"
-    
-    cached = cache.get(cache_key)
+    """
+    Courses visible to the user. The payload depends only on the user's
+    cohort — grade + subject set for students, subject set for teachers,
+    institution / district otherwise — so it is cached per cohort and shared.
+    """
+    user = request.user
+    ctx  = request.user_context
+    cache_key = cache_keys.scoped("courses", _courses_scope(ctx, user), models=_COURSES_MODELS)
+
+    cached = catalog.get(cache_key)
     if cached is not None:
         return JsonResponse(cached, safe=False)
-        
+
     base_qs = Course.objects.select_related("subject").order_by("grade", "subject__name")
 
-    if user.role == "STUDENT":
-        enrolled = StudentSubject.objects.filter(
-            student=user
-        ).values_list("subject_id", flat=True)
-        qs    = base_qs.filter(subject_id__in=enrolled)
-        grade = _get_student_grade(user)
-        if grade is not None:
-            qs = qs.filter(grade=grade)
-    elif user.role == "TEACHER":
-        assigned = user.teaching_assignments.values_list(
-            "subject_id", flat=True
-        ).distinct()
-        qs = base_qs.filter(subject_id__in=assigned)
+    if ctx.role == "STUDENT":
+        qs = base_qs.filter(subject_id__in=ctx.enrolled_subject_ids)
+        if ctx.grade is not None:
+            qs = qs.filter(grade=ctx.grade)
+    elif ctx.role == "TEACHER":
+        qs = base_qs.filter(subject_id__in=ctx.assigned_subject_ids)
     else:
         qs = scope_queryset(user, base_qs)
 
@@ -214,7 +167,7 @@ def courses(request):
         }
         for c in qs
     ]
-    cache.set(cache_key, data, timeout=1800)
+    catalog.set(cache_key, data, timeout=1800)
     return JsonResponse(data, safe=False)
 
 
@@ -329,45 +282,45 @@ def course_lessons(request, course_id):
 
     user = request.user
 
-    raw = list(
-        Lesson.objects
-        .filter(course=course)
-        .order_by("order")
-        .values("id", "title", "order", "video_url", "hls_manifest_url",
-                "pdf_url", "content")
-    )
+    # Lesson metadata is shared by every viewer — served from the catalog tier
+    lessons_key = f"course_lessons:{course.id}"
+    lessons = catalog.get(lessons_key)
+    if lessons is None:
+        lessons = [
+            {
+                "id":          l["id"],
+                "title":       l["title"],
+                "order":       l["order"],
+                "has_video":   bool(l["video_url"] or l["hls_manifest_url"]),
+                "has_pdf":     bool(l["pdf_url"]),
+                "has_content": bool(l["content"]),
+            }
+            for l in Lesson.objects
+            .filter(course=course)
+            .order_by("order")
+            .values("id", "title", "order", "video_url", "hls_manifest_url",
+                    "pdf_url", "content")
+        ]
+        catalog.set(lessons_key, lessons, timeout=1800)
 
-    lesson_ids    = [l["id"] for l in raw]
     completed_ids = set(
         LessonProgress.objects
-        .filter(user=user, lesson_id__in=lesson_ids, completed=True)
+        .filter(user=user, lesson_id__in=[l["id"] for l in lessons], completed=True)
         .values_list("lesson_id", flat=True)
     )
 
     global_rows = [
-        {
-            "id":          l["id"],
-            "title":       l["title"],
-            "order":       l["order"],
-            "type":        "global",
-            "completed":   l["id"] in completed_ids,
-            "has_video":   bool(l["video_url"] or l["hls_manifest_url"]),
-            "has_pdf":     bool(l["pdf_url"]),
-            "has_content": bool(l["content"]),
-        }
-        for l in raw
+        {**l, "type": "global", "completed": l["id"] in completed_ids}
+        for l in lessons
     ]
 
-    section = (
-        _get_student_section(user) if user.role == "STUDENT"
-        else _get_teacher_section(user)
-    )
+    section_id   = request.user_context.primary_section_id
     section_rows = []
-    if section:
+    if section_id:
         for sl in (
             SectionLesson.objects
-            .filter(course=course, section=section)
-            .select_related("created_by")
+            .filter(course=course, section_id=section_id)
+            .select_related("created_by", "section")
             .order_by("order")
         ):
             section_rows.append({
@@ -379,7 +332,7 @@ def course_lessons(request, course_id):
                 "has_video":     bool(sl.video_url or sl.hls_manifest_url),
                 "has_pdf":       bool(sl.pdf_url),
                 "has_content":   bool(sl.content),
-                "section_label": section.name,
+                "section_label": sl.section.name,
                 "created_by":    sl.created_by.username if sl.created_by else None,
             })
 
@@ -474,12 +427,8 @@ def section_lesson_list_create(request, course_id):
     course = get_object_or_404(Course, id=course_id)
 
     if request.method == "GET":
-        user    = request.user
-        section = (
-            _get_student_section(user) if user.role == "STUDENT"
-            else _get_teacher_section(user)
-        )
-        if not section:
+        section_id = request.user_context.primary_section_id
+        if not section_id:
             return JsonResponse([], safe=False)
 
         data = [
@@ -493,7 +442,7 @@ def section_lesson_list_create(request, course_id):
                 "created_by":  sl.created_by.username if sl.created_by else None,
             }
             for sl in SectionLesson.objects
-            .filter(course=course, section=section)
+            .filter(course=course, section_id=section_id)
             .select_related("created_by")
             .order_by("order")
         ]
@@ -787,15 +736,8 @@ def batch_course_progress(request):
     # Cap to avoid abuse
     course_ids = course_ids[:50]
 
-    # Bulk-fetch all requested courses in 1 query (fixes N+1 SENTRY-BRONZE-GARDEN-1E)
-    courses_map = {
-        c.id: c
-        for c in Course.objects.filter(id__in=course_ids).select_related("subject")
-    }
-    accessible_ids = [
-        cid for cid in course_ids
-        if cid in courses_map and has_access_to_course(request.user, courses_map[cid])
-    ]
+    # One query for the courses' subjects; access is decided in memory
+    accessible_ids = filter_accessible(request.user, course_ids)
 
     if not accessible_ids:
         return JsonResponse({}, status=200)
@@ -912,6 +854,12 @@ def course_progress(request, course_id):
 # TEACHER ANALYTICS
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Served through single_flight: fresh for the soft TTL, then served stale
+# while one request recomputes, until the hard TTL
+ANALYTICS_SOFT_TTL = 300
+ANALYTICS_HARD_TTL = 1800
+
+
 @require_roles(["TEACHER", "PRINCIPAL", "ADMIN"])
 @require_http_methods(["GET"])
 def teacher_course_analytics(request):
@@ -923,64 +871,62 @@ def teacher_course_analytics(request):
     PRINCIPAL / OFFICIAL / ADMIN keep institution/district scoping via scope_queryset.
     """
     user = request.user
-    cache_key = f"teacher_course_analytics:{user.id}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return JsonResponse(cached, safe=False)
-
-    if user.role == "TEACHER":
-        subject_ids = (
-            user.teaching_assignments
-            .values_list("subject_id", flat=True)
-            .distinct()
+    subject_ids = request.user_context.assigned_subject_ids
+
+    def build():
+        if user.role == "TEACHER":
+            qs = Course.objects.filter(
+                subject_id__in=subject_ids
+            ).select_related("subject")
+        else:
+            qs = scope_queryset(user, Course.objects.select_related("subject"))
+
+        # Annotate all stats in a single query instead of N per-course COUNTs
+        # (fixes N+1 SENTRY-BRONZE-GARDEN-1G)
+        from django.db.models import Count, Q as _Q
+        qs = qs.annotate(
+            total_lessons=Count(
+                "lessons",
+                filter=_Q(lessons__is_published=True),
+            ),
+            enrolled_students=Count(
+                "lessons__lessonprogress__user",
+                distinct=True,
+            ),
+            completed_students=Count(
+                "lessons__lessonprogress__user",
+                filter=_Q(lessons__lessonprogress__completed=True),
+                distinct=True,
+            ),
+            completed_lessons=Count(
+                "lessons__lessonprogress__lesson",
+                filter=_Q(lessons__lessonprogress__completed=True),
+                distinct=True,
+            ),
         )
-        qs = Course.objects.filter(
-            subject_id__in=subject_ids
-        ).select_related("subject")
-    else:
-        qs = scope_queryset(user, Course.objects.select_related("subject"))
-
-    # Annotate all stats in a single query instead of N per-course COUNTs
-    # (fixes N+1 SENTRY-BRONZE-GARDEN-1G)
-    from django.db.models import Count, Q as _Q
-    qs = qs.annotate(
-        total_lessons=Count(
-            "lessons",
-            filter=_Q(lessons__is_published=True),
-        ),
-        enrolled_students=Count(
-            "lessons__lessonprogress__user",
-            distinct=True,
-        ),
-        completed_students=Count(
-            "lessons__lessonprogress__user",
-            filter=_Q(lessons__lessonprogress__completed=True),
-            distinct=True,
-        ),
-        completed_lessons=Count(
-            "lessons__lessonprogress__lesson",
-            filter=_Q(lessons__lessonprogress__completed=True),
-            distinct=True,
-        ),
-    )
 
-    data = []
-    for course in qs:
-        total = course.total_lessons
-        completed = course.completed_lessons
-        percentage = round(completed / total * 100) if total else 0
-        data.append({
-            "course_id":          course.id,
-            "title":              course.title,
-            "grade":              course.grade,
-            "subject":            course.subject.name,
-            "total_lessons":      total,
-            "completed_lessons":  completed,
-            "percentage":         percentage,
-            "enrolled_students":  course.enrolled_students,
-            "completed_students": course.completed_students,
-        })
-    cache.set(cache_key, data, timeout=300)
+        data = []
+        for course in qs:
+            total = course.total_lessons
+            completed = course.completed_lessons
+            percentage = round(completed / total * 100) if total else 0
+            data.append({
+                "course_id":          course.id,
+                "title":              course.title,
+                "grade":              course.grade,
+                "subject":            course.subject.name,
+                "total_lessons":      total,
+                "completed_lessons":  completed,
+                "percentage":         percentage,
+                "enrolled_students":  course.enrolled_students,
+                "completed_students": course.completed_students,
+            })
+        return data
+
+    data = single_flight.get_or_compute(
+        f"teacher_course_analytics:{user.id}", build,
+        soft_ttl=ANALYTICS_SOFT_TTL, hard_ttl=ANALYTICS_HARD_TTL,
+    )
     return JsonResponse(data, safe=False)
 
 
@@ -1027,64 +973,66 @@ def teacher_lesson_analytics(request):
 @require_http_methods(["GET"])
 def teacher_class_analytics(request):
     user = request.user
-    cache_key = f"teacher_class_analytics:{user.id}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return JsonResponse(cached, safe=False)
 
-    if user.role == "TEACHER":
-        classroom_ids = (
-            user.teaching_assignments
-            .values_list("section__classroom_id", flat=True).distinct()
-        )
-        classrooms = ClassRoom.objects.filter(
-            id__in=classroom_ids
-        ).select_related("institution")
-    else:
-        classrooms = scope_queryset(user, ClassRoom.objects.select_related("institution"))
-
-    data = []
+    def build():
+        if user.role == "TEACHER":
+            classroom_ids = (
+                user.teaching_assignments
+                .values_list("section__classroom_id", flat=True).distinct()
+            )
+            classrooms = ClassRoom.objects.filter(
+                id__in=classroom_ids
+            ).select_related("institution")
+        else:
+            classrooms = scope_queryset(user, ClassRoom.objects.select_related("institution"))
+
+        data = []
     
-    # Try to import StudentRiskScore inside to avoid circular imports just in case
-    try:
-        from apps.analytics.models import StudentRiskScore
-        has_risk_models = True
-    except ImportError:
-        has_risk_models = False
-
-    for c in classrooms:
-        students_qs = User.objects.filter(role="STUDENT", section__classroom=c)
-        total_students = students_qs.count()
-        attempts = AssessmentAttempt.objects.filter(
-            user__section__classroom=c, submitted_at__isnull=False
-        )
-        total_att = attempts.count()
-        pass_att  = attempts.filter(passed=True).count()
-        pass_rate = round(pass_att / total_att * 100) if total_att else 0
+        # Try to import StudentRiskScore inside to avoid circular imports just in case
+        try:
+            from apps.analytics.models import StudentRiskScore
+            has_risk_models = True
+        except ImportError:
+            has_risk_models = False
+
+        for c in classrooms:
+            students_qs = User.objects.filter(role="STUDENT", section__classroom=c)
+            total_students = students_qs.count()
+            attempts = AssessmentAttempt.objects.filter(
+                user__section__classroom=c, submitted_at__isnull=False
+            )
+            total_att = attempts.count()
+            pass_att  = attempts.filter(passed=True).count()
+            pass_rate = round(pass_att / total_att * 100) if total_att else 0
         
-        high_risk_count = 0
-        medium_risk_count = 0
+            high_risk_count = 0
+            medium_risk_count = 0
         
-        if has_risk_models and total_students > 0:
-            student_ids = students_qs.values_list("id", flat=True)
-            risks = StudentRiskScore.objects.filter(user_id__in=student_ids)
-            for r in risks:
-                if r.risk_level == "HIGH":
-                    high_risk_count += 1
-                elif r.risk_level == "MEDIUM":
-                    medium_risk_count += 1
+            if has_risk_models and total_students > 0:
+                student_ids = students_qs.values_list("id", flat=True)
+                risks = StudentRiskScore.objects.filter(user_id__in=student_ids)
+                for r in risks:
+                    if r.risk_level == "HIGH":
+                        high_risk_count += 1
+                    elif r.risk_level == "MEDIUM":
+                        medium_risk_count += 1
             
-        data.append({
-            "class_id":       c.id,
-            "class_name":     c.name,
-            "institution":    c.institution.name if c.institution else None,
-            "total_students": total_students,
-            "total_attempts": total_att,
-            "pass_rate":      pass_rate,
-            "high_risk_count": high_risk_count,
-            "medium_risk_count": medium_risk_count,
-        })
-    cache.set(cache_key, data, timeout=300)
+            data.append({
+                "class_id":       c.id,
+                "class_name":     c.name,
+                "institution":    c.institution.name if c.institution else None,
+                "total_students": total_students,
+                "total_attempts": total_att,
+                "pass_rate":      pass_rate,
+                "high_risk_count": high_risk_count,
+                "medium_risk_count": medium_risk_count,
+            })
+        return data
+
+    data = single_flight.get_or_compute(
+        f"teacher_class_analytics:{user.id}", build,
+        soft_ttl=ANALYTICS_SOFT_TTL, hard_ttl=ANALYTICS_HARD_TTL,
+    )
     return JsonResponse(data, safe=False)
 
 
@@ -1137,54 +1085,54 @@ def teacher_class_students(request, class_id):
 @require_http_methods(["GET"])
 def teacher_assessment_analytics(request):
     user = request.user
-    cache_key = f"teacher_assessment_analytics:{user.id}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return JsonResponse(cached, safe=False)
+    subject_ids = request.user_context.assigned_subject_ids
+
+    def build():
+        if user.role == "TEACHER":
+            assessments = Assessment.objects.filter(
+                course__subject_id__in=subject_ids
+            ).select_related("course__subject")
+        else:
+            course_ids  = list(
+                scope_queryset(user, Course.objects.all()).values_list("id", flat=True)
+            )
+            assessments = Assessment.objects.filter(
+                course_id__in=course_ids
+            ).select_related("course__subject")
+
+        data = []
+        for a in assessments:
+            attempts = AssessmentAttempt.objects.filter(
+                assessment=a, submitted_at__isnull=False
+            )
+            total_att       = attempts.count()
+            pass_count      = attempts.filter(passed=True).count()
+            fail_count      = total_att - pass_count
+            pass_rate       = round(pass_count / total_att * 100) if total_att else 0
+            unique_students = attempts.values("user").distinct().count()
+            avg_score       = round(attempts.aggregate(avg=Avg("score"))["avg"] or 0, 1)
+            data.append({
+                "assessment_id":   a.id,
+                "title":           a.title,
+                "grade":           a.course.grade,
+                "subject":         a.course.subject.name,
+                "course":          a.course.title,
+                "course_id":       a.course_id,
+                "total_marks":     a.total_marks,
+                "pass_marks":      a.pass_marks,
+                "total_attempts":  total_att,
+                "unique_students": unique_students,
+                "pass_count":      pass_count,
+                "fail_count":      fail_count,
+                "pass_rate":       pass_rate,
+                "average_score":   avg_score,
+            })
+        return data
 
-    if user.role == "TEACHER":
-        subject_ids = (
-            user.teaching_assignments.values_list("subject_id", flat=True).distinct()
-        )
-        assessments = Assessment.objects.filter(
-            course__subject_id__in=subject_ids
-        ).select_related("course__subject")
-    else:
-        course_ids  = list(
-            scope_queryset(user, Course.objects.all()).values_list("id", flat=True)
-        )
-        assessments = Assessment.objects.filter(
-            course_id__in=course_ids
-        ).select_related("course__subject")
-
-    data = []
-    for a in assessments:
-        attempts = AssessmentAttempt.objects.filter(
-            assessment=a, submitted_at__isnull=False
-        )
-        total_att       = attempts.count()
-        pass_count      = attempts.filter(passed=True).count()
-        fail_count      = total_att - pass_count
-        pass_rate       = round(pass_count / total_att * 100) if total_att else 0
-        unique_students = attempts.values("user").distinct().count()
-        avg_score       = round(attempts.aggregate(avg=Avg("score"))["avg"] or 0, 1)
-        data.append({
-            "assessment_id":   a.id,
-            "title":           a.title,
-            "grade":           a.course.grade,
-            "subject":         a.course.subject.name,
-            "course":          a.course.title,
-            "course_id":       a.course_id,
-            "total_marks":     a.total_marks,
-            "pass_marks":      a.pass_marks,
-            "total_attempts":  total_att,
-            "unique_students": unique_students,
-            "pass_count":      pass_count,
-            "fail_count":      fail_count,
-            "pass_rate":       pass_rate,
-            "average_score":   avg_score,
-        })
-    cache.set(cache_key, data, timeout=300)
+    data = single_flight.get_or_compute(
+        f"teacher_assessment_analytics:{user.id}", build,
+        soft_ttl=ANALYTICS_SOFT_TTL, hard_ttl=ANALYTICS_HARD_TTL,
+    )
     return JsonResponse(data, safe=False)
 
 
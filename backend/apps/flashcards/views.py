@@ -230,12 +230,12 @@ def study_list(request):
         ).select_related("subject", "created_by")
     else:
         # Student: decks for their section's subjects
-        section = getattr(user, "section", None)
-        if not section:
+        section_id = request.user_context.section_id
+        if not section_id:
             return JsonResponse([], safe=False)
 
         subject_ids = TeachingAssignment.objects.filter(
-            section=section
+            section_id=section_id
         ).values_list("subject_id", flat=True).distinct()
 
         qs = FlashcardDeck.objects.filter(
@@ -243,7 +243,7 @@ def study_list(request):
             subject_id__in=subject_ids,
         ).filter(
             # section-scoped OR global (section=None means visible to all)
-            models.Q(section=section) | models.Q(section__isnull=True)
+            models.Q(section_id=section_id) | models.Q(section__isnull=True)
         ).select_related("subject", "created_by")
 
     # Annotate with student's due count — single batch query across all decks
@@ -625,18 +625,13 @@ def ai_publish_flashcard_deck(request, deck_id):
                 .values_list("id", flat=True)
             )
 
-        notifs = [
-            Notification(
-                user_id=uid,
-                subject=f"\U0001f4da New Flashcard Deck: {deck.title}",
-                message=f"A new flashcard deck '{deck.title}' is ready for you to study.",
-                notification_type=NotificationType.INFO,
-                link=f"/flashcards",
-            )
-            for uid in student_ids
-        ]
-        if notifs:
-            Notification.objects.bulk_create(notifs)
+        Notification.bulk_send(
+            student_ids,
+            f"\U0001f4da New Flashcard Deck: {deck.title}",
+            message=f"A new flashcard deck '{deck.title}' is ready for you to study.",
+            notification_type=NotificationType.INFO,
+            link="/flashcards",
+        )
 
         logger.info(
             "Flashcard deck published: id=%s notified=%d students",
@@ -6,4 +6,5 @@ urlpatterns = [
     path("me/",                   views.my_summary),
     path("leaderboard/class/",    views.leaderboard_class),
     path("leaderboard/school/",   views.leaderboard_school),
+    path("leaderboard/district/", views.leaderboard_district),
 ]
\ No newline at end of file
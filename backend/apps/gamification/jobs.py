@@ -0,0 +1,16 @@
+# apps.gamification.jobs
+"""
+Background job handlers for gamification.
+
+rebuild_leaderboards reseeds the Redis leaderboards once a day, picking up
+students who changed section / institution or stopped being students since
+their last points award.
+"""
+from apps.jobs.queue import periodic
+
+from .leaderboards import rebuild
+
+
+@periodic(every=24 * 60 * 60)
+def rebuild_leaderboards():
+    rebuild()
@@ -0,0 +1,188 @@
+# apps.gamification.leaderboards
+"""
+Redis sorted-set leaderboards.
+
+One ZSET per scope, member = user_id, score = StudentPoints.total_points:
+  lb:class:{classroom_id}
+  lb:school:{institution_id}
+  lb:district:{district_id}
+
+_award_points() writes the new total to all three after COMMIT (ZADD GT, so
+a late-arriving older total never overwrites a newer one). Reads are
+O(log n): ZREVRANGE for the top N, ZCOUNT (score, +inf) for rank-of-me —
+the same "1 + number of students with more points" rank the SQL version
+computes.
+
+A scope key that does not exist yet is seeded from StudentPoints on first
+read. Role / section / institution changes are reconciled by
+`manage.py rebuild_leaderboards` (also run daily by run_workers).
+
+Every function returns None when Redis is unavailable; callers then fall
+back to the StudentPoints queries.
+"""
+import logging
+
+from django.contrib.auth import get_user_model
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("class", "school", "district")
+
+# StudentPoints lookup path → scope
+_SCOPE_FIELDS = {
+    "class":    "user__section__classroom_id",
+    "school":   "user__institution_id",
+    "district": "user__institution__district_id",
+}
+
+
+def _key(scope: str, scope_id) -> str:
+    return f"lb:{scope}:{scope_id}"
+
+
+def _redis():
+    from gyangrit.redis_client import get_redis
+    return get_redis()
+
+
+def _scope_ids(user_id: int) -> dict[str, int | None]:
+    User = get_user_model()
+    row = (
+        User.objects.filter(id=user_id, role="STUDENT")
+        .values("section__classroom_id", "institution_id", "institution__district_id")
+        .first()
+    )
+    if row is None:
+        return {}
+    return {
+        "class":    row["section__classroom_id"],
+        "school":   row["institution_id"],
+        "district": row["institution__district_id"],
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Writes
+# ─────────────────────────────────────────────────────────────────────────────
+
+def record_points(user_id: int, total_points: int) -> None:
+    """Publish a student's new running total to every scope they belong to."""
+    r = _redis()
+    if r is None:
+        return
+    try:
+        scopes = {s: sid for s, sid in _scope_ids(user_id).items() if sid}
+        if not scopes:
+            return
+        pipe = r.pipeline(transaction=False)
+        for scope, scope_id in scopes.items():
+            pipe.zadd(_key(scope, scope_id), {str(user_id): total_points}, gt=True)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("Leaderboard update failed for user %s: %s", user_id, exc)
+
+
+def _seed(r, scope: str, scope_id) -> None:
+    """Load one scope from StudentPoints (first read after deploy / eviction)."""
+    from apps.gamification.models import StudentPoints
+
+    rows = (
+        StudentPoints.objects
+        .filter(user__role="STUDENT", **{_SCOPE_FIELDS[scope]: scope_id})
+        .values_list("user_id", "total_points")
+    )
+    mapping = {str(uid): pts for uid, pts in rows}
+    if mapping:
+        r.zadd(_key(scope, scope_id), mapping, gt=True)
+
+
+def rebuild() -> dict[str, int]:
+    """
+    Reseed every leaderboard from StudentPoints. Each set is built under a
+    temporary key and RENAMEd into place, so readers never see it half-built;
+    sets for scopes that no longer have students are deleted.
+    Returns {scope: number_of_sets}, or {} without Redis.
+    """
+    from apps.gamification.models import StudentPoints
+
+    r = _redis()
+    if r is None:
+        return {}
+
+    sets: dict[str, dict[str, int]] = {}
+    rows = (
+        StudentPoints.objects
+        .filter(user__role="STUDENT")
+        .values_list("user_id", "total_points", *_SCOPE_FIELDS.values())
+        .iterator(chunk_size=2000)
+    )
+    for user_id, points, *scope_ids in rows:
+        for scope, scope_id in zip(_SCOPE_FIELDS, scope_ids):
+            if scope_id:
+                sets.setdefault(_key(scope, scope_id), {})[str(user_id)] = points
+
+    for key, mapping in sets.items():
+        tmp = f"{key}:rebuild"
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(tmp)
+        members = list(mapping.items())
+        for i in range(0, len(members), 1000):
+            pipe.zadd(tmp, dict(members[i:i + 1000]))
+        pipe.rename(tmp, key)
+        pipe.execute()
+
+    stale = [
+        key for scope in SCOPES
+        for key in r.scan_iter(match=f"lb:{scope}:*", count=500)
+        if key not in sets and not key.endswith(":rebuild")
+    ]
+    if stale:
+        r.delete(*stale)
+
+    counts = {scope: 0 for scope in SCOPES}
+    for key in sets:
+        counts[key.split(":")[1]] += 1
+    logger.info("Leaderboards rebuilt: %s (%d stale sets removed)", counts, len(stale))
+    return counts
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Reads
+# ─────────────────────────────────────────────────────────────────────────────
+
+def top(scope: str, scope_id, n: int = 20) -> list[tuple[int, int]] | None:
+    """[(user_id, total_points), ...] best first, or None without Redis."""
+    r = _redis()
+    if r is None:
+        return None
+    try:
+        key = _key(scope, scope_id)
+        if not r.exists(key):
+            _seed(r, scope, scope_id)
+        return [(int(uid), int(pts)) for uid, pts in r.zrevrange(key, 0, n - 1, withscores=True)]
+    except Exception as exc:
+        logger.warning("Leaderboard read failed for %s: %s", _key(scope, scope_id), exc)
+        return None
+
+
+def rank_of(scope: str, scope_id, user_id: int) -> tuple[int, int] | None:
+    """
+    (rank, total_points) for a student, rank = 1 + students with more points.
+    A student with no points ranks after everyone on the board.
+    None without Redis.
+    """
+    r = _redis()
+    if r is None:
+        return None
+    try:
+        key = _key(scope, scope_id)
+        pipe = r.pipeline(transaction=False)
+        pipe.zscore(key, str(user_id))
+        pipe.zcard(key)
+        score, size = pipe.execute()
+        if score is None:
+            return size + 1, 0
+        return r.zcount(key, f"({score}", "+inf") + 1, int(score)
+    except Exception as exc:
+        logger.warning("Leaderboard rank failed for %s: %s", _key(scope, scope_id), exc)
+        return None
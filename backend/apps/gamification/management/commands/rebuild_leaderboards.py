@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.gamification.leaderboards import rebuild
+
+
+class Command(BaseCommand):
+    help = "Reseeds the Redis class / school / district leaderboards from StudentPoints."
+
+    def handle(self, *args, **options):
+        counts = rebuild()
+        if not counts:
+            raise CommandError("Redis is not configured (REDIS_URL) — leaderboards are served from the DB.")
+        self.stdout.write(self.style.SUCCESS(
+            "Rebuilt leaderboards: "
+            + ", ".join(f"{n} {scope}" for scope, n in counts.items())
+        ))
@@ -18,6 +18,7 @@ from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from apps.gamification import leaderboards
 from apps.gamification.models import (
     POINT_VALUES,
     BadgeCode,
@@ -38,7 +39,8 @@ logger = logging.getLogger(__name__)
 def _award_points(user, reason: str, **kwargs) -> int:
     """
     Award points for a reason. Creates a PointEvent and updates
-    StudentPoints atomically using select_for_update.
+    StudentPoints atomically using select_for_update, then publishes the
+    new total to the Redis leaderboards once the transaction commits.
     Returns the points awarded.
     """
     points = POINT_VALUES.get(reason, 0)
@@ -56,6 +58,10 @@ def _award_points(user, reason: str, **kwargs) -> int:
         summary.total_points += points
         summary.save(update_fields=["total_points", "updated_at"])
 
+        # Leaderboard sorted sets only see committed totals
+        total = summary.total_points
+        transaction.on_commit(lambda: leaderboards.record_points(user.id, total))
+
     logger.info(
         "Gamification: user=%s +%d pts reason=%s total=%d",
         user.id, points, reason, summary.total_points,
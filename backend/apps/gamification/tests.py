@@ -23,3 +23,19 @@ class TestLeaderboard:
     def test_school_leaderboard(self, student_client):
         resp = student_client.get("/api/v1/gamification/leaderboard/school/")
         assert resp.status_code in (200, 400)
+
+    def test_district_leaderboard(self, student_client, student_user, student_user2, admin_client):
+        from apps.gamification.models import StudentPoints
+        StudentPoints.objects.create(user=student_user, total_points=40)
+        StudentPoints.objects.create(user=student_user2, total_points=90)
+
+        resp = student_client.get("/api/v1/gamification/leaderboard/district/")
+        assert resp.status_code == 200
+        entries = resp.json()["entries"]
+        assert [e["user_id"] for e in entries] == [student_user2.id, student_user.id]
+        assert entries[1]["is_me"] and entries[1]["rank"] == 2
+
+        district_id = student_user.institution.district_id
+        resp = admin_client.get(f"/api/v1/gamification/leaderboard/district/?district_id={district_id}")
+        assert resp.status_code == 200
+        assert admin_client.get("/api/v1/gamification/leaderboard/district/").status_code == 400
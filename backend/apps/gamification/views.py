@@ -1,4 +1,11 @@
 # apps.gamification.views
+"""
+Points, badges, streaks and leaderboards.
+
+Leaderboards are served from Redis sorted sets (apps.gamification.leaderboards)
+— top 20 and rank-of-me are O(log n) reads shared by every viewer. Without
+Redis they fall back to ordering StudentPoints in SQL, cached per viewer.
+"""
 import logging
 
 from django.contrib.auth import get_user_model
@@ -8,6 +15,7 @@ from django.db.models import F
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
+from apps.gamification import leaderboards
 from apps.gamification.models import (
     BadgeCode,
     StudentBadge,
@@ -124,6 +132,45 @@ def _build_leaderboard(queryset, requesting_user) -> list[dict]:
     return entries
 
 
+def _redis_leaderboard(scope: str, scope_id, requesting_user) -> list[dict] | None:
+    """
+    Same entries as _build_leaderboard, read from the scope's sorted set.
+    is_me / the appended own-rank row only apply to students.
+    Returns None when Redis is unavailable.
+    """
+    top = leaderboards.top(scope, scope_id)
+    if top is None:
+        return None
+
+    names = dict(
+        User.objects.filter(id__in=[uid for uid, _ in top]).values_list("id", "username")
+    )
+    is_student = requesting_user.role == "STUDENT"
+    entries = [
+        {
+            "rank":         rank,
+            "user_id":      uid,
+            "display_name": names.get(uid, ""),
+            "total_points": points,
+            "is_me":        is_student and uid == requesting_user.id,
+        }
+        for rank, (uid, points) in enumerate(top, start=1)
+    ]
+
+    if is_student and not any(e["is_me"] for e in entries):
+        mine = leaderboards.rank_of(scope, scope_id, requesting_user.id)
+        if mine is None:
+            return None
+        entries.append({
+            "rank":         mine[0],
+            "user_id":      requesting_user.id,
+            "display_name": requesting_user.username,
+            "total_points": mine[1],
+            "is_me":        True,
+        })
+    return entries
+
+
 @require_auth
 @require_http_methods(["GET"])
 def my_summary(request):
@@ -139,7 +186,12 @@ def my_summary(request):
     data = _get_student_summary(user)
 
     # Inject class rank
+    mine = None
     if user.section and user.section.classroom:
+        mine = leaderboards.rank_of("class", user.section.classroom_id, user.id)
+    if mine is not None and mine[1] > 0:
+        data["class_rank"] = mine[0]
+    elif user.section and user.section.classroom:
         class_student_ids = User.objects.filter(
             role="STUDENT", section__classroom=user.section.classroom
         ).values_list("id", flat=True)
@@ -191,6 +243,14 @@ def leaderboard_class(request):
     else:
         return JsonResponse({"detail": "Forbidden"}, status=403)
 
+    entries = _redis_leaderboard("class", classroom.id, user)
+    if entries is not None:
+        return JsonResponse({
+            "class_id":   classroom.id,
+            "class_name": classroom.name,
+            "entries":    entries,
+        })
+
     student_ids = User.objects.filter(
         role="STUDENT", section__classroom=classroom
     ).values_list("id", flat=True)
@@ -276,6 +336,13 @@ def leaderboard_school(request):
         institution_name = institution.name
         inst_key = str(institution.id)
 
+        entries = _redis_leaderboard("school", institution.id, user)
+        if entries is not None:
+            return JsonResponse({
+                "institution_name": institution_name,
+                "entries":          entries,
+            })
+
     cache_key = f"leaderboard:school:{inst_key}:{user.id}"
     cached = cache.get(cache_key)
     if cached is not None:
@@ -306,4 +373,64 @@ def leaderboard_school(request):
         "entries":          entries,
     }
     cache.set(cache_key, payload, timeout=300)
-    return JsonResponse(payload)
\ No newline at end of file
+    return JsonResponse(payload)
+
+
+@require_auth
+@require_http_methods(["GET"])
+def leaderboard_district(request):
+    """
+    GET /api/v1/gamification/leaderboard/district/
+    Returns top 20 students in the requesting user's district.
+    Students also get their own rank if outside the top 20.
+    OFFICIAL/ADMIN can pass ?district_id= to view any district.
+    """
+    from apps.academics.models import District
+
+    user = request.user
+
+    if user.role in ["STUDENT", "TEACHER", "PRINCIPAL"]:
+        if not user.institution or not user.institution.district_id:
+            return JsonResponse({"detail": "No district assigned"}, status=400)
+        district = user.institution.district
+
+    elif user.role in ["OFFICIAL", "ADMIN"]:
+        district_id = request.GET.get("district_id")
+        if not district_id:
+            return JsonResponse({"detail": "district_id is required"}, status=400)
+        try:
+            district = District.objects.get(id=district_id)
+        except (District.DoesNotExist, ValueError):
+            return JsonResponse({"detail": "District not found"}, status=404)
+
+    else:
+        return JsonResponse({"detail": "Forbidden"}, status=403)
+
+    entries = _redis_leaderboard("district", district.id, user)
+    if entries is None:
+        cache_key = f"leaderboard:district:{district.id}:{user.id}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return JsonResponse(cached)
+
+        qs = StudentPoints.objects.filter(
+            user__role="STUDENT", user__institution__district=district,
+        )
+        if user.role == "STUDENT":
+            entries = _build_leaderboard(qs, user)
+        else:
+            entries = [
+                {
+                    "rank":         i + 1,
+                    "user_id":      sp.user_id,
+                    "display_name": sp.user.username,
+                    "total_points": sp.total_points,
+                    "is_me":        False,
+                }
+                for i, sp in enumerate(qs.select_related("user").order_by("-total_points")[:20])
+            ]
+        payload = {"district_name": district.name, "entries": entries}
+        cache.set(cache_key, payload, timeout=_LEADERBOARD_TTL)
+        return JsonResponse(payload)
+
+    return JsonResponse({"district_name": district.name, "entries": entries})
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gradebook', '0002_rename_gradebook_g_student_8a3c1f_idx_gradebook_g_student_901ddb_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gradeentry',
+            index=models.Index(fields=['student', '-entered_at', '-id'], name='gradebook_g_student_bdc156_idx'),
+        ),
+    ]
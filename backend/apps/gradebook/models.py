@@ -84,6 +84,7 @@ class GradeEntry(models.Model):
         indexes = [
             models.Index(fields=["student", "subject", "term"]),
             models.Index(fields=["entered_by", "-entered_at"]),
+            models.Index(fields=["student", "-entered_at", "-id"]),   # keyset pages
         ]
 
     def __str__(self):
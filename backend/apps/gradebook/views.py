@@ -25,6 +25,7 @@ from django.views.decorators.http import require_http_methods
 
 from apps.accesscontrol.permissions import require_roles
 from apps.academics.models import Subject, ClassRoom
+from gyangrit import pagination
 from .models import GradeEntry, GradeTerm, GradeCategory
 
 User = get_user_model()
@@ -173,9 +174,12 @@ def delete_entry(request, entry_id):
 @require_http_methods(["GET"])
 def student_grades(request, student_id):
     """
-    Returns all grade entries for a student.
+    Returns grade entries for a student, most recently entered first.
     - STUDENT: can only view their own grades.
     - TEACHER / PRINCIPAL / ADMIN: can view any student in their scope.
+
+    Keyset-paginated on (entered_at, id): ?cursor= with the `next` / `prev`
+    from a previous response, ?page_size= (default 100, max 500).
     """
     if not request.user.is_authenticated:
         return JsonResponse({"detail": "Authentication required"}, status=401)
@@ -192,7 +196,7 @@ def student_grades(request, student_id):
 
     qs = GradeEntry.objects.filter(
         student=student
-    ).select_related("subject", "entered_by").order_by("subject__name", "term", "entered_at")
+    ).select_related("subject", "entered_by")
 
     if term:
         qs = qs.filter(term=term)
@@ -201,10 +205,16 @@ def student_grades(request, student_id):
     if category:
         qs = qs.filter(category=category)
 
+    try:
+        page = pagination.paginate_request(qs, request, ("-entered_at", "-id"), default_size=100, max_size=500)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
     return JsonResponse({
         "student_id":   student.id,
         "student":      student.display_name or student.username,
-        "entries":      [_entry_to_dict(e) for e in qs],
+        "entries":      [_entry_to_dict(e) for e in page.items],
+        **page.cursors(),
     })
 
 
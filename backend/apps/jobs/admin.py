@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display  = ("name", "queue", "status", "attempts", "max_attempts", "run_at", "created_at")
+    list_filter   = ("status", "queue")
+    search_fields = ("name", "message_id", "last_error")
+    readonly_fields = ("message_id", "payload", "locked_at", "locked_by", "last_error", "created_at")
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.jobs"
+    verbose_name = "Background Jobs"
+
+    def ready(self):
+        # Import every app's jobs.py so @job handlers are registered in both
+        # the web workers (for .delay()) and `manage.py run_workers`.
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules("jobs")
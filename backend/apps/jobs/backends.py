@@ -0,0 +1,344 @@
+# apps.jobs.backends
+"""
+Queue storage backends. All three expose the same interface used by
+queue.enqueue() and worker.Worker:
+
+  push(message, delay=0)
+  reserve(queues, timeout, worker_id) -> (message, receipt) | None
+  ack(message, receipt)
+  retry(message, receipt, delay, error)
+  fail(message, receipt, error)
+  heartbeat(worker_id)   — worker liveness (Redis only)
+  recover()              — requeue jobs orphaned by dead workers
+  stats() -> dict        — queue depths for logging / health checks
+
+RedisBackend    production. Reliable-queue pattern: RPOPLPUSH into a
+                per-worker processing list, so a job is only removed once
+                its handler finished. Retries wait in a sorted set.
+DatabaseBackend fallback when Redis is absent. Job rows claimed with
+                SELECT ... FOR UPDATE SKIP LOCKED.
+MemoryBackend   in-process, non-durable. Dev only — starts its own worker
+                thread on first push.
+"""
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# A RUNNING job whose worker has not finished it within this window is
+# assumed dead and becomes claimable again (database backend).
+_VISIBILITY_TIMEOUT = 10 * 60
+_WORKER_TTL = 60          # seconds a worker's liveness key survives without a heartbeat
+_DEAD_LETTER_MAX = 1000
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Redis
+# ─────────────────────────────────────────────────────────────────────────────
+
+class RedisBackend:
+    PREFIX = "jobs"
+
+    def __init__(self, client):
+        self.r = client
+
+    def _ready(self, queue):
+        return f"{self.PREFIX}:queue:{queue}"
+
+    def _delayed(self, queue):
+        return f"{self.PREFIX}:delayed:{queue}"
+
+    def _processing(self, worker_id):
+        return f"{self.PREFIX}:processing:{worker_id}"
+
+    def _alive(self, worker_id):
+        return f"{self.PREFIX}:worker:{worker_id}"
+
+    @property
+    def _workers(self):
+        return f"{self.PREFIX}:workers"
+
+    @property
+    def _dead(self):
+        return f"{self.PREFIX}:dead"
+
+    def push(self, message, delay=0):
+        raw = json.dumps(message)
+        if delay > 0:
+            self.r.zadd(self._delayed(message["queue"]), {raw: time.time() + delay})
+        else:
+            self.r.lpush(self._ready(message["queue"]), raw)
+
+    def _promote_due(self, queues):
+        now = time.time()
+        for queue in queues:
+            for raw in self.r.zrangebyscore(self._delayed(queue), 0, now, start=0, num=100):
+                # ZREM returns 0 if another worker already promoted this entry
+                if self.r.zrem(self._delayed(queue), raw):
+                    self.r.lpush(self._ready(queue), raw)
+
+    def reserve(self, queues, timeout, worker_id):
+        self._promote_due(queues)
+        processing = self._processing(worker_id)
+        for queue in queues:
+            raw = self.r.rpoplpush(self._ready(queue), processing)
+            if raw:
+                return json.loads(raw), (processing, raw)
+        # Nothing ready — block briefly on the highest-priority queue so
+        # critical jobs (OTP) are picked up the moment they arrive.
+        raw = self.r.brpoplpush(self._ready(queues[0]), processing, timeout=max(1, int(timeout)))
+        if raw:
+            return json.loads(raw), (processing, raw)
+        return None
+
+    def ack(self, message, receipt):
+        processing, raw = receipt
+        self.r.lrem(processing, 1, raw)
+
+    def retry(self, message, receipt, delay, error):
+        processing, raw = receipt
+        pipe = self.r.pipeline()
+        pipe.lrem(processing, 1, raw)
+        pipe.zadd(self._delayed(message["queue"]), {json.dumps(message): time.time() + delay})
+        pipe.execute()
+
+    def fail(self, message, receipt, error):
+        processing, raw = receipt
+        pipe = self.r.pipeline()
+        pipe.lrem(processing, 1, raw)
+        pipe.lpush(self._dead, json.dumps({**message, "error": error, "failed_at": time.time()}))
+        pipe.ltrim(self._dead, 0, _DEAD_LETTER_MAX - 1)
+        pipe.execute()
+
+    def heartbeat(self, worker_id):
+        pipe = self.r.pipeline()
+        pipe.sadd(self._workers, worker_id)
+        pipe.set(self._alive(worker_id), "1", ex=_WORKER_TTL)
+        pipe.execute()
+
+    def recover(self):
+        """Push jobs held by workers that stopped heart-beating back onto their queues."""
+        recovered = 0
+        for worker_id in self.r.smembers(self._workers):
+            if self.r.exists(self._alive(worker_id)):
+                continue
+            processing = self._processing(worker_id)
+            while True:
+                raw = self.r.rpop(processing)
+                if raw is None:
+                    break
+                self.r.lpush(self._ready(json.loads(raw)["queue"]), raw)
+                recovered += 1
+            self.r.srem(self._workers, worker_id)
+        if recovered:
+            logger.warning("Recovered %d jobs from dead workers", recovered)
+        return recovered
+
+    def stats(self):
+        queues = getattr(settings, "JOBS_QUEUES", ["default"])
+        pipe = self.r.pipeline()
+        for queue in queues:
+            pipe.llen(self._ready(queue))
+            pipe.zcard(self._delayed(queue))
+        pipe.llen(self._dead)
+        counts = pipe.execute()
+        data = {}
+        for i, queue in enumerate(queues):
+            data[queue] = {"ready": counts[2 * i], "delayed": counts[2 * i + 1]}
+        data["dead"] = counts[-1]
+        return data
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Database
+# ─────────────────────────────────────────────────────────────────────────────
+
+class DatabaseBackend:
+    poll_interval = 1.0
+
+    def push(self, message, delay=0):
+        from .models import Job
+        Job.objects.create(
+            message_id=message["id"],
+            queue=message["queue"],
+            name=message["name"],
+            payload={"args": message["args"], "kwargs": message["kwargs"]},
+            attempts=message["attempts"],
+            max_attempts=message["max_attempts"],
+            run_at=timezone.now() + timedelta(seconds=delay),
+        )
+
+    def _claim(self, queues, worker_id):
+        from .models import Job, JobStatus
+        now = timezone.now()
+        stale = now - timedelta(seconds=_VISIBILITY_TIMEOUT)
+        with transaction.atomic():
+            for queue in queues:
+                row = (
+                    Job.objects
+                    .select_for_update(skip_locked=True)
+                    .filter(queue=queue)
+                    .filter(
+                        Q(status=JobStatus.PENDING, run_at__lte=now)
+                        | Q(status=JobStatus.RUNNING, locked_at__lt=stale)
+                    )
+                    .order_by("run_at", "id")
+                    .first()
+                )
+                if row is None:
+                    continue
+                row.status = JobStatus.RUNNING
+                row.locked_at = now
+                row.locked_by = worker_id
+                row.save(update_fields=["status", "locked_at", "locked_by"])
+                message = {
+                    "id":           row.message_id,
+                    "name":         row.name,
+                    "queue":        row.queue,
+                    "args":         row.payload.get("args", []),
+                    "kwargs":       row.payload.get("kwargs", {}),
+                    "attempts":     row.attempts,
+                    "max_attempts": row.max_attempts,
+                }
+                return message, row.pk
+        return None
+
+    def reserve(self, queues, timeout, worker_id):
+        deadline = time.monotonic() + timeout
+        while True:
+            claimed = self._claim(queues, worker_id)
+            if claimed is not None:
+                return claimed
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+
+    def ack(self, message, receipt):
+        from .models import Job
+        Job.objects.filter(pk=receipt).delete()
+
+    def retry(self, message, receipt, delay, error):
+        from .models import Job, JobStatus
+        Job.objects.filter(pk=receipt).update(
+            status=JobStatus.PENDING,
+            attempts=message["attempts"],
+            run_at=timezone.now() + timedelta(seconds=delay),
+            locked_at=None,
+            locked_by="",
+            last_error=error[:5000],
+        )
+
+    def fail(self, message, receipt, error):
+        from .models import Job, JobStatus
+        Job.objects.filter(pk=receipt).update(
+            status=JobStatus.FAILED,
+            attempts=message["attempts"],
+            locked_at=None,
+            last_error=error[:5000],
+        )
+
+    def heartbeat(self, worker_id):
+        pass
+
+    def recover(self):
+        # Stale RUNNING rows are reclaimed lazily by _claim()
+        return 0
+
+    def stats(self):
+        from django.db.models import Count
+        from .models import Job
+        data = {}
+        for row in Job.objects.values("queue", "status").annotate(n=Count("id")):
+            data.setdefault(row["queue"], {})[row["status"]] = row["n"]
+        return data
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# In-memory (dev)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class MemoryBackend:
+    """
+    Process-local queue. Jobs are lost if the process exits — use only for
+    `runserver`. A single background Worker is started lazily on first push.
+    """
+
+    def __init__(self, autostart: bool = True):
+        self._ready: dict[str, deque] = {}
+        self._delayed: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._worker_started = not autostart
+
+    def push(self, message, delay=0):
+        with self._cond:
+            if delay > 0:
+                heapq.heappush(self._delayed, (time.time() + delay, next(self._seq), message))
+            else:
+                self._ready.setdefault(message["queue"], deque()).append(message)
+            self._cond.notify()
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        if self._worker_started:
+            return
+        with self._cond:
+            if self._worker_started:
+                return
+            self._worker_started = True
+        from .worker import Worker
+        worker = Worker(self, worker_id="memory")
+        threading.Thread(target=worker.run, name="jobs-memory-worker", daemon=True).start()
+
+    def _promote_due(self):
+        now = time.time()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, message = heapq.heappop(self._delayed)
+            self._ready.setdefault(message["queue"], deque()).append(message)
+
+    def reserve(self, queues, timeout, worker_id):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._promote_due()
+                for queue in queues:
+                    pending = self._ready.get(queue)
+                    if pending:
+                        return pending.popleft(), None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(min(remaining, 0.5))
+
+    def ack(self, message, receipt):
+        pass
+
+    def retry(self, message, receipt, delay, error):
+        self.push(message, delay=delay)
+
+    def fail(self, message, receipt, error):
+        pass
+
+    def heartbeat(self, worker_id):
+        pass
+
+    def recover(self):
+        return 0
+
+    def stats(self):
+        with self._cond:
+            data = {q: {"ready": len(d)} for q, d in self._ready.items()}
+            data["delayed"] = len(self._delayed)
+        return data
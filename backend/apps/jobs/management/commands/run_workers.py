@@ -0,0 +1,68 @@
+"""
+python manage.py run_workers [--concurrency 4] [--queues critical,default] [--burst]
+
+Consumes background jobs (OTP/email delivery, web push, Ably publishes,
+analytics writes) from the configured JOBS_BACKEND. Run it as its own
+systemd service next to gunicorn. SIGTERM stops reserving new jobs and
+waits for in-flight handlers to finish.
+"""
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs.backends import MemoryBackend
+from apps.jobs.queue import get_backend
+from apps.jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Run background job workers (bounded concurrency, with retries)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int,
+            default=getattr(settings, "JOBS_CONCURRENCY", 4),
+            help="Handler threads in this process (default: JOBS_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--queues",
+            default=",".join(getattr(settings, "JOBS_QUEUES", ["default"])),
+            help="Comma-separated queue names, highest priority first.",
+        )
+        parser.add_argument(
+            "--burst", action="store_true",
+            help="Exit once the queues are empty instead of waiting for new jobs.",
+        )
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if isinstance(backend, MemoryBackend):
+            raise CommandError(
+                "JOBS_BACKEND is 'memory' — jobs only exist inside the web process. "
+                "Set JOBS_BACKEND to 'redis' or 'database' to run standalone workers."
+            )
+
+        queues = [q.strip() for q in options["queues"].split(",") if q.strip()]
+        worker = Worker(
+            backend,
+            queues=queues,
+            concurrency=options["concurrency"],
+            burst=options["burst"],
+        )
+
+        def _shutdown(signum, frame):
+            self.stdout.write("Shutting down — waiting for running jobs to finish…")
+            worker.stop()
+
+        signal.signal(signal.SIGTERM, _shutdown)
+        signal.signal(signal.SIGINT, _shutdown)
+
+        self.stdout.write(
+            f"Worker {worker.worker_id}: backend={type(backend).__name__} "
+            f"queues={','.join(queues)} concurrency={worker.concurrency}"
+        )
+        worker.run()
+        self.stdout.write(self.style.SUCCESS(
+            f"Worker stopped. processed={worker.processed} failed={worker.failed}"
+        ))
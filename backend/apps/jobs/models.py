@@ -0,0 +1,42 @@
+# apps.jobs.models
+"""
+Job rows for the database queue backend (JOBS_BACKEND = "database").
+
+Used when Redis is not available. Workers claim rows with
+SELECT ... FOR UPDATE SKIP LOCKED so several `run_workers` processes can
+share the table safely. Successful jobs are deleted; jobs that exhaust
+their retries stay behind as FAILED with the last error for inspection.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class JobStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Running"
+    FAILED  = "failed",  "Failed"
+
+
+class Job(models.Model):
+    message_id   = models.CharField(max_length=32, unique=True)
+    queue        = models.CharField(max_length=50, default="default")
+    name         = models.CharField(max_length=200)
+    # JSON envelope: {"args": [...], "kwargs": {...}}
+    payload      = models.JSONField(default=dict)
+    status       = models.CharField(max_length=10, choices=JobStatus.choices, default=JobStatus.PENDING)
+    attempts     = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_at       = models.DateTimeField(default=timezone.now)
+    locked_at    = models.DateTimeField(null=True, blank=True)
+    locked_by    = models.CharField(max_length=100, blank=True)
+    last_error   = models.TextField(blank=True)
+    created_at   = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [
+            models.Index(fields=["queue", "status", "run_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}] attempt {self.attempts}/{self.max_attempts}"
@@ -0,0 +1,198 @@
+# apps.jobs.queue
+"""
+Durable background jobs — the replacement for fire-and-forget daemon threads.
+
+    from apps.jobs.queue import job
+
+    @job(queue="critical", max_attempts=5)
+    def deliver_otp(username, email, mobile, otp_code):
+        ...
+
+    deliver_otp.delay("ravi", "r@x.in", "", "123456")   # enqueue now
+    deliver_otp.delay_on_commit(...)                     # enqueue after COMMIT
+    enqueue("apps.accounts.jobs.deliver_otp", args=[...], delay=30)
+
+    @periodic(every=5)
+    def flush_heartbeats(): ...                          # enqueued every 5s by run_workers
+
+Handlers live in each app's jobs.py (autodiscovered by JobsConfig.ready()).
+Arguments must be JSON-serialisable — pass primary keys, never model
+instances — and handlers must tolerate being retried.
+
+Settings:
+  JOBS_BACKEND        "redis" | "database" | "memory"
+  JOBS_ALWAYS_EAGER   run handlers inline inside .delay() (tests)
+  JOBS_QUEUES         queue names in priority order
+  JOBS_MAX_ATTEMPTS   default attempts per job (first run + retries)
+  JOBS_RETRY_BACKOFF  base seconds for exponential retry backoff
+  JOBS_CONCURRENCY    handler threads per worker process
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = "default"
+_MAX_RETRY_DELAY = 10 * 60   # never park a retry for more than 10 min
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    name: str
+    func: Callable
+    queue: str
+    max_attempts: int | None
+
+
+_REGISTRY: dict[str, JobSpec] = {}
+_PERIODIC: dict[str, float] = {}
+
+
+def job(name: str | None = None, *, queue: str = DEFAULT_QUEUE, max_attempts: int | None = None):
+    """
+    Register a function as a background job handler.
+
+    Adds .delay(*args, **kwargs) and .delay_on_commit(*args, **kwargs) to the
+    function; calling the function directly still runs it synchronously.
+    """
+    def decorator(func):
+        job_name = name or f"{func.__module__}.{func.__name__}"
+        _REGISTRY[job_name] = JobSpec(job_name, func, queue, max_attempts)
+
+        def delay(*args, **kwargs):
+            return enqueue(job_name, args=args, kwargs=kwargs)
+
+        def delay_on_commit(*args, **kwargs):
+            transaction.on_commit(lambda: enqueue(job_name, args=args, kwargs=kwargs))
+
+        func.job_name = job_name
+        func.delay = delay
+        func.delay_on_commit = delay_on_commit
+        return func
+
+    return decorator
+
+
+def periodic(every: float, *, name: str | None = None, queue: str = DEFAULT_QUEUE):
+    """
+    Register a no-argument job that run_workers enqueues every `every` seconds.
+    Only one worker process enqueues each tick (cache.add lock), so the
+    handler runs once per interval no matter how many workers are running.
+    """
+    def decorator(func):
+        func = job(name, queue=queue, max_attempts=1)(func)
+        _PERIODIC[func.job_name] = every
+        return func
+
+    return decorator
+
+
+def periodic_jobs() -> dict[str, float]:
+    return dict(_PERIODIC)
+
+
+def get_job(name: str) -> JobSpec:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise LookupError(f"Unknown job: {name}") from None
+
+
+def enqueue(name: str, args=(), kwargs: dict | None = None, *, delay: float = 0,
+            queue: str | None = None) -> str:
+    """
+    Put a job on the queue and return its message id.
+
+    If the backend cannot accept the job (e.g. Redis unreachable) the handler
+    runs inline so the work is delayed rather than lost.
+    """
+    spec = get_job(name)
+    message = {
+        "id":           uuid.uuid4().hex,
+        "name":         name,
+        "queue":        queue or spec.queue,
+        "args":         list(args),
+        "kwargs":       dict(kwargs or {}),
+        "attempts":     0,
+        "max_attempts": spec.max_attempts or getattr(settings, "JOBS_MAX_ATTEMPTS", 3),
+        "enqueued_at":  time.time(),
+    }
+
+    if getattr(settings, "JOBS_ALWAYS_EAGER", False):
+        # Round-trip through JSON so tests catch non-serialisable arguments
+        _run_inline(json.loads(json.dumps(message)))
+        return message["id"]
+
+    try:
+        get_backend().push(message, delay=delay)
+    except Exception:
+        logger.exception("Job enqueue failed for %s — running inline", name)
+        _run_inline(message)
+    return message["id"]
+
+
+def run_message(message: dict) -> None:
+    """Execute one job message. Raises whatever the handler raises."""
+    spec = get_job(message["name"])
+    spec.func(*message.get("args", []), **message.get("kwargs", {}))
+
+
+def _run_inline(message: dict) -> None:
+    try:
+        run_message(message)
+    except Exception:
+        logger.exception("Inline job %s failed", message["name"])
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff: base, 2×base, 4×base … capped at 10 min."""
+    base = getattr(settings, "JOBS_RETRY_BACKOFF", 5)
+    return min(base * (2 ** max(attempts - 1, 0)), _MAX_RETRY_DELAY)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Backend selection
+# ─────────────────────────────────────────────────────────────────────────────
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the process-wide queue backend configured by JOBS_BACKEND."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _build_backend()
+    return _backend
+
+
+def reset_backend() -> None:
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+
+def _build_backend():
+    from . import backends
+
+    kind = getattr(settings, "JOBS_BACKEND", "memory")
+    if kind == "redis":
+        from gyangrit.redis_client import get_redis
+        client = get_redis()
+        if client is not None:
+            return backends.RedisBackend(client)
+        logger.warning("JOBS_BACKEND=redis but Redis is unavailable — using the database queue.")
+        return backends.DatabaseBackend()
+    if kind == "database":
+        return backends.DatabaseBackend()
+    return backends.MemoryBackend()
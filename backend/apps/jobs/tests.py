@@ -0,0 +1,118 @@
+# apps/jobs/tests.py
+"""Background jobs — queue backends, worker retries, eager mode."""
+import json
+
+import pytest
+
+from apps.jobs.backends import DatabaseBackend, MemoryBackend
+from apps.jobs.queue import enqueue, job
+from apps.jobs.worker import Worker
+
+calls = []
+
+
+@job(name="tests.record")
+def _record(value):
+    calls.append(value)
+
+
+@job(name="tests.flaky", max_attempts=3)
+def _flaky(value):
+    calls.append(value)
+    if calls.count(value) < 2:
+        raise RuntimeError("transient")
+
+
+@job(name="tests.broken", max_attempts=2)
+def _broken():
+    calls.append("broken")
+    raise RuntimeError("always fails")
+
+
+def _message(name, *args, max_attempts=3):
+    return {
+        "id": name.replace(".", "") + "1", "name": name, "queue": "default",
+        "args": list(args), "kwargs": {}, "attempts": 0, "max_attempts": max_attempts,
+    }
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    calls.clear()
+
+
+class TestEagerMode:
+    def test_delay_runs_inline(self):
+        _record.delay(7)
+        assert calls == [7]
+
+    def test_unknown_job_rejected(self):
+        with pytest.raises(LookupError):
+            enqueue("tests.does_not_exist")
+
+    @pytest.mark.django_db
+    def test_event_written_through_job(self, student_client, student_user):
+        from apps.analytics.models import EngagementEvent
+        body = json.dumps({"event_type": "ai_chat", "resource_id": 5, "duration_seconds": 40})
+        resp = student_client.post("/api/v1/analytics/event/", data=body,
+                                   content_type="application/json")
+        assert resp.status_code == 202
+        event = EngagementEvent.objects.get(user=student_user, resource_id=5)
+        assert event.duration_seconds == 40
+
+
+class TestWorker:
+    def _run(self, backend, **kwargs):
+        worker = Worker(backend, queues=["default"], burst=True, reserve_timeout=0.2, **kwargs)
+        worker.run()
+        return worker
+
+    def test_processes_queue(self):
+        backend = MemoryBackend(autostart=False)
+        for i in range(5):
+            backend.push(_message("tests.record", i))
+        worker = self._run(backend, concurrency=2)
+        assert sorted(calls) == [0, 1, 2, 3, 4]
+        assert worker.processed == 5
+
+    def test_retries_then_succeeds(self, settings):
+        settings.JOBS_RETRY_BACKOFF = 0
+        backend = MemoryBackend(autostart=False)
+        backend.push(_message("tests.flaky", "x"))
+        worker = self._run(backend, concurrency=1)
+        assert calls == ["x", "x"]
+        assert worker.failed == 1 and worker.processed == 1
+
+    def test_gives_up_after_max_attempts(self, settings):
+        settings.JOBS_RETRY_BACKOFF = 0
+        backend = MemoryBackend(autostart=False)
+        backend.push(_message("tests.broken", max_attempts=2))
+        worker = self._run(backend, concurrency=1)
+        assert calls == ["broken", "broken"]
+        assert worker.processed == 0
+
+
+@pytest.mark.django_db
+class TestDatabaseBackend:
+    def test_claim_ack(self):
+        from apps.jobs.models import Job
+        backend = DatabaseBackend()
+        backend.push(_message("tests.record", 1))
+        message, receipt = backend.reserve(["default"], 0, "w1")
+        assert message["args"] == [1]
+        assert backend.reserve(["default"], 0, "w2") is None   # already claimed
+        backend.ack(message, receipt)
+        assert not Job.objects.exists()
+
+    def test_retry_and_fail(self):
+        from apps.jobs.models import Job, JobStatus
+        backend = DatabaseBackend()
+        backend.push(_message("tests.broken"))
+        message, receipt = backend.reserve(["default"], 0, "w1")
+        message["attempts"] = 1
+        backend.retry(message, receipt, 60, "RuntimeError: boom")
+        row = Job.objects.get()
+        assert row.status == JobStatus.PENDING and row.attempts == 1
+        assert backend.reserve(["default"], 0, "w1") is None   # delayed into the future
+        backend.fail(message, receipt, "RuntimeError: boom")
+        assert Job.objects.get().status == JobStatus.FAILED
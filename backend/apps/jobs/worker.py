@@ -0,0 +1,142 @@
+# apps.jobs.worker
+"""
+Job consumer used by `manage.py run_workers` (and by MemoryBackend in dev).
+
+One reserve loop feeds a fixed-size thread pool. A semaphore caps the
+number of reserved-but-unfinished jobs at `concurrency`, so a worker never
+pulls more work off the queue than it can run — the rest stays in Redis /
+the DB for other workers or survives a restart.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from .queue import enqueue, periodic_jobs, retry_delay, run_message
+
+logger = logging.getLogger(__name__)
+
+_RESERVE_TIMEOUT = 5      # seconds a reserve() call may block
+_HEARTBEAT_EVERY = 15     # seconds between liveness pings (< backends._WORKER_TTL)
+
+
+class Worker:
+    def __init__(self, backend, *, queues=None, concurrency=None, burst=False, worker_id=None,
+                 reserve_timeout=_RESERVE_TIMEOUT):
+        self.backend = backend
+        self.queues = list(queues or getattr(settings, "JOBS_QUEUES", ["default"]))
+        self.concurrency = max(1, concurrency or getattr(settings, "JOBS_CONCURRENCY", 4))
+        self.burst = burst
+        self.reserve_timeout = reserve_timeout
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.processed = 0
+        self.failed = 0
+        self._stop = threading.Event()
+        self._next_periodic: dict[str, float] = {}
+
+    def stop(self) -> None:
+        """Stop reserving new jobs; in-flight jobs are allowed to finish."""
+        self._stop.set()
+
+    def run(self) -> None:
+        slots = threading.BoundedSemaphore(self.concurrency)
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job")
+        last_beat = 0.0
+
+        try:
+            self.backend.heartbeat(self.worker_id)
+            self.backend.recover()
+        except Exception:
+            logger.exception("Job worker %s: startup recovery failed", self.worker_id)
+
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now - last_beat >= _HEARTBEAT_EVERY:
+                    try:
+                        self.backend.heartbeat(self.worker_id)
+                    except Exception:
+                        logger.warning("Job worker %s: heartbeat failed", self.worker_id)
+                    last_beat = now
+
+                if not self.burst:
+                    self._schedule_periodic(now)
+
+                # Wait for a free slot before taking a job off the queue
+                if not slots.acquire(timeout=1):
+                    continue
+                try:
+                    reserved = self.backend.reserve(self.queues, self.reserve_timeout, self.worker_id)
+                except Exception:
+                    slots.release()
+                    logger.exception("Job worker %s: reserve failed", self.worker_id)
+                    self._stop.wait(self.reserve_timeout)
+                    continue
+
+                if reserved is None:
+                    slots.release()
+                    if self.burst:
+                        break
+                    continue
+
+                message, receipt = reserved
+                future = pool.submit(self._process, message, receipt)
+                future.add_done_callback(lambda _f: slots.release())
+        finally:
+            pool.shutdown(wait=True)
+
+    def _schedule_periodic(self, now: float) -> None:
+        for name, every in periodic_jobs().items():
+            if now < self._next_periodic.get(name, 0):
+                continue
+            self._next_periodic[name] = now + every
+            # cache.add is atomic on Redis — first worker to claim the tick enqueues it
+            try:
+                if cache.add(f"jobs:periodic:{name}", 1, timeout=max(1, int(every))):
+                    enqueue(name)
+            except Exception:
+                logger.exception("Job worker %s: scheduling %s failed", self.worker_id, name)
+
+    def _process(self, message: dict, receipt) -> None:
+        close_old_connections()
+        started = time.monotonic()
+        try:
+            run_message(message)
+        except Exception as exc:
+            self.failed += 1
+            self._handle_failure(message, receipt, exc)
+        else:
+            self.processed += 1
+            self._safe(self.backend.ack, message, receipt)
+            logger.debug("Job %s (%s) done in %.0fms",
+                         message["name"], message["id"], (time.monotonic() - started) * 1000)
+        finally:
+            close_old_connections()
+
+    def _handle_failure(self, message: dict, receipt, exc: Exception) -> None:
+        message["attempts"] = message.get("attempts", 0) + 1
+        error = f"{type(exc).__name__}: {exc}"
+        if message["attempts"] >= message.get("max_attempts", 1):
+            logger.error("Job %s (%s) failed permanently after %d attempts: %s",
+                         message["name"], message["id"], message["attempts"], error,
+                         exc_info=exc)
+            self._safe(self.backend.fail, message, receipt, error)
+            return
+
+        delay = retry_delay(message["attempts"])
+        logger.warning("Job %s (%s) failed (attempt %d/%d), retrying in %ss: %s",
+                       message["name"], message["id"], message["attempts"],
+                       message["max_attempts"], delay, error)
+        self._safe(self.backend.retry, message, receipt, delay, error)
+
+    def _safe(self, method, *args) -> None:
+        try:
+            method(*args)
+        except Exception:
+            logger.exception("Job worker %s: %s failed", self.worker_id, method.__name__)
@@ -7,7 +7,7 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_http_methods
 
-from apps.academics.models import StudentSubject
+from apps.accesscontrol.context import for_user, invalidate as invalidate_context
 from apps.content.models import Course
 from apps.content.models import LessonProgress
 from .models import Enrollment, LearningPath, LearningPathCourse
@@ -32,19 +32,16 @@ def can_access_course(user, course):
     if not user.is_authenticated:
         return False
 
-    if user.is_superuser or user.role == "ADMIN":
+    ctx = for_user(user)
+
+    if ctx.is_admin:
         return True
 
-    if user.role == "STUDENT":
-        return StudentSubject.objects.filter(
-            student=user,
-            subject=course.subject,
-        ).exists()
+    if ctx.role == "STUDENT":
+        return course.subject_id in ctx.enrolled_subject_ids
 
-    if user.role == "TEACHER":
-        return user.teaching_assignments.filter(
-            subject=course.subject,
-        ).exists()
+    if ctx.role == "TEACHER":
+        return course.subject_id in ctx.assigned_subject_ids
 
     # PRINCIPAL and OFFICIAL do not self-enroll
     return False
@@ -246,20 +243,13 @@ def enroll_learning_path(request, path_id):
     course_list = [item.course for item in path_courses]
 
     # Determine accessible courses in 1 query per role instead of 1 per course
-    if user.is_superuser or user.role == "ADMIN":
+    ctx = request.user_context
+    if ctx.is_admin:
         accessible_ids = {c.id for c in course_list}
-    elif user.role == "STUDENT":
-        enrolled_subject_ids = set(
-            StudentSubject.objects
-            .filter(student=user)
-            .values_list("subject_id", flat=True)
-        )
-        accessible_ids = {c.id for c in course_list if c.subject_id in enrolled_subject_ids}
-    elif user.role == "TEACHER":
-        teaching_subject_ids = set(
-            user.teaching_assignments.values_list("subject_id", flat=True)
-        )
-        accessible_ids = {c.id for c in course_list if c.subject_id in teaching_subject_ids}
+    elif ctx.role == "STUDENT":
+        accessible_ids = {c.id for c in course_list if c.subject_id in ctx.enrolled_subject_ids}
+    elif ctx.role == "TEACHER":
+        accessible_ids = {c.id for c in course_list if c.subject_id in ctx.assigned_subject_ids}
     else:
         accessible_ids = set()  # PRINCIPAL / OFFICIAL cannot self-enroll
 
@@ -277,6 +267,7 @@ def enroll_learning_path(request, path_id):
     ]
     if new_enrollments:
         Enrollment.objects.bulk_create(new_enrollments, ignore_conflicts=True)
+        invalidate_context(user.id)  # bulk_create skips post_save
     enrolled_count = len(new_enrollments)
 
     return JsonResponse({
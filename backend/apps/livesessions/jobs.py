@@ -0,0 +1,58 @@
+# apps.livesessions.jobs
+"""
+Background job handlers for live sessions: LiveKit Egress start/stop,
+LiveKit room teardown and Ably bell-panel events.
+"""
+import logging
+
+from apps.jobs.queue import enqueue, job
+
+from .models import LiveSession
+
+logger = logging.getLogger(__name__)
+
+# Seconds between stopping the Egress and deleting the room — gives the
+# compositor time to flush/finalize the MP4 before participants are kicked.
+_EGRESS_FLUSH_SECONDS = 3
+
+
+@job()
+def start_session_recording(session_id):
+    from .recording import start_recording
+    session = LiveSession.objects.filter(id=session_id).first()
+    if session is not None:
+        start_recording(session)
+
+
+@job()
+def stop_session_recording(session_id):
+    """
+    RECORDING FIX: stop the Egress BEFORE deleting the LiveKit room.
+    If the room is deleted first, the in-progress Egress is killed mid-stream
+    and the MP4 never gets finalised/uploaded to R2 — stays PROCESSING forever.
+    The room delete is enqueued with a delay instead of sleeping in the worker.
+    """
+    from .recording import stop_recording
+    session = LiveSession.objects.filter(id=session_id).first()
+    if session is None:
+        return
+    try:
+        stop_recording(session)
+    except Exception as exc:
+        logger.warning("Egress stop failed for session %s: %s", session.public_id, exc)
+    enqueue(delete_session_room.job_name, args=[session.livekit_room_name],
+            delay=_EGRESS_FLUSH_SECONDS)
+
+
+@job()
+def delete_session_room(room_name):
+    from .views import _delete_livekit_room
+    _delete_livekit_room(room_name)
+
+
+@job()
+def notify_session_event(session_id, event):
+    from .views import _notify_session_event
+    session = LiveSession.objects.select_related("teacher").filter(id=session_id).first()
+    if session is not None:
+        _notify_session_event(session, event)
@@ -39,6 +39,7 @@ from datetime import timezone as dt_tz
 
 import requests
 from django.conf import settings
+from gyangrit import http_client
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -194,7 +195,7 @@ def start_recording(session) -> str | None:
     }
 
     try:
-        resp = requests.post(
+        resp = http_client.post(
             f"{_livekit_http_url()}/twirp/livekit.Egress/StartRoomCompositeEgress",
             json=payload,
             headers={
@@ -255,7 +256,7 @@ def stop_recording(session) -> bool:
         return False
 
     try:
-        resp = requests.post(
+        resp = http_client.post(
             f"{_livekit_http_url()}/twirp/livekit.Egress/StopEgress",
             json={"egress_id": egress_id},
             headers={
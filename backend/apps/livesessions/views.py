@@ -39,6 +39,7 @@ import jwt as pyjwt  # PyJWT — used by _make_livekit_token and _delete_livekit
 
 import requests as http_requests
 from django.conf import settings
+from gyangrit import http_client
 from apps.accesscontrol.permissions import require_auth  # returns 401 JSON, not 302
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
@@ -137,7 +138,7 @@ def _notify_students_inapp(session: LiveSession, sender, subject_line: str,
     """
     from apps.accounts.models import User
     from apps.notifications.models import Broadcast, Notification, AudienceType, NotificationType
-    from apps.notifications.push import send_push_to_users
+    from apps.notifications.jobs import send_push
 
     student_ids = list(
         User.objects.filter(role="STUDENT", section_id=session.section_id)
@@ -161,17 +162,14 @@ def _notify_students_inapp(session: LiveSession, sender, subject_line: str,
         link=link,
     )
 
-    Notification.objects.bulk_create([
-        Notification(
-            user_id=uid,
-            broadcast=broadcast,
-            subject=subject_line,
-            message=message,
-            notification_type=NotificationType.INFO,
-            link=link,
-        )
-        for uid in student_ids
-    ])
+    Notification.bulk_send(
+        student_ids,
+        subject_line,
+        message=message,
+        notification_type=NotificationType.INFO,
+        link=link,
+        broadcast=broadcast,
+    )
 
     broadcast.recipient_count = len(student_ids)
     broadcast.save(update_fields=["recipient_count"])
@@ -180,15 +178,15 @@ def _notify_students_inapp(session: LiveSession, sender, subject_line: str,
                 session.public_id, len(student_ids))
 
     try:
-        send_push_to_users(
-            user_ids=student_ids,
-            title=subject_line,
-            body=message,
-            url=link,
-            tag=f"live-session-{session.public_id}",
+        send_push.delay(
+            student_ids,
+            subject_line,
+            message,
+            link,
+            f"live-session-{session.public_id}",
         )
     except Exception as exc:
-        logger.warning("Push delivery failed for session %s: %s", session.public_id, exc)
+        logger.warning("Push enqueue failed for session %s: %s", session.public_id, exc)
 
 
 # ── LiveKit room admin helper ─────────────────────────────────────────────────
@@ -217,7 +215,7 @@ def _delete_livekit_room(room_name: str) -> None:
 
     http_url = livekit_url.replace("wss://", "https://").replace("ws://", "http://").rstrip("/")
     try:
-        resp = http_requests.post(
+        resp = http_client.post(
             f"{http_url}/twirp/livekit.RoomService/DeleteRoom",
             json={"room": room_name},
             headers={
@@ -333,14 +331,13 @@ def session_start(request, session_id):
     session.started_at = timezone.now()
     session.save(update_fields=["status", "started_at"])
 
-    import threading
-    from .recording import start_recording
-    threading.Thread(target=start_recording, args=(session,), daemon=True).start()
+    from .jobs import notify_session_event, start_session_recording
+    start_session_recording.delay(session.id)
 
     try:
-        _notify_session_event(session, "session:started")
+        notify_session_event.delay_on_commit(session.id, "session:started")
     except Exception as exc:
-        logger.warning("Ably notify failed: %s", exc)
+        logger.warning("Ably notify enqueue failed: %s", exc)
 
     try:
         teacher_name = session.teacher.get_full_name() or session.teacher.username
@@ -371,32 +368,17 @@ def session_end(request, session_id):
     session.ended_at = timezone.now()
     session.save(update_fields=["status", "ended_at"])
 
+    from .jobs import notify_session_event, stop_session_recording
+
     # Notify via Ably (bell panel update)
     try:
-        _notify_session_event(session, "session:ended")
+        notify_session_event.delay_on_commit(session.id, "session:ended")
     except Exception as exc:
-        logger.warning("Ably notify failed: %s", exc)
-
-    # RECORDING FIX: Stop the Egress BEFORE deleting the LiveKit room.
-    # If the room is deleted first, the in-progress Egress is killed mid-stream
-    # and the MP4 never gets finalised/uploaded to R2 — stays PROCESSING forever.
-    # We stop Egress first, wait 3 s for it to flush, then delete the room.
-    def _stop_then_delete(sess):
-        import time as _t
-        try:
-            from .recording import stop_recording
-            stop_recording(sess)
-        except Exception as exc:
-            logger.warning("Egress stop failed for session %s: %s", sess.public_id, exc)
-        _t.sleep(3)  # give Egress time to flush/finalize the MP4
-        try:
-            _delete_livekit_room(sess.livekit_room_name)
-        except Exception as exc:
-            logger.warning("LiveKit room delete failed for session %s: %s",
-                           sess.public_id, exc)
+        logger.warning("Ably notify enqueue failed: %s", exc)
 
-    import threading
-    threading.Thread(target=_stop_then_delete, args=[session], daemon=True).start()
+    # Stops the Egress first, then deletes the LiveKit room a few seconds
+    # later so the MP4 is finalised (see jobs.stop_session_recording).
+    stop_session_recording.delay(session.id)
 
     return JsonResponse(_session_to_dict(session))
 
@@ -518,37 +500,23 @@ def session_token(request, session_id):
 # ── Ably notification helper ──────────────────────────────────────────────────
 
 def _notify_session_event(session: LiveSession, event: str) -> None:
-    import base64
-    from urllib.parse import quote
+    """Batch-publish a session event to every section student's notifications channel."""
     from apps.accounts.models import User
+    from apps.notifications import realtime
 
-    api_key = getattr(settings, "ABLY_API_KEY", "").strip()
-    if not api_key:
-        return
-
-    credentials = base64.b64encode(api_key.encode()).decode()
     students = User.objects.filter(
         role="STUDENT", section_id=session.section_id
     ).values_list("id", flat=True)
-
-    for uid in students:
-        channel = quote(f"notifications:{uid}", safe="")
-        try:
-            http_requests.post(
-                f"https://rest.ably.io/channels/{channel}/messages",
-                json={"name": event, "data": {
-                    "session_id":    session.public_id,
-                    "session_title": session.title,
-                    "teacher_name":  session.teacher.get_full_name() or session.teacher.username,
-                }},
-                headers={
-                    "Authorization": f"Basic {credentials}",
-                    "Content-Type":  "application/json",
-                },
-                timeout=3,
-            )
-        except Exception as exc:
-            logger.warning("Ably notify session user %s: %s", uid, exc)
+    realtime.send(
+        [f"notifications:{uid}" for uid in students],
+        event,
+        {
+            "session_id":    session.public_id,
+            "session_title": session.title,
+            "teacher_name":  session.teacher.get_full_name() or session.teacher.username,
+        },
+        raise_errors=True,
+    )
 
 
 # ── QStash scheduled reminders ────────────────────────────────────────────────
@@ -582,7 +550,7 @@ def _schedule_session_reminders(session: LiveSession) -> None:
             continue
 
         try:
-            resp = http_requests.post(
+            resp = http_client.post(
                 "https://qstash.upstash.io/v2/publish/" + remind_url,
                 json={"session_id": session.id, "minutes_before": label},
                 headers={
@@ -1,13 +1,13 @@
 # apps.notifications.admin
 from django.contrib import admin
 from unfold.admin import ModelAdmin as UnfoldModelAdmin
-from apps.notifications.models import Broadcast, Notification
+from apps.notifications.models import Broadcast, BroadcastReceipt, Notification, UnreadCounter
 
 
 @admin.register(Broadcast)
 class BroadcastAdmin(UnfoldModelAdmin):
-    list_display  = ("id", "sender", "subject", "notification_type", "audience_type", "audience_label", "recipient_count", "sent_at")
-    list_filter   = ("notification_type", "audience_type", "sent_at")
+    list_display  = ("id", "sender", "subject", "notification_type", "audience_type", "audience_label", "recipient_count", "fan_out_on_read", "sent_at")
+    list_filter   = ("notification_type", "audience_type", "fan_out_on_read", "sent_at")
     search_fields = ("sender__username", "subject", "message", "audience_label")
     ordering      = ("-sent_at",)
     readonly_fields = ("sent_at", "recipient_count")
@@ -20,4 +20,17 @@ class NotificationAdmin(UnfoldModelAdmin):
     search_fields = ("user__username", "subject", "message")
     ordering      = ("-created_at",)
     readonly_fields = ("created_at",)
-    raw_id_fields = ("broadcast",)
\ No newline at end of file
+    raw_id_fields = ("broadcast",)
+
+@admin.register(BroadcastReceipt)
+class BroadcastReceiptAdmin(UnfoldModelAdmin):
+    list_display  = ("id", "broadcast", "user", "read_at", "dismissed_at")
+    search_fields = ("user__username", "broadcast__subject")
+    raw_id_fields = ("broadcast", "user")
+
+
+@admin.register(UnreadCounter)
+class UnreadCounterAdmin(UnfoldModelAdmin):
+    list_display  = ("user", "unread", "updated_at")
+    search_fields = ("user__username",)
+    raw_id_fields = ("user",)
@@ -8,6 +8,8 @@ urlpatterns = [
     path("history/",                  views.notification_history),  # full searchable archive
     path("<int:notification_id>/read/", views.mark_read),
     path("read-all/",                 views.mark_all_read),
+    path("broadcasts/<int:broadcast_id>/read/",    views.mark_broadcast_read),
+    path("broadcasts/<int:broadcast_id>/dismiss/", views.dismiss_broadcast),
 
     # ── Send + history — staff roles only ────────────────────────────────────
     path("send/",                     views.send_notification),
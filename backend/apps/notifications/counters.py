@@ -0,0 +1,106 @@
+# apps.notifications.counters
+"""
+Denormalized per-user unread counter behind the bell badge.
+
+UnreadCounter.unread = unread direct Notification rows + unread, undismissed
+fan-out broadcasts (apps.notifications.inbox). Reading the badge is one
+primary-key lookup — no COUNT over Notification.
+
+Writers keep it current with single UPDATE statements:
+  incr(user_ids)    Notification.send / bulk_send
+  incr_audience(qs) a fan-out broadcast, in the transaction that saves it
+  decr(user_id)     a notification or broadcast goes from unread to read
+  reset(user_id)    mark-all-read
+
+A user without a row (new account, or rows predating the counter) is
+counted once on first read and stored — see get(). Drift from paths that
+bypass these helpers (admin deletes, raw bulk_create) is corrected by:
+
+    python manage.py reconcile_unread_counters
+"""
+from collections import Counter, defaultdict
+
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import UnreadCounter
+
+
+def get(user) -> int:
+    """Current unread count for the bell badge."""
+    unread = UnreadCounter.objects.filter(user_id=user.id).values_list("unread", flat=True).first()
+    if unread is None:
+        unread = reconcile(user)
+    return unread
+
+
+def incr(user_ids) -> None:
+    """
+    +1 per occurrence of each user ID (one UPDATE per distinct multiplicity,
+    normally just one). Users without a row are counted on first read.
+    """
+    by_amount = defaultdict(list)
+    for user_id, n in Counter(user_ids).items():
+        by_amount[n].append(user_id)
+    for n, ids in by_amount.items():
+        UnreadCounter.objects.filter(user_id__in=ids).update(unread=F("unread") + n)
+
+
+def incr_audience(users) -> None:
+    """
+    +1 for every user in a User queryset, as one UPDATE … WHERE user_id IN
+    (subquery). Call it in the transaction that saves a fan-out broadcast,
+    so the badge and inbox.broadcasts_for() become visible together.
+    """
+    UnreadCounter.objects.filter(user_id__in=users.values("id")).update(unread=F("unread") + 1)
+
+
+def decr(user_id: int, by: int = 1) -> None:
+    UnreadCounter.objects.filter(user_id=user_id).update(unread=Greatest(F("unread") - by, 0))
+
+
+def reset(user_id: int) -> None:
+    UnreadCounter.objects.update_or_create(user_id=user_id, defaults={"unread": 0})
+
+
+def reconcile(user) -> int:
+    """Recount one user from the source tables and store it. Returns the count."""
+    from .inbox import unread_count
+
+    unread = unread_count(user)
+    UnreadCounter.objects.update_or_create(user_id=user.id, defaults={"unread": unread})
+    return unread
+
+
+def reconcile_all(chunk_size: int = 500) -> tuple[int, int]:
+    """Recount every user. Returns (users checked, counters corrected)."""
+    from django.contrib.auth import get_user_model
+
+    from .inbox import unread_count
+
+    checked = corrected = 0
+    users = get_user_model().objects.order_by("id").only("id", "role", "district", "date_joined")
+    batch = []
+    for user in users.iterator(chunk_size=chunk_size):
+        batch.append(user)
+        if len(batch) >= chunk_size:
+            corrected += _reconcile_batch(batch, unread_count)
+            checked += len(batch)
+            batch = []
+    if batch:
+        corrected += _reconcile_batch(batch, unread_count)
+        checked += len(batch)
+    return checked, corrected
+
+
+def _reconcile_batch(users, unread_count) -> int:
+    stored = dict(
+        UnreadCounter.objects.filter(user_id__in=[u.id for u in users]).values_list("user_id", "unread")
+    )
+    corrected = 0
+    for user in users:
+        actual = unread_count(user)
+        if stored.get(user.id) != actual:
+            UnreadCounter.objects.update_or_create(user_id=user.id, defaults={"unread": actual})
+            corrected += 1
+    return corrected
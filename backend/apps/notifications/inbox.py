@@ -0,0 +1,210 @@
+# apps.notifications.inbox
+"""
+Per-user inbox = direct Notification rows + fan-out-on-read Broadcasts.
+
+System-wide and district-wide broadcasts (FAN_OUT_ON_READ) are written once
+and never copied into Notification. A user's inbox joins them in at read
+time:
+
+  broadcasts_for(user)  visible broadcasts, annotated with is_read and
+                        created_at (= sent_at) so they filter and sort like
+                        Notification rows
+  page(...)             one keyset page of the two sources, newest first
+  unread_count(user)    direct unread + broadcast unread
+  id_chunks(ids, n)     stream a recipient ID queryset in lists of n
+
+Per-user state lives in BroadcastReceipt, written only when the user reads
+or dismisses a broadcast — an untouched broadcast costs nothing per user.
+
+Visibility mirrors who would have received a Notification row at send
+time — the rule is spelled out on recipients_of().
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from gyangrit import pagination
+from gyangrit.pagination import CursorPage
+
+from .models import AudienceType, Broadcast, BroadcastReceipt, Notification
+
+DISTRICT_ROLES = ("STUDENT", "TEACHER", "PRINCIPAL")
+
+DIRECT    = "direct"
+BROADCAST = "broadcast"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Audience
+# ─────────────────────────────────────────────────────────────────────────────
+
+def broadcasts_for(user):
+    """Fan-out broadcasts visible to `user`, not dismissed, newest first."""
+    audience = Q(audience_type=AudienceType.SYSTEM)
+    if user.role in DISTRICT_ROLES:
+        audience |= (
+            Q(audience_type=AudienceType.DISTRICT_ALL)
+            & (Q(audience_district="") | Q(audience_district=user.district or ""))
+            & ~Q(sender=user)
+        )
+
+    receipts = BroadcastReceipt.objects.filter(broadcast=OuterRef("pk"), user=user)
+    return (
+        Broadcast.objects
+        .filter(audience, fan_out_on_read=True, sent_at__gte=user.date_joined)
+        .exclude(Exists(receipts.filter(dismissed_at__isnull=False)))
+        .annotate(
+            is_read=Exists(receipts.filter(read_at__isnull=False)),
+            created_at=F("sent_at"),
+        )
+        .order_by("-sent_at", "-id")
+    )
+
+
+def recipients_of(broadcast):
+    """
+    User queryset a fan-out broadcast is visible to (send, push, counters):
+    SYSTEM is every user who existed when it was sent, sender included;
+    DISTRICT_ALL is the students, teachers and principals of
+    audience_district ("" = every district), sender excluded. broadcasts_for() is the same rule seen from one user.
+    """
+    User = get_user_model()
+    qs = User.objects.filter(date_joined__lte=broadcast.sent_at)
+    if broadcast.audience_type == AudienceType.SYSTEM:
+        return qs
+    qs = qs.filter(role__in=DISTRICT_ROLES)
+    if broadcast.audience_district:
+        qs = qs.filter(institution__district__name=broadcast.audience_district)
+    if broadcast.sender_id:
+        qs = qs.exclude(id=broadcast.sender_id)
+    return qs
+
+
+def id_chunks(ids, chunk_size: int):
+    """
+    Yield lists of at most chunk_size IDs from a values_list queryset,
+    streamed with iterator() — the whole audience is never in memory.
+    """
+    chunk = []
+    for pk in ids.iterator(chunk_size=chunk_size):
+        chunk.append(pk)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Reading
+# ─────────────────────────────────────────────────────────────────────────────
+
+def unread_count(user) -> int:
+    return (
+        Notification.objects.filter(user=user, is_read=False).count()
+        + broadcasts_for(user).filter(is_read=False).count()
+    )
+
+
+def page(direct_qs, broadcast_qs, cursor: str | None, size: int, ranked: bool = False) -> CursorPage:
+    """
+    One keyset page of both querysets interleaved newest first — or by
+    search_rank, then created_at, when ranked (both went through
+    search.apply). Items are (kind, row).
+
+    The merged order is (search_rank?, created_at, kind, id) descending;
+    the cursor carries that key, and each source is filtered to the rows
+    after it before taking size+1. Only the sort keys are read from each
+    side; the chosen rows are then loaded by id.
+    """
+    fields = ["search_rank", "created_at"] if ranked else ["created_at"]
+    direction, reverse = None, False
+    if cursor:
+        values, direction = pagination.decode_cursor(cursor)
+        if len(values) != len(fields) + 2 or values[-2] not in (DIRECT, BROADCAST):
+            raise pagination.InvalidCursor("Invalid cursor")
+        reverse = direction == pagination.PREV
+
+    ordering = [f"-{f}" for f in fields] + ["-id"]
+    if reverse:
+        ordering = pagination.reverse_ordering(ordering)
+
+    keys = []
+    for kind, qs in ((DIRECT, direct_qs), (BROADCAST, broadcast_qs)):
+        if cursor:
+            qs = qs.filter(_after(kind, ordering, values))
+        keys += [
+            (*key[:-1], kind, key[-1])
+            for key in qs.order_by(*ordering).values_list(*fields, "id")[:size + 1]
+        ]
+    keys.sort(reverse=not reverse)
+    keys = keys[:size + 1]
+
+    direct = direct_qs.select_related("broadcast__sender").in_bulk(
+        [key[-1] for key in keys[:size] if key[-2] == DIRECT]
+    )
+    broadcasts = broadcast_qs.select_related("sender").in_bulk(
+        [key[-1] for key in keys[:size] if key[-2] == BROADCAST]
+    )
+    rows = [
+        (key, (key[-2], direct[key[-1]] if key[-2] == DIRECT else broadcasts[key[-1]]))
+        for key in keys[:size]
+    ] + [(key, None) for key in keys[size:]]
+    result = pagination.page_from_rows(rows, size, direction, key=lambda row: list(row[0]))
+    result.items = [item for _, item in result.items]
+    return result
+
+
+def _after(kind, ordering, values):
+    """
+    Keyset filter for one source. The merged key has `kind` between the
+    sort fields and id; within a source kind is constant, so ties on the
+    sort fields fall before or after the cursor depending on kind alone.
+    """
+    fields, cursor_kind, cursor_id = values[:-2], values[-2], values[-1]
+    if kind == cursor_kind:
+        return pagination.keyset_q(ordering, [*fields, cursor_id])
+    descending = ordering[0].startswith("-")
+    ties_after = kind < cursor_kind if descending else kind > cursor_kind
+    return pagination.keyset_q(ordering[:-1], fields, inclusive=ties_after)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Receipts
+# ─────────────────────────────────────────────────────────────────────────────
+
+def mark(user, broadcast_id: int, field: str) -> bool:
+    """
+    Set read_at or dismissed_at on the user's receipt for a visible broadcast.
+    Returns False if the broadcast is not in the user's inbox.
+    """
+    from .counters import decr
+
+    is_read = broadcasts_for(user).filter(id=broadcast_id).values_list("is_read", flat=True).first()
+    if is_read is None:
+        return False
+    BroadcastReceipt.objects.update_or_create(
+        user=user, broadcast_id=broadcast_id, defaults={field: timezone.now()},
+    )
+    if not is_read:
+        decr(user.id)
+    return True
+
+
+def mark_all_read(user) -> int:
+    """
+    Mark every unread visible broadcast read. Returns how many. The caller
+    resets the unread counter (it also covers direct notifications).
+    """
+    ids = list(broadcasts_for(user).filter(is_read=False).values_list("id", flat=True))
+    if not ids:
+        return 0
+    now = timezone.now()
+    BroadcastReceipt.objects.bulk_create(
+        [BroadcastReceipt(user=user, broadcast_id=pk, read_at=now) for pk in ids],
+        ignore_conflicts=True,
+    )
+    BroadcastReceipt.objects.filter(
+        user=user, broadcast_id__in=ids, read_at__isnull=True,
+    ).update(read_at=now)
+    return len(ids)
@@ -0,0 +1,67 @@
+# apps.notifications.jobs
+"""
+Background job handlers for Web Push delivery and realtime (Ably) publishes.
+"""
+from apps.jobs.queue import job
+
+from .push import send_push_to_users
+
+
+@job()
+def send_push(user_ids, title, body, url="/notifications", tag="gyangrit"):
+    send_push_to_users(user_ids, title, body, url, tag)
+
+
+@job(max_attempts=1)
+def send_broadcast_push(broadcast_id, chunk_size=1000):
+    """
+    Push and realtime for a fan-out-on-read broadcast. Its audience is
+    streamed in ID order and split into ranges of chunk_size users, one
+    send_broadcast_chunk job each, so a failure retries one chunk and no
+    single job runs for the whole audience. One attempt only: a retry would
+    enqueue every range again. (Unread counters were bumped when the
+    broadcast was saved.)
+    """
+    from .inbox import id_chunks, recipients_of
+    from .models import Broadcast
+
+    broadcast = Broadcast.objects.filter(id=broadcast_id).first()
+    if broadcast is None:
+        return
+    ids = recipients_of(broadcast).order_by("id").values_list("id", flat=True)
+    for chunk in id_chunks(ids, chunk_size):
+        send_broadcast_chunk.delay(broadcast_id, chunk[0], chunk[-1])
+
+
+@job()
+def send_broadcast_chunk(broadcast_id, first_id, last_id):
+    """
+    Push and realtime for the broadcast's recipients with first_id <= id <=
+    last_id. A retry re-sends only this range; pushes share the tag
+    "broadcast-<id>", so a repeat replaces the notification on the device.
+    """
+    from . import realtime
+    from .inbox import recipients_of
+    from .models import Broadcast
+
+    broadcast = Broadcast.objects.filter(id=broadcast_id).first()
+    if broadcast is None:
+        return
+    chunk = list(
+        recipients_of(broadcast)
+        .filter(id__gte=first_id, id__lte=last_id)
+        .values_list("id", flat=True)
+    )
+    if not chunk:
+        return
+    body = broadcast.message[:200] if broadcast.message else broadcast.subject
+    event = {"broadcast_id": broadcast.id, "subject": broadcast.subject, "type": broadcast.notification_type}
+    realtime.send([f"notifications:{uid}" for uid in chunk], "notification", event)
+    send_push_to_users(chunk, broadcast.subject, body, broadcast.link or "/notifications",
+                       f"broadcast-{broadcast.id}")
+
+
+@job()
+def publish_realtime(channels, event, data):
+    from .realtime import send
+    send(channels, event, data, raise_errors=True)
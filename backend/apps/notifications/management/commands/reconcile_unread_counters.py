@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.notifications.counters import reconcile_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts every user's unread notifications (direct + fan-out broadcasts) "
+        "and corrects the denormalized UnreadCounter rows that have drifted."
+    )
+
+    def handle(self, *args, **options):
+        checked, corrected = reconcile_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} users, corrected {corrected} unread counters."
+        ))
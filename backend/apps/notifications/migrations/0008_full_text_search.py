@@ -0,0 +1,77 @@
+"""
+Full-text search indexes for Notification / Broadcast (apps.notifications.search).
+
+postgresql: expression GIN index on the weighted subject + message tsvector.
+sqlite:     FTS5 external-content table per model + sync triggers.
+Other backends: nothing (search falls back to icontains).
+"""
+from django.db import migrations
+
+TABLES = ("notifications_notification", "notifications_broadcast")
+GIN_INDEXES = {
+    "Notification": "notif_search_gin",
+    "Broadcast":    "broadcast_search_gin",
+}
+SEARCH_CONFIG = "english"   # apps.notifications.search.SEARCH_CONFIG
+
+
+def _gin_index(name):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+    return GinIndex(
+        SearchVector("subject", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("message", weight="B", config=SEARCH_CONFIG),
+        name=name,
+    )
+
+
+def _fts_sql(table):
+    fts = f"{table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(subject, message, content='{table}', content_rowid='id')",
+        f"INSERT INTO {fts}(rowid, subject, message) SELECT id, subject, message FROM {table}",
+        f"""CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN
+              INSERT INTO {fts}(rowid, subject, message) VALUES (new.id, new.subject, new.message);
+            END""",
+        f"""CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+              INSERT INTO {fts}({fts}, rowid, subject, message) VALUES ('delete', old.id, old.subject, old.message);
+            END""",
+        f"""CREATE TRIGGER {fts}_au AFTER UPDATE OF subject, message ON {table} BEGIN
+              INSERT INTO {fts}({fts}, rowid, subject, message) VALUES ('delete', old.id, old.subject, old.message);
+              INSERT INTO {fts}(rowid, subject, message) VALUES (new.id, new.subject, new.message);
+            END""",
+    ]
+
+
+def forwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for model_name, index_name in GIN_INDEXES.items():
+            schema_editor.add_index(apps.get_model("notifications", model_name), _gin_index(index_name))
+    elif vendor == "sqlite":
+        for table in TABLES:
+            for sql in _fts_sql(table):
+                schema_editor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for model_name, index_name in GIN_INDEXES.items():
+            schema_editor.remove_index(apps.get_model("notifications", model_name), _gin_index(index_name))
+    elif vendor == "sqlite":
+        for table in TABLES:
+            for suffix in ("_ai", "_ad", "_au"):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts{suffix}")
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0007_unread_counter"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
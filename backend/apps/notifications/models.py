@@ -15,6 +15,13 @@ Why two models?
 Sending to a class of 40 students creates 1 Broadcast + 40 Notification rows.
 The sender sees 1 sent item in their history, not 40. Recipients each get
 their own is_read state. Deleting a Notification does not delete the Broadcast.
+
+Fan-out on read (FAN_OUT_ON_READ audiences — system-wide and district-wide):
+A state-wide announcement would be hundreds of thousands of Notification
+rows, so these Broadcasts are stored once (fan_out_on_read=True) and joined
+into each inbox at read time (see apps.notifications.inbox). Per-user state
+is sparse: a BroadcastReceipt row exists only once a user reads or
+dismisses the broadcast.
 """
 
 import logging
@@ -46,6 +53,10 @@ class AudienceType(models.TextChoices):
     SYSTEM = "system", "System-wide"
 
 
+# Audiences delivered by fan-out on read instead of one Notification per user
+FAN_OUT_ON_READ = {AudienceType.SYSTEM, AudienceType.DISTRICT_ALL}
+
+
 class NotificationType(models.TextChoices):
     INFO       = "info",        "Info"
     SUCCESS    = "success",     "Success"
@@ -90,11 +101,16 @@ class Broadcast(models.Model):
     attachment_name = models.CharField(max_length=255, blank=True)
     sent_at        = models.DateTimeField(default=timezone.now, db_index=True)
     recipient_count = models.PositiveIntegerField(default=0)
+    # True → no Notification rows; recipients see it via apps.notifications.inbox
+    fan_out_on_read   = models.BooleanField(default=False)
+    # District name for DISTRICT_ALL fan-out broadcasts ("" = every district)
+    audience_district = models.CharField(max_length=255, blank=True)
 
     class Meta:
         ordering = ["-sent_at"]
         indexes  = [
             models.Index(fields=["sender", "-sent_at"]),
+            models.Index(fields=["fan_out_on_read", "audience_type", "-sent_at"]),
         ]
 
     def __str__(self):
@@ -130,6 +146,10 @@ class Notification(models.Model):
     link       = models.CharField(max_length=500, blank=True)
     attachment_url  = models.URLField(blank=True)
     attachment_name = models.CharField(max_length=255, blank=True)
+    # Coalescing: rows sharing a group_key (e.g. "chat:12") are folded into
+    # one unread row per user while a burst lasts; group_count = items folded in.
+    group_key   = models.CharField(max_length=64, blank=True, default="")
+    group_count = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
@@ -137,6 +157,7 @@ class Notification(models.Model):
         indexes  = [
             models.Index(fields=["user", "is_read", "-created_at"]),
             models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["group_key", "user"]),
         ]
 
     def __str__(self):
@@ -169,12 +190,103 @@ class Notification(models.Model):
             attachment_name=attachment_name,
             broadcast=broadcast,
         )
+        from .counters import incr
+        incr([user.id])
         logger.info(
             "Notification created: id=%s user=%s type=%s subject='%s'",
             n.id, user.username, notification_type, subject,
         )
         return n
 
+    @classmethod
+    def bulk_send(
+        cls,
+        user_ids,
+        subject,
+        message="",
+        notification_type=NotificationType.INFO,
+        link="",
+        attachment_url="",
+        attachment_name="",
+        broadcast=None,
+        group_key="",
+        batch_size=1000,
+    ):
+        """
+        Create one notification per user ID with chunked bulk_create — no User
+        rows loaded, one INSERT (+ one unread-counter UPDATE) per batch_size
+        recipients. Returns the count.
+        """
+        from .counters import incr
+
+        def flush(rows):
+            cls.objects.bulk_create(rows)
+            incr(row.user_id for row in rows)
+            return len(rows)
+
+        created = 0
+        chunk = []
+        for user_id in user_ids:
+            chunk.append(cls(
+                user_id=user_id,
+                subject=subject,
+                message=message,
+                notification_type=notification_type,
+                is_read=False,
+                link=link,
+                attachment_url=attachment_url,
+                attachment_name=attachment_name,
+                broadcast=broadcast,
+                group_key=group_key,
+            ))
+            if len(chunk) >= batch_size:
+                created += flush(chunk)
+                chunk = []
+        if chunk:
+            created += flush(chunk)
+        return created
+
+
+class UnreadCounter(models.Model):
+    """
+    Denormalized unread total per user (direct + fan-out broadcasts) —
+    maintained by apps.notifications.counters, so the bell badge is a
+    primary-key lookup instead of a COUNT.
+    """
+    user       = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="unread_counter",
+    )
+    unread     = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} — {self.unread} unread"
+
+
+class BroadcastReceipt(models.Model):
+    """
+    Sparse per-user state for a fan-out-on-read Broadcast. No row = unread.
+    """
+    broadcast    = models.ForeignKey(Broadcast, on_delete=models.CASCADE, related_name="receipts")
+    user         = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="broadcast_receipts",
+    )
+    read_at      = models.DateTimeField(null=True, blank=True)
+    dismissed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "broadcast"], name="uniq_broadcast_receipt"),
+        ]
+
+    def __str__(self):
+        return f"Receipt broadcast={self.broadcast_id} user={self.user_id}"
+
 
 class PushSubscription(models.Model):
     """
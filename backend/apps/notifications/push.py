@@ -13,14 +13,34 @@ Generate keys once:
 
 Or use the management command:
   python manage.py generate_vapid_keys
+
+Delivery (send_push_to_users, run by the send_push job):
+  - every subscription for the recipient set is loaded in one query
+  - subscriptions are grouped by endpoint origin (fcm.googleapis.com,
+    updates.push.services.mozilla.com, ...) and delivered on a bounded
+    thread pool, at most _PER_ORIGIN in flight per push service
+  - the signed VAPID header is cached per audience (= origin) until shortly
+    before its JWT expires, instead of an ECDSA signature per message
+  - stale subscriptions (404/410) are deleted in one query at the end
 """
 import json
 import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+_MAX_WORKERS = 16                # threads per dispatch
+_PER_ORIGIN  = 4                 # concurrent requests per push service
+_TIMEOUT     = 5
+_VAPID_TTL   = 12 * 60 * 60      # JWT lifetime (the Web Push maximum is 24h)
+_VAPID_SLACK = 60 * 60           # re-sign when less than this is left
+
 
 def _get_vapid_keys():
     """Return (private_key, claims) tuple or (None, None) if not configured."""
@@ -31,27 +51,76 @@ def _get_vapid_keys():
     return private_key, {"sub": email}
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# VAPID header cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+_vapid_cache: dict[tuple, tuple[dict, float]] = {}
+_vapid_lock = threading.Lock()
+
+
+def _vapid_headers(private_key: str, claims: dict, audience: str) -> dict:
+    """Signed VAPID headers for one push service, reused until near expiry."""
+    from py_vapid import Vapid
+
+    key = (private_key, claims["sub"], audience)
+    now = time.time()
+    with _vapid_lock:
+        cached = _vapid_cache.get(key)
+        if cached and cached[1] - _VAPID_SLACK > now:
+            return cached[0]
+
+    expires = int(now) + _VAPID_TTL
+    headers = Vapid.from_string(private_key=private_key).sign(
+        {**claims, "aud": audience, "exp": expires}
+    )
+    with _vapid_lock:
+        _vapid_cache[key] = (headers, expires)
+    return headers
+
+
+def _origin(endpoint: str) -> str:
+    parts = urlsplit(endpoint)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Dispatch
+# ─────────────────────────────────────────────────────────────────────────────
+
 def send_push_to_user(user_id: int, title: str, body: str, url: str = "/notifications", tag: str = "gyangrit") -> int:
     """
     Send a push notification to all subscriptions for a user.
     Returns the number of successful deliveries.
+    """
+    return send_push_to_users([user_id], title, body, url, tag)
 
-    Automatically deletes stale subscriptions (410 Gone from push service).
+
+def send_push_to_users(user_ids: list[int], title: str, body: str, url: str = "/notifications", tag: str = "gyangrit") -> int:
+    """
+    Send push to multiple users. Returns total successful deliveries.
+
+    Automatically deletes stale subscriptions (404/410 from the push service).
     """
     try:
-        from pywebpush import webpush, WebPushException
+        from pywebpush import WebPusher, WebPushException
     except ImportError:
         logger.warning("pywebpush not installed — push notifications disabled.")
         return 0
 
+    from gyangrit import http_client
     from .models import PushSubscription
 
     private_key, claims = _get_vapid_keys()
     if not private_key:
         return 0
 
-    subscriptions = list(PushSubscription.objects.filter(user_id=user_id))
-    if not subscriptions:
+    by_origin: dict[str, deque] = defaultdict(deque)
+    for sub in PushSubscription.objects.filter(user_id__in=user_ids).only(
+        "id", "user_id", "endpoint", "p256dh", "auth",
+    ):
+        by_origin[_origin(sub.endpoint)].append(sub)
+    if not by_origin:
         return 0
 
     payload = json.dumps({
@@ -60,50 +129,58 @@ def send_push_to_user(user_id: int, title: str, body: str, url: str = "/notifica
         "url":   url,
         "tag":   tag,
     })
-
+    session = http_client.get_session()
+    lock = threading.Lock()
     sent = 0
     stale_ids = []
 
-    for sub in subscriptions:
-        subscription_info = {
-            "endpoint": sub.endpoint,
-            "keys": {
-                "p256dh": sub.p256dh,
-                "auth":   sub.auth,
-            },
-        }
+    def deliver(origin: str, sub) -> None:
+        nonlocal sent
         try:
-            webpush(
-                subscription_info=subscription_info,
-                data=payload,
-                vapid_private_key=private_key,
-                vapid_claims=claims,
-                timeout=5,
+            resp = WebPusher(
+                {"endpoint": sub.endpoint, "keys": {"p256dh": sub.p256dh, "auth": sub.auth}},
+                requests_session=session,
+            ).send(
+                payload,
+                headers=dict(_vapid_headers(private_key, claims, origin)),
+                timeout=_TIMEOUT,
             )
-            sent += 1
+            if resp.status_code > 202:
+                raise WebPushException(f"Push failed: {resp.status_code}", response=resp)
+            with lock:
+                sent += 1
         except WebPushException as exc:
             status = getattr(exc, "response", None)
-            status_code = status.status_code if status else 0
+            status_code = status.status_code if status is not None else 0
             if status_code in (404, 410):
                 # Subscription expired or unsubscribed — clean up
-                stale_ids.append(sub.id)
-                logger.info("Push subscription stale (HTTP %d), deleting: user=%s", status_code, user_id)
+                with lock:
+                    stale_ids.append(sub.id)
             else:
-                logger.warning("Push failed for user=%s: %s", user_id, exc)
+                logger.warning("Push failed for user=%s: %s", sub.user_id, exc)
         except Exception as exc:
-            logger.warning("Push failed for user=%s: %s", user_id, exc)
+            logger.warning("Push failed for user=%s: %s", sub.user_id, exc)
+
+    def lane(origin: str) -> None:
+        # Each lane drains its origin's queue; _PER_ORIGIN lanes per origin
+        queue = by_origin[origin]
+        while True:
+            try:
+                sub = queue.popleft()
+            except IndexError:
+                return
+            deliver(origin, sub)
+
+    lanes = [
+        origin
+        for origin, subs in by_origin.items()
+        for _ in range(min(_PER_ORIGIN, len(subs)))
+    ]
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(lanes))) as pool:
+        list(pool.map(lane, lanes))
 
     if stale_ids:
         PushSubscription.objects.filter(id__in=stale_ids).delete()
+        logger.info("Deleted %d stale push subscriptions", len(stale_ids))
 
     return sent
-
-
-def send_push_to_users(user_ids: list[int], title: str, body: str, url: str = "/notifications", tag: str = "gyangrit") -> int:
-    """
-    Send push to multiple users. Returns total successful deliveries.
-    """
-    total = 0
-    for uid in user_ids:
-        total += send_push_to_user(uid, title, body, url, tag)
-    return total
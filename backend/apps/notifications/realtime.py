@@ -0,0 +1,195 @@
+# apps.notifications.realtime
+"""
+Realtime (Ably) publisher for chat, live-session and competition events.
+
+Views never talk to Ably themselves:
+
+    from apps.notifications import realtime
+    realtime.publish("competition:12", "room:started", {...})
+    realtime.fan_out([f"notifications:{uid}" for uid in ids], "chat_message", {...})
+
+Both enqueue the publish_realtime job after COMMIT, so the HTTP work runs on
+a worker and subscribers never hear about rows they can't read yet. Job
+handlers that already run on a worker call send() directly.
+
+send() uses Ably's batch publish endpoint (POST /messages): one request
+carries the same message to up to _CHANNELS_PER_REQUEST channels, so a
+60-member room is one round trip instead of 60.
+
+token_request() mints the TokenRequest browsers exchange for an Ably token.
+It is signed locally with the key secret (HMAC-SHA256), so handing one out
+needs no call to Ably.
+
+Backends (settings.REALTIME_BACKEND):
+  "ably"   Ably REST via gyangrit.http_client (needs ABLY_API_KEY)
+  "local"  in-process stand-in broker (tests / offline dev) — everything
+           sent is recorded on realtime.broker
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_BATCH_URL = "https://rest.ably.io/messages"
+_CHANNELS_PER_REQUEST = 100
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Local stand-in broker
+# ─────────────────────────────────────────────────────────────────────────────
+
+class LocalBroker:
+    """Records published messages in memory, in publish order."""
+
+    def __init__(self):
+        self._messages: list[dict] = []
+        self._lock = threading.Lock()
+
+    def publish(self, channels: list[str], event: str, data: dict) -> None:
+        with self._lock:
+            self._messages.extend(
+                {"channel": channel, "name": event, "data": data} for channel in channels
+            )
+
+    def messages(self, channel: str | None = None, event: str | None = None) -> list[dict]:
+        with self._lock:
+            return [
+                m for m in self._messages
+                if (channel is None or m["channel"] == channel)
+                and (event is None or m["name"] == event)
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._messages.clear()
+
+
+broker = LocalBroker()
+
+
+def _backend() -> str:
+    return getattr(settings, "REALTIME_BACKEND", "ably")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Enqueue (request path)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def publish(channel: str, event: str, data: dict) -> None:
+    """Publish one event to one channel after COMMIT, off the request thread."""
+    fan_out([channel], event, data)
+
+
+def fan_out(channels, event: str, data: dict) -> None:
+    """Publish the same event to many channels after COMMIT, one job per chunk."""
+    from .jobs import publish_realtime
+
+    channels = list(channels)
+    for i in range(0, len(channels), _CHANNELS_PER_REQUEST):
+        publish_realtime.delay_on_commit(channels[i:i + _CHANNELS_PER_REQUEST], event, data)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Send (worker path)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _auth_header() -> str | None:
+    api_key = getattr(settings, "ABLY_API_KEY", "").strip()
+    if not api_key:
+        logger.warning("ABLY_API_KEY not set — skipping realtime publish")
+        return None
+    if ":" not in api_key:
+        logger.error("ABLY_API_KEY format invalid")
+        return None
+    return "Basic " + base64.b64encode(api_key.encode()).decode()
+
+
+def send(channels, event: str, data: dict, raise_errors: bool = False) -> bool:
+    """
+    Publish now, batching up to _CHANNELS_PER_REQUEST channels per request.
+    Returns True if every channel was accepted. raise_errors=True re-raises
+    request failures so a job retry can pick them up.
+    """
+    channels = list(channels)
+    if not channels:
+        return True
+    if _backend() == "local":
+        broker.publish(channels, event, data)
+        return True
+
+    auth = _auth_header()
+    if auth is None:
+        return False
+
+    ok = True
+    for i in range(0, len(channels), _CHANNELS_PER_REQUEST):
+        chunk = channels[i:i + _CHANNELS_PER_REQUEST]
+        try:
+            ok = _send_chunk(chunk, event, data, auth) and ok
+        except Exception as exc:
+            logger.error("Ably batch publish of %s to %d channels failed: %s", event, len(chunk), exc)
+            if raise_errors:
+                raise
+            ok = False
+    return ok
+
+
+def _send_chunk(channels: list[str], event: str, data: dict, auth: str) -> bool:
+    from gyangrit import http_client
+
+    resp = http_client.post(
+        _BATCH_URL,
+        json=[{"channels": channels, "messages": {"name": event, "data": data}}],
+        headers={"Authorization": auth, "Content-Type": "application/json"},
+        timeout=5,
+    )
+    if resp.status_code == 400:
+        # Partial success (Ably error 40020): some channels were accepted.
+        # Retrying the whole chunk would duplicate those, so just report.
+        body = resp.json() if resp.content else {}
+        failed = [
+            r.get("channel") for r in body.get("batchResponse", [])
+            if isinstance(r, dict) and r.get("error")
+        ]
+        if failed:
+            logger.warning("Ably batch publish of %s: %d/%d channels rejected (%s...)",
+                           event, len(failed), len(channels), failed[:3])
+            return False
+    resp.raise_for_status()
+    return True
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Token requests (browser auth)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def token_request(api_key: str, client_id: str, capability: dict, ttl_ms: int) -> dict:
+    """
+    Build a signed Ably TokenRequest for `client_id` limited to `capability`.
+    https://ably.com/docs/auth/token#token-request — the client library
+    exchanges it with Ably directly.
+    """
+    key_name, key_secret = api_key.split(":", 1)
+    request = {
+        "keyName":    key_name,
+        "ttl":        ttl_ms,
+        "capability": json.dumps(capability, separators=(",", ":")),
+        "clientId":   client_id,
+        "timestamp":  int(time.time() * 1000),
+        "nonce":      secrets.token_hex(16),
+    }
+    signed = "".join(
+        f"{request[field]}\n"
+        for field in ("keyName", "ttl", "capability", "clientId", "timestamp", "nonce")
+    )
+    digest = hmac.new(key_secret.encode(), signed.encode(), hashlib.sha256).digest()
+    request["mac"] = base64.b64encode(digest).decode()
+    return request
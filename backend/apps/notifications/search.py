@@ -0,0 +1,80 @@
+# apps.notifications.search
+"""
+Ranked full-text search over Notification and Broadcast subject + message.
+
+    qs = search.apply(qs, "exam schedule")   # filtered, annotated search_rank
+    qs.order_by("-search_rank", "-created_at")
+
+Backends (chosen by the connection vendor):
+
+  postgresql  to_tsvector over subject (weight A) + message (weight B),
+              backed by an expression GIN index (migration 0008) — the
+              vector below must stay identical to the indexed expression.
+              Query syntax is websearch_to_tsquery ("quoted phrases",
+              -exclude, or). Rank = ts_rank.
+
+  sqlite      FTS5 external-content tables <table>_fts, kept in sync by
+              triggers (migration 0008). Every term is prefix-matched.
+              Rank = -bm25 with subject weighted over message.
+
+  other       icontains on subject / message, search_rank = 0.
+"""
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Must match migration 0008_full_text_search.
+SEARCH_CONFIG = "english"
+
+
+def vector():
+    from django.contrib.postgres.search import SearchVector
+    return (
+        SearchVector("subject", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("message", weight="B", config=SEARCH_CONFIG)
+    )
+
+
+def apply(qs, q: str):
+    """Filter qs to rows matching q, annotated with search_rank (higher = better)."""
+    q = q.strip()
+    if not q:
+        return qs
+    if connection.vendor == "postgresql":
+        return _postgres(qs, q)
+    if connection.vendor == "sqlite":
+        return _sqlite(qs, q)
+    return (
+        qs.filter(Q(subject__icontains=q) | Q(message__icontains=q))
+        .annotate(search_rank=Value(0.0, output_field=FloatField()))
+    )
+
+
+def _postgres(qs, q):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    query = SearchQuery(q, config=SEARCH_CONFIG, search_type="websearch")
+    return (
+        qs.annotate(search_document=vector())
+        .filter(search_document=query)
+        .annotate(search_rank=SearchRank(vector(), query))
+    )
+
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input is never parsed as FTS5 syntax
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in q.split())
+
+
+def _sqlite(qs, q):
+    table = qs.model._meta.db_table
+    fts = f"{table}_fts"
+    match = _fts5_query(q)
+    return (
+        qs.filter(id__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", (match,)))
+        .annotate(search_rank=RawSQL(
+            f'SELECT -bm25({fts}, 2.0, 1.0) FROM {fts} WHERE {fts} MATCH %s AND rowid = "{table}"."id"',
+            (match,),
+            output_field=FloatField(),
+        ))
+    )
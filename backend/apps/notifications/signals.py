@@ -49,29 +49,20 @@ def _enrolled_students(course):
 
 def _bulk_notify(students, subject, message, notification_type, link=""):
     """
-    Create one Notification row per student in a single bulk_create.
+    Create one Notification row per student in a single bulk_create
+    (Notification.bulk_send — also bumps their unread counters).
     Returns the number of notifications created.
     """
     from apps.notifications.models import Notification
 
-    rows = [
-        Notification(
-            user=student,
-            subject=subject,
+    with transaction.atomic():
+        return Notification.bulk_send(
+            [student.id for student in students],
+            subject,
             message=message,
             notification_type=notification_type,
-            is_read=False,
             link=link,
         )
-        for student in students
-    ]
-    if not rows:
-        return 0
-
-    with transaction.atomic():
-        Notification.objects.bulk_create(rows, ignore_conflicts=True)
-
-    return len(rows)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
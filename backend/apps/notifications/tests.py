@@ -31,3 +31,232 @@ class TestNotificationSend:
             content_type="application/json",
         )
         assert resp.status_code in (403, 404)
+
+
+@pytest.mark.django_db
+class TestRealtimeFanOut:
+    def test_published_after_commit_in_chunks(self, django_capture_on_commit_callbacks):
+        from apps.notifications import realtime
+        realtime.broker.clear()
+        channels = [f"notifications:{i}" for i in range(250)]
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            realtime.fan_out(channels, "ping", {"n": 1})
+            assert realtime.broker.messages() == []   # nothing before COMMIT
+        assert len(callbacks) == 3
+        assert [m["channel"] for m in realtime.broker.messages(event="ping")] == channels
+
+
+@pytest.mark.django_db
+class TestPushDispatch:
+    def test_concurrent_delivery_and_stale_cleanup(self, student_user, student_user2, settings):
+        import base64
+        import os
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from apps.notifications import push
+        from apps.notifications.models import PushSubscription
+
+        def b64(raw):
+            return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(410 if self.path.startswith("/gone") else 201)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+
+        vapid_key = ec.generate_private_key(ec.SECP256R1())
+        settings.VAPID_PRIVATE_KEY = b64(vapid_key.private_numbers().private_value.to_bytes(32, "big"))
+        settings.VAPID_CLAIMS_EMAIL = "mailto:admin@example.com"
+
+        def subscribe(user, path):
+            browser_key = ec.generate_private_key(ec.SECP256R1()).public_key().public_bytes(
+                serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint,
+            )
+            return PushSubscription.objects.create(
+                user=user, endpoint=f"{base}/{path}", p256dh=b64(browser_key), auth=b64(os.urandom(16)),
+            )
+
+        for i in range(3):
+            subscribe(student_user, f"ok/{i}")
+        gone = subscribe(student_user2, "gone/1")
+        push._vapid_cache.clear()
+        try:
+            sent = push.send_push_to_users([student_user.id, student_user2.id], "Hi", "Body")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert sent == 3
+        assert not PushSubscription.objects.filter(id=gone.id).exists()
+        assert PushSubscription.objects.filter(user=student_user).count() == 3
+        assert list(push._vapid_cache) == [(settings.VAPID_PRIVATE_KEY, "mailto:admin@example.com", base)]
+
+
+@pytest.mark.django_db
+class TestBroadcastFanOutOnRead:
+    def test_system_broadcast_read_from_inbox(self, admin_client, student_client, student_user):
+        from apps.notifications.models import Broadcast, Notification
+        resp = admin_client.post(
+            "/api/v1/notifications/send/",
+            data=json.dumps({"subject": "Holiday", "message": "School closed", "audience_type": "system"}),
+            content_type="application/json",
+        )
+        assert resp.status_code == 201
+        broadcast = Broadcast.objects.get(id=resp.json()["broadcast_id"])
+        assert broadcast.fan_out_on_read
+        assert not Notification.objects.filter(broadcast=broadcast).exists()
+
+        data = student_client.get("/api/v1/notifications/").json()
+        assert data["unread"] == 1
+        assert [(n["kind"], n["id"], n["is_read"]) for n in data["notifications"]] == [
+            ("broadcast", broadcast.id, False),
+        ]
+
+        assert student_client.post(f"/api/v1/notifications/broadcasts/{broadcast.id}/read/").status_code == 200
+        data = student_client.get("/api/v1/notifications/history/").json()
+        assert data["unread"] == 0
+        assert data["results"][0]["is_read"] is True
+
+        student_client.post(f"/api/v1/notifications/broadcasts/{broadcast.id}/dismiss/")
+        assert student_client.get("/api/v1/notifications/history/").json()["count"] == 0
+
+
+@pytest.mark.django_db
+class TestBroadcastPipeline:
+    def test_class_broadcast_streams_chunks(self, principal_client, classroom, student_user, student_user2,
+                                            settings, monkeypatch, django_capture_on_commit_callbacks):
+        from apps.notifications import realtime, views
+        from apps.notifications.models import Broadcast, Notification
+        settings.VAPID_PRIVATE_KEY = ""
+        monkeypatch.setattr(views, "_SEND_CHUNK", 1)
+        realtime.broker.clear()
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            resp = principal_client.post(
+                "/api/v1/notifications/send/",
+                data=json.dumps({"subject": "Test", "audience_type": "class_students", "class_id": classroom.id}),
+                content_type="application/json",
+            )
+        assert resp.status_code == 201
+        assert resp.json()["recipient_count"] == 2
+        broadcast = Broadcast.objects.get(id=resp.json()["broadcast_id"])
+        assert broadcast.recipient_count == 2
+        assert set(Notification.objects.filter(broadcast=broadcast).values_list("user_id", flat=True)) == {
+            student_user.id, student_user2.id,
+        }
+        assert len(callbacks) == 4    # push + realtime per one-recipient chunk
+        assert {m["channel"] for m in realtime.broker.messages(event="notification")} == {
+            f"notifications:{student_user.id}", f"notifications:{student_user2.id}",
+        }
+
+    def test_fan_out_push_splits_into_chunk_jobs(self, admin_user, student_user, student_user2,
+                                                 settings, monkeypatch):
+        from apps.notifications import jobs, realtime
+        from apps.notifications.models import AudienceType, Broadcast
+        settings.VAPID_PRIVATE_KEY = ""
+        broadcast = Broadcast.objects.create(
+            sender=admin_user, subject="Holiday", audience_type=AudienceType.SYSTEM, fan_out_on_read=True,
+        )
+        ranges = []
+        monkeypatch.setattr(jobs.send_broadcast_chunk, "delay", lambda *args: ranges.append(args))
+        realtime.broker.clear()
+
+        jobs.send_broadcast_push(broadcast.id, chunk_size=2)
+        assert len(ranges) == 2     # three users, two ID ranges
+        for args in ranges:
+            jobs.send_broadcast_chunk(*args)
+        assert {m["channel"] for m in realtime.broker.messages(event="notification")} == {
+            f"notifications:{uid}" for uid in (admin_user.id, student_user.id, student_user2.id)
+        }
+
+
+@pytest.mark.django_db
+class TestUnreadCounter:
+    def test_counter_tracks_inserts_reads_and_reconcile(self, student_client, student_user, student_user2):
+        from django.core.management import call_command
+        from apps.notifications.models import Notification, UnreadCounter
+
+        assert student_client.get("/api/v1/notifications/").json()["unread"] == 0   # row created on first read
+        Notification.bulk_send([student_user.id, student_user.id, student_user2.id], "Hi")
+        first = Notification.send(student_user, "Direct")
+        assert UnreadCounter.objects.get(user=student_user).unread == 3
+
+        student_client.post(f"/api/v1/notifications/{first.id}/read/")
+        student_client.post(f"/api/v1/notifications/{first.id}/read/")   # already read — no change
+        assert student_client.get("/api/v1/notifications/").json()["unread"] == 2
+
+        UnreadCounter.objects.filter(user=student_user).update(unread=99)
+        call_command("reconcile_unread_counters")
+        assert UnreadCounter.objects.get(user=student_user).unread == 2
+        assert UnreadCounter.objects.get(user=student_user2).unread == 1
+
+        student_client.post("/api/v1/notifications/read-all/")
+        assert UnreadCounter.objects.get(user=student_user).unread == 0
+
+    def test_fan_out_broadcast_counted_on_save(self, admin_client, student_client, settings,
+                                               django_capture_on_commit_callbacks):
+        settings.VAPID_PRIVATE_KEY = ""
+        assert student_client.get("/api/v1/notifications/").json()["unread"] == 0
+        with django_capture_on_commit_callbacks() as callbacks:
+            resp = admin_client.post(
+                "/api/v1/notifications/send/",
+                data=json.dumps({"subject": "Holiday", "audience_type": "system"}),
+                content_type="application/json",
+            )
+        assert student_client.get("/api/v1/notifications/").json()["unread"] == 1
+
+        # Read before the push job runs — the job must not count it again
+        student_client.post(f"/api/v1/notifications/broadcasts/{resp.json()['broadcast_id']}/read/")
+        for callback in callbacks:
+            callback()
+        assert student_client.get("/api/v1/notifications/").json()["unread"] == 0
+
+
+@pytest.mark.django_db
+class TestNotificationSearch:
+    def test_history_search_is_ranked(self, student_client, student_user):
+        from apps.notifications.models import Notification
+        Notification.send(student_user, "Library hours", message="The exam hall is closed")
+        Notification.send(student_user, "Exam schedule", message="Exams start Monday")
+        Notification.send(student_user, "Sports day")
+
+        results = student_client.get("/api/v1/notifications/history/?q=exam").json()["results"]
+        assert [n["subject"] for n in results] == ["Exam schedule", "Library hours"]
+
+        prefix = student_client.get("/api/v1/notifications/history/?q=sched").json()
+        assert prefix["count"] == 1
+
+
+@pytest.mark.django_db
+class TestHistoryCursor:
+    def test_merged_inbox_pages_across_kinds(self, student_client, student_user, admin_user):
+        from apps.notifications.models import AudienceType, Broadcast, Notification
+        for i in range(3):
+            Notification.send(student_user, f"direct {i}")
+            Broadcast.objects.create(
+                sender=admin_user, subject=f"broadcast {i}", audience_type=AudienceType.SYSTEM,
+                fan_out_on_read=True,
+            )
+
+        seen, cursor = [], None
+        while True:
+            url = "/api/v1/notifications/history/?page_size=4" + (f"&cursor={cursor}" if cursor else "")
+            data = student_client.get(url).json()
+            assert data.get("count") == (None if cursor else 6)   # counted on the first page only
+            seen += [n["subject"] for n in data["results"]]
+            cursor = data["next"]
+            if not cursor:
+                break
+        assert seen == [f"{kind} {i}" for i in (2, 1, 0) for kind in ("broadcast", "direct")]
@@ -7,6 +7,8 @@ Endpoints:
   GET  /api/v1/notifications/history/               — searchable inbox history (all roles)
   POST /api/v1/notifications/<id>/read/             — mark one read
   POST /api/v1/notifications/read-all/              — mark all read
+  POST /api/v1/notifications/broadcasts/<id>/read/    — mark a system/district broadcast read
+  POST /api/v1/notifications/broadcasts/<id>/dismiss/ — hide a system/district broadcast
   POST /api/v1/notifications/send/                  — send broadcast (staff only)
   GET  /api/v1/notifications/sent/                  — sent history (staff only)
   GET  /api/v1/notifications/sent/<id>/             — broadcast detail (staff only)
@@ -17,9 +19,17 @@ Filter params (consistent naming across both history endpoints):
   type        — notification type (info, announcement, etc.)
   sent_after  — ISO date string, inclusive lower bound  (replaces old "from")
   sent_before — ISO date string, inclusive upper bound  (replaces old "to")
-  page        — 1-based page number
+  cursor      — opaque `next` / `prev` token from the previous response
   page_size   — items per page (default 20, max 100)
   unread_only — "1" to show only unread (inbox history only)
+
+Both history endpoints use keyset pagination (gyangrit.pagination) on
+(created_at / sent_at, id) — or relevance first when searching — so a deep
+page costs the same as the first.
+
+Inbox items carry "kind": "direct" (a Notification row) or "broadcast" (a
+system/district Broadcast delivered by fan-out on read, see
+apps.notifications.inbox). Ids are only unique within a kind.
 """
 import json
 import logging
@@ -28,20 +38,33 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from apps.accesscontrol.permissions import require_auth  # returns 401 JSON, not 302
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.utils.dateparse import parse_date
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-from .models import AudienceType, Broadcast, Notification, NotificationType
+from gyangrit import pagination
+
+from . import counters, inbox, search
+from .models import (
+    FAN_OUT_ON_READ,
+    AudienceType,
+    Broadcast,
+    BroadcastReceipt,
+    Notification,
+    NotificationType,
+)
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 SENDER_ROLES = {"TEACHER", "PRINCIPAL", "OFFICIAL", "ADMIN"}
 
+# Recipients handled per pipeline step in send_notification
+_SEND_CHUNK = 1000
+
 ROLE_ALLOWED_AUDIENCES = {
     "TEACHER": {
         AudienceType.CLASS_STUDENTS,
@@ -86,6 +109,7 @@ def _serialize_notification(n, truncate_message: bool = False) -> dict:
 
     return {
         "id":              n.id,
+        "kind":            inbox.DIRECT,
         "subject":         n.subject,
         "message":         msg,
         "type":            n.notification_type,
@@ -102,27 +126,44 @@ def _serialize_notification(n, truncate_message: bool = False) -> dict:
     }
 
 
-def _parse_page_params(request, default_size: int = 20, max_size: int = 100):
-    """Parse ?page= and ?page_size= safely, returning (page, page_size)."""
-    try:
-        page = max(1, int(request.GET.get("page", 1)))
-    except (ValueError, TypeError):
-        page = 1
-    try:
-        page_size = min(max_size, max(1, int(request.GET.get("page_size", default_size))))
-    except (ValueError, TypeError):
-        page_size = default_size
-    return page, page_size
+def _serialize_broadcast_item(b, truncate_message: bool = False) -> dict:
+    """Serialize a fan-out Broadcast (from inbox.broadcasts_for) to the inbox shape."""
+    msg = b.message
+    if truncate_message and msg and len(msg) > 120:
+        msg = msg[:120] + "\u2026"
+
+    return {
+        "id":              b.id,
+        "kind":            inbox.BROADCAST,
+        "subject":         b.subject,
+        "message":         msg,
+        "type":            b.notification_type,
+        "is_read":         b.is_read,
+        "link":            b.link,
+        "attachment_url":  b.attachment_url,
+        "attachment_name": b.attachment_name,
+        "created_at":      b.sent_at.isoformat(),
+        "sender":          b.sender.username if b.sender else "System",
+    }
+
+
+def _serialize_item(kind, row, truncate_message: bool = False) -> dict:
+    if kind == inbox.BROADCAST:
+        return _serialize_broadcast_item(row, truncate_message)
+    return _serialize_notification(row, truncate_message)
 
 
 def _apply_notification_filters(qs, request):
     """
     Apply common search filters to a Notification queryset.
-    Used by both list_notifications and notification_history.
+    Used by both list_notifications and notification_history, for direct
+    Notification rows and inbox.broadcasts_for() alike (both expose
+    subject, message, notification_type and created_at).
     """
     q = request.GET.get("q", "").strip()
     if q:
-        qs = qs.filter(Q(subject__icontains=q) | Q(message__icontains=q))
+        # Full-text, annotated with search_rank (see apps.notifications.search)
+        qs = search.apply(qs, q)
 
     notif_type = request.GET.get("type", "").strip()
     if notif_type:
@@ -208,135 +249,99 @@ def _get_district_for_sender(sender):
 
 def _resolve_recipients(sender, audience_type, class_id=None, institution_id=None):
     """
-    Returns (list of User, audience_label string).
-    Raises ValueError if the scope is invalid for this sender.
+    Returns (recipient ID queryset, audience_label string) for the
+    row-per-recipient audiences. Raises ValueError if the scope is invalid
+    for this sender. FAN_OUT_ON_READ audiences never reach here — their
+    audience is inbox.recipients_of().
+
+    The queryset is a lazy values_list of user IDs — callers stream it in
+    chunks (inbox.id_chunks) so no User rows are loaded and memory does not
+    grow with the audience.
     """
     role = sender.role
+    users = User.objects.order_by()
 
-    if audience_type == AudienceType.CLASS_STUDENTS:
-        classroom = (
-            _get_teacher_classroom(sender, class_id)
-            if role == "TEACHER"
-            else _get_classroom_in_scope(sender, class_id)
-        )
-        qs = User.objects.filter(role="STUDENT", section__classroom=classroom)
-        return list(qs), f"Class {classroom.name} — Students"
-
-    if audience_type == AudienceType.CLASS_TEACHERS:
-        classroom = (
-            _get_teacher_classroom(sender, class_id)
-            if role == "TEACHER"
-            else _get_classroom_in_scope(sender, class_id)
-        )
-        qs = User.objects.filter(
-            role="TEACHER",
-            teaching_assignments__section__classroom=classroom,
-        ).distinct()
-        return list(qs), f"Class {classroom.name} — Teachers"
-
-    if audience_type == AudienceType.CLASS_ALL:
+    if audience_type in (AudienceType.CLASS_STUDENTS, AudienceType.CLASS_TEACHERS, AudienceType.CLASS_ALL):
         classroom = (
             _get_teacher_classroom(sender, class_id)
             if role == "TEACHER"
             else _get_classroom_in_scope(sender, class_id)
         )
-        student_ids = list(
-            User.objects.filter(role="STUDENT", section__classroom=classroom)
-            .values_list("id", flat=True)
-        )
-        teacher_ids = list(
-            User.objects.filter(
-                role="TEACHER",
-                teaching_assignments__section__classroom=classroom,
-            ).distinct().values_list("id", flat=True)
-        )
-        combined = list(set(student_ids + teacher_ids))
-        qs = User.objects.filter(id__in=combined)
-        return list(qs), f"Class {classroom.name} — Everyone"
+        students = Q(role="STUDENT", section__classroom=classroom)
+        teachers = Q(role="TEACHER", teaching_assignments__section__classroom=classroom)
+        if audience_type == AudienceType.CLASS_STUDENTS:
+            return _ids(users.filter(students)), f"Class {classroom.name} — Students"
+        if audience_type == AudienceType.CLASS_TEACHERS:
+            return _ids(users.filter(teachers).distinct()), f"Class {classroom.name} — Teachers"
+        return _ids(users.filter(students | teachers).distinct()), f"Class {classroom.name} — Everyone"
 
     if audience_type == AudienceType.SCHOOL_STUDENTS:
         inst = _get_institution_in_scope(sender, institution_id)
         qs = (
-            User.objects.filter(role="STUDENT")
+            users.filter(role="STUDENT")
             if inst is None
-            else User.objects.filter(role="STUDENT", institution=inst)
+            else users.filter(role="STUDENT", institution=inst)
         )
         label = "All Schools — Students" if inst is None else f"{inst.name} — Students"
-        return list(qs), label
+        return _ids(qs), label
 
     if audience_type == AudienceType.SCHOOL_TEACHERS:
         inst = _get_institution_in_scope(sender, institution_id)
         qs = (
-            User.objects.filter(role="TEACHER")
+            users.filter(role="TEACHER")
             if inst is None
-            else User.objects.filter(role="TEACHER", institution=inst)
+            else users.filter(role="TEACHER", institution=inst)
         )
         label = "All Schools — Teachers" if inst is None else f"{inst.name} — Teachers"
-        return list(qs), label
+        return _ids(qs), label
 
     if audience_type == AudienceType.SCHOOL_ALL:
         inst = _get_institution_in_scope(sender, institution_id)
         qs = (
-            User.objects.filter(role__in=["STUDENT", "TEACHER", "PRINCIPAL"])
+            users.filter(role__in=["STUDENT", "TEACHER", "PRINCIPAL"])
             if inst is None
-            else User.objects.filter(
+            else users.filter(
                 institution=inst, role__in=["STUDENT", "TEACHER", "PRINCIPAL"]
             )
         )
         label = "All Schools — Everyone" if inst is None else f"{inst.name} — Everyone"
-        return list(qs), label
+        return _ids(qs), label
 
     if audience_type == AudienceType.DISTRICT_STUDENTS:
         district = _get_district_for_sender(sender)
         qs = (
-            User.objects.filter(role="STUDENT")
+            users.filter(role="STUDENT")
             if district is None
-            else User.objects.filter(role="STUDENT", institution__district__name=district)
+            else users.filter(role="STUDENT", institution__district__name=district)
         )
         label = "All Districts — Students" if district is None else f"{district} District — Students"
-        return list(qs), label
+        return _ids(qs), label
 
     if audience_type == AudienceType.DISTRICT_TEACHERS:
         district = _get_district_for_sender(sender)
         qs = (
-            User.objects.filter(role="TEACHER")
+            users.filter(role="TEACHER")
             if district is None
-            else User.objects.filter(role="TEACHER", institution__district__name=district)
+            else users.filter(role="TEACHER", institution__district__name=district)
         )
         label = "All Districts — Teachers" if district is None else f"{district} District — Teachers"
-        return list(qs), label
+        return _ids(qs), label
 
     if audience_type == AudienceType.DISTRICT_PRINCIPALS:
         district = _get_district_for_sender(sender)
         qs = (
-            User.objects.filter(role="PRINCIPAL")
+            users.filter(role="PRINCIPAL")
             if district is None
-            else User.objects.filter(role="PRINCIPAL", institution__district__name=district)
+            else users.filter(role="PRINCIPAL", institution__district__name=district)
         )
         label = "All Districts — Principals" if district is None else f"{district} District — Principals"
-        return list(qs), label
+        return _ids(qs), label
 
-    if audience_type == AudienceType.DISTRICT_ALL:
-        district = _get_district_for_sender(sender)
-        qs = (
-            User.objects.filter(role__in=["STUDENT", "TEACHER", "PRINCIPAL"])
-            if district is None
-            else User.objects.filter(
-                role__in=["STUDENT", "TEACHER", "PRINCIPAL"],
-                institution__district__name=district,
-            )
-        )
-        label = "All Districts — Everyone" if district is None else f"{district} District — Everyone"
-        return list(qs), label
+    raise ValueError(f"Unknown audience type: {audience_type}")
 
-    if audience_type == AudienceType.SYSTEM:
-        if sender.role != "ADMIN" and not sender.is_superuser:
-            raise ValueError("Only ADMIN can send system-wide notifications")
-        # Include ALL users — including the sender (we exclude sender after)
-        qs = User.objects.all()
-        return list(qs), "System-wide (all users)"
 
-    raise ValueError(f"Unknown audience type: {audience_type}")
+def _ids(qs):
+    return qs.values_list("id", flat=True)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -359,11 +364,7 @@ def list_notifications(request):
       notification on subsequent polls, so the payload drops to near-zero
       when nothing new has arrived.
     """
-    qs = (
-        Notification.objects
-        .filter(user=request.user)
-        .select_related("broadcast__sender")
-    )
+    sources = [Notification.objects.filter(user=request.user), inbox.broadcasts_for(request.user)]
 
     # Incremental fetch — only return notifications newer than `since`
     since_raw = request.GET.get("since", "").strip()
@@ -371,28 +372,20 @@ def list_notifications(request):
         from django.utils.dateparse import parse_datetime
         since_dt = parse_datetime(since_raw)
         if since_dt:
-            qs = qs.filter(created_at__gt=since_dt)
+            sources = [qs.filter(created_at__gt=since_dt) for qs in sources]
 
     notif_type = request.GET.get("type", "").strip()
     if notif_type:
-        qs = qs.filter(notification_type=notif_type)
+        sources = [qs.filter(notification_type=notif_type) for qs in sources]
 
     if request.GET.get("unread_only") == "1":
-        qs = qs.filter(is_read=False)
-
-    notifications = qs.order_by("-created_at")[:20]
+        sources = [qs.filter(is_read=False) for qs in sources]
 
-    # Cache unread count (30s) — busted immediately by mark_read / mark_all_read
-    _unread_cache_key = f"notif_unread:{request.user.id}"
-    from django.core.cache import cache as _cache
-    unread_count = _cache.get(_unread_cache_key)
-    if unread_count is None:
-        unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
-        _cache.set(_unread_cache_key, unread_count, timeout=30)
+    items = inbox.page(*sources, cursor=None, size=20).items
 
     return JsonResponse({
-        "unread":        unread_count,
-        "notifications": [_serialize_notification(n, truncate_message=True) for n in notifications],
+        "unread":        counters.get(request.user),
+        "notifications": [_serialize_item(kind, row, truncate_message=True) for kind, row in items],
     })
 
 
@@ -409,56 +402,49 @@ def notification_history(request):
     and unread filter.
 
     Query params:
-      q           — search subject + message (case-insensitive)
+      q           — full-text search on subject + message; results are ranked by relevance
       type        — filter by notification type
       sent_after  — ISO date (YYYY-MM-DD), inclusive lower bound
       sent_before — ISO date (YYYY-MM-DD), inclusive upper bound
       unread_only — "1" to show only unread
-      page        — 1-based, default 1
+      cursor      — `next` / `prev` from a previous response (omit for the first page)
       page_size   — default 20, max 100
 
     Response:
       {
-        "count":       <total matching rows>,
-        "page":        <current page>,
-        "total_pages": <total pages>,
-        "unread":      <total unread across ALL notifications, not just this page>,
-        "results":     [ ...notification objects... ]
+        "count":   <total matching rows — first page (no cursor) only>,
+        "unread":  <total unread across ALL notifications, not just this page>,
+        "results": [ ...notification objects... ],
+        "next":    <cursor for older items, or null>,
+        "prev":    <cursor for newer items, or null>
       }
     """
-    qs = (
-        Notification.objects
-        .filter(user=request.user)
-        .select_related("broadcast__sender")
-    )
-
     # Apply shared filters
-    qs = _apply_notification_filters(qs, request)
+    sources = [
+        _apply_notification_filters(qs, request)
+        for qs in (Notification.objects.filter(user=request.user), inbox.broadcasts_for(request.user))
+    ]
 
     if request.GET.get("unread_only") == "1":
-        qs = qs.filter(is_read=False)
-
-    # Total unread count — use same cache key as the panel (30s TTL)
-    from django.core.cache import cache as _cache
-    _unread_key = f"notif_unread:{request.user.id}"
-    total_unread = _cache.get(_unread_key)
-    if total_unread is None:
-        total_unread = Notification.objects.filter(user=request.user, is_read=False).count()
-        _cache.set(_unread_key, total_unread, timeout=30)
+        sources = [qs.filter(is_read=False) for qs in sources]
 
-    page, page_size = _parse_page_params(request)
-    total  = qs.count()
-    offset = (page - 1) * page_size
-
-    notifications = qs[offset: offset + page_size]
+    cursor, page_size = pagination.page_params(request)
+    ranked = bool(request.GET.get("q", "").strip())
+    try:
+        page = inbox.page(*sources, cursor=cursor, size=page_size, ranked=ranked)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    return JsonResponse({
-        "count":       total,
-        "page":        page,
-        "total_pages": max(1, (total + page_size - 1) // page_size),
-        "unread":      total_unread,
-        "results":     [_serialize_notification(n) for n in notifications],
-    })
+    data = {
+        "unread":  counters.get(request.user),
+        "results": [_serialize_item(kind, row) for kind, row in page.items],
+        **page.cursors(),
+    }
+    # COUNT(*) over both sources (a full FTS match with q) is what keyset
+    # paging avoids — pay it once per filter set, on the first page
+    if not cursor:
+        data["count"] = sum(qs.count() for qs in sources)
+    return JsonResponse(data)
 
 
 @csrf_exempt
@@ -466,17 +452,12 @@ def notification_history(request):
 @require_http_methods(["POST"])
 def mark_read(request, notification_id):
     """POST /api/v1/notifications/<id>/read/"""
-    updated = Notification.objects.filter(
-        id=notification_id, user=request.user
-    ).update(is_read=True)
-
-    if not updated:
+    mine = Notification.objects.filter(id=notification_id, user=request.user)
+    if mine.filter(is_read=False).update(is_read=True):
+        counters.decr(request.user.id)
+    elif not mine.exists():
         return JsonResponse({"error": "Not found"}, status=404)
 
-    # Bust the unread badge cache immediately
-    from django.core.cache import cache as _cache
-    _cache.delete(f"notif_unread:{request.user.id}")
-
     return JsonResponse({"success": True})
 
 
@@ -488,20 +469,99 @@ def mark_all_read(request):
     count = Notification.objects.filter(
         user=request.user, is_read=False
     ).update(is_read=True)
+    count += inbox.mark_all_read(request.user)
+    counters.reset(request.user.id)
 
     logger.info("User %s marked %d notifications as read.", request.user.id, count)
 
-    # Bust the unread badge cache immediately
-    from django.core.cache import cache as _cache
-    _cache.delete(f"notif_unread:{request.user.id}")
-
     return JsonResponse({"success": True, "marked": count})
 
 
+@csrf_exempt
+@require_auth
+@require_http_methods(["POST"])
+def mark_broadcast_read(request, broadcast_id):
+    """POST /api/v1/notifications/broadcasts/<id>/read/"""
+    if not inbox.mark(request.user, broadcast_id, "read_at"):
+        return JsonResponse({"error": "Not found"}, status=404)
+
+    return JsonResponse({"success": True})
+
+
+@csrf_exempt
+@require_auth
+@require_http_methods(["POST"])
+def dismiss_broadcast(request, broadcast_id):
+    """POST /api/v1/notifications/broadcasts/<id>/dismiss/ — hide from this user's inbox."""
+    if not inbox.mark(request.user, broadcast_id, "dismissed_at"):
+        return JsonResponse({"error": "Not found"}, status=404)
+
+    return JsonResponse({"success": True})
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SEND
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _send_fan_out_broadcast(user, audience_type, **fields):
+    """
+    SYSTEM / DISTRICT_ALL: store one Broadcast and no Notification rows —
+    recipients see it through inbox.broadcasts_for(). Unread counters are
+    bumped in the same transaction; push and realtime are resolved and
+    delivered by the send_broadcast_push job.
+    """
+    try:
+        if audience_type == AudienceType.SYSTEM:
+            if user.role != "ADMIN" and not user.is_superuser:
+                raise ValueError("Only ADMIN can send system-wide notifications")
+            district = ""
+            audience_label = "System-wide (all users)"
+        else:
+            district = _get_district_for_sender(user) or ""
+            audience_label = (
+                f"{district} District — Everyone" if district else "All Districts — Everyone"
+            )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    broadcast = Broadcast(
+        sender=user,
+        audience_type=audience_type,
+        audience_label=audience_label,
+        audience_district=district,
+        fan_out_on_read=True,
+        **fields,
+    )
+    recipient_count = inbox.recipients_of(broadcast).count()
+    if not recipient_count:
+        return JsonResponse(
+            {"error": "No recipients found. Check your audience selection."},
+            status=400,
+        )
+    broadcast.recipient_count = recipient_count
+    with transaction.atomic():
+        broadcast.save()
+        counters.incr_audience(inbox.recipients_of(broadcast))
+
+    logger.info(
+        "Broadcast id=%s sent by user=%s to %d recipients (audience=%s, label=%s, fan-out on read)",
+        broadcast.id, user.id, recipient_count, audience_type, audience_label,
+    )
+
+    try:
+        from .jobs import send_broadcast_push
+        send_broadcast_push.delay_on_commit(broadcast.id)
+    except Exception as exc:
+        logger.warning("Push enqueue failed for broadcast %s: %s", broadcast.id, exc)
+
+    return JsonResponse({
+        "success":         True,
+        "broadcast_id":    broadcast.id,
+        "recipient_count": recipient_count,
+        "audience_label":  audience_label,
+    }, status=201)
+
+
 @csrf_exempt
 @require_auth
 @require_http_methods(["POST"])
@@ -549,8 +609,19 @@ def send_notification(request):
             status=403,
         )
 
+    if audience_type in FAN_OUT_ON_READ:
+        return _send_fan_out_broadcast(
+            user, audience_type,
+            subject=subject,
+            message=message,
+            notification_type=notification_type,
+            link=link,
+            attachment_url=attachment_url,
+            attachment_name=attachment_name,
+        )
+
     try:
-        recipients, audience_label = _resolve_recipients(
+        recipient_ids, audience_label = _resolve_recipients(
             sender=user,
             audience_type=audience_type,
             class_id=class_id,
@@ -559,19 +630,17 @@ def send_notification(request):
     except ValueError as e:
         return JsonResponse({"error": str(e)}, status=400)
 
-    # SYSTEM-wide broadcasts: include the sender. The admin is also a
-    # platform member and should receive their own announcement.
-    # All other scoped broadcasts: exclude the sender (teachers should
-    # not receive their own class announcements in their inbox).
-    if audience_type != AudienceType.SYSTEM:
-        recipients = [r for r in recipients if r.id != user.id]
+    # Senders don't receive their own class / school / district announcements
+    recipient_ids = recipient_ids.exclude(id=user.id)
 
-    if not recipients:
-        return JsonResponse(
-            {"error": "No recipients found. Check your audience selection."},
-            status=400,
-        )
+    # Pipeline, one chunk of recipient IDs at a time: INSERT the rows, then
+    # queue that chunk's push and realtime jobs (released on COMMIT). Only
+    # one chunk is ever held in memory, whatever the audience size.
+    from . import realtime
+    from .jobs import send_push
 
+    push_body = message[:200] if message else subject
+    recipient_count = 0
     with transaction.atomic():
         broadcast = Broadcast.objects.create(
             sender=user,
@@ -583,52 +652,51 @@ def send_notification(request):
             link=link,
             attachment_url=attachment_url,
             attachment_name=attachment_name,
-            recipient_count=len(recipients),
         )
+        event = {"broadcast_id": broadcast.id, "subject": subject, "type": notification_type}
 
-        Notification.objects.bulk_create([
-            Notification(
-                broadcast=broadcast,
-                user=recipient,
-                subject=subject,
+        for chunk in inbox.id_chunks(recipient_ids, _SEND_CHUNK):
+            Notification.bulk_send(
+                chunk,
+                subject,
                 message=message,
                 notification_type=notification_type,
-                is_read=False,
                 link=link,
                 attachment_url=attachment_url,
                 attachment_name=attachment_name,
+                broadcast=broadcast,
+                batch_size=_SEND_CHUNK,
             )
-            for recipient in recipients
-        ])
+            # Push is best-effort — a failed enqueue never fails the send
+            try:
+                send_push.delay_on_commit(
+                    chunk, subject, push_body, link or "/notifications", f"broadcast-{broadcast.id}",
+                )
+            except Exception as exc:
+                logger.warning("Push enqueue failed for broadcast %s: %s", broadcast.id, exc)
+            realtime.fan_out([f"notifications:{uid}" for uid in chunk], "notification", event)
+            recipient_count += len(chunk)
+
+        if not recipient_count:
+            transaction.set_rollback(True)
+        else:
+            Broadcast.objects.filter(id=broadcast.id).update(recipient_count=recipient_count)
+
+    if not recipient_count:
+        return JsonResponse(
+            {"error": "No recipients found. Check your audience selection."},
+            status=400,
+        )
 
     logger.info(
         "Broadcast id=%s sent by user=%s to %d recipients (audience=%s, label=%s)",
-        broadcast.id, user.id, len(recipients), audience_type, audience_label,
+        broadcast.id, user.id, recipient_count, audience_type, audience_label,
     )
 
-    # ── Push notifications (best-effort, non-blocking) ────────────────────
-    # Send browser push to all recipients who have subscriptions.
-    # Runs after the DB transaction is committed so notifications exist.
-    # Wrapped in try/except — push failure never blocks the broadcast.
-    try:
-        from .push import send_push_to_users
-        recipient_ids = [r.id for r in recipients]
-        push_count = send_push_to_users(
-            user_ids=recipient_ids,
-            title=subject,
-            body=message[:200] if message else subject,
-            url=link or "/notifications",
-            tag=f"broadcast-{broadcast.id}",
-        )
-        if push_count:
-            logger.info("Push sent to %d devices for broadcast %s", push_count, broadcast.id)
-    except Exception as exc:
-        logger.warning("Push delivery failed for broadcast %s: %s", broadcast.id, exc)
-
     return JsonResponse({
         "success":         True,
         "broadcast_id":    broadcast.id,
-        "recipient_count": len(recipients),
+        "recipient_count": recipient_count,
         "audience_label":  audience_label,
     }, status=201)
 
@@ -647,11 +715,11 @@ def sent_history(request):
     Staff roles only (TEACHER, PRINCIPAL, OFFICIAL, ADMIN).
 
     Query params:
-      q           — search subject + message
+      q           — full-text search on subject + message, ranked by relevance
       type        — notification type
       sent_after  — ISO date, inclusive lower bound
       sent_before — ISO date, inclusive upper bound
-      page        — default 1
+      cursor      — `next` / `prev` from a previous response (omit for the first page)
       page_size   — default 20, max 100
     """
     user = request.user
@@ -659,10 +727,12 @@ def sent_history(request):
         return JsonResponse({"detail": "Forbidden"}, status=403)
 
     qs = Broadcast.objects.filter(sender=user)
+    ordering = ("-sent_at", "-id")
 
     q = request.GET.get("q", "").strip()
     if q:
-        qs = qs.filter(Q(subject__icontains=q) | Q(message__icontains=q))
+        qs = search.apply(qs, q)
+        ordering = ("-search_rank", *ordering)
 
     notif_type = request.GET.get("type", "").strip()
     if notif_type:
@@ -680,10 +750,10 @@ def sent_history(request):
         if parsed:
             qs = qs.filter(sent_at__date__lte=parsed)
 
-    page, page_size = _parse_page_params(request)
-    total      = qs.count()
-    offset     = (page - 1) * page_size
-    broadcasts = qs[offset: offset + page_size]
+    try:
+        page = pagination.paginate_request(qs, request, ordering)
+    except pagination.InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
     data = [
         {
@@ -699,15 +769,13 @@ def sent_history(request):
             "sent_at":           b.sent_at.isoformat(),
             "recipient_count":   b.recipient_count,
         }
-        for b in broadcasts
+        for b in page.items
     ]
 
-    return JsonResponse({
-        "count":       total,
-        "page":        page,
-        "total_pages": max(1, (total + page_size - 1) // page_size),
-        "results":     data,
-    })
+    response = {"results": data, **page.cursors()}
+    if not request.GET.get("cursor"):
+        response["count"] = qs.count()   # first page only, as in notification_history
+    return JsonResponse(response)
 
 
 @require_auth
@@ -723,6 +791,19 @@ def broadcast_detail(request, broadcast_id):
     if broadcast.sender != user and user.role != "ADMIN" and not user.is_superuser:
         return JsonResponse({"detail": "Forbidden"}, status=403)
 
+    if broadcast.fan_out_on_read:
+        read_count = broadcast.receipts.filter(read_at__isnull=False).count()
+        recipients = [
+            {"user_id": u["id"], "username": u["username"], "is_read": u["is_read"]}
+            for u in inbox.recipients_of(broadcast)
+            .annotate(is_read=Exists(BroadcastReceipt.objects.filter(
+                broadcast=broadcast, user=OuterRef("pk"), read_at__isnull=False,
+            )))
+            .order_by("username")
+            .values("id", "username", "is_read")[:50]
+        ]
+        return JsonResponse(_broadcast_detail_payload(broadcast, read_count, recipients))
+
     notifs = (
         broadcast.notifications
         .select_related("user")
@@ -734,10 +815,16 @@ def broadcast_detail(request, broadcast_id):
     agg = broadcast.notifications.aggregate(
         read=_Count("id", filter=_Q(is_read=True))
     )
-    read_count   = agg["read"] or 0
-    unread_count = broadcast.recipient_count - read_count
+    read_count = agg["read"] or 0
+    recipients = [
+        {"user_id": n.user_id, "username": n.user.username, "is_read": n.is_read}
+        for n in notifs
+    ]
+    return JsonResponse(_broadcast_detail_payload(broadcast, read_count, recipients))
 
-    return JsonResponse({
+
+def _broadcast_detail_payload(broadcast, read_count, recipients) -> dict:
+    return {
         "id":                broadcast.id,
         "subject":           broadcast.subject,
         "message":           broadcast.message,
@@ -750,12 +837,9 @@ def broadcast_detail(request, broadcast_id):
         "sent_at":           broadcast.sent_at.isoformat(),
         "recipient_count":   broadcast.recipient_count,
         "read_count":        read_count,
-        "unread_count":      unread_count,
-        "recipients": [
-            {"user_id": n.user_id, "username": n.user.username, "is_read": n.is_read}
-            for n in notifs
-        ],
-    })
+        "unread_count":      broadcast.recipient_count - read_count,
+        "recipients":        recipients,
+    }
 
 
 # ─────────────────────────────────────────────────────────────────────────────
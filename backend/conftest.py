@@ -7,6 +7,14 @@ import pytest
 from django.test import Client
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # Cached state is keyed by row IDs, which repeat across rolled-back tests.
+    # Clearing the catalog tier clears its local LRU and the default cache.
+    from django.core.cache import caches
+    caches["catalog"].clear()
+
+
 @pytest.fixture
 def district(db):
     from apps.academics.models import District
@@ -0,0 +1,108 @@
+"""
+gyangrit/cache_keys.py
+
+Generation-versioned cache keys for payloads shared by a scope.
+
+A list of courses depends on the viewer's grade and subjects, not on who
+they are; a section list depends on their institution. Keying such
+payloads by user stores one identical copy per user and nothing ever
+invalidates them. Instead, key by the scope that determines the payload
+and embed a generation counter for every model it was built from:
+
+    key = cache_keys.scoped("courses", f"g{grade}:s{cache_keys.id_set(subject_ids)}",
+                            models=("content.course",))
+    # → "courses:g10:s3f1c...:1718000000000.1718000000042"
+
+Every save/delete of a tracked model bumps its generation (signals wired
+by connect_signals(), called from AccesscontrolConfig.ready), so the next
+read builds a fresh key — correct immediately after an edit, with no
+delete fan-out. Orphaned entries simply expire.
+
+Generations are read through the "catalog" cache (gyangrit.tiered_cache),
+so building a key is normally a local-tier hit, not a Redis round trip.
+The shared copy lives in Redis with no timeout, seeded from the clock so
+an evicted counter can never come back at an old value. bump() goes
+through the same tier: it evicts this worker's copy and publishes the
+invalidation to the others (LOCAL_TTL bounds the lag if that is missed).
+Writers that skip signals (bulk_create, queryset.update, seed commands)
+call bump() themselves or rely on the payload TTL.
+"""
+import hashlib
+import time
+
+from django.core.cache import caches
+
+# Models whose generation can be embedded in a key (app_label.model_name)
+TRACKED_MODELS = (
+    "academics.district",
+    "academics.institution",
+    "academics.classroom",
+    "academics.section",
+    "academics.subject",
+    "academics.classsubject",
+    "content.course",
+)
+
+
+def _gen_key(label: str) -> str:
+    return f"gen:{label}"
+
+
+def _seed() -> int:
+    return int(time.time() * 1000)
+
+
+def generations(labels) -> list[int]:
+    """Current generation of each model label (one cache round trip)."""
+    catalog = caches["catalog"]
+    keys = [_gen_key(label) for label in labels]
+    found = catalog.get_many(keys)
+    for key in keys:
+        if key not in found:
+            catalog.add(key, _seed(), timeout=None)
+            found[key] = catalog.get(key)
+    return [found[key] for key in keys]
+
+
+def bump(label: str) -> None:
+    catalog = caches["catalog"]
+    key = _gen_key(label)
+    try:
+        catalog.incr(key)
+    except ValueError:
+        catalog.set(key, _seed(), timeout=None)
+
+
+def id_set(ids) -> str:
+    """Short stable token for a set of IDs (order-insensitive)."""
+    raw = ",".join(str(i) for i in sorted(ids))
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def token(value) -> str:
+    """Key-safe token for free text (district names contain spaces)."""
+    return hashlib.sha1(str(value).encode()).hexdigest()[:12]
+
+
+def scoped(name: str, scope: str, models) -> str:
+    """Cache key for payload `name` in `scope`, valid until any of `models` changes."""
+    gens = ".".join(str(g) for g in generations(models))
+    return f"{name}:{scope}:{gens}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Signals
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _bump_on_change(sender, **kwargs):
+    bump(sender._meta.label_lower)
+
+
+def connect_signals() -> None:
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    for label in TRACKED_MODELS:
+        model = apps.get_model(label)
+        for signal in (post_save, post_delete):
+            signal.connect(_bump_on_change, sender=model, dispatch_uid=f"cache_gen:{label}")
@@ -0,0 +1,232 @@
+"""
+gyangrit/http_client.py
+
+Shared pooled HTTP client for outbound integrations (Ably REST, LiveKit
+Twirp, QStash, AI providers, Fast2SMS).
+
+Module-level requests.post() builds a throwaway Session per call, so every
+publish paid a fresh TCP + TLS handshake. Here each worker process keeps one
+requests.Session with an HTTPAdapter per known host:
+
+  keep-alive    connections are returned to the host's pool and reused
+  limits        pool_maxsize = connections kept alive per host
+  timeouts      (connect, read) per host; a caller's scalar timeout= only
+                replaces the read part, so connects always fail fast
+
+Usage mirrors requests — exceptions are still requests.RequestException:
+
+    from gyangrit import http_client
+    resp = http_client.post(url, json=..., headers=..., timeout=5)
+
+Metrics (per worker process, see stats()):
+  requests, new connections, reuse ratio = 1 - connections / requests,
+  average / max TCP+TLS connect time, errors — per host.
+
+The session is dropped in forked children (gunicorn preload_app), so
+workers never share sockets opened by the master.
+"""
+import logging
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# host → pool size and (connect, read) timeouts. The LiveKit host comes from
+# settings.LIVEKIT_URL; settings.HTTP_CLIENT_HOSTS entries are merged over
+# these. Unknown hosts use "default".
+_HOSTS = {
+    "default":                           {"pool": 4,  "connect": 3.05, "read": 10},
+    "rest.ably.io":                      {"pool": 20, "connect": 3.05, "read": 5},
+    "qstash.upstash.io":                 {"pool": 4,  "connect": 3.05, "read": 5},
+    "api.bayofassets.com":               {"pool": 10, "connect": 3.05, "read": 15},
+    "api.groq.com":                      {"pool": 10, "connect": 3.05, "read": 15},
+    "api.together.xyz":                  {"pool": 10, "connect": 3.05, "read": 15},
+    "generativelanguage.googleapis.com": {"pool": 10, "connect": 3.05, "read": 15},
+    "www.fast2sms.com":                  {"pool": 4,  "connect": 3.05, "read": 4},
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats: dict[str, dict] = {}
+_stats_lock = threading.Lock()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Metrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _bump(host: str, **deltas) -> None:
+    with _stats_lock:
+        row = _stats.setdefault(host, {
+            "requests": 0, "connections": 0, "errors": 0,
+            "connect_seconds": 0.0, "connect_max": 0.0,
+        })
+        for field, value in deltas.items():
+            if field == "connect_max":
+                row[field] = max(row[field], value)
+            else:
+                row[field] += value
+
+
+def stats() -> dict:
+    """Per-host counters for this worker process."""
+    with _stats_lock:
+        rows = {host: dict(row) for host, row in _stats.items()}
+    hosts = {}
+    for host, row in sorted(rows.items()):
+        requests_, conns = row["requests"], row["connections"]
+        hosts[host] = {
+            "requests":        requests_,
+            "connections":     conns,
+            "errors":          row["errors"],
+            "reuse_ratio":     round(1 - conns / requests_, 3) if requests_ else None,
+            "avg_connect_ms":  round(row["connect_seconds"] / conns * 1000, 1) if conns else None,
+            "max_connect_ms":  round(row["connect_max"] * 1000, 1),
+        }
+    return {"pid": os.getpid(), "hosts": hosts}
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+class _TimedConnectMixin:
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        elapsed = time.perf_counter() - start
+        _bump(self.host, connections=1, connect_seconds=elapsed, connect_max=elapsed)
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _HTTPPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _HTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report their connect time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _HTTPPool, "https": _HTTPSPool}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Session
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _host_table() -> dict[str, dict]:
+    table = {host: dict(config) for host, config in _HOSTS.items()}
+    livekit_host = urlsplit(
+        getattr(settings, "LIVEKIT_URL", "").replace("wss://", "https://")
+    ).hostname
+    if livekit_host:
+        table.setdefault(livekit_host, {"pool": 10, "connect": 3.05, "read": 10})
+    for host, config in getattr(settings, "HTTP_CLIENT_HOSTS", {}).items():
+        table.setdefault(host, {}).update(config)
+    return table
+
+
+def _host_config(host: str) -> dict:
+    table = _host_table()
+    return {**table["default"], **table.get(host, {})}
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    # Shared across threads — never carry one integration's cookies into another call
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    default = _host_config("default")
+    for scheme in ("https://", "http://"):
+        session.mount(scheme, _PooledAdapter(pool_connections=16, pool_maxsize=default["pool"]))
+
+    for host in _host_table():
+        if host != "default":
+            session.mount(f"https://{host}/", _PooledAdapter(
+                pool_connections=1, pool_maxsize=_host_config(host)["pool"],
+            ))
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return this process's pooled Session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def reset_session() -> None:
+    """Close and drop the pooled Session (after fork, or when settings change)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def _drop_after_fork() -> None:
+    # Sockets opened by the parent must not be shared with the child
+    # (fresh locks too — the parent may have forked while holding one).
+    global _session, _session_lock, _stats, _stats_lock
+    _session, _session_lock = None, threading.Lock()
+    _stats, _stats_lock = {}, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_after_fork)
+
+
+def _timeout(host: str, timeout) -> tuple[float, float] | float:
+    config = _host_config(host)
+    if timeout is None:
+        return config["connect"], config["read"]
+    if isinstance(timeout, (int, float)):
+        return min(config["connect"], timeout), timeout
+    return timeout
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Requests
+# ─────────────────────────────────────────────────────────────────────────────
+
+def request(method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+    host = urlsplit(url).hostname or ""
+    _bump(host, requests=1)
+    try:
+        return get_session().request(method, url, timeout=_timeout(host, timeout), **kwargs)
+    except requests.RequestException:
+        _bump(host, errors=1)
+        raise
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
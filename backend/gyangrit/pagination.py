@@ -0,0 +1,157 @@
+"""
+gyangrit/pagination.py
+
+Keyset (cursor) pagination for list endpoints.
+
+OFFSET n makes the database walk and discard n rows, so page 500 of a
+history is 500x slower than page 1. Keyset pagination instead remembers the
+sort key of the last row served and asks for rows strictly after it —
+every page costs the same, served from the (sort key, id) index.
+
+    page = paginate_request(qs, request, ordering=("-sent_at", "-id"))
+    return JsonResponse({"results": [...page.items], **page.cursors()})
+
+The ordering must end in a unique field (id) so the key is total. Cursors
+are opaque url-safe tokens carrying the key of the edge row and a
+direction; clients pass `next` / `prev` back verbatim as ?cursor=.
+A malformed cursor raises InvalidCursor (a ValueError) — views answer 400.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+NEXT = "n"
+PREV = "p"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cursor tokens
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _dump(value):
+    return {"dt": value.isoformat()} if isinstance(value, datetime) else value
+
+
+def _load(value):
+    return datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+
+
+def encode_cursor(values, direction: str) -> str:
+    raw = json.dumps({"k": [_dump(v) for v in values], "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[list, str]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        values, direction = [_load(v) for v in data["k"]], data["d"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor")
+    if direction not in (NEXT, PREV):
+        raise InvalidCursor("Invalid cursor")
+    return values, direction
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Keyset filter
+# ─────────────────────────────────────────────────────────────────────────────
+
+def reverse_ordering(ordering) -> list[str]:
+    return [f[1:] if f.startswith("-") else f"-{f}" for f in ordering]
+
+
+def keyset_q(ordering, values, inclusive: bool = False) -> Q:
+    """
+    Rows that sort after `values` in `ordering`:
+      (a > va) OR (a = va AND b > vb) OR ...   (< for "-" fields)
+    inclusive=True also admits rows equal on every field.
+    """
+    branches, equal = [], Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        op = "lt" if field.startswith("-") else "gt"
+        branches.append(equal & Q(**{f"{name}__{op}": value}))
+        equal &= Q(**{name: value})
+    if inclusive:
+        branches.append(equal)
+    return reduce(or_, branches)
+
+
+def sort_key(item, ordering) -> list:
+    names = [f.lstrip("-") for f in ordering]
+    if isinstance(item, dict):
+        return [item[n] for n in names]
+    return [getattr(item, n) for n in names]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pages
+# ─────────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class CursorPage:
+    items: list
+    next: str | None
+    prev: str | None
+
+    def cursors(self) -> dict:
+        return {"next": self.next, "prev": self.prev}
+
+
+def page_from_rows(rows: list, size: int, direction: str | None, key) -> CursorPage:
+    """
+    Build a CursorPage from up to size+1 rows fetched in request direction
+    (reversed ordering for PREV). key(item) → sort-key values for a cursor.
+    """
+    has_more = len(rows) > size
+    items = rows[:size]
+    if direction == PREV:
+        items.reverse()
+        return CursorPage(
+            items,
+            next=encode_cursor(key(items[-1]), NEXT) if items else None,
+            prev=encode_cursor(key(items[0]), PREV) if has_more else None,
+        )
+    return CursorPage(
+        items,
+        next=encode_cursor(key(items[-1]), NEXT) if has_more else None,
+        prev=encode_cursor(key(items[0]), PREV) if direction == NEXT and items else None,
+    )
+
+
+def paginate(qs, cursor: str | None, size: int, ordering) -> CursorPage:
+    """One page of qs in `ordering`, starting after / before `cursor`."""
+    direction = None
+    if cursor:
+        values, direction = decode_cursor(cursor)
+        if len(values) != len(ordering):
+            raise InvalidCursor("Invalid cursor")
+        if direction == PREV:
+            ordering = reverse_ordering(ordering)
+        qs = qs.filter(keyset_q(ordering, values))
+    rows = list(qs.order_by(*ordering)[:size + 1])
+    return page_from_rows(rows, size, direction, key=lambda item: sort_key(item, ordering))
+
+
+def page_params(request, default_size: int = 20, max_size: int = 100) -> tuple[str | None, int]:
+    """Parse ?cursor= and ?page_size= safely, returning (cursor, page_size)."""
+    try:
+        size = min(max_size, max(1, int(request.GET.get("page_size", default_size))))
+    except (ValueError, TypeError):
+        size = default_size
+    return request.GET.get("cursor") or None, size
+
+
+def paginate_request(qs, request, ordering, default_size: int = 20, max_size: int = 100) -> CursorPage:
+    cursor, size = page_params(request, default_size, max_size)
+    return paginate(qs, cursor, size, ordering)
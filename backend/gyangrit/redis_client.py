@@ -0,0 +1,63 @@
+"""
+gyangrit/redis_client.py
+
+Shared raw Redis connection for features that need more than the Django
+cache API (lists, sorted sets, sets, locks).
+
+get_redis() returns a process-wide redis.Redis client built from
+settings.REDIS_URL, or None when Redis is not configured / the redis package
+is not installed (dev + test). Every caller MUST handle None and fall back to
+its DB or in-process path.
+
+redis-py's connection pool is thread-safe and re-creates its connections
+after fork, so this is safe with gunicorn preload_app + gthread workers.
+"""
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_UNAVAILABLE = object()
+_client = None
+_client_lock = threading.Lock()
+
+
+def _connect():
+    url = getattr(settings, "REDIS_URL", "").strip()
+    if not url:
+        return _UNAVAILABLE
+    try:
+        import redis
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is not installed.")
+        return _UNAVAILABLE
+
+    options = {
+        "socket_connect_timeout": 5,
+        "socket_timeout":         15,   # must exceed the longest blocking pop (jobs: 5s)
+        "health_check_interval":  30,
+        "decode_responses":       True,
+    }
+    if url.startswith("rediss://"):
+        # Upstash terminates TLS with a cert chain redis-py can't always verify
+        options["ssl_cert_reqs"] = None
+    return redis.Redis.from_url(url, **options)
+
+
+def get_redis():
+    """Return the shared Redis client, or None if Redis is unavailable."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _connect()
+    return None if _client is _UNAVAILABLE else _client
+
+
+def reset_redis() -> None:
+    """Drop the cached client — used by tests that flip settings.REDIS_URL."""
+    global _client
+    with _client_lock:
+        _client = None
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     "apps.livesessions.apps.LiveSessionsConfig",
     "apps.ai_assistant.apps.AiAssistantConfig",
     "apps.analytics.apps.AnalyticsConfig",
+    "apps.jobs.apps.JobsConfig",
 ]
 
 AUTH_USER_MODEL = "accounts.User"
@@ -60,11 +61,13 @@ MIDDLEWARE = [
     # WhiteNoise: serves static files in production without a separate web server.
     # Must be right after SecurityMiddleware and before all others.
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # Sliding expiry: saves the session only when modified or due a refresh
+    "apps.accounts.sessions.SlidingSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "apps.accounts.middleware.SingleActiveSessionMiddleware",
+    "apps.accesscontrol.middleware.UserContextMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -164,6 +167,28 @@ REST_FRAMEWORK = {
     ],
 }
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Caches
+# dev.py / prod.py point "default" at Upstash Redis when configured. "catalog"
+# is a per-worker LRU in front of "default" for read-mostly catalog data
+# (gyangrit.tiered_cache) — every CACHES override must keep it.
+# ─────────────────────────────────────────────────────────────────────────────
+
+CATALOG_CACHE = {
+    "BACKEND":  "gyangrit.tiered_cache.TieredCache",
+    "LOCATION": "catalog",
+    "TIMEOUT":  600,
+    "OPTIONS": {
+        "REMOTE":            "default",
+        "LOCAL_MAX_ENTRIES": 1000,
+        "LOCAL_TTL":         30,
+    },
+}
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "catalog": CATALOG_CACHE,
+}
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Sessions & CSRF
 # Base (dev) defaults. prod.py overrides these with Secure + SameSite=None
@@ -177,7 +202,10 @@ CSRF_COOKIE_SAMESITE     = "Lax"
 SESSION_COOKIE_SECURE    = False   # overridden to True in prod.py
 CSRF_COOKIE_SECURE       = False   # overridden to True in prod.py
 SESSION_COOKIE_AGE       = 3600    # 1 hour
-SESSION_SAVE_EVERY_REQUEST = True
+# Sliding expiry (apps.accounts.sessions): an unmodified session is re-saved,
+# and its cookie re-issued, only after this fraction of SESSION_COOKIE_AGE.
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_FRACTION   = 0.25
 
 # Custom cookie names — prevent collision with Django admin session
 SESSION_COOKIE_NAME = "gyangrit_sessionid"
@@ -246,6 +274,8 @@ TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER", "")
 # ─────────────────────────────────────────────────────────────────────────────
 
 ABLY_API_KEY = os.getenv("ABLY_API_KEY", "")
+# "ably" (REST batch publish) | "local" (in-process stand-in broker — tests/offline dev)
+REALTIME_BACKEND = os.getenv("REALTIME_BACKEND", "ably")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Django Unfold — admin theme
@@ -361,6 +391,33 @@ VAPID_PRIVATE_KEY    = os.environ.get("VAPID_PRIVATE_KEY", "")
 VAPID_PUBLIC_KEY     = os.environ.get("VAPID_PUBLIC_KEY", "")
 VAPID_CLAIMS_EMAIL   = os.environ.get("VAPID_CLAIMS_EMAIL", "mailto:admin@gyangrit.com")
 
+# ── Background jobs (apps.jobs) ──────────────────────────────────────────────
+# Backend: "redis" (prod, needs REDIS_URL) | "database" | "memory" (in-process, dev).
+# Workers: python manage.py run_workers  — see COMMANDS.md.
+# REDIS_URL is the raw Redis connection (gyangrit.redis_client) shared by
+# features that need lists / sorted sets; prod.py / dev.py set it from Upstash.
+REDIS_URL          = ""
+JOBS_BACKEND       = os.environ.get("JOBS_BACKEND", "memory")
+JOBS_ALWAYS_EAGER  = False
+JOBS_QUEUES        = ["critical", "default"]   # priority order
+JOBS_CONCURRENCY   = int(os.environ.get("JOBS_CONCURRENCY", "4"))
+JOBS_MAX_ATTEMPTS  = 3
+JOBS_RETRY_BACKOFF = 5                          # seconds, doubled per attempt
+
+# ── Heartbeat ingestion (apps.analytics.ingest) ──────────────────────────────
+# Heartbeats are summed in Redis (or per-process when Redis is absent) and
+# upserted in bulk every N seconds. 0 = write each heartbeat immediately.
+HEARTBEAT_FLUSH_INTERVAL = int(os.environ.get("HEARTBEAT_FLUSH_INTERVAL", "5"))
+
+# ── Competition rooms (apps.competitions.scoreboard) ─────────────────────────
+# Live room:scores broadcasts are coalesced to at most one per interval (seconds).
+COMPETITION_SCORES_INTERVAL = 0.5
+
+# ── Outbound HTTP (gyangrit.http_client) ─────────────────────────────────────
+# Per-host overrides for the pooled client, merged over its built-in table:
+#   {"rest.ably.io": {"pool": 40, "connect": 2, "read": 5}}
+HTTP_CLIENT_HOSTS = {}
+
 # ── QStash (Upstash) — scheduled delayed tasks for session reminders ─────────
 QSTASH_TOKEN     = os.environ.get("UPSTASH_QSTASH_QSTASH_TOKEN", "")
 BACKEND_BASE_URL = os.environ.get("BACKEND_BASE_URL", "https://gyangrit.onrender.com")
@@ -63,10 +63,12 @@ if UPSTASH_REDIS_URL:
                     "ssl_cert_reqs": None,
                 },
                 "TIMEOUT": 300,
-            }
+            },
+            "catalog": CATALOG_CACHE,
         }
         SESSION_ENGINE = "django.contrib.sessions.backends.cache"
         SESSION_CACHE_ALIAS = "default"
+        REDIS_URL = UPSTASH_REDIS_URL
     except ImportError:
         pass
 else:
@@ -74,5 +76,6 @@ else:
         "default": {
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
             "LOCATION": "gyangrit-local-dev",
-        }
+        },
+        "catalog": CATALOG_CACHE,
     }
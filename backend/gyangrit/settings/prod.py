@@ -150,14 +150,20 @@ if UPSTASH_REDIS_URL:
                     "ssl_cert_reqs": None,
                 },
                 "TIMEOUT": 300,  # default 5 min TTL
-            }
+            },
+            "catalog": CATALOG_CACHE,
         }
         SESSION_ENGINE = "django.contrib.sessions.backends.cache"
         SESSION_CACHE_ALIAS = "default"
+        REDIS_URL = UPSTASH_REDIS_URL
         logger.info("Redis cache enabled (Upstash). Sessions stored in Redis.")
     except ImportError:
         logger.warning("redis package not installed — using default DB sessions.")
 
+# Background jobs: Redis queue when available, otherwise the DB job table.
+# Never "memory" in prod — jobs must survive gunicorn worker recycling.
+JOBS_BACKEND = os.environ.get("JOBS_BACKEND", "redis" if REDIS_URL else "database")
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Static files — WhiteNoise
 # ─────────────────────────────────────────────────────────────────────────────
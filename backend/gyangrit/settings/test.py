@@ -22,9 +22,24 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "gyangrit-test",
-    }
+    },
+    "catalog": CATALOG_CACHE,  # noqa: F405
 }
 
+# ── Background jobs run inline ────────────────────────────────────────────────
+JOBS_BACKEND      = "memory"
+JOBS_ALWAYS_EAGER = True
+
+# ── Single-flight background refreshes run inline (gyangrit.single_flight) ────
+SINGLE_FLIGHT_INLINE = True
+
+# ── Realtime publishes go to the in-process broker (apps.notifications.realtime)
+REALTIME_BACKEND = "local"
+
+# ── Heartbeats written immediately, no throttled score broadcasts ─────────────
+HEARTBEAT_FLUSH_INTERVAL = 0
+COMPETITION_SCORES_INTERVAL = 0
+
 # ── Console email ─────────────────────────────────────────────────────────────
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
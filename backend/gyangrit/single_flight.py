@@ -0,0 +1,184 @@
+"""
+gyangrit/single_flight.py
+
+Stampede-safe get-or-compute for expensive cached payloads.
+
+Plain get → compute → set lets every concurrent request recompute a heavy
+aggregate the moment its key expires. get_or_compute() instead keeps two
+deadlines per entry and lets only one request per key compute:
+
+    data = single_flight.get_or_compute(
+        f"teacher_course_analytics:{user.id}", build,
+        soft_ttl=300, hard_ttl=900,
+    )
+
+  fresh   (age < soft_ttl)   served from cache
+  stale   (soft ≤ age < hard) served from cache; the request that takes
+                              the key's lock recomputes in a background
+                              thread, everyone else keeps getting stale
+  missing (age ≥ hard_ttl)    the lock holder computes inline; the others
+                              wait up to WAIT_SECONDS for its result, then
+                              give up and compute themselves
+
+The lock is cache.add("flight:<key>") — SET NX on Redis, so it holds
+across workers — with LOCK_TIMEOUT as a safety expiry if its holder dies.
+
+With settings.SINGLE_FLIGHT_INLINE (tests), background refreshes run
+inline so they share the test's database connection.
+
+Metrics (per worker process, see stats()): fresh / stale / missing reads,
+computes, background refreshes, waits served by another worker's compute,
+wait timeouts and compute errors — per key family (the key up to its
+first ":").
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = 60
+WAIT_SECONDS = 5.0
+_POLL_SECONDS = 0.05
+
+_stats: dict[str, dict] = {}
+_stats_lock = threading.Lock()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Metrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _bump(key: str, field: str) -> None:
+    with _stats_lock:
+        row = _stats.setdefault(key.split(":", 1)[0], {
+            "fresh": 0, "stale": 0, "missing": 0, "computes": 0, "refreshes": 0,
+            "waited": 0, "wait_timeouts": 0, "errors": 0,
+        })
+        row[field] += 1
+
+
+def stats() -> dict:
+    """Per key-family stampede counters for this worker process."""
+    with _stats_lock:
+        families = {family: dict(row) for family, row in sorted(_stats.items())}
+    return {"pid": os.getpid(), "families": families}
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Lock
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _acquire(key: str) -> str | None:
+    token = uuid.uuid4().hex
+    return token if cache.add(f"flight:{key}", token, timeout=LOCK_TIMEOUT) else None
+
+
+def _release(key: str, token: str) -> None:
+    if cache.get(f"flight:{key}") == token:
+        cache.delete(f"flight:{key}")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Compute
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _entry(raw):
+    # Values cached by plain cache.set() before a view moved to
+    # get_or_compute() lack the envelope — treat them as missing
+    if isinstance(raw, dict) and "fresh_until" in raw:
+        return raw
+    return None
+
+
+def _store(key, compute, soft_ttl, hard_ttl):
+    value = compute()
+    cache.set(key, {"value": value, "fresh_until": time.time() + soft_ttl}, timeout=hard_ttl)
+    _bump(key, "computes")
+    return value
+
+
+def _refresh(key, compute, soft_ttl, hard_ttl, token):
+    try:
+        _store(key, compute, soft_ttl, hard_ttl)
+    except Exception:
+        _bump(key, "errors")
+        logger.exception("Background refresh of %s failed — serving stale until hard expiry.", key)
+    finally:
+        _release(key, token)
+
+
+def _refresh_in_background(key, compute, soft_ttl, hard_ttl, token):
+    if getattr(settings, "SINGLE_FLIGHT_INLINE", False):
+        _refresh(key, compute, soft_ttl, hard_ttl, token)
+        return
+
+    def run():
+        try:
+            _refresh(key, compute, soft_ttl, hard_ttl, token)
+        finally:
+            # The thread's connections die with it — close them now, whatever
+            # CONN_MAX_AGE says (close_old_connections would keep them open)
+            connections.close_all()
+
+    threading.Thread(target=run, name=f"refresh:{key}", daemon=True).start()
+
+
+def get_or_compute(key: str, compute, soft_ttl: float, hard_ttl: float):
+    """
+    Cached value of compute() under key — fresh for soft_ttl seconds,
+    served stale while one request refreshes it until hard_ttl.
+    """
+    entry = _entry(cache.get(key))
+    if entry is not None:
+        if time.time() < entry["fresh_until"]:
+            _bump(key, "fresh")
+            return entry["value"]
+        _bump(key, "stale")
+        token = _acquire(key)
+        if token:
+            _bump(key, "refreshes")
+            _refresh_in_background(key, compute, soft_ttl, hard_ttl, token)
+        return entry["value"]
+
+    _bump(key, "missing")
+    token = _acquire(key)
+    if token is None:
+        # Another request is computing — wait for its result
+        deadline = time.monotonic() + WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(_POLL_SECONDS)
+            entry = _entry(cache.get(key))
+            if entry is not None:
+                _bump(key, "waited")
+                return entry["value"]
+        _bump(key, "wait_timeouts")
+        return _store(key, compute, soft_ttl, hard_ttl)
+
+    try:
+        return _store(key, compute, soft_ttl, hard_ttl)
+    except Exception:
+        _bump(key, "errors")
+        raise
+    finally:
+        _release(key, token)
+
+
+def _drop_after_fork() -> None:
+    global _stats, _stats_lock
+    _stats, _stats_lock = {}, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_after_fork)
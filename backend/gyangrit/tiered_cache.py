@@ -0,0 +1,307 @@
+"""
+gyangrit/tiered_cache.py
+
+Two-tier Django cache backend: a bounded in-process LRU in front of a
+remote cache alias (Upstash Redis in production).
+
+A remote GET over TLS often costs as much as the query it saves. For
+read-mostly catalog data (subjects, districts, sections, courses, lesson
+lists) each worker keeps recently read values in memory for a few seconds:
+
+    from django.core.cache import caches
+    catalog = caches["catalog"]
+    data = catalog.get(key)          # local → remote → None
+
+Configuration (settings.CACHES):
+
+    "catalog": {
+        "BACKEND": "gyangrit.tiered_cache.TieredCache",
+        "TIMEOUT": 600,
+        "OPTIONS": {
+            "REMOTE":            "default",   # alias of the shared cache
+            "LOCAL_MAX_ENTRIES": 1000,        # LRU bound per worker
+            "LOCAL_TTL":         30,          # max seconds a local copy lives
+        },
+    }
+
+Django builds one backend instance per thread; the local tier underneath
+is shared per alias by the whole worker process. Local copies are pickled
+on write and unpickled on read, so callers can mutate what they get
+without corrupting the tier. A local copy lives at most LOCAL_TTL seconds
+(less when set with a shorter timeout).
+
+Cross-worker invalidation: set / delete / touch publish the key on the
+Redis channel "cache:invalidate:<alias>"; every worker runs a daemon
+listener that evicts the key locally. Without Redis (dev, tests) there is
+one process and nothing to tell. If the listener is down, LOCAL_TTL still
+bounds how long a worker can serve an old copy.
+
+Metrics (per worker process, see stats()): local hits, remote hits and
+misses per key family — the key up to its first ":" ("courses",
+"subjects_list", ...) — so the table stays small however many users.
+"""
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL = "cache:invalidate:{alias}"
+
+_stats: dict[str, dict] = {}
+_stats_lock = threading.Lock()
+
+# Identifies this process's own invalidation messages
+_origin = uuid.uuid4().hex
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Metrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _family(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+def _bump(alias: str, key: str, field: str) -> None:
+    with _stats_lock:
+        row = _stats.setdefault(f"{alias}:{_family(key)}", {
+            "local_hits": 0, "remote_hits": 0, "misses": 0, "sets": 0, "evictions": 0,
+        })
+        row[field] += 1
+
+
+def stats() -> dict:
+    """Per key-family counters for this worker process."""
+    with _stats_lock:
+        rows = {family: dict(row) for family, row in _stats.items()}
+    families = {}
+    for family, row in sorted(rows.items()):
+        reads = row["local_hits"] + row["remote_hits"] + row["misses"]
+        families[family] = {
+            **row,
+            "local_hit_ratio": round(row["local_hits"] / reads, 3) if reads else None,
+            "hit_ratio":       round((reads - row["misses"]) / reads, 3) if reads else None,
+        }
+    return {"pid": os.getpid(), "families": families}
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Backend
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _LocalTier:
+    """One bounded LRU per alias per process, shared by every thread."""
+
+    def __init__(self):
+        self.entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.listener_pid = None
+
+
+_tiers: dict[str, _LocalTier] = {}
+_tiers_lock = threading.Lock()
+
+
+def _tier(alias: str) -> _LocalTier:
+    with _tiers_lock:
+        return _tiers.setdefault(alias, _LocalTier())
+
+
+class TieredCache(BaseCache):
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._alias = name or "catalog"
+        self._remote_alias = options.get("REMOTE", "default")
+        self._max_entries = int(options.get("LOCAL_MAX_ENTRIES", 1000))
+        self._local_ttl = float(options.get("LOCAL_TTL", 30))
+        self._tier = _tier(self._alias)
+
+    @property
+    def _local(self):
+        return self._tier.entries
+
+    @property
+    def _lock(self):
+        return self._tier.lock
+
+    @property
+    def remote(self):
+        return caches[self._remote_alias]
+
+    # ── local tier ────────────────────────────────────────────────────────────
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry[1]
+
+    def _local_set(self, key, value, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        ttl = self._local_ttl if timeout is None else min(self._local_ttl, timeout)
+        if ttl <= 0:
+            self._local_evict(key)
+            return
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (time.monotonic() + ttl, data)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+    def _local_evict(self, key) -> bool:
+        with self._lock:
+            return self._local.pop(key, None) is not None
+
+    # ── cross-worker invalidation ─────────────────────────────────────────────
+
+    def _publish(self, key):
+        from gyangrit.redis_client import get_redis
+
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.publish(_CHANNEL.format(alias=self._alias), f"{_origin} {key}")
+        except Exception as exc:
+            logger.warning("Cache invalidation publish failed for %s: %s", key, exc)
+
+    def _ensure_listener(self):
+        pid = os.getpid()
+        if self._tier.listener_pid == pid:
+            return
+        from gyangrit.redis_client import get_redis
+
+        with self._lock:
+            if self._tier.listener_pid == pid:
+                return
+            self._tier.listener_pid = pid
+        if get_redis() is None:
+            return
+        threading.Thread(
+            target=self._listen, name=f"cache-invalidate-{self._alias}", daemon=True,
+        ).start()
+
+    def _listen(self):
+        from gyangrit.redis_client import get_redis
+
+        channel = _CHANNEL.format(alias=self._alias)
+        while True:
+            try:
+                pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                for message in pubsub.listen():
+                    origin, _, key = str(message.get("data", "")).partition(" ")
+                    if origin != _origin and self._local_evict(key):
+                        # key is the made key "<prefix>:<version>:<key>"
+                        _bump(self._alias, key.split(":", 2)[-1], "evictions")
+            except Exception as exc:
+                logger.warning("Cache invalidation listener for %s dropped: %s", channel, exc)
+                time.sleep(1)
+
+    # ── cache API ─────────────────────────────────────────────────────────────
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._ensure_listener()
+        data = self._local_get(local_key)
+        if data is not None:
+            _bump(self._alias, key, "local_hits")
+            return pickle.loads(data)
+
+        value = self.remote.get(key, self._missing_key, version=version)
+        if value is self._missing_key:
+            _bump(self._alias, key, "misses")
+            return default
+        _bump(self._alias, key, "remote_hits")
+        self._local_set(local_key, value, self._local_ttl)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._ensure_listener()
+        self.remote.set(key, value, timeout=self._remote_timeout(timeout), version=version)
+        self._local_set(local_key, value, timeout)
+        _bump(self._alias, key, "sets")
+        self._publish(local_key)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        added = self.remote.add(key, value, timeout=self._remote_timeout(timeout), version=version)
+        if added:
+            self._local_set(local_key, value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._local_evict(local_key)
+        self._publish(local_key)
+        return self.remote.touch(key, timeout=self._remote_timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._ensure_listener()
+        self._local_evict(local_key)
+        self._publish(local_key)
+        return self.remote.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        return self._local_get(local_key) is not None or self.remote.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.remote.incr(key, delta, version=version)
+        # Evict after the write, so a read in between can't re-cache the old value
+        self._local_evict(local_key)
+        self._publish(local_key)
+        return value
+
+    def clear(self):
+        """Clear this worker's local tier and the remote cache."""
+        with self._lock:
+            self._local.clear()
+        self.remote.clear()
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _remote_timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+
+def _drop_after_fork() -> None:
+    # The parent's local copies and listener thread don't survive into workers
+    # (fresh locks too — the parent may have forked while holding one), and
+    # each worker needs its own origin to hear the others' invalidations.
+    global _tiers_lock, _stats, _stats_lock, _origin
+    _tiers_lock = threading.Lock()
+    for tier in _tiers.values():
+        tier.entries, tier.lock, tier.listener_pid = OrderedDict(), threading.Lock(), None
+    _stats, _stats_lock = {}, threading.Lock()
+    _origin = uuid.uuid4().hex
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_after_fork)
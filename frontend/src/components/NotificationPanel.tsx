@@ -3,7 +3,8 @@ import { useEffect, useRef, useState, useCallback } from "react";
 import { createPortal } from "react-dom";
 import {
   fetchNotifications,
-  markRead,
+  markItemRead,
+  inboxKey,
   markAllRead,
   type AppNotification,
 } from "../services/notifications";
@@ -170,9 +171,9 @@ export function NotificationPanel({ onClose, onUnreadChange, onViewAll }: Props)
 
   const handleItemClick = async (n: AppNotification) => {
     if (!n.is_read) {
-      markRead(n.id).catch(() => {});
+      markItemRead(n).catch(() => {});
       setNotifications((prev) =>
-        prev.map((x) => (x.id === n.id ? { ...x, is_read: true } : x))
+        prev.map((x) => (inboxKey(x) === inboxKey(n) ? { ...x, is_read: true } : x))
       );
       onUnreadChange(
         Math.max(0, notifications.filter((x) => !x.is_read).length - 1)
@@ -298,7 +299,7 @@ export function NotificationPanel({ onClose, onUnreadChange, onViewAll }: Props)
           ) : (
             notifications.map((n) => (
               <button
-                key={n.id}
+                key={inboxKey(n)}
                 onClick={() => handleItemClick(n)}
                 style={{
                   display:      "flex",
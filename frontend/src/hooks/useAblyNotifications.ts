@@ -8,8 +8,7 @@
  */
 import { useEffect, useRef } from "react";
 import { useAuth } from "../auth/AuthContext";
-import { getAblyToken } from "../services/competitions";
-import type { TokenParams, ErrorInfo, TokenDetails, TokenRequest } from "ably";
+import { ablyAuthCallback } from "../services/competitions";
 
 export function useAblyNotifications() {
   const { authenticated, user, offlineMode } = useAuth();
@@ -22,22 +21,7 @@ export function useAblyNotifications() {
     const connect = async () => {
       try {
         const { default: Ably } = await import("ably");
-        const client = new Ably.Realtime({
-          authCallback: async (
-            _data: TokenParams,
-            callback: (
-              error: ErrorInfo | string | null,
-              token: TokenDetails | TokenRequest | string | null,
-            ) => void,
-          ) => {
-            try {
-              const tokenData = await getAblyToken(undefined, "chat");
-              callback(null, tokenData.token);
-            } catch (err) {
-              callback(err instanceof Error ? err.message : "Token fetch failed", null);
-            }
-          },
-        });
+        const client = new Ably.Realtime({ authCallback: ablyAuthCallback(undefined, "chat") });
         if (!mounted) { client.close(); return; }
 
         const channel = client.channels.get(`notifications:${user.id}`);
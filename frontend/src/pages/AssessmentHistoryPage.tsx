@@ -40,23 +40,34 @@ export default function AssessmentHistoryPage() {
   // This page is used for two routes:
   //   1. /assessments/history           — all attempts across all assessments
   //   2. /assessments/:grade/:subject/:assessmentId/history — specific assessment history
-  // In case 2 the URL params are present; we filter client-side since getAllMyAttempts
-  // returns everything and the list is small enough.
+  // In case 2 the URL params are present; we filter client-side over the
+  // pages loaded so far (newest first, "Load older attempts" fetches more).
   const { assessmentId: assessmentIdParam } = useParams<{ assessmentId?: string }>();
   const assessmentIdFilter = assessmentIdParam ? Number(assessmentIdParam) : null;
 
   const [attempts, setAttempts]           = useState<AttemptWithContext[]>([]);
+  const [nextCursor, setNextCursor]       = useState<string | null>(null);
+  const [loadingMore, setLoadingMore]     = useState(false);
   const [loading, setLoading]             = useState(true);
   const [error, setError]                 = useState<string | null>(null);
   const [subjectFilter, setSubjectFilter] = useState("all");
 
   useEffect(() => {
     getAllMyAttempts()
-      .then(setAttempts)
+      .then((page) => { setAttempts(page.results); setNextCursor(page.next); })
       .catch(() => setError("Failed to load history."))
       .finally(() => setLoading(false));
   }, []);
 
+  const loadMore = () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    getAllMyAttempts(nextCursor)
+      .then((page) => { setAttempts((prev) => [...prev, ...page.results]); setNextCursor(page.next); })
+      .catch(() => setError("Failed to load history."))
+      .finally(() => setLoadingMore(false));
+  };
+
   // If we're on a per-assessment history route, pre-filter
   const base = assessmentIdFilter
     ? attempts.filter((a) => a.assessment_id === assessmentIdFilter)
@@ -174,6 +185,14 @@ export default function AssessmentHistoryPage() {
             </button>
           ))
         )}
+
+        {nextCursor && (
+          <div style={{ display: "flex", justifyContent: "center", marginTop: "var(--space-6)" }}>
+            <button className="btn btn--secondary" disabled={loadingMore} onClick={loadMore}>
+              {loadingMore ? "Loading…" : "Load older attempts"}
+            </button>
+          </div>
+        )}
     </>
   );
 }
@@ -20,7 +20,7 @@ import {
   type ChatMessage,
   type ChatRoom,
 } from "../services/chat";
-import { getAblyToken } from "../services/competitions";
+import { ablyAuthCallback, getAblyToken } from "../services/competitions";
 import { useAuth } from "../auth/AuthContext";
 
 // ── Types ─────────────────────────────────────────────────────────────────
@@ -359,8 +359,8 @@ export default function ChatRoomPage() {
     setMessages([]);
     setThreadParent(null);
     getChatHistory(activeRoom.id)
-      .then((msgs) => {
-        setMessages(msgs.map((m) => ({ ...m, replies: [] })));
+      .then(({ results }) => {
+        setMessages(results.map((m) => ({ ...m, replies: [] })));
         setTimeout(scrollToBottom, 100);
       })
       .catch(() => setError("Failed to load messages."))
@@ -377,7 +377,10 @@ export default function ChatRoomPage() {
         const tokenData = await getAblyToken(undefined, "chat");
         if (!mounted) return;
 
-        const client = new Ably.Realtime({ token: tokenData.token, clientId: tokenData.client_id });
+        const client = new Ably.Realtime({
+          authCallback: ablyAuthCallback(undefined, "chat", tokenData),
+          clientId:     tokenData.client_id,
+        });
         ablyRef.current = client;
 
         // Chat channel for active room
@@ -440,7 +443,7 @@ export default function ChatRoomPage() {
     const poll = setInterval(() => {
       if (!mounted || !activeRoom || !navigator.onLine) return;
       getChatHistory(activeRoom.id)
-        .then((msgs) => setMessages(msgs.map((m) => ({ ...m, replies: [] }))))
+        .then(({ results }) => setMessages(results.map((m) => ({ ...m, replies: [] }))))
         .catch(() => {});
     }, 5000);
 
@@ -25,6 +25,7 @@ import {
   finishRoom,
   submitAnswer,
   getAblyToken,
+  ablyAuthCallback,
   getMyCompetitionHistory,
   type CompetitionRoom,
   type Question,
@@ -368,8 +369,8 @@ export default function CompetitionRoomPage() {
         if (!mounted) return;
 
         const client = new Ably.Realtime({
-          token:    tokenData.token,
-          clientId: tokenData.client_id,
+          authCallback: ablyAuthCallback(numRoomId, undefined, tokenData),
+          clientId:     tokenData.client_id,
         });
         ablyRef.current = client;
 
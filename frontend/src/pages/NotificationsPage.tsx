@@ -19,7 +19,8 @@ import {
   getSentHistory,
   getBroadcastDetail,
   sendNotification,
-  markRead,
+  markItemRead,
+  inboxKey,
   markAllRead,
   type AudienceOptions,
   type AudienceType,
@@ -40,6 +41,8 @@ import { usePageTitle } from "../hooks/usePageTitle";
 
 // ── Constants & helpers ────────────────────────────────────────────────────
 
+const PAGE_SIZE = 20;
+
 const TYPE_COLORS: Record<string, string> = {
   info:         "var(--saffron)",
   success:      "var(--success)",
@@ -672,8 +675,10 @@ export default function NotificationsPage() {
   // ── Inbox state ──────────────────────────────────────────────────────────
   const [inbox, setInbox]           = useState<AppNotification[]>([]);
   const [inboxTotal, setInboxTotal] = useState(0);
-  const [inboxPages, setInboxPages] = useState(1);
-  const [inboxPage, setInboxPage]   = useState(1);
+  const [inboxPage, setInboxPage]   = useState(1);    // display only — paging is by cursor
+  const [inboxCursor, setInboxCursor] = useState<string | undefined>();
+  const [inboxNext, setInboxNext]   = useState<string | null>(null);
+  const [inboxPrev, setInboxPrev]   = useState<string | null>(null);
   const [inboxUnread, setInboxUnread] = useState(0);
   const [inboxLoading, setInboxLoading] = useState(false);
   const [inboxFilters, setInboxFilters] = useState<FilterState>({ q: "", type: "", sent_after: "", sent_before: "" });
@@ -693,7 +698,9 @@ export default function NotificationsPage() {
   const [sentList, setSentList]       = useState<Broadcast[]>([]);
   const [sentTotal, setSentTotal]     = useState(0);
   const [sentPage, setSentPage]       = useState(1);
-  const [sentPages, setSentPages]     = useState(1);
+  const [sentCursor, setSentCursor]   = useState<string | undefined>();
+  const [sentNext, setSentNext]       = useState<string | null>(null);
+  const [sentPrev, setSentPrev]       = useState<string | null>(null);
   const [sentLoading, setSentLoading] = useState(false);
   const [sentFilters, setSentFilters] = useState<FilterState>({ q: "", type: "", sent_after: "", sent_before: "" });
   const [broadcastDetailId, setBroadcastDetailId] = useState<number | null>(null);
@@ -708,19 +715,20 @@ export default function NotificationsPage() {
       sent_after:  inboxFilters.sent_after  || undefined,
       sent_before: inboxFilters.sent_before || undefined,
       unread_only: inboxUnreadOnly || undefined,
-      page:        inboxPage,
-      page_size:   20,
+      cursor:      inboxCursor,
+      page_size:   PAGE_SIZE,
     };
     getNotificationHistory(params)
       .then((d) => {
         if (!d) return;
         setInbox(d.results);
-        setInboxTotal(d.count);
-        setInboxPages(d.total_pages);
+        if (d.count !== undefined) setInboxTotal(d.count);   // sent with the first page only
+        setInboxNext(d.next);
+        setInboxPrev(d.prev);
         setInboxUnread(d.unread);
       })
       .finally(() => setInboxLoading(false));
-  }, [inboxFilters, inboxUnreadOnly, inboxPage]);
+  }, [inboxFilters, inboxUnreadOnly, inboxCursor]);
 
   const loadSent = useCallback(() => {
     if (!isSender) return;
@@ -730,31 +738,38 @@ export default function NotificationsPage() {
       type:        (sentFilters.type as NotificationType) || undefined,
       sent_after:  sentFilters.sent_after  || undefined,
       sent_before: sentFilters.sent_before || undefined,
-      page:        sentPage,
+      cursor:      sentCursor,
+      page_size:   PAGE_SIZE,
     })
       .then((d) => {
         if (!d) return;
         setSentList(d.results);
-        setSentTotal(d.count);
-        setSentPages(d.total_pages);
+        if (d.count !== undefined) setSentTotal(d.count);
+        setSentNext(d.next);
+        setSentPrev(d.prev);
       })
       .finally(() => setSentLoading(false));
-  }, [isSender, sentFilters, sentPage]);
+  }, [isSender, sentFilters, sentCursor]);
 
   useEffect(() => { loadInbox(); },                        [loadInbox]);
   useEffect(() => { if (activeTab === "history") loadSent(); }, [activeTab, loadSent]);
   useEffect(() => { if (isSender) getAudienceOptions().then(setOptions).catch(() => {}); }, [isSender]);
 
   // Reset page when filters change
-  const updateInboxFilters = (f: FilterState) => { setInboxFilters(f); setInboxPage(1); };
-  const updateSentFilters  = (f: FilterState) => { setSentFilters(f);  setSentPage(1);  };
+  const resetInboxPaging = () => { setInboxCursor(undefined); setInboxPage(1); };
+  const resetSentPaging  = () => { setSentCursor(undefined);  setSentPage(1);  };
+  const updateInboxFilters = (f: FilterState) => { setInboxFilters(f); resetInboxPaging(); };
+  const updateSentFilters  = (f: FilterState) => { setSentFilters(f);  resetSentPaging();  };
+
+  const inboxPages = Math.max(1, Math.ceil(inboxTotal / PAGE_SIZE));
+  const sentPages  = Math.max(1, Math.ceil(sentTotal / PAGE_SIZE));
 
   // ── Inbox actions ─────────────────────────────────────────────────────────
 
   const handleInboxItemClick = async (n: AppNotification) => {
     if (!n.is_read) {
-      markRead(n.id).catch(() => {});
-      setInbox((prev) => prev.map((x) => x.id === n.id ? { ...x, is_read: true } : x));
+      markItemRead(n).catch(() => {});
+      setInbox((prev) => prev.map((x) => inboxKey(x) === inboxKey(n) ? { ...x, is_read: true } : x));
       setInboxUnread((c) => Math.max(0, c - 1));
     }
     setDetailNotif(n);
@@ -888,7 +903,7 @@ export default function NotificationsPage() {
               onChange={updateInboxFilters}
               showUnreadToggle
               unreadOnly={inboxUnreadOnly}
-              onUnreadToggle={() => { setInboxUnreadOnly((v) => !v); setInboxPage(1); }}
+              onUnreadToggle={() => { setInboxUnreadOnly((v) => !v); resetInboxPaging(); }}
             />
 
             {inboxLoading ? (
@@ -912,16 +927,16 @@ export default function NotificationsPage() {
             ) : (
               <div style={{ display: "flex", flexDirection: "column", gap: "var(--space-3)" }}>
                 {inbox.map((n) => (
-                  <InboxRow key={n.id} n={n} onClick={handleInboxItemClick} />
+                  <InboxRow key={inboxKey(n)} n={n} onClick={handleInboxItemClick} />
                 ))}
               </div>
             )}
 
-            {inboxPages > 1 && (
+            {(inboxNext || inboxPrev) && (
               <div style={{ display: "flex", justifyContent: "center", gap: "var(--space-3)", marginTop: "var(--space-8)", alignItems: "center" }}>
-                <button className="btn btn--secondary" disabled={inboxPage <= 1} onClick={() => setInboxPage((p) => p - 1)}>← Previous</button>
+                <button className="btn btn--secondary" disabled={!inboxPrev} onClick={() => { setInboxCursor(inboxPrev ?? undefined); setInboxPage((p) => p - 1); }}>← Previous</button>
                 <span style={{ fontSize: "var(--text-sm)", color: "var(--ink-muted)" }}>{inboxPage} / {inboxPages}</span>
-                <button className="btn btn--secondary" disabled={inboxPage >= inboxPages} onClick={() => setInboxPage((p) => p + 1)}>Next →</button>
+                <button className="btn btn--secondary" disabled={!inboxNext} onClick={() => { setInboxCursor(inboxNext ?? undefined); setInboxPage((p) => p + 1); }}>Next →</button>
               </div>
             )}
           </>
@@ -1045,11 +1060,11 @@ export default function NotificationsPage() {
                 <div style={{ display: "flex", flexDirection: "column", gap: "var(--space-3)" }}>
                   {sentList.map((b) => <SentCard key={b.id} b={b} onClick={(x) => setBroadcastDetailId(x.id)} />)}
                 </div>
-                {sentPages > 1 && (
+                {(sentNext || sentPrev) && (
                   <div style={{ display: "flex", justifyContent: "center", gap: "var(--space-3)", marginTop: "var(--space-8)", alignItems: "center" }}>
-                    <button className="btn btn--secondary" disabled={sentPage <= 1} onClick={() => setSentPage((p) => p - 1)}>← Previous</button>
+                    <button className="btn btn--secondary" disabled={!sentPrev} onClick={() => { setSentCursor(sentPrev ?? undefined); setSentPage((p) => p - 1); }}>← Previous</button>
                     <span style={{ fontSize: "var(--text-sm)", color: "var(--ink-muted)" }}>{sentPage} / {sentPages}</span>
-                    <button className="btn btn--secondary" disabled={sentPage >= sentPages} onClick={() => setSentPage((p) => p + 1)}>Next →</button>
+                    <button className="btn btn--secondary" disabled={!sentNext} onClick={() => { setSentCursor(sentNext ?? undefined); setSentPage((p) => p + 1); }}>Next →</button>
                   </div>
                 )}
               </>
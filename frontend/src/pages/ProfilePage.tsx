@@ -3,7 +3,7 @@ import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../auth/AuthContext";
 import { getMySummary, type MySummary } from "../services/gamification";
-import { getStudentGrades, type GradeEntry } from "../services/gradebook";
+import { getAllStudentGrades, type GradeEntry } from "../services/gradebook";
 import { apiPatch, apiPost } from "../services/api";
 import LogoutButton from "../components/LogoutButton";
 import { usePageTitle } from "../hooks/usePageTitle";
@@ -116,8 +116,9 @@ function GradesSection({ studentId }: { studentId: number }) {
   const [expanded, setExpanded] = useState(false);
 
   useEffect(() => {
-    getStudentGrades(studentId)
-      .then((d) => setEntries(d.entries))
+    // Averages and counts cover every mark, not just the first page
+    getAllStudentGrades(studentId)
+      .then(setEntries)
       .catch(() => { /* non-fatal — section stays empty */ })
       .finally(() => setLoading(false));
   }, [studentId]);
@@ -142,6 +143,9 @@ function GradesSection({ studentId }: { studentId: number }) {
     bySubject[e.subject].push(e);
   });
 
+  // Within a subject, list marks by term (the API returns newest first)
+  Object.values(bySubject).forEach((list) => list.sort((a, b) => a.term.localeCompare(b.term)));
+
   const subjectKeys = Object.keys(bySubject).sort();
   const shownKeys   = expanded ? subjectKeys : subjectKeys.slice(0, 3);
 
@@ -87,6 +87,16 @@ export async function initCsrf(): Promise<void> {
   }
 }
 
+/**
+ * Keyset-paginated list (backend gyangrit.pagination). Pass `next` / `prev`
+ * back verbatim as ?cursor= — they are opaque; null = no more in that direction.
+ */
+export type CursorPage<T> = {
+  results: T[];
+  next:    string | null;
+  prev:    string | null;
+};
+
 export async function apiGet<T>(path: string): Promise<T> {
   let res: Response;
   try {
@@ -1,4 +1,4 @@
-import { apiGet, apiPost, apiPatch } from "./api";
+import { apiGet, apiPost, apiPatch, type CursorPage } from "./api";
 
 export type AssessmentListItem = {
   id: number;
@@ -98,8 +98,11 @@ export const submitAssessment = (
 export const getMyAttempts = (assessmentId: number) =>
   apiGet<AttemptHistoryItem[]>(`/assessments/${assessmentId}/my-attempts/`);
 
-export const getAllMyAttempts = () =>
-  apiGet<AttemptWithContext[]>(`/assessments/my-history/`);
+/** Newest first, 50 per page — pass `next` back as cursor for older attempts. */
+export const getAllMyAttempts = (cursor?: string) =>
+  apiGet<CursorPage<AttemptWithContext>>(
+    `/assessments/my-history/${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ""}`
+  );
 
 export const updateAssessment = (assessmentId: number, payload: Partial<AssessmentDetail & { is_published: boolean }>) =>
   apiPatch<AssessmentDetail>(`/assessments/${assessmentId}/update/`, payload);
\ No newline at end of file
@@ -1,5 +1,5 @@
 // services/chat.ts
-import { apiGet, apiPost } from "./api";
+import { apiGet, apiPost, type CursorPage } from "./api";
 
 export type RoomType = "subject" | "staff" | "officials";
 
@@ -51,8 +51,11 @@ export const listChatRooms = (institutionId?: string) =>
 export const getChatRoomDetail = (roomId: number) =>
   apiGet<ChatRoom>(`/chat/rooms/${roomId}/`);
 
-export const getChatHistory = (roomId: number) =>
-  apiGet<ChatMessage[]>(`/chat/rooms/${roomId}/history/`);
+/** Latest 50 top-level messages, oldest first; `next` pages back to older ones. */
+export const getChatHistory = (roomId: number, cursor?: string) =>
+  apiGet<CursorPage<ChatMessage>>(
+    `/chat/rooms/${roomId}/history/${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ""}`
+  );
 
 export const getChatThread = (roomId: number, messageId: number) =>
   apiGet<ThreadResponse>(`/chat/rooms/${roomId}/thread/${messageId}/`);
@@ -94,5 +97,7 @@ export const adminListRooms = (params?: { institution_id?: string; room_type?: s
   );
 };
 
-export const adminGetRoomMessages = (roomId: number) =>
-  apiGet<{ room: ChatRoom; messages: ChatMessage[] }>(`/chat/admin/rooms/${roomId}/messages/`);
+export const adminGetRoomMessages = (roomId: number, cursor?: string) =>
+  apiGet<{ room: ChatRoom; messages: ChatMessage[]; next: string | null; prev: string | null }>(
+    `/chat/admin/rooms/${roomId}/messages/${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ""}`
+  );
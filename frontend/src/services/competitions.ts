@@ -1,4 +1,5 @@
 // services/competitions.ts
+import type { ErrorInfo, TokenDetails, TokenParams, TokenRequest } from "ably";
 import { apiGet, apiPost } from "./api";
 
 // ── Types ─────────────────────────────────────────────────────────────────
@@ -56,7 +57,7 @@ export type LeaderboardEntry = {
 };
 
 export type AblyTokenResponse = {
-  token:      string;
+  token_request: TokenRequest;   // signed server-side; the Ably client exchanges it
   expires:    number;
   client_id:  string;
   capability: Record<string, string[]>;
@@ -105,6 +106,32 @@ export const getAblyToken = (roomId?: number, channelType?: "competition" | "cha
     ...(channelType ? { channel_type: channelType } : {}),
   });
 
+/**
+ * Ably authCallback backed by /realtime/token/. `first` (a response the
+ * caller already fetched) is handed out once; renewals fetch a fresh
+ * TokenRequest.
+ */
+export function ablyAuthCallback(
+  roomId?: number,
+  channelType?: "competition" | "chat",
+  first?: AblyTokenResponse,
+) {
+  let pending = first;
+  return (
+    _params: TokenParams,
+    callback: (
+      error: ErrorInfo | string | null,
+      token: TokenDetails | TokenRequest | string | null,
+    ) => void,
+  ) => {
+    const next = pending ? Promise.resolve(pending) : getAblyToken(roomId, channelType);
+    pending = undefined;
+    next
+      .then((data) => callback(null, data.token_request))
+      .catch((err) => callback(err instanceof Error ? err.message : "Token fetch failed", null));
+  };
+}
+
 export const getMyCompetitionHistory = () =>
   apiGet<{room_id: number, title: string, assessment: string, score: number, rank: number, finished_at: string, participant_count: number}[]>("/competitions/history/");
 
@@ -29,7 +29,9 @@ export type GradeEntry = {
 export type StudentGrades = {
   student_id: number;
   student:    string;
-  entries:    GradeEntry[];
+  entries:    GradeEntry[];   // most recently entered first
+  next:       string | null;  // cursor for older entries
+  prev:       string | null;
 };
 
 export type ClassGradeStudent = {
@@ -80,8 +82,10 @@ export const getStudentGrades = (studentId: number, params?: {
   term?: GradeTerm;
   subject_id?: number;
   category?: GradeCategory;
+  cursor?: string;
 }) => {
   const qs = new URLSearchParams();
+  if (params?.cursor)     qs.set("cursor",     params.cursor);
   if (params?.term)       qs.set("term",       params.term);
   if (params?.subject_id) qs.set("subject_id", String(params.subject_id));
   if (params?.category)   qs.set("category",   params.category);
@@ -89,6 +93,25 @@ export const getStudentGrades = (studentId: number, params?: {
   return apiGet<StudentGrades>(`/gradebook/student/${studentId}/${q}`);
 };
 
+/**
+ * Every entry for a student (or filter), following `next` page by page —
+ * for callers that aggregate over the whole list (averages, counts).
+ */
+export const getAllStudentGrades = async (studentId: number, params?: {
+  term?: GradeTerm;
+  subject_id?: number;
+  category?: GradeCategory;
+}): Promise<GradeEntry[]> => {
+  const entries: GradeEntry[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await getStudentGrades(studentId, { ...params, cursor });
+    entries.push(...page.entries);
+    cursor = page.next ?? undefined;
+  } while (cursor);
+  return entries;
+};
+
 export const getClassGrades = (classId: number, params?: {
   term?: GradeTerm;
   subject_id?: number;
@@ -1,5 +1,5 @@
 // services.notifications
-import { apiGet, apiPost } from "./api";
+import { apiGet, apiPost, type CursorPage } from "./api";
 
 // ── Types ─────────────────────────────────────────────────────────────────
 
@@ -53,6 +53,9 @@ export const NOTIFICATION_TYPE_LABELS: Record<NotificationType, string> = {
 
 export type AppNotification = {
   id:              number;
+  // "direct" = own Notification row; "broadcast" = system/district-wide
+  // Broadcast read from the shared row. Ids are unique per kind only.
+  kind:            "direct" | "broadcast";
   subject:         string;
   message:         string;
   type:            NotificationType;
@@ -70,12 +73,9 @@ export type NotificationInbox = {
 };
 
 /** Response shape for the full searchable inbox history endpoint */
-export type InboxHistoryResponse = {
-  count:       number;
-  page:        number;
-  total_pages: number;
-  unread:      number;   // global unread count (not filtered)
-  results:     AppNotification[];
+export type InboxHistoryResponse = CursorPage<AppNotification> & {
+  count?: number;   // first page only — keep it while paging
+  unread: number;   // global unread count (not filtered)
 };
 
 export type Broadcast = {
@@ -102,11 +102,8 @@ export type BroadcastDetail = Broadcast & {
   }[];
 };
 
-export type SentHistoryResponse = {
-  count:       number;
-  page:        number;
-  total_pages: number;
-  results:     Broadcast[];
+export type SentHistoryResponse = CursorPage<Broadcast> & {
+  count?: number;   // first page only — keep it while paging
 };
 
 export type AudienceOptions = {
@@ -149,7 +146,7 @@ export type NotificationFilterParams = {
   sent_after?:  string;          // ISO date YYYY-MM-DD, inclusive lower bound
   sent_before?: string;          // ISO date YYYY-MM-DD, inclusive upper bound
   unread_only?: boolean;         // true = only unread (inbox history only)
-  page?:        number;
+  cursor?:      string;          // `next` / `prev` from the previous page
   page_size?:   number;
 };
 
@@ -189,7 +186,7 @@ export const getNotificationHistory = (params?: NotificationFilterParams) => {
   if (params?.sent_after)  qs.set("sent_after",  params.sent_after);
   if (params?.sent_before) qs.set("sent_before", params.sent_before);
   if (params?.unread_only) qs.set("unread_only", "1");
-  if (params?.page)        qs.set("page", String(params.page));
+  if (params?.cursor)      qs.set("cursor", params.cursor);
   if (params?.page_size)   qs.set("page_size", String(params.page_size));
   const query = qs.toString() ? `?${qs}` : "";
   return apiGet<InboxHistoryResponse>(`/notifications/history/${query}`);
@@ -198,6 +195,19 @@ export const getNotificationHistory = (params?: NotificationFilterParams) => {
 export const markRead = (id: number) =>
   apiPost<{ success: boolean }>(`/notifications/${id}/read/`, {});
 
+export const markBroadcastRead = (id: number) =>
+  apiPost<{ success: boolean }>(`/notifications/broadcasts/${id}/read/`, {});
+
+export const dismissBroadcast = (id: number) =>
+  apiPost<{ success: boolean }>(`/notifications/broadcasts/${id}/dismiss/`, {});
+
+/** Mark an inbox item read via the endpoint for its kind. */
+export const markItemRead = (n: Pick<AppNotification, "id" | "kind">) =>
+  n.kind === "broadcast" ? markBroadcastRead(n.id) : markRead(n.id);
+
+/** Stable React key / identity for an inbox item (ids repeat across kinds). */
+export const inboxKey = (n: Pick<AppNotification, "id" | "kind">) => `${n.kind}-${n.id}`;
+
 export const markAllRead = () =>
   apiPost<{ success: boolean; marked: number }>("/notifications/read-all/", {});
 
@@ -214,7 +224,7 @@ export const getSentHistory = (params?: NotificationFilterParams) => {
   if (params?.type)        qs.set("type", params.type);
   if (params?.sent_after)  qs.set("sent_after",  params.sent_after);
   if (params?.sent_before) qs.set("sent_before", params.sent_before);
-  if (params?.page)        qs.set("page", String(params.page));
+  if (params?.cursor)      qs.set("cursor", params.cursor);
   if (params?.page_size)   qs.set("page_size", String(params.page_size));
   const query = qs.toString() ? `?${qs}` : "";
   return apiGet<SentHistoryResponse>(`/notifications/sent/${query}`);
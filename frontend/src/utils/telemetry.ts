@@ -42,16 +42,15 @@ function _flush() {
   const events = Array.from(deduped.values());
   if (!events.length) return;
 
-  // Send as batch if backend supports it, else fire individually
-  // For now: single POST per unique event (deduped from 4 to ~2)
-  for (const evt of events) {
-    apiPost("/analytics/event/", {
+  // One POST for the whole flush (backend bulk-inserts the batch)
+  apiPost("/analytics/events/batch/", {
+    events: events.map((evt) => ({
       event_type: evt.event_type,
       resource_id: evt.resource_id,
       resource_label: evt.resource_label,
       duration_seconds: evt.duration_seconds,
-    }).catch(() => {});
-  }
+    })),
+  }).catch(() => {});
 }
 
 // Flush on page hide (tab close / navigate away)